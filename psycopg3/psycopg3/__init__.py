@@ -7,10 +7,12 @@ psycopg3 -- PostgreSQL database adapter for Python
 from . import pq
 from .copy import Copy, AsyncCopy
 from .cursor import AsyncCursor, Cursor, Column
+from .cursor import AsyncNamedCursor, NamedCursor
 from .errors import Warning, Error, InterfaceError, DatabaseError
 from .errors import DataError, OperationalError, IntegrityError
 from .errors import InternalError, ProgrammingError, NotSupportedError
 from .connection import AsyncConnection, Connection, Notify
+from .pipeline import Pipeline, AsyncPipeline
 from .transaction import Rollback, Transaction, AsyncTransaction
 
 from .dbapi20 import BINARY, DATETIME, NUMBER, ROWID, STRING
@@ -43,12 +45,16 @@ __all__ = [
     "AsyncConnection",
     "AsyncCopy",
     "AsyncCursor",
+    "AsyncNamedCursor",
+    "AsyncPipeline",
     "AsyncTransaction",
     "Column",
     "Connection",
     "Copy",
     "Cursor",
+    "NamedCursor",
     "Notify",
+    "Pipeline",
     "Rollback",
     "Transaction",
 ]
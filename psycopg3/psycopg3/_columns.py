@@ -0,0 +1,75 @@
+"""
+Support for fetching results column-wise into NumPy arrays.
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, TYPE_CHECKING
+
+from . import errors as e
+from .oids import builtins
+
+if TYPE_CHECKING:
+    from .proto import Transformer
+
+TIMESTAMPTZ_OID = builtins["timestamptz"].oid
+
+# NumPy dtype of the arrays returned for the columns of known types
+_dtypes: Dict[int, str] = {
+    builtins["int2"].oid: "int16",
+    builtins["int4"].oid: "int32",
+    builtins["int8"].oid: "int64",
+    builtins["float4"].oid: "float32",
+    builtins["float8"].oid: "float64",
+    builtins["bool"].oid: "bool",
+    builtins["timestamp"].oid: "datetime64[us]",
+    TIMESTAMPTZ_OID: "datetime64[us]",
+}
+
+
+def load_arrays(tx: "Transformer", row0: int, row1: int) -> List[Any]:
+    """
+    Return the columns of the records from *row0* to *row1* as NumPy arrays.
+
+    Columns containing NULLs are returned as masked arrays.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise e.NotSupportedError(
+            "fetchnumpy() requires the numpy package to be installed"
+        ) from None
+
+    res = tx.pgresult
+    assert res
+    n = row1 - row0
+    rv = []
+    for col in range(res.nfields):
+        oid = res.ftype(col)
+        data = np.empty(n, dtype=_dtypes.get(oid, object))
+        nulls = np.zeros(n, dtype=bool)
+
+        # Fast path: decode binary numbers with no Python object per value.
+        # Datetime arrays can't be exported as buffers: write their int64
+        # representation instead.
+        buf = data.view("int64") if data.dtype.kind == "M" else data
+        if data.dtype == object or not tx.load_column_into(
+            col, row0, row1, buf, nulls
+        ):
+            values = tx.load_column(col, row0, row1)
+            for i, val in enumerate(values):
+                if val is None:
+                    nulls[i] = True
+                    continue
+                if oid == TIMESTAMPTZ_OID and isinstance(val, datetime):
+                    # NumPy datetimes are naive: represent them in UTC
+                    val = val.astimezone(timezone.utc).replace(tzinfo=None)
+                data[i] = val
+
+        if nulls.any():
+            rv.append(np.ma.masked_array(data, mask=nulls))
+        else:
+            rv.append(data)
+
+    return rv
@@ -0,0 +1,157 @@
+"""
+Support for prepared statements
+"""
+
+# Copyright (C) 2020 The Psycopg Team
+
+from enum import IntEnum, auto
+from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING
+from collections import OrderedDict
+
+from .pq import ExecStatus
+from ._queries import PostgresQuery
+
+if TYPE_CHECKING:
+    from .pq.proto import PGresult
+
+Key = Tuple[bytes, Tuple[int, ...]]
+
+
+class Prepare(IntEnum):
+    NO = auto()
+    YES = auto()
+    SHOULD = auto()
+
+
+class PrepareManager:
+    """
+    Keep track of the queries executed on a connection and prepare them.
+
+    A query is prepared on the server once it has been executed
+    `prepare_threshold` times. Up to `prepared_max` statements are kept
+    prepared: the least recently used ones are deallocated.
+    """
+
+    # Number of times a query is executed before it is prepared.
+    prepare_threshold: Optional[int] = 5
+
+    # Maximum number of prepared statements on the connection.
+    prepared_max: int = 100
+
+    def __init__(self) -> None:
+        # Number of times each non-prepared query was executed.
+        self._counts: "OrderedDict[Key, int]" = OrderedDict()
+
+        # Names of the prepared statements, least recently used first.
+        self._names: "OrderedDict[Key, bytes]" = OrderedDict()
+
+        # Names of the statements evicted, to deallocate on the server.
+        self._to_deallocate: List[bytes] = []
+
+        self._prep_seq = 0
+
+        # Number of executions which used, or didn't use, a prepared statement
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: PostgresQuery) -> Key:
+        return (query.query, tuple(query.types or ()))
+
+    def get(
+        self, query: PostgresQuery, prepare: Optional[bool] = None
+    ) -> Tuple[Prepare, bytes]:
+        """
+        Check if a query is prepared, or if it should be prepared.
+
+        Return the action to take and the name of the statement to use.
+        """
+        if prepare is False or self.prepare_threshold is None:
+            # The user doesn't want us to prepare
+            return Prepare.NO, b""
+
+        key = self.key(query)
+        name = self._names.get(key)
+        if name is not None:
+            self._names.move_to_end(key)
+            self.hits += 1
+            return Prepare.YES, name
+
+        self.misses += 1
+        count = self._counts.get(key, 0)
+        if count >= self.prepare_threshold or prepare:
+            # The query was executed enough times: prepare it
+            self._prep_seq += 1
+            return Prepare.SHOULD, f"_pg3_{self._prep_seq}".encode()
+        else:
+            return Prepare.NO, b""
+
+    def maintain(
+        self,
+        query: Optional[PostgresQuery],
+        results: Sequence["PGresult"],
+        prep: Prepare,
+        name: bytes,
+    ) -> None:
+        """
+        Update the state of the cache after a query was executed.
+
+        *query* is `!None` if the query executed was not a candidate to be
+        prepared.
+        """
+        if results and results[-1].status == ExecStatus.PIPELINE_ABORTED:
+            # The query, and its preparation, never reached the server
+            return
+
+        if query and prep is Prepare.SHOULD:
+            # The statement is prepared on the server even if its execution
+            # failed: store it, to reuse it or to deallocate it later.
+            key = self.key(query)
+            self._counts.pop(key, None)
+            if key in self._names:
+                # Prepared twice in the same pipeline: drop the older one
+                self._to_deallocate.append(self._names.pop(key))
+            self._names[key] = name
+            while len(self._names) > self.prepared_max:
+                _, old = self._names.popitem(last=False)
+                self._to_deallocate.append(old)
+
+        for result in results:
+            if result.status not in (
+                ExecStatus.TUPLES_OK,
+                ExecStatus.COMMAND_OK,
+            ):
+                # Don't count failed queries
+                return
+
+            cmd = result.command_status
+            if cmd in (b"DISCARD ALL", b"DEALLOCATE ALL"):
+                # The user dropped all the prepared statements
+                self.clear()
+                return
+
+        if query and prep is Prepare.NO and self.prepare_threshold is not None:
+            key = self.key(query)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._counts.move_to_end(key)
+            # Keep track of more queries than the ones prepared, but not
+            # of an unbounded number of them
+            if len(self._counts) > self.prepared_max * 5:
+                self._counts.popitem(last=False)
+
+    def get_maintenance_commands(self) -> List[bytes]:
+        """
+        Return the commands to run to deallocate the statements evicted.
+
+        The commands can only run if the connection is not in a failed
+        transaction: until then they are kept pending.
+        """
+        cmds = [b"DEALLOCATE " + name for name in self._to_deallocate]
+        self._to_deallocate.clear()
+        return cmds
+
+    def clear(self) -> None:
+        """Forget about all the queries executed and prepared."""
+        self._counts.clear()
+        self._names.clear()
+        self._to_deallocate.clear()
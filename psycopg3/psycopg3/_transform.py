@@ -4,14 +4,16 @@ Helper object to transform values between Python and PostgreSQL
 
 # Copyright (C) 2020 The Psycopg Team
 
+import struct
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Union
 from typing import TYPE_CHECKING
 
 from . import errors as e
 from .pq import Format
 from .oids import builtins, INVALID_OID
 from .proto import AdaptContext, DumpersMap
-from .proto import LoadFunc, LoadersMap
+from .proto import LoadFunc, LoadersMap, Row, RowMaker
 from .cursor import BaseCursor
 from .connection import BaseConnection
 
@@ -20,6 +22,25 @@ if TYPE_CHECKING:
     from .adapt import Dumper, Loader
 
 TEXT_OID = builtins["text"].oid
+TIMESTAMP_OID = builtins["timestamp"].oid
+TIMESTAMPTZ_OID = builtins["timestamptz"].oid
+
+# struct format of the binary types which can be decoded as C numbers
+_raw_formats: Dict[int, str] = {
+    builtins["int2"].oid: "h",
+    builtins["int4"].oid: "i",
+    builtins["int8"].oid: "q",
+    builtins["float4"].oid: "f",
+    builtins["float8"].oid: "d",
+    builtins["bool"].oid: "?",
+    TIMESTAMP_OID: "q",
+    TIMESTAMPTZ_OID: "q",
+}
+
+# Microseconds between the Unix epoch and the PostgreSQL epoch (2000-01-01)
+_PG_EPOCH_USECS = 946_684_800_000_000
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
 
 
 class Transformer:
@@ -44,6 +65,9 @@ class Transformer:
         # mapping class, fmt -> Dumper instance
         self._dumpers_cache: Dict[Tuple[type, Format], "Dumper"] = {}
 
+        # mapping oid, fmt -> Dumper instance
+        self._oid_dumpers_cache: Dict[Tuple[int, Format], "Dumper"] = {}
+
         # mapping oid, fmt -> Loader instance
         self._loaders_cache: Dict[Tuple[int, Format], "Loader"] = {}
 
@@ -54,6 +78,12 @@ class Transformer:
         # the length of the result columns
         self._row_loaders: List[LoadFunc] = []
 
+        # for every result column, true if the loader accepts a memoryview
+        self._row_views: List[bool] = []
+
+        # function to build the row objects from the loaded values
+        self.make_row: Optional[RowMaker] = None
+
     def _setup_context(self, context: AdaptContext) -> None:
         if not context:
             self._connection = None
@@ -114,22 +144,36 @@ class Transformer:
 
     @pgresult.setter
     def pgresult(self, result: Optional["PGresult"]) -> None:
+        self.set_pgresult(result)
+
+    def set_pgresult(
+        self, result: Optional["PGresult"], *, set_loaders: bool = True
+    ) -> None:
+        """
+        Set the result to load the rows from.
+
+        If *set_loaders* is `!False` keep the loaders of the previous result,
+        which is assumed to have the same columns.
+        """
         self._pgresult = result
-        rc = self._row_loaders = []
 
         self._ntuples: int
         self._nfields: int
         if not result:
             self._nfields = self._ntuples = 0
+            if set_loaders:
+                self._row_loaders = []
+                self._row_views = []
             return
 
         nf = self._nfields = result.nfields
         self._ntuples = result.ntuples
+        if not set_loaders:
+            return
 
-        for i in range(nf):
-            oid = result.ftype(i)
-            fmt = result.fformat(i)
-            rc.append(self.get_loader(oid, fmt).load)
+        self.set_row_types(
+            [(result.ftype(i), result.fformat(i)) for i in range(nf)]
+        )
 
     @property
     def dumpers(self) -> DumpersMap:
@@ -141,8 +185,11 @@ class Transformer:
 
     def set_row_types(self, types: Iterable[Tuple[int, Format]]) -> None:
         rc = self._row_loaders = []
+        rv = self._row_views = []
         for oid, fmt in types:
-            rc.append(self.get_loader(oid, fmt).load)
+            loader = self.get_loader(oid, fmt)
+            rc.append(loader.load)
+            rv.append(loader.accept_memoryview)
 
     def get_dumper(self, obj: Any, format: Format) -> "Dumper":
         # Fast path: return a Dumper class already instantiated from the same type
@@ -185,7 +232,35 @@ class Transformer:
             f" to format {Format(format).name}"
         )
 
-    def load_row(self, row: int) -> Optional[Tuple[Any, ...]]:
+    def get_dumper_by_oid(self, oid: int, format: Format) -> "Dumper":
+        """
+        Return a dumper producing data for the type *oid*.
+
+        Only the dumpers registered on Python classes and with a fixed oid
+        are considered.
+        """
+        try:
+            return self._oid_dumpers_cache[oid, format]
+        except KeyError:
+            pass
+
+        for dmap in self._dumpers_maps:
+            for (src, fmt), dumper_class in dmap.items():
+                if (
+                    fmt == format
+                    and isinstance(src, type)
+                    and getattr(dumper_class, "oid", None) == oid
+                ):
+                    dumper = dumper_class(src, self)
+                    self._oid_dumpers_cache[oid, format] = dumper
+                    return dumper
+
+        raise e.ProgrammingError(
+            f"cannot find a dumper for oid {oid}"
+            f" in format {Format(format).name}"
+        )
+
+    def load_row(self, row: int) -> Optional[Row]:
         res = self._pgresult
         if not res:
             return None
@@ -193,14 +268,129 @@ class Transformer:
         if row >= self._ntuples:
             return None
 
+        return self._load_row(res, row)
+
+    def load_rows(self, row0: int, row1: int) -> List[Row]:
+        """
+        Return the records in the result from *row0* included to *row1*
+        excluded.
+        """
+        res = self._pgresult
+        if not res:
+            raise e.InterfaceError("result not set")
+
+        if not (0 <= row0 <= self._ntuples and 0 <= row1 <= self._ntuples):
+            raise e.InterfaceError(
+                f"rows must be included between 0 and {self._ntuples}"
+            )
+
+        return [self._load_row(res, row) for row in range(row0, row1)]
+
+    def load_column(self, col: int, row0: int, row1: int) -> List[Any]:
+        """
+        Return the values of the column *col* in the records from *row0*
+        included to *row1* excluded.
+        """
+        res = self._check_column(col, row0, row1)
+
+        load = self._row_loaders[col]
+        view = self._row_views[col]
         rv: List[Any] = []
-        for col in range(self._nfields):
+        for row in range(row0, row1):
+            val: Union[bytes, memoryview, None]
+            if view:
+                val = res.get_value_view(row, col)
+            else:
+                val = res.get_value(row, col)
+            rv.append(load(val) if val is not None else None)
+
+        return rv
+
+    def load_column_into(
+        self, col: int, row0: int, row1: int, data: Any, nulls: Any
+    ) -> bool:
+        """
+        Decode the column *col* as C numbers into the buffer *data*.
+
+        Only binary columns of numeric, bool and timestamp types are
+        supported: return `!False` without touching the buffers for other
+        columns. The values of the records from *row0* to *row1* are written
+        in native byte order; timestamps are written as microseconds since
+        the Unix epoch, with infinity represented by the smallest int64.
+        Every byte of *nulls* is set to 1 if the value is NULL, else 0.
+
+        The loaders configured for the column are not used.
+        """
+        res = self._check_column(col, row0, row1)
+        if res.fformat(col) != Format.BINARY:
+            return False
+        oid = res.ftype(col)
+        fmt = _raw_formats.get(oid)
+        if not fmt:
+            return False
+
+        unpack = struct.Struct("!" + fmt).unpack
+        pack_into = struct.Struct("=" + fmt).pack_into
+        size = struct.calcsize(fmt)
+        dbuf = memoryview(data).cast("B")
+        # Annotated as Any: typeshed doesn't allow to set items to int
+        nbuf: Any = memoryview(nulls).cast("B")
+        if dbuf.nbytes < (row1 - row0) * size or nbuf.nbytes < row1 - row0:
+            raise e.InterfaceError("buffer too small for the column data")
+
+        is_ts = oid == TIMESTAMP_OID or oid == TIMESTAMPTZ_OID
+        for i, row in enumerate(range(row0, row1)):
             val = res.get_value(row, col)
+            if val is None:
+                nbuf[i] = 1
+                pack_into(dbuf, i * size, 0)
+                continue
+
+            nbuf[i] = 0
+            (v,) = unpack(val)
+            if is_ts:
+                if v == _INT64_MIN or v == _INT64_MAX:
+                    v = _INT64_MIN
+                elif v > _INT64_MAX - _PG_EPOCH_USECS:
+                    raise e.DataError("timestamp out of range")
+                else:
+                    v += _PG_EPOCH_USECS
+            pack_into(dbuf, i * size, v)
+
+        return True
+
+    def _check_column(self, col: int, row0: int, row1: int) -> "PGresult":
+        res = self._pgresult
+        if not res:
+            raise e.InterfaceError("result not set")
+
+        if not 0 <= col < self._nfields:
+            raise e.InterfaceError(
+                f"column must be included between 0 and {self._nfields}"
+            )
+
+        if not (0 <= row0 <= self._ntuples and 0 <= row1 <= self._ntuples):
+            raise e.InterfaceError(
+                f"rows must be included between 0 and {self._ntuples}"
+            )
+
+        return res
+
+    def _load_row(self, res: "PGresult", row: int) -> Row:
+        rv: List[Any] = []
+        for col in range(self._nfields):
+            val: Union[bytes, memoryview, None]
+            if self._row_views[col]:
+                val = res.get_value_view(row, col)
+            else:
+                val = res.get_value(row, col)
             if val is None:
                 rv.append(None)
             else:
                 rv.append(self._row_loaders[col](val))
 
+        if self.make_row:
+            return self.make_row(rv)
         return tuple(rv)
 
     def load_sequence(
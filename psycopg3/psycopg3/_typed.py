@@ -0,0 +1,177 @@
+"""
+Dumper converting objects of any Python class to a specified type.
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+import struct
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from . import errors as e
+from .pq import Format
+from .oids import builtins
+from .adapt import Dumper, Transformer
+from .proto import AdaptContext
+from .types.array import ListDumper, ListBinaryDumper, _struct_head
+
+DumpFunc = Callable[[Any], bytes]
+
+# Types whose data in binary format is the same, so that the dumper of one can
+# be used for the other.
+_binary_compatible = {
+    builtins["timestamp"].oid: builtins["timestamptz"].oid,
+    builtins["timestamptz"].oid: builtins["timestamp"].oid,
+}
+
+
+class TypedDumper(Dumper):
+    """
+    Dump objects as the PostgreSQL type *oid*, whatever their Python class.
+
+    An object is dumped by the dumper of its class if it produces the type
+    requested, otherwise by a dumper of the type, converting numbers to the
+    Python class it expects. `!str` objects are passed to the server to parse
+    in text format, or for types for which no dumper is known. Other objects
+    raise a `~psycopg3.DataError`.
+    """
+
+    def __init__(self, oid: int, format: Format, context: AdaptContext = None):
+        super().__init__(object, context)
+        self._oid = oid
+        self.format = format
+        self._tx = Transformer(context)
+        self._dumps: Dict[type, DumpFunc] = {}
+
+        # The oid of the items, if the type is a builtin array
+        self._item_oid = 0
+        info = builtins.get(oid)
+        if not info:
+            self._name = f"oid {oid}"
+        elif info.array_oid == oid:
+            self._name = f"{info.name}[]"
+            self._item_oid = info.oid
+        else:
+            self._name = info.name
+
+    @property
+    def oid(self) -> int:
+        return self._oid
+
+    def dump(self, obj: Any) -> bytes:
+        try:
+            dump = self._dumps[type(obj)]
+        except KeyError:
+            dump = self._dumps[type(obj)] = self._get_dump(obj)
+
+        try:
+            return dump(obj)
+        except (struct.error, OverflowError) as ex:
+            raise e.DataError(
+                f"cannot dump {obj!r} as {self._name}: {ex}"
+            ) from None
+
+    def _get_dump(self, obj: Any) -> DumpFunc:
+        """Return the function to dump the objects of the class of *obj*."""
+        if self._item_oid and isinstance(obj, list):
+            ldumper: Union[_TypedListDumper, _TypedListBinaryDumper]
+            if self.format == Format.BINARY:
+                ldumper = _TypedListBinaryDumper(list, self.context)
+            else:
+                ldumper = _TypedListDumper(list, self.context)
+            ldumper.item_dumper = TypedDumper(
+                self._item_oid, self.format, self.context
+            )
+            return ldumper.dump
+
+        dumper = self._tx.get_dumper(obj, self.format)
+        if dumper.oid == self._oid:
+            return dumper.dump
+        if self.format == Format.BINARY:
+            if _binary_compatible.get(dumper.oid) == self._oid:
+                return dumper.dump
+
+        try:
+            typed: Optional[Dumper]
+            typed = self._tx.get_dumper_by_oid(self._oid, self.format)
+        except e.ProgrammingError:
+            typed = None
+
+        if typed:
+            if isinstance(obj, typed.src):
+                return typed.dump
+            conv = _get_converter(type(obj), typed.src)
+            if conv:
+                return _converting_dump(typed.dump, conv)
+
+        if isinstance(obj, str) and (not typed or self.format == Format.TEXT):
+            return dumper.dump
+
+        raise e.DataError(
+            f"cannot dump {type(obj).__name__} objects as {self._name}"
+        )
+
+
+class _TypedListDumper(ListDumper):
+    item_dumper: Dumper
+
+    def _get_item_dumper(self, item: Any, format: Format) -> Dumper:
+        return self.item_dumper
+
+
+class _TypedListBinaryDumper(ListBinaryDumper):
+    item_dumper: Dumper
+
+    def dump(self, obj: List[Any]) -> bytes:
+        if not obj:
+            # The server checks the items type of empty arrays too
+            return _struct_head.pack(0, 0, self.item_dumper.oid)
+        return super().dump(obj)
+
+    def _get_item_dumper(self, item: Any, format: Format) -> Dumper:
+        return self.item_dumper
+
+
+def _converting_dump(dump: DumpFunc, conv: Callable[[Any], Any]) -> DumpFunc:
+    def dump_converted(obj: Any) -> bytes:
+        return dump(conv(obj))
+
+    return dump_converted
+
+
+def _get_converter(cls: type, target: type) -> Optional[Callable[[Any], Any]]:
+    """
+    Return a function to convert numbers of class *cls* to class *target*.
+
+    Return `!None` if no conversion is possible.
+    """
+    if not issubclass(cls, (int, float, Decimal)):
+        return None
+
+    if issubclass(target, bool):
+        return None
+
+    if issubclass(target, int):
+
+        def to_int(obj: Any) -> Any:
+            try:
+                rv = int(obj)
+            except (ValueError, OverflowError):
+                pass
+            else:
+                if rv == obj:
+                    return target(rv)
+            raise e.DataError(f"cannot convert {obj!r} to an integer")
+
+        return to_int
+
+    if issubclass(target, float):
+        return target
+
+    if issubclass(target, Decimal):
+        if issubclass(cls, float):
+            # Decimal(float) would use all the digits of its binary value
+            return lambda obj: target(repr(obj))
+        return target
+
+    return None
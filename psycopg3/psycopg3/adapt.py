@@ -104,6 +104,10 @@ class Loader:
     globals: LoadersMap = {}
     connection: Optional[BaseConnection]
 
+    # If true, load() may receive a memoryview on the result data instead of
+    # a copy of it: it must not keep a reference to it after returning.
+    accept_memoryview = False
+
     def __init__(self, oid: int, context: AdaptContext = None):
         self.oid = oid
         self.context = context
@@ -9,8 +9,8 @@ import asyncio
 import logging
 import threading
 from types import TracebackType
-from typing import Any, AsyncIterator, Callable, Iterator, List, NamedTuple
-from typing import Optional, Type, TYPE_CHECKING, Union
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List
+from typing import NamedTuple, Optional, Type, TYPE_CHECKING, Union
 from weakref import ref, ReferenceType
 from functools import partial
 from contextlib import contextmanager
@@ -26,10 +26,12 @@ from . import errors as e
 from . import encodings
 from .pq import TransactionStatus, ExecStatus, Format
 from .sql import Composable
-from .proto import DumpersMap, LoadersMap, PQGen, RV, Query
+from .proto import DumpersMap, LoadersMap, PQGen, RV, Query, RowFactory
 from .waiting import wait, wait_async
 from .conninfo import make_conninfo
 from .generators import notifies
+from ._preparing import PrepareManager
+from .pipeline import BasePipeline, Pipeline, AsyncPipeline
 from .transaction import Transaction, AsyncTransaction
 
 logger = logging.getLogger(__name__)
@@ -99,25 +101,49 @@ class BaseConnection:
     TransactionStatus = pq.TransactionStatus
 
     cursor_factory: Union[Type["Cursor"], Type["AsyncCursor"]]
+    _pipeline: Optional["BasePipeline[Any]"]
 
     def __init__(self, pgconn: "PGconn"):
         self.pgconn = pgconn  # TODO: document this
         self._autocommit = False
         self.dumpers: DumpersMap = {}
         self.loaders: LoadersMap = {}
+        self.row_factory: Optional[RowFactory] = None
         self._notice_handlers: List[NoticeHandler] = []
         self._notify_handlers: List[NotifyHandler] = []
 
+        # Statements prepared automatically on the connection
+        self._prepared = PrepareManager()
+
         # Stack of savepoint names managed by current transaction blocks.
         # the first item is "" in case the outermost Transaction must manage
         # only a begin/commit and not a savepoint.
         self._savepoints: List[str] = []
 
+        # The pipeline the connection is in, if pipeline mode is active.
+        self._pipeline = None
+
         wself = ref(self)
 
         pgconn.notice_handler = partial(BaseConnection._notice_handler, wself)
         pgconn.notify_handler = partial(BaseConnection._notify_handler, wself)
 
+    def _in_transaction(self) -> bool:
+        """
+        Return `!True` if a transaction is in progress.
+
+        In pipeline mode the transaction status is ACTIVE while there are
+        commands in flight, so the pipeline keeps track of the transaction.
+        """
+        if self._pipeline:
+            return self._pipeline._in_transaction
+        return self.pgconn.transaction_status != TransactionStatus.IDLE
+
+    def _set_in_transaction(self, value: bool) -> None:
+        # Record a begin or the end of a transaction queued in a pipeline
+        if self._pipeline:
+            self._pipeline._in_transaction = value
+
     @property
     def closed(self) -> bool:
         """`True` if the connection is closed."""
@@ -164,6 +190,54 @@ class BaseConnection:
     def _set_client_encoding(self, name: str) -> None:
         raise NotImplementedError
 
+    @property
+    def prepare_threshold(self) -> Optional[int]:
+        """
+        Number of times a query is executed before it is prepared.
+
+        If it is set to 0, every query is prepared the first time is
+        executed. If it is set to `!None`, prepared statements are disabled
+        on the connection.
+
+        Default value: 5
+        """
+        return self._prepared.prepare_threshold
+
+    @prepare_threshold.setter
+    def prepare_threshold(self, value: Optional[int]) -> None:
+        self._prepared.prepare_threshold = value
+
+    @property
+    def prepared_max(self) -> int:
+        """
+        Maximum number of prepared statements on the connection.
+
+        When the limit is exceeded the least recently used statement is
+        deallocated.
+
+        Default value: 100
+        """
+        return self._prepared.prepared_max
+
+    @prepared_max.setter
+    def prepared_max(self, value: int) -> None:
+        self._prepared.prepared_max = value
+
+    @property
+    def prepared_stats(self) -> Dict[str, int]:
+        """
+        Counters about the use of prepared statements on the connection.
+
+        ``hits`` is the number of queries executed using a statement already
+        prepared, ``misses`` the number of queries that could be prepared but
+        weren't, ``prepared`` the number of statements currently prepared.
+        """
+        return {
+            "hits": self._prepared.hits,
+            "misses": self._prepared.misses,
+            "prepared": len(self._prepared._names),
+        }
+
     def cancel(self) -> None:
         """Cancel the current operation on the connection."""
         c = self.pgconn.get_cancel()
@@ -232,6 +306,7 @@ class Connection(BaseConnection):
     __module__ = "psycopg3"
 
     cursor_factory: Type["Cursor"]
+    _pipeline: Optional[Pipeline]
 
     def __init__(self, pgconn: "PGconn"):
         super().__init__(pgconn)
@@ -240,7 +315,12 @@ class Connection(BaseConnection):
 
     @classmethod
     def connect(
-        cls, conninfo: str = "", *, autocommit: bool = False, **kwargs: Any
+        cls,
+        conninfo: str = "",
+        *,
+        autocommit: bool = False,
+        row_factory: Optional[RowFactory] = None,
+        **kwargs: Any,
     ) -> "Connection":
         """
         Connect to a database server and return a new `Connection` instance.
@@ -253,6 +333,7 @@ class Connection(BaseConnection):
         pgconn = cls.wait(gen)
         conn = cls(pgconn)
         conn._autocommit = autocommit
+        conn.row_factory = row_factory
         return conn
 
     def __enter__(self) -> "Connection":
@@ -275,24 +356,48 @@ class Connection(BaseConnection):
         """Close the database connection."""
         self.pgconn.finish()
 
-    def cursor(self, name: str = "", format: Format = Format.TEXT) -> "Cursor":
+    def cursor(
+        self,
+        name: str = "",
+        format: Format = Format.TEXT,
+        *,
+        scrollable: Optional[bool] = None,
+        withhold: bool = False,
+        row_factory: Optional[RowFactory] = None,
+    ) -> "Cursor":
         """
         Return a new `Cursor` to send commands and queries to the connection.
+
+        If *name* is specified, return a `NamedCursor` to fetch the records
+        of a query from a cursor on the server.
         """
+        if row_factory is None:
+            row_factory = self.row_factory
+
         if name:
-            raise NotImplementedError
+            return cursor.NamedCursor(
+                self,
+                name,
+                format=format,
+                scrollable=scrollable,
+                withhold=withhold,
+                row_factory=row_factory,
+            )
 
-        return self.cursor_factory(self, format=format)
+        return self.cursor_factory(
+            self, format=format, row_factory=row_factory
+        )
 
     def _start_query(self) -> None:
         # the function is meant to be called by a cursor once the lock is taken
         if self._autocommit:
             return
 
-        if self.pgconn.transaction_status != TransactionStatus.IDLE:
+        if self._in_transaction():
             return
 
         self._exec_command(b"begin")
+        self._set_in_transaction(True)
 
     def commit(self) -> None:
         """Commit any pending transaction to the database."""
@@ -303,9 +408,10 @@ class Connection(BaseConnection):
                     "context. (Transaction will be automatically committed "
                     "on successful exit from context.)"
                 )
-            if self.pgconn.transaction_status == TransactionStatus.IDLE:
+            if not self._in_transaction():
                 return
             self._exec_command(b"commit")
+            self._set_in_transaction(False)
 
     def rollback(self) -> None:
         """Roll back to the start of any pending transaction."""
@@ -316,9 +422,10 @@ class Connection(BaseConnection):
                     "context. (Either raise Rollback() or allow "
                     "an exception to propagate out of the context.)"
                 )
-            if self.pgconn.transaction_status == TransactionStatus.IDLE:
+            if not self._in_transaction():
                 return
             self._exec_command(b"rollback")
+            self._set_in_transaction(False)
 
     def _exec_command(self, command: Query) -> None:
         # Caller must hold self.lock
@@ -328,6 +435,12 @@ class Connection(BaseConnection):
         elif isinstance(command, Composable):
             command = command.as_string(self).encode(self.client_encoding)
 
+        if self._pipeline:
+            # The result will be checked when the pipeline is synced
+            self.pgconn.send_query_params(command, None)
+            self._pipeline._enqueue(None)
+            return
+
         self.pgconn.send_query(command)
         results = self.wait(execute(self.pgconn))
         if results[-1].status != ExecStatus.COMMAND_OK:
@@ -353,6 +466,19 @@ class Connection(BaseConnection):
         with Transaction(self, savepoint_name, force_rollback) as tx:
             yield tx
 
+    @contextmanager
+    def pipeline(self) -> Iterator[Pipeline]:
+        """
+        Start a context block switching the connection in pipeline mode.
+
+        In the block the commands executed are sent to the server without
+        waiting for their results, which are received all together when
+        `Pipeline.sync()` is called, when a cursor with pending results is
+        fetched, or on block exit.
+        """
+        with Pipeline(self) as p:
+            yield p
+
     @classmethod
     def wait(cls, gen: PQGen[RV], timeout: Optional[float] = 0.1) -> RV:
         return wait(gen, timeout=timeout)
@@ -397,6 +523,7 @@ class AsyncConnection(BaseConnection):
     __module__ = "psycopg3"
 
     cursor_factory: Type["AsyncCursor"]
+    _pipeline: Optional[AsyncPipeline]
 
     def __init__(self, pgconn: "PGconn"):
         super().__init__(pgconn)
@@ -405,13 +532,19 @@ class AsyncConnection(BaseConnection):
 
     @classmethod
     async def connect(
-        cls, conninfo: str = "", *, autocommit: bool = False, **kwargs: Any
+        cls,
+        conninfo: str = "",
+        *,
+        autocommit: bool = False,
+        row_factory: Optional[RowFactory] = None,
+        **kwargs: Any,
     ) -> "AsyncConnection":
         conninfo = make_conninfo(conninfo, **kwargs)
         gen = connect(conninfo)
         pgconn = await cls.wait(gen)
         conn = cls(pgconn)
         conn._autocommit = autocommit
+        conn.row_factory = row_factory
         return conn
 
     async def __aenter__(self) -> "AsyncConnection":
@@ -434,25 +567,46 @@ class AsyncConnection(BaseConnection):
         self.pgconn.finish()
 
     async def cursor(
-        self, name: str = "", format: Format = Format.TEXT
+        self,
+        name: str = "",
+        format: Format = Format.TEXT,
+        *,
+        scrollable: Optional[bool] = None,
+        withhold: bool = False,
+        row_factory: Optional[RowFactory] = None,
     ) -> "AsyncCursor":
         """
         Return a new `AsyncCursor` to send commands and queries to the connection.
+
+        If *name* is specified, return an `AsyncNamedCursor`.
         """
+        if row_factory is None:
+            row_factory = self.row_factory
+
         if name:
-            raise NotImplementedError
+            return cursor.AsyncNamedCursor(
+                self,
+                name,
+                format=format,
+                scrollable=scrollable,
+                withhold=withhold,
+                row_factory=row_factory,
+            )
 
-        return self.cursor_factory(self, format=format)
+        return self.cursor_factory(
+            self, format=format, row_factory=row_factory
+        )
 
     async def _start_query(self) -> None:
         # the function is meant to be called by a cursor once the lock is taken
         if self._autocommit:
             return
 
-        if self.pgconn.transaction_status != TransactionStatus.IDLE:
+        if self._in_transaction():
             return
 
         await self._exec_command(b"begin")
+        self._set_in_transaction(True)
 
     async def commit(self) -> None:
         async with self.lock:
@@ -462,9 +616,10 @@ class AsyncConnection(BaseConnection):
                     "context. (Transaction will be automatically committed "
                     "on successful exit from context.)"
                 )
-            if self.pgconn.transaction_status == TransactionStatus.IDLE:
+            if not self._in_transaction():
                 return
             await self._exec_command(b"commit")
+            self._set_in_transaction(False)
 
     async def rollback(self) -> None:
         async with self.lock:
@@ -474,9 +629,10 @@ class AsyncConnection(BaseConnection):
                     "context. (Either raise Rollback() or allow "
                     "an exception to propagate out of the context.)"
                 )
-            if self.pgconn.transaction_status == TransactionStatus.IDLE:
+            if not self._in_transaction():
                 return
             await self._exec_command(b"rollback")
+            self._set_in_transaction(False)
 
     async def _exec_command(self, command: Query) -> None:
         # Caller must hold self.lock
@@ -486,6 +642,12 @@ class AsyncConnection(BaseConnection):
         elif isinstance(command, Composable):
             command = command.as_string(self).encode(self.client_encoding)
 
+        if self._pipeline:
+            # The result will be checked when the pipeline is synced
+            self.pgconn.send_query_params(command, None)
+            self._pipeline._enqueue(None)
+            return
+
         self.pgconn.send_query(command)
         results = await self.wait(execute(self.pgconn))
         if results[-1].status != ExecStatus.COMMAND_OK:
@@ -507,6 +669,14 @@ class AsyncConnection(BaseConnection):
         async with tx:
             yield tx
 
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[AsyncPipeline]:
+        """
+        Start a context block switching the connection in pipeline mode.
+        """
+        async with AsyncPipeline(self) as p:
+            yield p
+
     @classmethod
     async def wait(cls, gen: PQGen[RV]) -> RV:
         return await wait_async(gen)
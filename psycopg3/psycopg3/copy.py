@@ -4,23 +4,39 @@ psycopg3 copy support
 
 # Copyright (C) 2020 The Psycopg Team
 
+import io
+import os
 import re
+import mmap
 import struct
-from typing import TYPE_CHECKING, AsyncIterator, Iterator, Generic
-from typing import Any, Dict, List, Match, Optional, Sequence, Type, Union
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Generic, IO
+from typing import Any, Callable, Dict, List, Match, Optional, Sequence
+from typing import Tuple, Type, Union, cast
 from types import TracebackType
 
+from . import pq
+from . import errors as e
 from .pq import Format, ExecStatus
-from .proto import ConnectionType
+from .oids import builtins, INVALID_OID
+from .proto import Buffer, ConnectionType, PQGen
 from .generators import copy_from, copy_to, copy_end
 
 if TYPE_CHECKING:
-    from .pq.proto import PGresult
+    from .adapt import Dumper
+    from .proto import Transformer
+    from .pq.proto import PGconn, PGresult
     from .cursor import BaseCursor  # noqa: F401
     from .connection import Connection, AsyncConnection  # noqa: F401
 
+FileSource = Union[str, "os.PathLike[str]", IO[Any]]
+
 
 class BaseCopy(Generic[ConnectionType]):
+
+    # Size of the data to accumulate with write_row() before sending it to
+    # the server, and of the blocks of data to receive by default.
+    buffer_size = 64 * 1024
+
     def __init__(self, cursor: "BaseCursor[ConnectionType]"):
         self.cursor = cursor
         self.connection = cursor.connection
@@ -35,64 +51,147 @@ class BaseCopy(Generic[ConnectionType]):
         self._encoding = self.connection.client_encoding
         self._first_row = True
         self._finished = False
+        self._write_buffer = bytearray()
+        self._read_leftover = b""
+        self._row_dumpers: Optional[List[Optional["Dumper"]]] = None
 
         if self.format == Format.TEXT:
-            self._format_copy_row = self._format_row_text
+            self._format_row = format_row_text
+            self._parse_row = parse_row_text
         else:
-            self._format_copy_row = self._format_row_binary
-
-    def _format_row(self, row: Sequence[Any]) -> bytes:
-        """Convert a Python sequence to the data to send for copy"""
-        out: List[Optional[bytes]] = []
-        for item in row:
-            if item is not None:
-                dumper = self.transformer.get_dumper(item, self.format)
-                out.append(dumper.dump(item))
-            else:
-                out.append(None)
-        return self._format_copy_row(out)
-
-    def _format_row_text(self, row: Sequence[Optional[bytes]]) -> bytes:
-        """Convert a row of adapted data to the data to send for text copy"""
-        return (
-            b"\t".join(
-                _bsrepl_re.sub(_bsrepl_sub, item)
-                if item is not None
-                else br"\N"
-                for item in row
+            self._format_row = format_row_binary
+            self._parse_row = parse_row_binary
+
+    def set_types(self, types: Sequence[Union[int, str, None]]) -> None:
+        """
+        Set the types of the columns of the :sql:`COPY` operation.
+
+        *types* is a sequence of oids or type names, one per column.
+
+        In :sql:`COPY FROM` the values passed to `write_row()` are converted
+        to data of these types, rather than of the types chosen by their
+        Python class: this is necessary for instance to write Python `!int`
+        in :sql:`int4` columns using a binary copy. Numbers are converted to
+        the type of the column if they can be represented exactly;
+        `!str` values are passed to the server to parse for types without a
+        known dumper (such as :sql:`text` or enums), or in text format. Other
+        values which cannot be dumped as the type of their column raise
+        `~psycopg3.DataError`. Columns whose type is `!None` are converted
+        according to the Python class of the values.
+
+        In :sql:`COPY TO` the values returned by `read_row()` are converted
+        using the loaders for these types. Without types, or for columns
+        whose type is `!None`, the values are returned as `!str` in text
+        format and as `!bytes` in binary format.
+        """
+        oids = [
+            _get_type_oid(t) if isinstance(t, str) else t or INVALID_OID
+            for t in types
+        ]
+        if self._pgresult.status == ExecStatus.COPY_OUT:
+            self.transformer.set_row_types(
+                [(oid, self.format) for oid in oids]
             )
-            + b"\n"
-        )
+            return
 
-    def _format_row_binary(
-        self,
-        row: Sequence[Optional[bytes]],
-        __int2_struct: struct.Struct = struct.Struct("!h"),
-        __int4_struct: struct.Struct = struct.Struct("!i"),
-    ) -> bytes:
-        """Convert a row of adapted data to the data to send for binary copy"""
-        out = []
+        from ._typed import TypedDumper
+
+        self._row_dumpers = [
+            TypedDumper(oid, self.format, self.transformer) if oid else None
+            for oid in oids
+        ]
+
+    def _write_row_buffer(self, row: Sequence[Any]) -> Optional[bytes]:
+        """
+        Add a row to the write buffer.
+
+        Return the data to send to the server if the buffer is full.
+        """
         if self._first_row:
-            out.append(
-                # Signature, flags, extra length
-                b"PGCOPY\n\xff\r\n\0"
-                b"\x00\x00\x00\x00"
-                b"\x00\x00\x00\x00"
-            )
+            if self.format == Format.BINARY:
+                self._write_buffer += _binary_signature
             self._first_row = False
 
-        out.append(__int2_struct.pack(len(row)))
-        for item in row:
-            if item is not None:
-                out.append(__int4_struct.pack(len(item)))
-                out.append(item)
-            else:
-                out.append(b"\xff\xff\xff\xff")
+        self._format_row(
+            row, self.transformer, self._write_buffer, self._row_dumpers
+        )
+        if len(self._write_buffer) >= self.buffer_size:
+            return self._flush_buffer()
+        else:
+            return None
 
-        return b"".join(out)
+    def _read_block_gen(self, max_bytes: int) -> PQGen[bytes]:
+        """
+        Return the data left from a previous read, or receive a new block.
 
-    def _ensure_bytes(self, data: Union[bytes, str]) -> bytes:
-        if isinstance(data, bytes):
+        The block returned may be larger than *max_bytes*: see _trim_block().
+        """
+        if self._read_leftover:
+            data = self._read_leftover
+            self._read_leftover = b""
+            return data
+
+        if self._finished:
+            return b""
+
+        data, res = yield from copy_from_block(
+            self.connection.pgconn, max_bytes
+        )
+        if res:
+            self._finished = True
+            nrows = res.command_tuples
+            self.cursor._rowcount = nrows if nrows is not None else -1
+
+        return data
+
+    def _trim_block(self, data: bytes, max_bytes: int) -> bytes:
+        """Return at most *max_bytes* of *data*, keeping the rest for later."""
+        if len(data) > max_bytes:
+            self._read_leftover = data[max_bytes:]
+            data = data[:max_bytes]
+        return data
+
+    def _copy_block_into(self, data: bytes, buffer: Any) -> int:
+        """Copy *data* into *buffer*, keeping what doesn't fit for later."""
+        target = memoryview(buffer).cast("B")
+        n = len(data)
+        if n > len(target):
+            n = len(target)
+            self._read_leftover = data[n:]
+        target[:n] = memoryview(data)[:n]
+        return n
+
+    def _read_row_data(self, data: bytes) -> Optional[Tuple[Any, ...]]:
+        """
+        Convert the data of a row received from the server to a tuple.
+
+        Return `!None` on the binary copy trailer.
+        """
+        if self.format == Format.BINARY:
+            if self._first_row:
+                data = data[_check_binary_header(data) :]
+                self._first_row = False
+            if data == _binary_trailer:
+                return None
+
+        return self._parse_row(data, self.transformer)
+
+    def _flush_buffer(self) -> bytes:
+        """Return the data in the write buffer and empty it."""
+        data = bytes(self._write_buffer)
+        del self._write_buffer[:]
+        return data
+
+    def _end_data(self) -> bytes:
+        """Return the data to send at the end of a successful copy."""
+        if self.format == Format.BINARY and not self._first_row:
+            # send EOF only if we copied binary rows (_first_row is False)
+            self._write_buffer += _binary_trailer
+        return self._flush_buffer()
+
+    def _ensure_bytes(self, data: Union[Buffer, str]) -> Buffer:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # Sent as they are: the libpq copies the data in its own buffer
             return data
 
         elif isinstance(data, str):
@@ -105,6 +204,188 @@ class BaseCopy(Generic[ConnectionType]):
         else:
             raise TypeError(f"can't write {type(data).__name__}")
 
+    def _file_chunks(
+        self, file: FileSource, chunk_size: int
+    ) -> Iterator[Union[Buffer, str]]:
+        """
+        Iterate over the content of *file* in chunks of *chunk_size* bytes.
+
+        A file specified by path is memory-mapped. A file object is read into
+        a buffer reused for every chunk, so a chunk must be sent before
+        getting the next one.
+        """
+        # os.PathLike is a protocol, which cannot be used in isinstance().
+        if isinstance(file, str) or hasattr(file, "__fspath__"):
+            path = cast(Union[str, "os.PathLike[str]"], file)
+            with open(path, "rb") as f:
+                try:
+                    # A private writable map, because ctypes can only point
+                    # to writable buffers; the pages are never written.
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                except ValueError:
+                    # Empty files cannot be mapped
+                    return
+
+            # The map is released when the last chunk is deleted
+            mv = memoryview(mm)
+            for i in range(0, len(mv), chunk_size):
+                yield mv[i : i + chunk_size]
+
+        elif hasattr(file, "readinto"):
+            raw = cast(io.RawIOBase, file)
+            buf = bytearray(chunk_size)
+            mv = memoryview(buf)
+            while True:
+                n = raw.readinto(buf)
+                if not n:
+                    break
+                yield mv[:n]
+
+        else:
+            src = cast(IO[Any], file)
+            while True:
+                data = src.read(chunk_size)
+                if not data:
+                    break
+                yield data
+
+
+def _get_type_oid(name: str) -> int:
+    """Return the oid of a builtin type name, such as "int4" or "text[]"."""
+    info = builtins.get(name[:-2] if name.endswith("[]") else name)
+    if not info:
+        raise e.ProgrammingError(f"unknown type name: {name!r}")
+    return info.array_oid if name.endswith("[]") else info.oid
+
+
+def _format_row_text(
+    row: Sequence[Any],
+    tx: "Transformer",
+    out: Optional[bytearray] = None,
+    dumpers: Optional[List[Optional["Dumper"]]] = None,
+) -> bytearray:
+    """Convert a row of objects to the data to send for text copy"""
+    if out is None:
+        out = bytearray()
+
+    if not row:
+        out += b"\n"
+        return out
+
+    for i, item in enumerate(row):
+        if item is not None:
+            dumper = _get_row_dumper(tx, dumpers, i, item, Format.TEXT)
+            out += _bsrepl_re.sub(_bsrepl_sub, dumper.dump(item))
+        else:
+            out += br"\N"
+        out += b"\t"
+
+    out[-1:] = b"\n"
+    return out
+
+
+def _format_row_binary(
+    row: Sequence[Any],
+    tx: "Transformer",
+    out: Optional[bytearray] = None,
+    dumpers: Optional[List[Optional["Dumper"]]] = None,
+) -> bytearray:
+    """Convert a row of objects to the data to send for binary copy"""
+    if out is None:
+        out = bytearray()
+
+    out += _pack_int2(len(row))
+    for i, item in enumerate(row):
+        if item is not None:
+            dumper = _get_row_dumper(tx, dumpers, i, item, Format.BINARY)
+            data = dumper.dump(item)
+            out += _pack_int4(len(data))
+            out += data
+        else:
+            out += _binary_null
+
+    return out
+
+
+def _get_row_dumper(
+    tx: "Transformer",
+    dumpers: Optional[List[Optional["Dumper"]]],
+    i: int,
+    item: Any,
+    format: Format,
+) -> "Dumper":
+    if dumpers and i < len(dumpers):
+        dumper = dumpers[i]
+        if dumper:
+            return dumper
+    return tx.get_dumper(item, format)
+
+
+def _parse_row_text(data: bytes, tx: "Transformer") -> Tuple[Any, ...]:
+    """Convert a row of data received from a text copy to Python objects"""
+    fields = data.split(b"\t")
+    fields[-1] = fields[-1][:-1]  # drop the newline
+    row: List[Optional[bytes]] = []
+    for field in fields:
+        if field == b"\\N":
+            row.append(None)
+        elif b"\\" in field:
+            row.append(_bsunrepl_re.sub(_bsunrepl_sub, field))
+        else:
+            row.append(field)
+
+    return _load_sequence(row, tx)
+
+
+def _parse_row_binary(data: bytes, tx: "Transformer") -> Tuple[Any, ...]:
+    """Convert a row of data received from a binary copy to Python objects"""
+    row: List[Optional[bytes]] = []
+    nfields = _unpack_int2(data, 0)[0]
+    pos = 2
+    for i in range(nfields):
+        length = _unpack_int4(data, pos)[0]
+        pos += 4
+        if length >= 0:
+            row.append(data[pos : pos + length])
+            pos += length
+        else:
+            row.append(None)
+
+    return _load_sequence(row, tx)
+
+
+def _load_sequence(
+    row: List[Optional[bytes]], tx: "Transformer"
+) -> Tuple[Any, ...]:
+    try:
+        return tx.load_sequence(row)
+    except IndexError:
+        raise e.DataError(f"copy row has too many fields: {len(row)}")
+
+
+def _check_binary_header(data: bytes) -> int:
+    """Validate the header of a binary copy and return its length."""
+    if data[:11] != _binary_signature[:11]:
+        raise e.DataError("binary copy doesn't start with the signature")
+    # flags (ignored) and header extension length
+    return 19 + _unpack_int4(data, 15)[0]
+
+
+_pack_int2 = struct.Struct("!h").pack
+_pack_int4 = struct.Struct("!i").pack
+_UnpackInt = Callable[[bytes, int], Tuple[int]]
+_unpack_int2 = cast(_UnpackInt, struct.Struct("!h").unpack_from)
+_unpack_int4 = cast(_UnpackInt, struct.Struct("!i").unpack_from)
+
+_binary_signature = (
+    # Signature, flags, extra length
+    b"PGCOPY\n\xff\r\n\0"
+    b"\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00"
+)
+_binary_trailer = b"\xff\xff"
+_binary_null = b"\xff\xff\xff\xff"
+
 
 def _bsrepl_sub(
     m: Match[bytes],
@@ -124,6 +405,24 @@ def _bsrepl_sub(
 _bsrepl_re = re.compile(b"[\b\t\n\v\f\r\\\\]")
 
 
+def _bsunrepl_sub(
+    m: Match[bytes],
+    __map: Dict[bytes, bytes] = {
+        b"b": b"\b",
+        b"t": b"\t",
+        b"n": b"\n",
+        b"v": b"\v",
+        b"f": b"\f",
+        b"r": b"\r",
+    },
+) -> bytes:
+    g = m.group(1)
+    return __map.get(g, g)
+
+
+_bsunrepl_re = re.compile(rb"\\(.)", re.DOTALL)
+
+
 class Copy(BaseCopy["Connection"]):
     """Manage a :sql:`COPY` operation."""
 
@@ -134,6 +433,10 @@ class Copy(BaseCopy["Connection"]):
 
         Return an empty bytes string when the data is finished.
         """
+        if self._read_leftover:
+            data, self._read_leftover = self._read_leftover, b""
+            return data
+
         if self._finished:
             return b""
 
@@ -148,19 +451,100 @@ class Copy(BaseCopy["Connection"]):
         self.cursor._rowcount = nrows if nrows is not None else -1
         return b""
 
-    def write(self, buffer: Union[str, bytes]) -> None:
+    def read_block(self, max_bytes: int = 0) -> bytes:
+        """Read a block of data after a :sql:`COPY TO` operation.
+
+        Return all the data already received, waiting only if none is
+        available, up to *max_bytes* (`buffer_size` if not specified).
+        Return an empty bytes string when the data is finished.
+        """
+        max_bytes = max_bytes or self.buffer_size
+        data = self.connection.wait(self._read_block_gen(max_bytes))
+        return self._trim_block(data, max_bytes)
+
+    def readinto(self, buffer: Any) -> int:
+        """Read data after a :sql:`COPY TO` operation into a buffer.
+
+        Fill the writable *buffer* with the data already received, waiting
+        only if none is available. Return the number of bytes read, 0 when
+        the data is finished.
+        """
+        nbytes = memoryview(buffer).nbytes
+        data = self.connection.wait(self._read_block_gen(nbytes))
+        return self._copy_block_into(data, buffer)
+
+    def copy_to_file(self, file: IO[bytes]) -> int:
+        """Write all the data of a :sql:`COPY TO` operation to a file.
+
+        *file* must be a binary file-like object. Return the number of bytes
+        written.
+        """
+        nbytes = 0
+        while True:
+            data = self.read_block()
+            if not data:
+                break
+            file.write(data)
+            nbytes += len(data)
+
+        return nbytes
+
+    def read_row(self) -> Optional[Tuple[Any, ...]]:
+        """Read a parsed row of data after a :sql:`COPY TO` operation.
+
+        Return `!None` when the data is finished.
+        """
+        while True:
+            data = self.read()
+            if not data:
+                return None
+            row = self._read_row_data(data)
+            if row is not None:
+                return row
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate on the result of a :sql:`COPY TO` operation row by row."""
+        while True:
+            row = self.read_row()
+            if row is None:
+                break
+            yield row
+
+    def write(self, buffer: Union[Buffer, str]) -> None:
         """Write a block of data after a :sql:`COPY FROM` operation.
 
-        If the COPY is in binary format *buffer* must be `!bytes`. In text mode
-        it can be either `!bytes` or `!str`.
+        *buffer* can be `!bytes`, `!bytearray` or `!memoryview`, sent without
+        copying them. In text mode it can also be `!str`.
         """
-        conn = self.connection
-        conn.wait(copy_to(conn.pgconn, self._ensure_bytes(buffer)))
+        if self._write_buffer:
+            self._write(self._flush_buffer())
+        self._write(self._ensure_bytes(buffer))
+
+    def write_from(self, file: FileSource, chunk_size: int = 0) -> int:
+        """Write the content of a file after a :sql:`COPY FROM` operation.
+
+        *file* can be a path, which is memory-mapped, or a file object, read
+        into a reusable buffer; in text mode the file object can also return
+        `!str`. The data is sent in chunks of *chunk_size* bytes (`buffer_size`
+        if not specified). Return the number of bytes written.
+        """
+        nbytes = 0
+        for chunk in self._file_chunks(file, chunk_size or self.buffer_size):
+            data = self._ensure_bytes(chunk)
+            self.write(data)
+            nbytes += len(data)
+
+        return nbytes
 
     def write_row(self, row: Sequence[Any]) -> None:
         """Write a record after a :sql:`COPY FROM` operation."""
-        data = self._format_row(row)
-        self.write(data)
+        data = self._write_row_buffer(row)
+        if data:
+            self._write(data)
+
+    def _write(self, data: Buffer) -> None:
+        conn = self.connection
+        conn.wait(copy_to(conn.pgconn, data))
 
     def _finish(self, error: str = "") -> None:
         """Terminate a :sql:`COPY FROM` operation."""
@@ -187,9 +571,9 @@ class Copy(BaseCopy["Connection"]):
             return
 
         if not exc_type:
-            if self.format == Format.BINARY and not self._first_row:
-                # send EOF only if we copied binary rows (_first_row is False)
-                self.write(b"\xff\xff")
+            data = self._end_data()
+            if data:
+                self._write(data)
             self._finish()
         else:
             self._finish(
@@ -210,6 +594,10 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
     __module__ = "psycopg3"
 
     async def read(self) -> bytes:
+        if self._read_leftover:
+            data, self._read_leftover = self._read_leftover, b""
+            return data
+
         if self._finished:
             return b""
 
@@ -224,13 +612,65 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
         self.cursor._rowcount = nrows if nrows is not None else -1
         return b""
 
-    async def write(self, buffer: Union[str, bytes]) -> None:
-        conn = self.connection
-        await conn.wait(copy_to(conn.pgconn, self._ensure_bytes(buffer)))
+    async def read_block(self, max_bytes: int = 0) -> bytes:
+        max_bytes = max_bytes or self.buffer_size
+        data = await self.connection.wait(self._read_block_gen(max_bytes))
+        return self._trim_block(data, max_bytes)
+
+    async def readinto(self, buffer: Any) -> int:
+        nbytes = memoryview(buffer).nbytes
+        data = await self.connection.wait(self._read_block_gen(nbytes))
+        return self._copy_block_into(data, buffer)
+
+    async def copy_to_file(self, file: IO[bytes]) -> int:
+        nbytes = 0
+        while True:
+            data = await self.read_block()
+            if not data:
+                break
+            file.write(data)
+            nbytes += len(data)
+
+        return nbytes
+
+    async def read_row(self) -> Optional[Tuple[Any, ...]]:
+        while True:
+            data = await self.read()
+            if not data:
+                return None
+            row = self._read_row_data(data)
+            if row is not None:
+                return row
+
+    async def rows(self) -> AsyncIterator[Tuple[Any, ...]]:
+        while True:
+            row = await self.read_row()
+            if row is None:
+                break
+            yield row
+
+    async def write(self, buffer: Union[Buffer, str]) -> None:
+        if self._write_buffer:
+            await self._write(self._flush_buffer())
+        await self._write(self._ensure_bytes(buffer))
+
+    async def write_from(self, file: FileSource, chunk_size: int = 0) -> int:
+        nbytes = 0
+        for chunk in self._file_chunks(file, chunk_size or self.buffer_size):
+            data = self._ensure_bytes(chunk)
+            await self.write(data)
+            nbytes += len(data)
+
+        return nbytes
 
     async def write_row(self, row: Sequence[Any]) -> None:
-        data = self._format_row(row)
-        await self.write(data)
+        data = self._write_row_buffer(row)
+        if data:
+            await self._write(data)
+
+    async def _write(self, data: Buffer) -> None:
+        conn = self.connection
+        await conn.wait(copy_to(conn.pgconn, data))
 
     async def _finish(self, error: str = "") -> None:
         conn = self.connection
@@ -256,9 +696,9 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
             return
 
         if not exc_type:
-            if self.format == Format.BINARY and not self._first_row:
-                # send EOF only if we copied binary rows (_first_row is False)
-                await self.write(b"\xff\xff")
+            data = self._end_data()
+            if data:
+                await self._write(data)
             await self._finish()
         else:
             await self._finish(
@@ -271,3 +711,41 @@ class AsyncCopy(BaseCopy["AsyncConnection"]):
             if not data:
                 break
             yield data
+
+
+FormatRowFunc = Callable[
+    [
+        Sequence[Any],
+        "Transformer",
+        Optional[bytearray],
+        Optional[List[Optional["Dumper"]]],
+    ],
+    bytearray,
+]
+ParseRowFunc = Callable[[bytes, "Transformer"], Tuple[Any, ...]]
+CopyFromBlockFunc = Callable[
+    ["PGconn", int], PQGen[Tuple[bytes, Optional["PGresult"]]]
+]
+format_row_text: FormatRowFunc
+format_row_binary: FormatRowFunc
+parse_row_text: ParseRowFunc
+parse_row_binary: ParseRowFunc
+copy_from_block: CopyFromBlockFunc
+
+if pq.__impl__ == "c":
+    from psycopg3_c import _psycopg3
+
+    format_row_text = _psycopg3.format_row_text
+    format_row_binary = _psycopg3.format_row_binary
+    parse_row_text = _psycopg3.parse_row_text
+    parse_row_binary = _psycopg3.parse_row_binary
+    copy_from_block = _psycopg3.copy_from_block
+
+else:
+    from . import generators
+
+    format_row_text = _format_row_text
+    format_row_binary = _format_row_binary
+    parse_row_text = _parse_row_text
+    parse_row_binary = _parse_row_binary
+    copy_from_block = generators.copy_from_block
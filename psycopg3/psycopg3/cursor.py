@@ -11,13 +11,18 @@ from typing import Optional, Sequence, Type, TYPE_CHECKING
 from operator import attrgetter
 from contextlib import contextmanager
 
-from . import errors as e
 from . import pq
+from . import sql
+from . import errors as e
 from .pq import ConnStatus, ExecStatus, Format
 from .oids import builtins
 from .copy import Copy, AsyncCopy
 from .proto import ConnectionType, Query, Params, DumpersMap, LoadersMap, PQGen
+from .proto import Row, RowFactory
 from ._queries import PostgresQuery
+from ._preparing import Prepare
+from .pipeline import BasePipeline
+from .generators import pipeline_communicate, pipeline_fetch, send
 
 if sys.version_info >= (3, 7):
     from contextlib import asynccontextmanager
@@ -30,16 +35,19 @@ if TYPE_CHECKING:
     from .connection import Connection, AsyncConnection  # noqa: F401
 
 execute: Callable[["PGconn"], PQGen[List["PGresult"]]]
+fetch_result: Callable[["PGconn"], PQGen[Optional["PGresult"]]]
 
 if pq.__impl__ == "c":
     from psycopg3_c import _psycopg3
 
     execute = _psycopg3.execute
+    fetch_result = _psycopg3.fetch_result
 
 else:
     from . import generators
 
     execute = generators.execute
+    fetch_result = generators.fetch_result
 
 
 class Column(Sequence[Any]):
@@ -166,16 +174,26 @@ class BaseCursor(Generic[ConnectionType]):
 
     _transformer: "Transformer"
     _rowcount: int
+    _pipeline_pending: bool
+
+    # Number of commands sent by executemany() in pipeline mode before reading
+    # their results: keeping too many of them in flight makes the libpq
+    # buffers grow and slows down large batches.
+    _executemany_batch_size = 1000
 
     def __init__(
         self,
         connection: ConnectionType,
         format: Format = Format.TEXT,
+        *,
+        row_factory: Optional[RowFactory] = None,
     ):
         self._conn = connection
         self.format = format
+        self.row_factory = row_factory
         self.dumpers: DumpersMap = {}
         self.loaders: LoadersMap = {}
+        self._iexecute = 0
         self._reset()
         self.arraysize = 1
         self._closed = False
@@ -188,6 +206,7 @@ class BaseCursor(Generic[ConnectionType]):
         self._rowcount = -1
         self._query: Optional[bytes] = None
         self._params: Optional[List[Optional[bytes]]] = None
+        self._pipeline_pending = False
 
     @property
     def connection(self) -> ConnectionType:
@@ -225,6 +244,8 @@ class BaseCursor(Generic[ConnectionType]):
         self._pgresult = result
         if result and self._transformer:
             self._transformer.pgresult = result
+            if self.row_factory:
+                self._transformer.make_row = self.row_factory(self)
 
     @property
     def description(self) -> Optional[List[Column]]:
@@ -285,19 +306,270 @@ class BaseCursor(Generic[ConnectionType]):
             )
 
         self._reset()
+        self._iexecute += 1
         self._transformer = adapt.Transformer(self)
 
-    def _execute_send(
-        self, query: Query, params: Optional[Params], no_pqexec: bool = False
+    def _execute_gen(
+        self,
+        query: Query,
+        params: Optional[Params],
+        prepare: Optional[bool] = None,
+    ) -> PQGen[List["PGresult"]]:
+        """
+        Generator implementing execute(), common to sync and async
+        """
+        pgq = self._convert_query(query, params)
+
+        # Only queries sent with the extended protocol can be prepared
+        extended = bool(pgq.params) or self.format == Format.BINARY
+        prep, name = Prepare.NO, b""
+        if extended:
+            prep, name = self._conn._prepared.get(pgq, prepare)
+
+        if prep is Prepare.NO:
+            self._execute_send(pgq)
+        else:
+            if prep is Prepare.SHOULD:
+                self._send_prepare(name, pgq)
+                (result,) = yield from execute(self._conn.pgconn)
+                if result.status == ExecStatus.FATAL_ERROR:
+                    raise e.error_from_result(
+                        result, encoding=self._conn.client_encoding
+                    )
+            self._send_query_prepared(name, pgq)
+
+        results = yield from execute(self._conn.pgconn)
+
+        self._conn._prepared.maintain(
+            pgq if extended else None, results, prep, name
+        )
+        yield from self._maintain_prepared_gen()
+
+        return results
+
+    def _pipeline_send(
+        self, pgq: PostgresQuery, prepare: Optional[bool] = None
     ) -> None:
         """
-        Implement part of execute() before waiting common to sync and async
+        Queue a query in the connection pipeline, without waiting for results.
+        """
+        pipeline = self._conn._pipeline
+        assert pipeline
+
+        extended = bool(pgq.params) or self.format == Format.BINARY
+        prep, name = Prepare.NO, b""
+        if extended:
+            prep, name = self._conn._prepared.get(pgq, prepare)
+
+        if prep is Prepare.NO:
+            # Only the extended protocol is allowed in pipeline mode
+            self._execute_send(pgq, no_pqexec=True)
+        else:
+            if prep is Prepare.SHOULD:
+                self._send_prepare(name, pgq)
+                pipeline._enqueue(None)
+            self._send_query_prepared(name, pgq)
+
+        pipeline._enqueue(
+            (self, self._iexecute, pgq if extended else None, prep, name)
+        )
+        self._pipeline_pending = True
+
+    def _executemany_gen(
+        self, query: Query, params_seq: Sequence[Params]
+    ) -> PQGen[None]:
+        """
+        Generator implementing executemany(), common to sync and async
+        """
+        if BasePipeline.is_supported():
+            yield from self._executemany_gen_pipeline(query, params_seq)
+        else:
+            yield from self._executemany_gen_no_pipeline(query, params_seq)
+
+    def _executemany_gen_pipeline(
+        self, query: Query, params_seq: Sequence[Params]
+    ) -> PQGen[None]:
         """
+        Send the parameter sets without waiting for each result.
+
+        The query is prepared once, then the parameters are streamed to the
+        server in pipeline mode. The results are read in batches of
+        `_executemany_batch_size` commands, requesting the server to flush
+        them, so no round trip is added.
+
+        In autocommit, outside a transaction, every query is followed by a
+        synchronization point, so that it is committed on its own as it
+        would be outside pipeline mode. Otherwise the pipeline is synced only
+        at the end, in the transaction already started.
+        """
+        pgconn = self._conn.pgconn
+        sync_each = (
+            self._conn.autocommit
+            and pgconn.transaction_status == pq.TransactionStatus.IDLE
+        )
+        pgconn.enter_pipeline_mode()
+
+        # The parameters of the queries sent whose results were not read yet,
+        # to report the ones of a failed query; None for the prepare and the
+        # synchronization points.
+        sent: List[Optional[List[Optional[bytes]]]] = []
+        error: Optional[Exception] = None
+        try:
+            pgq: Optional[PostgresQuery] = None
+            for params in params_seq:
+                if pgq is None:
+                    pgq = self._convert_query(query, params)
+                    self._send_prepare(b"", pgq)
+                    sent.append(None)
+                else:
+                    pgq.dump(params)
+
+                self._send_query_prepared(b"", pgq)
+                sent.append(pgq.params)
+                if sync_each:
+                    pgconn.pipeline_sync()
+                    sent.append(None)
+
+                if len(sent) >= self._executemany_batch_size:
+                    pgconn.send_flush_request()
+                    results = yield from pipeline_fetch(pgconn, len(sent))
+                    batch, sent = sent, []
+                    self._executemany_results(batch, results)
+
+        except Exception as ex:
+            # Receive the results of what was sent before raising
+            error = ex
+
+        pgconn.pipeline_sync()
+        results = yield from pipeline_communicate(pgconn, len(sent))
+        pgconn.exit_pipeline_mode()
+
+        if error:
+            raise error
+
+        self._executemany_results(sent, results)
+
+    def _executemany_results(
+        self,
+        sent: List[Optional[List[Optional[bytes]]]],
+        results: List[List["PGresult"]],
+    ) -> None:
+        """Process the results of a batch of queries sent by executemany()."""
+        # After an error the following results are all aborted, so processing
+        # stops at the first failed query.
+        for pgparams, res in zip(sent, results):
+            if pgparams is None:
+                # The result of the prepare or of a synchronization point
+                if res[-1].status == ExecStatus.FATAL_ERROR:
+                    raise e.error_from_result(
+                        res[-1], encoding=self._conn.client_encoding
+                    )
+                continue
+
+            self._params = pgparams
+            self._execute_results(res)
+
+    def _executemany_gen_no_pipeline(
+        self, query: Query, params_seq: Sequence[Params]
+    ) -> PQGen[None]:
+        """
+        Execute the query once per parameter set, waiting for each result.
+        """
+        pgq: Optional[PostgresQuery] = None
+        for params in params_seq:
+            if pgq is None:
+                pgq = self._convert_query(query, params)
+                self._send_prepare(b"", pgq)
+                (result,) = yield from execute(self._conn.pgconn)
+                if result.status == ExecStatus.FATAL_ERROR:
+                    raise e.error_from_result(
+                        result, encoding=self._conn.client_encoding
+                    )
+            else:
+                pgq.dump(params)
+
+            self._send_query_prepared(b"", pgq)
+            results = yield from execute(self._conn.pgconn)
+            self._execute_results(results)
+
+    def _stream_send_gen(
+        self, query: Query, params: Optional[Params] = None
+    ) -> PQGen[None]:
+        """
+        Generator to send the query for stream(), common to sync and async
+        """
+        pgq = self._convert_query(query, params)
+        # Single row mode is only available with the extended protocol
+        self._execute_send(pgq, no_pqexec=True)
+        self._conn.pgconn.set_single_row_mode()
+        yield from send(self._conn.pgconn)
+
+    def _stream_fetchone_gen(self, first: bool) -> PQGen[Optional["PGresult"]]:
+        """
+        Generator to receive the next row in stream().
+
+        Return the result containing the row, or `!None` once the query
+        results are finished.
+        """
+        res = yield from fetch_result(self._conn.pgconn)
+        if res is None:
+            return None
+
+        if res.status == ExecStatus.SINGLE_TUPLE:
+            self._pgresult = res
+            # All the rows have the same columns: only the first result needs
+            # to set up the loaders.
+            self._transformer.set_pgresult(res, set_loaders=first)
+            if first and self.row_factory:
+                self._transformer.make_row = self.row_factory(self)
+            return res
+
+        # The query is finished, or it failed: receive the end of the results
+        # before processing the last one, so the connection is ready again.
+        yield from self._stream_discard_gen()
+        self._execute_results([res])
+        return None
+
+    def _stream_discard_gen(self) -> PQGen[None]:
+        """
+        Generator to receive and discard the rest of the results of stream().
+        """
+        while 1:
+            res = yield from fetch_result(self._conn.pgconn)
+            if res is None:
+                break
+
+    def _maintain_prepared_gen(self) -> PQGen[None]:
+        """
+        Deallocate the prepared statements evicted from the connection cache.
+        """
+        pgconn = self._conn.pgconn
+        if pgconn.transaction_status == pq.TransactionStatus.INERROR:
+            # Can't do it now: try again after the transaction is terminated
+            return
+        if self._conn._pipeline:
+            # Can't wait for the results now: try again after the pipeline
+            return
+
+        for cmd in self._conn._prepared.get_maintenance_commands():
+            pgconn.send_query(cmd)
+            yield from execute(pgconn)
+
+    def _convert_query(
+        self, query: Query, params: Optional[Params]
+    ) -> PostgresQuery:
         pgq = PostgresQuery(self._transformer)
         pgq.convert(query, params)
+        return pgq
 
+    def _execute_send(
+        self, pgq: PostgresQuery, no_pqexec: bool = False
+    ) -> None:
+        """
+        Implement part of execute() before waiting common to sync and async
+        """
+        self._query = pgq.query
         if pgq.params or no_pqexec or self.format == Format.BINARY:
-            self._query = pgq.query
             self._params = pgq.params
             self._conn.pgconn.send_query_params(
                 pgq.query,
@@ -309,7 +581,6 @@ class BaseCursor(Generic[ConnectionType]):
         else:
             # if we don't have to, let's use exec_ as it can run more than
             # one query in one go
-            self._query = pgq.query
             self._params = None
             self._conn.pgconn.send_query(pgq.query)
 
@@ -359,21 +630,15 @@ class BaseCursor(Generic[ConnectionType]):
                 f" {', '.join(sorted(s.name for s in sorted(badstats)))}"
             )
 
-    def _send_prepare(
-        self, name: bytes, query: Query, params: Optional[Params]
-    ) -> PostgresQuery:
+    def _send_prepare(self, name: bytes, pgq: PostgresQuery) -> None:
         """
         Implement part of execute() before waiting common to sync and async
         """
-        pgq = PostgresQuery(self._transformer)
-        pgq.convert(query, params)
-
         self._query = pgq.query
         self._conn.pgconn.send_prepare(name, pgq.query, param_types=pgq.types)
 
-        return pgq
-
     def _send_query_prepared(self, name: bytes, pgq: PostgresQuery) -> None:
+        self._query = pgq.query
         self._params = pgq.params
         self._conn.pgconn.send_query_prepared(
             name,
@@ -391,6 +656,31 @@ class BaseCursor(Generic[ConnectionType]):
                 "the last operation didn't produce a result"
             )
 
+    def _load_columns(self) -> List[List[Any]]:
+        assert self.pgresult
+        nrows = self.pgresult.ntuples
+        rv = [
+            self._transformer.load_column(i, self._pos, nrows)
+            for i in range(self.pgresult.nfields)
+        ]
+        self._pos = nrows
+        return rv
+
+    def _load_arrays(self) -> List[Any]:
+        from ._columns import load_arrays
+
+        assert self.pgresult
+        nrows = self.pgresult.ntuples
+        rv = load_arrays(self._transformer, self._pos, nrows)
+        self._pos = nrows
+        return rv
+
+    def _check_no_pipeline(self, what: str) -> None:
+        if self._conn._pipeline:
+            raise e.NotSupportedError(
+                f"{what} cannot be used in pipeline mode"
+            )
+
     def _check_copy_results(self, results: Sequence["PGresult"]) -> None:
         """
         Check that the value returned in a copy() operation is a legit COPY.
@@ -437,7 +727,10 @@ class Cursor(BaseCursor["Connection"]):
         self._reset()
 
     def execute(
-        self, query: Query, params: Optional[Params] = None
+        self,
+        query: Query,
+        params: Optional[Params] = None,
+        prepare: Optional[bool] = None,
     ) -> "Cursor":
         """
         Execute a query or command to the database.
@@ -445,9 +738,14 @@ class Cursor(BaseCursor["Connection"]):
         with self._conn.lock:
             self._start_query()
             self._conn._start_query()
-            self._execute_send(query, params)
-            gen = execute(self._conn.pgconn)
-            results = self._conn.wait(gen)
+            if self._conn._pipeline:
+                pgq = self._convert_query(query, params)
+                self._pipeline_send(pgq, prepare)
+                return self
+
+            results = self._conn.wait(
+                self._execute_gen(query, params, prepare)
+            )
             self._execute_results(results)
         return self
 
@@ -458,67 +756,77 @@ class Cursor(BaseCursor["Connection"]):
         with self._conn.lock:
             self._start_query()
             self._conn._start_query()
-            first = True
-            for params in params_seq:
-                if first:
-                    pgq = self._send_prepare(b"", query, params)
-                    gen = execute(self._conn.pgconn)
-                    (result,) = self._conn.wait(gen)
-                    if result.status == ExecStatus.FATAL_ERROR:
-                        raise e.error_from_result(
-                            result, encoding=self._conn.client_encoding
-                        )
-                else:
-                    pgq.dump(params)
-
-                self._send_query_prepared(b"", pgq)
-                gen = execute(self._conn.pgconn)
-                (result,) = self._conn.wait(gen)
-                self._execute_results((result,))
-
-    def fetchone(self) -> Optional[Sequence[Any]]:
+            if self._conn._pipeline:
+                for params in params_seq:
+                    pgq = self._convert_query(query, params)
+                    self._pipeline_send(pgq)
+            else:
+                self._conn.wait(self._executemany_gen(query, params_seq))
+
+    def fetchone(self) -> Optional[Row]:
         """
         Return the next record from the current recordset.
 
         Return `!None` the recordset is finished.
         """
+        self._fetch_pipeline()
         self._check_result()
         rv = self._transformer.load_row(self._pos)
         if rv is not None:
             self._pos += 1
         return rv
 
-    def fetchmany(self, size: int = 0) -> List[Sequence[Any]]:
+    def fetchmany(self, size: int = 0) -> List[Row]:
         """
         Return the next *size* records from the current recordset.
 
         *size* default to `!self.arraysize` if not specified.
         """
+        self._fetch_pipeline()
         self._check_result()
+        assert self.pgresult
+
         if not size:
             size = self.arraysize
+        records = self._transformer.load_rows(
+            self._pos, min(self._pos + size, self.pgresult.ntuples)
+        )
+        self._pos += len(records)
+        return records
 
-        pos = self._pos
-        load = self._transformer.load_row
-        rv: List[Sequence[Any]] = []
+    def fetchall(self) -> List[Row]:
+        """
+        Return all the remaining records from the current recordset.
+        """
+        self._fetch_pipeline()
+        self._check_result()
+        assert self.pgresult
 
-        for _ in range(size):
-            row = load(pos)
-            if row is None:
-                break
-            pos += 1
-            rv.append(row)
+        records = self._transformer.load_rows(self._pos, self.pgresult.ntuples)
+        self._pos += len(records)
+        return records
 
-        self._pos = pos
-        return rv
+    def fetch_columns(self) -> List[List[Any]]:
+        """
+        Return all the remaining records from the current recordset by column.
 
-    def fetchall(self) -> List[Sequence[Any]]:
+        Return a list with one item per column, each a list of values.
         """
-        Return all the remaining records from the current recordset.
+        self._fetch_pipeline()
+        self._check_result()
+        return self._load_columns()
+
+    def fetchnumpy(self) -> List[Any]:
+        """
+        Return all the remaining records from the current recordset as NumPy
+        arrays, one per column.
         """
-        return list(self)
+        self._fetch_pipeline()
+        self._check_result()
+        return self._load_arrays()
 
-    def __iter__(self) -> Iterator[Sequence[Any]]:
+    def __iter__(self) -> Iterator[Row]:
+        self._fetch_pipeline()
         self._check_result()
 
         load = self._transformer.load_row
@@ -530,6 +838,37 @@ class Cursor(BaseCursor["Connection"]):
             self._pos += 1
             yield row
 
+    def stream(
+        self, query: Query, params: Optional[Params] = None
+    ) -> Iterator[Row]:
+        """
+        Iterate row-by-row on a result from the database.
+        """
+        with self._conn.lock:
+            self._check_no_pipeline("stream()")
+            self._start_query()
+            self._conn._start_query()
+            self._conn.wait(self._stream_send_gen(query, params))
+            first = True
+            try:
+                while self._conn.wait(self._stream_fetchone_gen(first)):
+                    rec = self._transformer.load_row(0)
+                    assert rec is not None
+                    yield rec
+                    first = False
+            finally:
+                # If the iteration was interrupted, drop the rows not read
+                if (
+                    self._conn.pgconn.transaction_status
+                    == pq.TransactionStatus.ACTIVE
+                ):
+                    self._conn.wait(self._stream_discard_gen())
+
+    def _fetch_pipeline(self) -> None:
+        # Receive the results of the queries queued in the pipeline, if any
+        if self._pipeline_pending and self._conn._pipeline:
+            self._conn._pipeline.sync()
+
     @contextmanager
     def copy(self, statement: Query) -> Iterator[Copy]:
         """
@@ -540,11 +879,13 @@ class Cursor(BaseCursor["Connection"]):
 
     def _start_copy(self, statement: Query) -> Copy:
         with self._conn.lock:
+            self._check_no_pipeline("COPY")
             self._start_query()
             self._conn._start_query()
             # Make sure to avoid PQexec to avoid receiving a mix of COPY and
             # other operations.
-            self._execute_send(statement, None, no_pqexec=True)
+            pgq = self._convert_query(statement, None)
+            self._execute_send(pgq, no_pqexec=True)
             gen = execute(self._conn.pgconn)
             results = self._conn.wait(gen)
             self._check_copy_results(results)
@@ -572,14 +913,22 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
         self._reset()
 
     async def execute(
-        self, query: Query, params: Optional[Params] = None
+        self,
+        query: Query,
+        params: Optional[Params] = None,
+        prepare: Optional[bool] = None,
     ) -> "AsyncCursor":
         async with self._conn.lock:
             self._start_query()
             await self._conn._start_query()
-            self._execute_send(query, params)
-            gen = execute(self._conn.pgconn)
-            results = await self._conn.wait(gen)
+            if self._conn._pipeline:
+                pgq = self._convert_query(query, params)
+                self._pipeline_send(pgq, prepare)
+                return self
+
+            results = await self._conn.wait(
+                self._execute_gen(query, params, prepare)
+            )
             self._execute_results(results)
         return self
 
@@ -589,58 +938,55 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
         async with self._conn.lock:
             self._start_query()
             await self._conn._start_query()
-            first = True
-            for params in params_seq:
-                if first:
-                    pgq = self._send_prepare(b"", query, params)
-                    gen = execute(self._conn.pgconn)
-                    (result,) = await self._conn.wait(gen)
-                    if result.status == ExecStatus.FATAL_ERROR:
-                        raise e.error_from_result(
-                            result, encoding=self._conn.client_encoding
-                        )
-                else:
-                    pgq.dump(params)
-
-                self._send_query_prepared(b"", pgq)
-                gen = execute(self._conn.pgconn)
-                (result,) = await self._conn.wait(gen)
-                self._execute_results((result,))
-
-    async def fetchone(self) -> Optional[Sequence[Any]]:
+            if self._conn._pipeline:
+                for params in params_seq:
+                    pgq = self._convert_query(query, params)
+                    self._pipeline_send(pgq)
+            else:
+                await self._conn.wait(self._executemany_gen(query, params_seq))
+
+    async def fetchone(self) -> Optional[Row]:
+        await self._fetch_pipeline()
         self._check_result()
         rv = self._transformer.load_row(self._pos)
         if rv is not None:
             self._pos += 1
         return rv
 
-    async def fetchmany(self, size: int = 0) -> List[Sequence[Any]]:
+    async def fetchmany(self, size: int = 0) -> List[Row]:
+        await self._fetch_pipeline()
         self._check_result()
+        assert self.pgresult
+
         if not size:
             size = self.arraysize
+        records = self._transformer.load_rows(
+            self._pos, min(self._pos + size, self.pgresult.ntuples)
+        )
+        self._pos += len(records)
+        return records
 
-        pos = self._pos
-        load = self._transformer.load_row
-        rv: List[Sequence[Any]] = []
+    async def fetchall(self) -> List[Row]:
+        await self._fetch_pipeline()
+        self._check_result()
+        assert self.pgresult
 
-        for _ in range(size):
-            row = load(pos)
-            if row is None:
-                break
-            pos += 1
-            rv.append(row)
+        records = self._transformer.load_rows(self._pos, self.pgresult.ntuples)
+        self._pos += len(records)
+        return records
 
-        self._pos = pos
-        return rv
-
-    async def fetchall(self) -> List[Sequence[Any]]:
-        res = []
-        async for rec in self:
-            res.append(rec)
+    async def fetch_columns(self) -> List[List[Any]]:
+        await self._fetch_pipeline()
+        self._check_result()
+        return self._load_columns()
 
-        return res
+    async def fetchnumpy(self) -> List[Any]:
+        await self._fetch_pipeline()
+        self._check_result()
+        return self._load_arrays()
 
-    async def __aiter__(self) -> AsyncIterator[Sequence[Any]]:
+    async def __aiter__(self) -> AsyncIterator[Row]:
+        await self._fetch_pipeline()
         self._check_result()
 
         load = self._transformer.load_row
@@ -652,6 +998,32 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
             self._pos += 1
             yield row
 
+    async def stream(
+        self, query: Query, params: Optional[Params] = None
+    ) -> AsyncIterator[Row]:
+        async with self._conn.lock:
+            self._check_no_pipeline("stream()")
+            self._start_query()
+            await self._conn._start_query()
+            await self._conn.wait(self._stream_send_gen(query, params))
+            first = True
+            try:
+                while await self._conn.wait(self._stream_fetchone_gen(first)):
+                    rec = self._transformer.load_row(0)
+                    assert rec is not None
+                    yield rec
+                    first = False
+            finally:
+                if (
+                    self._conn.pgconn.transaction_status
+                    == pq.TransactionStatus.ACTIVE
+                ):
+                    await self._conn.wait(self._stream_discard_gen())
+
+    async def _fetch_pipeline(self) -> None:
+        if self._pipeline_pending and self._conn._pipeline:
+            await self._conn._pipeline.sync()
+
     @asynccontextmanager
     async def copy(self, statement: Query) -> AsyncIterator[AsyncCopy]:
         copy = await self._start_copy(statement)
@@ -660,11 +1032,13 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
 
     async def _start_copy(self, statement: Query) -> AsyncCopy:
         async with self._conn.lock:
+            self._check_no_pipeline("COPY")
             self._start_query()
             await self._conn._start_query()
             # Make sure to avoid PQexec to avoid receiving a mix of COPY and
             # other operations.
-            self._execute_send(statement, None, no_pqexec=True)
+            pgq = self._convert_query(statement, None)
+            self._execute_send(pgq, no_pqexec=True)
             gen = execute(self._conn.pgconn)
             results = await self._conn.wait(gen)
             self._check_copy_results(results)
@@ -673,13 +1047,346 @@ class AsyncCursor(BaseCursor["AsyncConnection"]):
         return AsyncCopy(self)
 
 
-class NamedCursorMixin:
-    pass
+class NamedCursorMixin(BaseCursor[ConnectionType]):
+    """
+    Implementation common to the cursors living on the server.
+
+    The query is declared as a server-side cursor and the records are fetched
+    from it in chunks, so that the whole result doesn't have to be received
+    at once by the client.
+    """
+
+    def __init__(
+        self,
+        connection: ConnectionType,
+        name: str,
+        format: Format = Format.TEXT,
+        *,
+        scrollable: Optional[bool] = None,
+        withhold: bool = False,
+        row_factory: Optional[RowFactory] = None,
+    ):
+        super().__init__(connection, format=format, row_factory=row_factory)
+        self._name = name
+        self._scrollable = scrollable
+        self._withhold = withhold
+        self._declared = False
+        self.itersize = 100
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__qualname__} {self._name!r}>"
+
+    @property
+    def name(self) -> str:
+        """The name of the cursor on the server."""
+        return self._name
+
+    @property
+    def scrollable(self) -> Optional[bool]:
+        """
+        Whether the cursor can scroll backwards.
 
+        `!None` if the choice is left to the server.
+        """
+        return self._scrollable
 
-class NamedCursor(NamedCursorMixin, Cursor):
-    pass
+    @property
+    def withhold(self) -> bool:
+        """
+        Whether the cursor can be used after the transaction which created it.
+        """
+        return self._withhold
 
+    def _qname(self) -> bytes:
+        return (
+            sql.Identifier(self._name)
+            .as_string(self._conn)
+            .encode(self._conn.client_encoding)
+        )
+
+    def _declare_gen(
+        self, query: Query, params: Optional[Params]
+    ) -> PQGen[None]:
+        """
+        Generator implementing execute(), common to sync and async
+        """
+        pgq = self._convert_query(query, params)
+
+        parts = [b"declare ", self._qname()]
+        if self._scrollable is not None:
+            parts.append(b" scroll" if self._scrollable else b" no scroll")
+        parts.append(b" cursor")
+        if self._withhold:
+            parts.append(b" with hold")
+        parts.append(b" for ")
+        pgq.query = b"".join(parts) + pgq.query
+
+        # Use the extended protocol, to refuse more than one statement
+        self._execute_send(pgq, no_pqexec=True)
+        (result,) = yield from execute(self._conn.pgconn)
+        self._check_command(result)
+        self._declared = True
+
+        # Fetching no record returns the description of the result
+        yield from self._fetch_gen(0)
+        self._rowcount = 0
+
+    def _fetch_gen(self, num: Optional[int]) -> PQGen[None]:
+        """
+        Fetch *num* records from the cursor (all if `!None`).
+
+        The records fetched are available in the cursor's `pgresult`.
+        """
+        self._check_declared()
+        howmany = b"all" if num is None else str(num).encode()
+        cmd = b"fetch forward %s from %s" % (howmany, self._qname())
+        self._conn.pgconn.send_query_params(
+            cmd, None, result_format=self.format
+        )
+        (result,) = yield from execute(self._conn.pgconn)
+        if result.status != ExecStatus.TUPLES_OK:
+            self._check_command(result)
+
+        self.pgresult = result
+        self._results = [result]
+        self._pos = 0
+        self._rowcount += result.ntuples
 
-class AsyncNamedCursor(NamedCursorMixin, AsyncCursor):
-    pass
+    def _scroll_gen(self, value: int, mode: str) -> PQGen[None]:
+        """
+        Generator implementing scroll(), common to sync and async
+        """
+        if mode not in ("relative", "absolute"):
+            raise ValueError(
+                f"bad mode: {mode}. It should be 'relative' or 'absolute'"
+            )
+        self._check_declared()
+        cmd = b"move %s %d from %s" % (mode.encode(), value, self._qname())
+        self._conn.pgconn.send_query_params(cmd, None)
+        (result,) = yield from execute(self._conn.pgconn)
+        self._check_command(result)
+
+    def _close_gen(self) -> PQGen[None]:
+        """
+        Close the cursor on the server, if it still exists.
+        """
+        if not self._declared or self._conn.closed:
+            return
+        self._declared = False
+
+        pgconn = self._conn.pgconn
+        if pgconn.transaction_status == pq.TransactionStatus.INERROR:
+            # The cursor will be dropped by the rollback
+            return
+
+        # The cursor may have been dropped by the end of the transaction
+        pgconn.send_query_params(
+            b"select 1 from pg_catalog.pg_cursors where name = $1",
+            [self._name.encode(self._conn.client_encoding)],
+        )
+        (result,) = yield from execute(pgconn)
+        self._check_command(result)
+        if not result.ntuples:
+            return
+
+        pgconn.send_query_params(b"close " + self._qname(), None)
+        (result,) = yield from execute(pgconn)
+        self._check_command(result)
+
+    def _check_declared(self) -> None:
+        if self._closed:
+            raise e.InterfaceError("the cursor is closed")
+        if not self._declared:
+            raise e.ProgrammingError("no result available")
+
+    def _check_command(self, result: "PGresult") -> None:
+        if result.status == ExecStatus.FATAL_ERROR:
+            raise e.error_from_result(
+                result, encoding=self._conn.client_encoding
+            )
+        elif result.status not in (
+            ExecStatus.COMMAND_OK,
+            ExecStatus.TUPLES_OK,
+        ):
+            raise e.InternalError(
+                f"unexpected result from the named cursor:"
+                f" {ExecStatus(result.status).name}"
+            )
+
+    def _load_rows(self) -> List[Row]:
+        assert self.pgresult
+        rv = self._transformer.load_rows(0, self.pgresult.ntuples)
+        self._pos = len(rv)
+        return rv
+
+
+class NamedCursor(NamedCursorMixin["Connection"], Cursor):
+    __module__ = "psycopg3"
+
+    def close(self) -> None:
+        """
+        Close the current cursor and free associated resources.
+        """
+        with self._conn.lock:
+            self._conn.wait(self._close_gen())
+        super().close()
+
+    def execute(
+        self,
+        query: Query,
+        params: Optional[Params] = None,
+        prepare: Optional[bool] = None,
+    ) -> "NamedCursor":
+        """
+        Declare a server-side cursor for a query.
+
+        If the cursor was already declared, it is closed first.
+        """
+        with self._conn.lock:
+            self._check_no_pipeline("named cursors")
+            self._conn.wait(self._close_gen())
+            self._start_query()
+            self._conn._start_query()
+            self._conn.wait(self._declare_gen(query, params))
+        return self
+
+    def executemany(self, query: Query, params_seq: Sequence[Params]) -> None:
+        raise e.NotSupportedError(
+            "executemany() is not supported on named cursors"
+        )
+
+    def stream(
+        self, query: Query, params: Optional[Params] = None
+    ) -> Iterator[Row]:
+        raise e.NotSupportedError("stream() is not supported on named cursors")
+
+    def fetchone(self) -> Optional[Row]:
+        with self._conn.lock:
+            self._conn.wait(self._fetch_gen(1))
+        rv = self._transformer.load_row(0)
+        if rv is not None:
+            self._pos += 1
+        return rv
+
+    def fetchmany(self, size: int = 0) -> List[Row]:
+        with self._conn.lock:
+            self._conn.wait(self._fetch_gen(size or self.arraysize))
+        return self._load_rows()
+
+    def fetchall(self) -> List[Row]:
+        with self._conn.lock:
+            self._conn.wait(self._fetch_gen(None))
+        return self._load_rows()
+
+    def fetch_columns(self) -> List[List[Any]]:
+        with self._conn.lock:
+            self._conn.wait(self._fetch_gen(None))
+        return self._load_columns()
+
+    def fetchnumpy(self) -> List[Any]:
+        with self._conn.lock:
+            self._conn.wait(self._fetch_gen(None))
+        return self._load_arrays()
+
+    def __iter__(self) -> Iterator[Row]:
+        while 1:
+            with self._conn.lock:
+                self._conn.wait(self._fetch_gen(self.itersize))
+            rows = self._load_rows()
+            for row in rows:
+                yield row
+            if len(rows) < self.itersize:
+                break
+
+    def scroll(self, value: int, mode: str = "relative") -> None:
+        """
+        Move the cursor in the result set to a new position.
+
+        If *mode* is ``relative`` (default), *value* is taken as an offset
+        to the current position, if ``absolute``, it states a target position.
+        """
+        with self._conn.lock:
+            self._conn.wait(self._scroll_gen(value, mode))
+
+    def _start_copy(self, statement: Query) -> Copy:
+        raise e.NotSupportedError("copy() is not supported on named cursors")
+
+
+class AsyncNamedCursor(NamedCursorMixin["AsyncConnection"], AsyncCursor):
+    __module__ = "psycopg3"
+
+    async def close(self) -> None:
+        async with self._conn.lock:
+            await self._conn.wait(self._close_gen())
+        await super().close()
+
+    async def execute(
+        self,
+        query: Query,
+        params: Optional[Params] = None,
+        prepare: Optional[bool] = None,
+    ) -> "AsyncNamedCursor":
+        async with self._conn.lock:
+            self._check_no_pipeline("named cursors")
+            await self._conn.wait(self._close_gen())
+            self._start_query()
+            await self._conn._start_query()
+            await self._conn.wait(self._declare_gen(query, params))
+        return self
+
+    async def executemany(
+        self, query: Query, params_seq: Sequence[Params]
+    ) -> None:
+        raise e.NotSupportedError(
+            "executemany() is not supported on named cursors"
+        )
+
+    def stream(
+        self, query: Query, params: Optional[Params] = None
+    ) -> AsyncIterator[Row]:
+        raise e.NotSupportedError("stream() is not supported on named cursors")
+
+    async def fetchone(self) -> Optional[Row]:
+        async with self._conn.lock:
+            await self._conn.wait(self._fetch_gen(1))
+        rv = self._transformer.load_row(0)
+        if rv is not None:
+            self._pos += 1
+        return rv
+
+    async def fetchmany(self, size: int = 0) -> List[Row]:
+        async with self._conn.lock:
+            await self._conn.wait(self._fetch_gen(size or self.arraysize))
+        return self._load_rows()
+
+    async def fetchall(self) -> List[Row]:
+        async with self._conn.lock:
+            await self._conn.wait(self._fetch_gen(None))
+        return self._load_rows()
+
+    async def fetch_columns(self) -> List[List[Any]]:
+        async with self._conn.lock:
+            await self._conn.wait(self._fetch_gen(None))
+        return self._load_columns()
+
+    async def fetchnumpy(self) -> List[Any]:
+        async with self._conn.lock:
+            await self._conn.wait(self._fetch_gen(None))
+        return self._load_arrays()
+
+    async def __aiter__(self) -> AsyncIterator[Row]:
+        while 1:
+            async with self._conn.lock:
+                await self._conn.wait(self._fetch_gen(self.itersize))
+            rows = self._load_rows()
+            for row in rows:
+                yield row
+            if len(rows) < self.itersize:
+                break
+
+    async def scroll(self, value: int, mode: str = "relative") -> None:
+        async with self._conn.lock:
+            await self._conn.wait(self._scroll_gen(value, mode))
+
+    async def _start_copy(self, statement: Query) -> AsyncCopy:
+        raise e.NotSupportedError("copy() is not supported on named cursors")
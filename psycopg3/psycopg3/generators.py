@@ -16,12 +16,12 @@ when the file descriptor is ready.
 # Copyright (C) 2020 The Psycopg Team
 
 import logging
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from . import pq
 from . import errors as e
 from .pq import ConnStatus, PollingStatus, ExecStatus
-from .proto import PQGen
+from .proto import Buffer, PQGen
 from .waiting import Wait, Ready
 from .encodings import py_codecs
 from .pq.proto import PGconn, PGresult
@@ -134,10 +134,41 @@ def fetch(pgconn: PGconn) -> PQGen[List[PGresult]]:
             # After entering copy mode the libpq will create a phony result
             # for every request so let's break the endless loop.
             break
+        if res.status == ExecStatus.PIPELINE_SYNC:
+            # The pipeline sync result is not followed by a NULL result.
+            break
 
     return results
 
 
+def fetch_result(pgconn: PGconn) -> PQGen[Optional[PGresult]]:
+    """
+    Generator retrieving a single result from the database without blocking.
+
+    The query must have already been sent to the server, so pgconn.flush() has
+    already returned 0.
+
+    Return the next result (whether success or error), or `!None` if all the
+    results of the query have been received. In single row mode every record
+    is returned in its own result.
+    """
+    while 1:
+        pgconn.consume_input()
+        if not pgconn.is_busy():
+            break
+        yield pgconn.socket, Wait.R
+
+    # Consume notifies
+    while 1:
+        n = pgconn.notifies()
+        if n is None:
+            break
+        if pgconn.notify_handler:
+            pgconn.notify_handler(n)
+
+    return pgconn.get_result()
+
+
 _copy_statuses = (
     ExecStatus.COPY_IN,
     ExecStatus.COPY_OUT,
@@ -145,6 +176,45 @@ _copy_statuses = (
 )
 
 
+def pipeline_communicate(
+    pgconn: PGconn, commands: int
+) -> PQGen[List[List[PGresult]]]:
+    """
+    Generator to send the commands queued in pipeline mode and fetch results.
+
+    The pipeline must have already been closed by a synchronization point
+    using `pgconn.pipeline_sync()`. Return a list of results for each of the
+    *commands* queued before it; the result of the synchronization point is
+    consumed.
+    """
+    rv = yield from pipeline_fetch(pgconn, commands)
+
+    results = yield from fetch(pgconn)
+    if not (results and results[-1].status == ExecStatus.PIPELINE_SYNC):
+        raise e.InternalError("pipeline synchronization result not received")
+
+    return rv
+
+
+def pipeline_fetch(
+    pgconn: PGconn, commands: int
+) -> PQGen[List[List[PGresult]]]:
+    """
+    Generator to send the commands queued in pipeline mode and fetch results.
+
+    The commands must be followed by a flush request or a synchronization
+    point, otherwise the server may not send their results. Return a list of
+    results for each of the first *commands* queued.
+    """
+    yield from send(pgconn)
+
+    rv = []
+    for i in range(commands):
+        rv.append((yield from fetch(pgconn)))
+
+    return rv
+
+
 def notifies(pgconn: PGconn) -> PQGen[List[pq.PGnotify]]:
     yield pgconn.socket, Wait.R
     pgconn.consume_input()
@@ -175,17 +245,46 @@ def copy_from(pgconn: PGconn) -> PQGen[Union[bytes, PGresult]]:
         return data
 
     # Retrieve the final result of copy
-    (result,) = yield from fetch(pgconn)
-    if result.status != ExecStatus.COMMAND_OK:
-        encoding = py_codecs.get(
-            pgconn.parameter_status(b"client_encoding") or "", "utf-8"
-        )
-        raise e.error_from_result(result, encoding=encoding)
+    return (yield from _copy_result(pgconn))
 
-    return result
 
+def copy_from_block(
+    pgconn: PGconn, max_bytes: int
+) -> PQGen[Tuple[bytes, Optional[PGresult]]]:
+    """
+    Generator receiving the data of a :sql:`COPY TO` in blocks.
 
-def copy_to(pgconn: PGconn, buffer: bytes) -> PQGen[None]:
+    Wait only if no data is available, then return all the data already
+    received, up to about *max_bytes* (the last message is not split), as
+    a single block. Also return the final result of the copy if the data is
+    finished, else `!None`.
+    """
+    chunks: List[bytes] = []
+    size = 0
+    while size < max_bytes:
+        nbytes, data = pgconn.get_copy_data(1)
+        if nbytes > 0:
+            chunks.append(data)
+            size += nbytes
+            continue
+
+        if nbytes == 0:
+            if chunks:
+                break
+
+            # would block
+            yield pgconn.socket, Wait.R
+            pgconn.consume_input()
+            continue
+
+        # Retrieve the final result of copy
+        result = yield from _copy_result(pgconn)
+        return b"".join(chunks), result
+
+    return b"".join(chunks), None
+
+
+def copy_to(pgconn: PGconn, buffer: Buffer) -> PQGen[None]:
     # Retry enqueuing data until successful
     while pgconn.put_copy_data(buffer) == 0:
         yield pgconn.socket, Wait.W
@@ -204,6 +303,11 @@ def copy_end(pgconn: PGconn, error: Optional[bytes]) -> PQGen[PGresult]:
             break
 
     # Retrieve the final result of copy
+    return (yield from _copy_result(pgconn))
+
+
+def _copy_result(pgconn: PGconn) -> PQGen[PGresult]:
+    """Retrieve the final result of a copy, raising if it is an error."""
     (result,) = yield from fetch(pgconn)
     if result.status != ExecStatus.COMMAND_OK:
         encoding = py_codecs.get(
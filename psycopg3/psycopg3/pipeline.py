@@ -0,0 +1,196 @@
+"""
+Pipeline mode context managers returned by Connection.pipeline()
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from types import TracebackType
+from typing import Any, Deque, Generic, List, Optional, Tuple, Type
+from typing import TYPE_CHECKING
+from collections import deque
+
+from . import pq
+from . import errors as e
+from .pq import ExecStatus
+from .proto import ConnectionType, PQGen
+from ._queries import PostgresQuery
+from ._preparing import Prepare
+from .generators import pipeline_communicate
+
+if TYPE_CHECKING:
+    from .pq.proto import PGresult
+    from .cursor import BaseCursor
+    from .connection import Connection, AsyncConnection  # noqa: F401
+
+# A command queued in the pipeline: the cursor to receive its results, the
+# number of the execute() which queued it, and the prepared statement info.
+# It is `!None` for commands whose results are only checked for errors.
+PendingResult = Optional[
+    Tuple["BaseCursor[Any]", int, Optional[PostgresQuery], Prepare, bytes]
+]
+
+
+class BasePipeline(Generic[ConnectionType]):
+    def __init__(self, connection: ConnectionType):
+        self._conn = connection
+        self._queue: Deque[PendingResult] = deque()
+
+        # True if a transaction is in progress or queued to start: while the
+        # commands are in flight the transaction status of the connection is
+        # ACTIVE, so it can't tell if a begin must be sent.
+        self._in_transaction = False
+
+    @property
+    def connection(self) -> ConnectionType:
+        """The connection the object is managing."""
+        return self._conn
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(connection={self._conn})"
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Return `!True` if the libpq in use supports the pipeline mode."""
+        return pq.version() >= 140000
+
+    def _enter(self) -> None:
+        if self._conn._pipeline:
+            raise e.ProgrammingError(
+                "the connection is already in pipeline mode"
+            )
+        self._in_transaction = (
+            self._conn.pgconn.transaction_status != pq.TransactionStatus.IDLE
+        )
+        self._conn.pgconn.enter_pipeline_mode()
+        self._conn._pipeline = self
+
+    def _exit(self) -> None:
+        self._conn._pipeline = None
+        if not self._conn.closed:
+            self._conn.pgconn.exit_pipeline_mode()
+
+    def _enqueue(self, pending: PendingResult) -> None:
+        self._queue.append(pending)
+
+    def _sync_gen(self) -> PQGen[None]:
+        """
+        Generator implementing sync(), common to sync and async
+        """
+        queued, self._queue = self._queue, deque()
+        self._conn.pgconn.pipeline_sync()
+        results = yield from pipeline_communicate(
+            self._conn.pgconn, len(queued)
+        )
+        self._dispatch_results(queued, results)
+
+    def _dispatch_results(
+        self, queued: Deque[PendingResult], results: List[List["PGresult"]]
+    ) -> None:
+        """
+        Pass the results received to the cursors which executed the commands.
+
+        Raise the first error received, after all the results have been
+        dispatched.
+        """
+        error: Optional[e.Error] = None
+        for pending, res in zip(queued, results):
+            if pending:
+                cursor, iexecute, pgq, prep, name = pending
+                self._conn._prepared.maintain(pgq, res, prep, name)
+                # Skip the results if the cursor executed something else
+                if cursor._iexecute == iexecute:
+                    cursor._pipeline_pending = False
+                    if res[-1].status == ExecStatus.PIPELINE_ABORTED:
+                        # Not executed because of a previous error
+                        continue
+                    try:
+                        cursor._execute_results(res)
+                    except e.Error as ex:
+                        if error is None:
+                            error = ex
+                    continue
+
+            if error is None and res[-1].status == ExecStatus.FATAL_ERROR:
+                error = e.error_from_result(
+                    res[-1], encoding=self._conn.client_encoding
+                )
+
+        if error is not None:
+            raise error
+
+
+class Pipeline(BasePipeline["Connection"]):
+    """
+    Returned by `Connection.pipeline()` to handle the pipeline mode.
+    """
+
+    __module__ = "psycopg3"
+
+    def __enter__(self) -> "Pipeline":
+        with self._conn.lock:
+            self._enter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        with self._conn.lock:
+            try:
+                if not self._conn.closed:
+                    self._conn.wait(self._sync_gen())
+            except Exception:
+                # Don't clobber an exception raised in the block
+                if not exc_val:
+                    raise
+            finally:
+                self._exit()
+
+    def sync(self) -> None:
+        """
+        Send the commands queued to the server and wait for their results.
+
+        Raise the first error received, if any, after all the results have
+        been passed to the cursors which executed the commands.
+        """
+        with self._conn.lock:
+            self._conn.wait(self._sync_gen())
+
+
+class AsyncPipeline(BasePipeline["AsyncConnection"]):
+    """
+    Returned by `AsyncConnection.pipeline()` to handle the pipeline mode.
+    """
+
+    __module__ = "psycopg3"
+
+    async def __aenter__(self) -> "AsyncPipeline":
+        async with self._conn.lock:
+            self._enter()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        async with self._conn.lock:
+            try:
+                if not self._conn.closed:
+                    await self._conn.wait(self._sync_gen())
+            except Exception:
+                # Don't clobber an exception raised in the block
+                if not exc_val:
+                    raise
+            finally:
+                self._exit()
+
+    async def sync(self) -> None:
+        """
+        Send the commands queued to the server and wait for their results.
+        """
+        async with self._conn.lock:
+            await self._conn.wait(self._sync_gen())
@@ -0,0 +1,923 @@
+"""
+psycopg3 connection pool
+"""
+
+# Copyright (C) 2020 The Psycopg Team
+
+import sys
+import time
+import random
+import asyncio
+import logging
+import threading
+from types import TracebackType
+from typing import Any, AsyncIterator, Counter, Deque, Dict, Generic
+from typing import Iterator, List, Optional, Tuple, Type
+from collections import deque
+from contextlib import contextmanager
+
+if sys.version_info >= (3, 7):
+    from contextlib import asynccontextmanager
+else:
+    from .utils.context import asynccontextmanager
+
+from . import errors as e
+from .pq import TransactionStatus
+from .proto import ConnectionType
+from .connection import Connection, AsyncConnection, execute
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(e.OperationalError):
+    """The pool couldn't provide a connection in acceptable time."""
+
+    __module__ = "psycopg3.pool"
+
+
+class PoolClosed(e.OperationalError):
+    """Attempt to get a connection from a closed pool."""
+
+    __module__ = "psycopg3.pool"
+
+
+class BasePool(Generic[ConnectionType]):
+    """
+    Base class for the connection pools.
+
+    Hold the configuration and the accounting common to the sync and async
+    pool implementations.
+    """
+
+    _num_pool = 0
+
+    def __init__(
+        self,
+        conninfo: str = "",
+        *,
+        kwargs: Optional[Dict[str, Any]] = None,
+        min_size: int = 4,
+        max_size: Optional[int] = None,
+        name: Optional[str] = None,
+        timeout: float = 30.0,
+        max_lifetime: float = 60 * 60.0,
+        max_idle: float = 10 * 60.0,
+        reconnect_delay: float = 1.0,
+    ):
+        if max_size is None:
+            max_size = min_size
+        if min_size < 0:
+            raise ValueError("min_size cannot be negative")
+        if max_size < min_size or max_size < 1:
+            raise ValueError(
+                "max_size must be at least 1 and not smaller than min_size"
+            )
+
+        if not name:
+            BasePool._num_pool += 1
+            name = f"pool-{BasePool._num_pool}"
+
+        self.conninfo = conninfo
+        self.kwargs: Dict[str, Any] = kwargs or {}
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.reconnect_delay = reconnect_delay
+
+        # Idle connections with the time they were returned to the pool.
+        # The most recently returned are on the right.
+        self._pool: Deque[Tuple[ConnectionType, float]] = deque()
+
+        # Number of connections owned by the pool, either idle, checked out
+        # or being created.
+        self._nconns = 0
+
+        # Number of clients waiting for a connection
+        self._nwaiting = 0
+
+        # Monotonic time after which each connection must be discarded,
+        # indexed by id() of the connection.
+        self._expire_at: Dict[int, float] = {}
+
+        # Monotonic time at which each checked out connection was handed
+        # out, indexed by id() of the connection.
+        self._checkout_at: Dict[int, float] = {}
+
+        # Counters reported by get_stats()
+        self._stats: Counter[str] = Counter()
+
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__module__}.{self.__class__.__name__}"
+            f" {self.name!r} at 0x{id(self):x}>"
+        )
+
+    @property
+    def closed(self) -> bool:
+        """`True` if the pool is closed."""
+        return self._closed
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the current state of the pool and the usage counters.
+        """
+        rv = dict(self._stats)
+        rv["pool_min"] = self.min_size
+        rv["pool_max"] = self.max_size
+        rv["pool_size"] = self._nconns
+        rv["pool_available"] = len(self._pool)
+        rv["requests_waiting"] = self._nwaiting
+        return rv
+
+    def pop_stats(self) -> Dict[str, int]:
+        """
+        Return the same values of `get_stats()` and reset the counters.
+        """
+        rv = self.get_stats()
+        self._stats.clear()
+        return rv
+
+    def _new_expire_at(self) -> float:
+        # Add some jitter to the lifetime, so that connections created
+        # together don't all expire at the same time.
+        return time.monotonic() + self.max_lifetime * (
+            1.0 - 0.05 * random.random()
+        )
+
+    def _check_interval(self) -> float:
+        return min(self.max_idle, self.max_lifetime, 60.0) / 4
+
+    def _is_expired(self, conn: ConnectionType) -> bool:
+        return conn.closed or self._expire_at[id(conn)] <= time.monotonic()
+
+    def _checked_out(self, conn: ConnectionType, t0: float) -> None:
+        # Account for a connection handed out to a client requesting it at t0
+        now = time.monotonic()
+        self._stats["requests_wait_ms"] += int((now - t0) * 1000)
+        self._checkout_at[id(conn)] = now
+
+    def _checked_in(self, conn: ConnectionType) -> None:
+        # Account for a connection returned by a client
+        t = self._checkout_at.pop(id(conn), None)
+        if t is not None:
+            self._stats["usage_ms"] += int((time.monotonic() - t) * 1000)
+
+    def _connected(self, conn: ConnectionType, t0: float) -> None:
+        # Account for a new connection created, with an attempt started at t0
+        self._expire_at[id(conn)] = self._new_expire_at()
+        self._stats["connections_num"] += 1
+        self._stats["connections_ms"] += int((time.monotonic() - t0) * 1000)
+
+    def _forget(self, conn: ConnectionType) -> ConnectionType:
+        # Drop the pool accounting for a connection about to be closed.
+        del self._expire_at[id(conn)]
+        self._checkout_at.pop(id(conn), None)
+        self._nconns -= 1
+        return conn
+
+    def _get_stale(self) -> List[ConnectionType]:
+        # Remove from the pool the connections to close.
+        now = time.monotonic()
+        to_close = []
+        keep: Deque[Tuple[ConnectionType, float]] = deque()
+        for conn, returned_at in self._pool:
+            if self._is_expired(conn):
+                to_close.append(self._forget(conn))
+            elif (
+                now - returned_at > self.max_idle
+                and self._nconns > self.min_size
+            ):
+                to_close.append(self._forget(conn))
+            else:
+                keep.append((conn, returned_at))
+        self._pool = keep
+        return to_close
+
+
+class ConnectionPool(BasePool[Connection]):
+    """
+    A pool of `~psycopg3.Connection` objects.
+
+    The pool keeps at least `min_size` connections open, filling it in a
+    background thread, and creates new connections on demand up to
+    `max_size`. Connections idle for more than `max_idle` seconds (while the
+    pool is larger than `min_size`) or open for longer than `max_lifetime`
+    seconds are closed and replaced.
+    """
+
+    __module__ = "psycopg3.pool"
+
+    def __init__(
+        self,
+        conninfo: str = "",
+        *,
+        connection_class: Type[Connection] = Connection,
+        **kwargs: Any,
+    ):
+        super().__init__(conninfo, **kwargs)
+        self.connection_class = connection_class
+
+        self._lock = threading.RLock()
+        # Notified when a connection is available or the pool is closed
+        self._cond = threading.Condition(self._lock)
+        # Notified when the maintenance thread has work to do
+        self._worker_cond = threading.Condition(self._lock)
+
+        self._worker = threading.Thread(
+            target=self._run, name=f"{self.name}-worker", daemon=True
+        )
+        self._worker.start()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return super().get_stats()
+
+    def pop_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return super().pop_stats()
+
+    def wait(self, timeout: float = 30.0) -> None:
+        """
+        Wait for the pool to be filled with `min_size` connections.
+
+        Raise `PoolTimeout` if the connections are not ready within *timeout*
+        seconds.
+        """
+        with self._lock:
+            ready = self._cond.wait_for(
+                lambda: self._closed or len(self._pool) >= self.min_size,
+                timeout,
+            )
+            if self._closed:
+                raise PoolClosed(f"the pool {self.name!r} is closed")
+            if not ready:
+                raise PoolTimeout(
+                    f"pool {self.name!r} initialization"
+                    f" incomplete after {timeout} sec"
+                )
+
+    @contextmanager
+    def connection(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[Connection]:
+        """
+        Context manager to obtain a connection from the pool.
+
+        On exit from the block the transaction is committed (or rolled back
+        if an exception was raised) and the connection is returned to the
+        pool.
+
+        :param timeout: Seconds to wait for a connection to be available
+            before raising `PoolTimeout`. If `!None` use the pool `timeout`.
+        """
+        conn = self.getconn(timeout=timeout)
+        try:
+            yield conn
+        except BaseException:
+            self._end_transaction(conn, commit=False)
+            self.putconn(conn)
+            raise
+        else:
+            self._end_transaction(conn, commit=True)
+            self.putconn(conn)
+
+    def getconn(self, timeout: Optional[float] = None) -> Connection:
+        """
+        Obtain a connection from the pool.
+
+        The connection must be returned to the pool using `putconn()`.
+        Prefer `connection()` to make sure it is returned.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+
+        to_close: List[Connection] = []
+        try:
+            with self._lock:
+                self._stats["requests_num"] += 1
+                queued = False
+                while True:
+                    if self._closed:
+                        raise PoolClosed(f"the pool {self.name!r} is closed")
+
+                    if self._pool:
+                        # Pick the most recently used connection: the others
+                        # will eventually be released by the max_idle check.
+                        conn, _ = self._pool.pop()
+                        if self._is_expired(conn):
+                            to_close.append(self._forget(conn))
+                            continue
+                        self._checked_out(conn, t0)
+                        return conn
+
+                    if self._nconns < self.max_size:
+                        # Reserve a slot and connect out of the lock
+                        self._nconns += 1
+                        break
+
+                    if not queued:
+                        queued = True
+                        self._stats["requests_queued"] += 1
+
+                    remaining = deadline - time.monotonic()
+                    self._nwaiting += 1
+                    try:
+                        ready = remaining > 0.0 and self._cond.wait(remaining)
+                    finally:
+                        self._nwaiting -= 1
+                    if not ready:
+                        self._stats["requests_timeouts"] += 1
+                        raise PoolTimeout(
+                            f"couldn't get a connection from the pool"
+                            f" {self.name!r} after {timeout} sec"
+                        )
+        finally:
+            self._close_all(to_close)
+
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._lock:
+                self._nconns -= 1
+                self._cond.notify()
+            raise
+
+        with self._lock:
+            self._checked_out(conn, t0)
+        return conn
+
+    def putconn(self, conn: Connection) -> None:
+        """
+        Return a connection to the pool.
+
+        The connection is returned in idle transaction state: an unfinished
+        transaction is rolled back. If the connection is broken, or it cannot
+        be restored to a clean state, it is discarded and a new one will be
+        created in its place.
+        """
+        with self._lock:
+            if id(conn) not in self._expire_at:
+                raise e.ProgrammingError(
+                    f"can't return connection to pool {self.name!r},"
+                    f" it doesn't belong to it"
+                )
+            self._checked_in(conn)
+
+        self._reset(conn)
+
+        with self._lock:
+            if conn.pgconn.transaction_status != TransactionStatus.IDLE:
+                self._stats["connections_lost"] += 1
+            elif not (self._closed or self._is_expired(conn)):
+                self._pool.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+
+            self._forget(conn)
+
+        conn.close()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        Close the pool and all the idle connections.
+
+        Connections currently checked out will be closed as soon as they are
+        returned to the pool.
+        """
+        with self._lock:
+            self._closed = True
+            to_close = [self._forget(conn) for conn, _ in self._pool]
+            self._pool.clear()
+            self._cond.notify_all()
+            self._worker_cond.notify_all()
+
+        self._close_all(to_close)
+
+        if self._worker is not threading.current_thread():
+            self._worker.join(timeout)
+
+    def _connect(self) -> Connection:
+        t0 = time.monotonic()
+        try:
+            conn = self.connection_class.connect(self.conninfo, **self.kwargs)
+        except Exception:
+            with self._lock:
+                self._stats["connections_errors"] += 1
+            raise
+
+        with self._lock:
+            self._connected(conn, t0)
+        return conn
+
+    def _end_transaction(self, conn: Connection, commit: bool) -> None:
+        # Terminate the transaction at the end of a connection() block,
+        # the same way a connection used as context manager would.
+        if conn.closed:
+            return
+        try:
+            if commit:
+                conn.commit()
+            else:
+                conn.rollback()
+        except Exception as ex:
+            logger.warning(
+                "error terminating transaction on connection from pool %r:"
+                " %s",
+                self.name,
+                ex,
+            )
+
+    def _reset(self, conn: Connection) -> None:
+        # Bring the connection back to idle state, if possible
+        if conn.closed:
+            return
+
+        status = conn.pgconn.transaction_status
+        if status == TransactionStatus.IDLE:
+            return
+
+        if status in (TransactionStatus.INTRANS, TransactionStatus.INERROR):
+            logger.warning(
+                "rolling back connection returned to pool %r in status %s",
+                self.name,
+                TransactionStatus(status).name,
+            )
+            try:
+                conn.rollback()
+            except Exception as ex:
+                logger.warning(
+                    "rollback failed on connection returned to pool %r: %s",
+                    self.name,
+                    ex,
+                )
+        else:
+            # ACTIVE or UNKNOWN: we can't tell what's going on on the
+            # connection: the pool will discard it.
+            logger.warning(
+                "discarding connection returned to pool %r in status %s",
+                self.name,
+                TransactionStatus(status).name,
+            )
+
+    def _forget(self, conn: Connection) -> Connection:
+        # Must be called holding the lock.
+        super()._forget(conn)
+        self._cond.notify()
+        self._worker_cond.notify()
+        return conn
+
+    def _close_all(self, conns: List[Connection]) -> None:
+        for conn in conns:
+            conn.close()
+
+    def _run(self) -> None:
+        """
+        Maintenance loop run in the pool worker thread.
+
+        Keep the pool filled with `min_size` connections and close the
+        connections idle for too long or past their lifetime.
+        """
+        delay = 0.0
+        while True:
+            with self._lock:
+                if delay:
+                    self._worker_cond.wait(delay)
+                    delay = 0.0
+                if self._closed:
+                    break
+                to_close = self._get_stale()
+                nnew = max(0, self.min_size - self._nconns)
+                self._nconns += nnew
+
+            self._close_all(to_close)
+
+            for i in range(nnew):
+                try:
+                    conn = self._connect()
+                except Exception as ex:
+                    logger.warning(
+                        "error connecting in pool %r: %s", self.name, ex
+                    )
+                    with self._lock:
+                        self._nconns -= nnew - i
+                    delay = self.reconnect_delay
+                    break
+
+                with self._lock:
+                    if self._closed:
+                        self._nconns -= nnew - i
+                        conn.close()
+                        return
+                    self._pool.appendleft((conn, time.monotonic()))
+                    self._cond.notify()
+
+            if nnew or delay:
+                continue
+
+            with self._lock:
+                if not self._closed and self._nconns >= self.min_size:
+                    self._worker_cond.wait(self._check_interval())
+
+
+class AsyncConnectionPool(BasePool[AsyncConnection]):
+    """
+    A pool of `~psycopg3.AsyncConnection` objects.
+
+    The pool behaves like `ConnectionPool`, using an `asyncio` task instead
+    of a thread to keep the pool filled. It must be created with an event
+    loop running.
+
+    The clients waiting for a connection are served in the order they asked
+    for it. Unless *health_check* is `!False`, every connection is checked
+    to be working before being handed out.
+    """
+
+    __module__ = "psycopg3.pool"
+
+    def __init__(
+        self,
+        conninfo: str = "",
+        *,
+        connection_class: Type[AsyncConnection] = AsyncConnection,
+        health_check: bool = True,
+        **kwargs: Any,
+    ):
+        super().__init__(conninfo, **kwargs)
+        self.connection_class = connection_class
+        self.health_check = health_check
+
+        # Clients waiting for a connection, in arrival order. The future is
+        # resolved with a connection, or with None if the client has been
+        # assigned a slot to create a new connection.
+        self._waiting: Deque["asyncio.Future[Optional[AsyncConnection]]"]
+        self._waiting = deque()
+
+        # Set when the maintenance task has work to do
+        self._wakeup = asyncio.Event()
+
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def __aenter__(self) -> "AsyncConnectionPool":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def wait(self, timeout: float = 30.0) -> None:
+        """
+        Wait for the pool to be filled with `min_size` connections.
+
+        Raise `PoolTimeout` if the connections are not ready within *timeout*
+        seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while not self._closed and len(self._pool) < self.min_size:
+            if time.monotonic() >= deadline:
+                raise PoolTimeout(
+                    f"pool {self.name!r} initialization"
+                    f" incomplete after {timeout} sec"
+                )
+            await asyncio.sleep(0.01)
+
+        if self._closed:
+            raise PoolClosed(f"the pool {self.name!r} is closed")
+
+    @asynccontextmanager
+    async def connection(
+        self, timeout: Optional[float] = None
+    ) -> AsyncIterator[AsyncConnection]:
+        """
+        Context manager to obtain a connection from the pool.
+
+        On exit from the block the transaction is committed (or rolled back
+        if an exception was raised) and the connection is returned to the
+        pool.
+        """
+        conn = await self.getconn(timeout=timeout)
+        try:
+            yield conn
+        except BaseException:
+            await self._end_transaction(conn, commit=False)
+            await self.putconn(conn)
+            raise
+        else:
+            await self._end_transaction(conn, commit=True)
+            await self.putconn(conn)
+
+    async def getconn(
+        self, timeout: Optional[float] = None
+    ) -> AsyncConnection:
+        """
+        Obtain a connection from the pool.
+
+        The connection must be returned to the pool using `putconn()`.
+        Prefer `connection()` to make sure it is returned.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+
+        self._stats["requests_num"] += 1
+        queued = False
+        while True:
+            if self._closed:
+                raise PoolClosed(f"the pool {self.name!r} is closed")
+
+            conn: Optional[AsyncConnection] = None
+            if self._pool:
+                conn, _ = self._pool.pop()
+            elif self._nconns < self.max_size:
+                self._nconns += 1
+            else:
+                if not queued:
+                    queued = True
+                    self._stats["requests_queued"] += 1
+                conn = await self._wait_turn(deadline, timeout)
+
+            if conn is None:
+                # We have a free slot: create a new connection.
+                try:
+                    conn = await self._connect()
+                except BaseException:
+                    self._release_slot()
+                    raise
+
+            elif self._is_expired(conn):
+                await self._forget(conn).close()
+                continue
+
+            elif not await self._check(conn):
+                self._stats["connections_lost"] += 1
+                await self._forget(conn).close()
+                continue
+
+            self._checked_out(conn, t0)
+            return conn
+
+    async def putconn(self, conn: AsyncConnection) -> None:
+        """
+        Return a connection to the pool.
+
+        The connection is returned in idle transaction state: an unfinished
+        transaction is rolled back. If the connection is broken, or it cannot
+        be restored to a clean state, it is discarded and a new one will be
+        created in its place.
+        """
+        if id(conn) not in self._expire_at:
+            raise e.ProgrammingError(
+                f"can't return connection to pool {self.name!r},"
+                f" it doesn't belong to it"
+            )
+        self._checked_in(conn)
+
+        await self._reset(conn)
+
+        if conn.pgconn.transaction_status != TransactionStatus.IDLE:
+            self._stats["connections_lost"] += 1
+        elif not (self._closed or self._is_expired(conn)):
+            self._add_to_pool(conn)
+            return
+
+        await self._forget(conn).close()
+
+    async def close(self, timeout: float = 1.0) -> None:
+        """
+        Close the pool and all the idle connections.
+
+        Connections currently checked out will be closed as soon as they are
+        returned to the pool.
+        """
+        self._closed = True
+
+        waiting, self._waiting = self._waiting, deque()
+        for fut in waiting:
+            if not fut.done():
+                fut.set_exception(
+                    PoolClosed(f"the pool {self.name!r} is closed")
+                )
+
+        to_close = [self._forget(conn) for conn, _ in self._pool]
+        self._pool.clear()
+
+        self._worker.cancel()
+        await asyncio.wait([self._worker], timeout=timeout)
+
+        for conn in to_close:
+            await conn.close()
+
+    async def _wait_turn(
+        self, deadline: float, timeout: float
+    ) -> Optional[AsyncConnection]:
+        # Queue up for a connection released by another client.
+        fut: "asyncio.Future[Optional[AsyncConnection]]"
+        fut = asyncio.get_event_loop().create_future()
+        self._waiting.append(fut)
+        self._nwaiting += 1
+        try:
+            # Shield the future: if it's resolved while timing out we can
+            # still use the result.
+            return await asyncio.wait_for(
+                asyncio.shield(fut), max(0.0, deadline - time.monotonic())
+            )
+
+        except asyncio.TimeoutError:
+            if fut.done():
+                return fut.result()
+            fut.cancel()
+            self._waiting.remove(fut)
+            self._stats["requests_timeouts"] += 1
+            raise PoolTimeout(
+                f"couldn't get a connection from the pool"
+                f" {self.name!r} after {timeout} sec"
+            )
+
+        except BaseException:
+            # The client was cancelled: don't lose what it was assigned.
+            if not fut.done():
+                fut.cancel()
+                self._waiting.remove(fut)
+            elif not (fut.cancelled() or fut.exception()):
+                conn = fut.result()
+                if conn:
+                    self._add_to_pool(conn)
+                else:
+                    self._release_slot()
+            raise
+
+        finally:
+            self._nwaiting -= 1
+
+    async def _check(self, conn: AsyncConnection) -> bool:
+        # Return True if the connection is good to be handed out
+        if not self.health_check:
+            return True
+
+        try:
+            async with conn.lock:
+                conn.pgconn.send_query(b"")
+                await conn.wait(execute(conn.pgconn))
+        except Exception as ex:
+            logger.warning(
+                "discarding broken connection from pool %r: %s",
+                self.name,
+                ex,
+            )
+            return False
+
+        return conn.pgconn.transaction_status == TransactionStatus.IDLE
+
+    def _add_to_pool(self, conn: AsyncConnection) -> None:
+        # Give the connection to the first client waiting, if any, otherwise
+        # make it available for the next request.
+        while self._waiting:
+            fut = self._waiting.popleft()
+            if not fut.done():
+                fut.set_result(conn)
+                return
+
+        self._pool.append((conn, time.monotonic()))
+
+    def _release_slot(self) -> None:
+        # A connection was dropped: if any client is waiting, give it the
+        # chance of creating a new one, otherwise the worker will refill.
+        self._nconns -= 1
+        while self._waiting:
+            fut = self._waiting.popleft()
+            if not fut.done():
+                self._nconns += 1
+                fut.set_result(None)
+                return
+
+        self._wakeup.set()
+
+    def _forget(self, conn: AsyncConnection) -> AsyncConnection:
+        super()._forget(conn)
+        # _release_slot will decrement it again.
+        self._nconns += 1
+        self._release_slot()
+        return conn
+
+    async def _connect(self) -> AsyncConnection:
+        t0 = time.monotonic()
+        try:
+            conn = await self.connection_class.connect(
+                self.conninfo, **self.kwargs
+            )
+        except Exception:
+            self._stats["connections_errors"] += 1
+            raise
+
+        self._connected(conn, t0)
+        return conn
+
+    async def _end_transaction(
+        self, conn: AsyncConnection, commit: bool
+    ) -> None:
+        if conn.closed:
+            return
+        try:
+            if commit:
+                await conn.commit()
+            else:
+                await conn.rollback()
+        except Exception as ex:
+            logger.warning(
+                "error terminating transaction on connection from pool %r:"
+                " %s",
+                self.name,
+                ex,
+            )
+
+    async def _reset(self, conn: AsyncConnection) -> None:
+        if conn.closed:
+            return
+
+        status = conn.pgconn.transaction_status
+        if status == TransactionStatus.IDLE:
+            return
+
+        if status in (TransactionStatus.INTRANS, TransactionStatus.INERROR):
+            logger.warning(
+                "rolling back connection returned to pool %r in status %s",
+                self.name,
+                TransactionStatus(status).name,
+            )
+            try:
+                await conn.rollback()
+            except Exception as ex:
+                logger.warning(
+                    "rollback failed on connection returned to pool %r: %s",
+                    self.name,
+                    ex,
+                )
+        else:
+            logger.warning(
+                "discarding connection returned to pool %r in status %s",
+                self.name,
+                TransactionStatus(status).name,
+            )
+
+    async def _run(self) -> None:
+        """
+        Maintenance loop run in the pool worker task.
+
+        Keep the pool filled with `min_size` connections and close the
+        connections idle for too long or past their lifetime.
+        """
+        while not self._closed:
+            self._wakeup.clear()
+
+            for conn in self._get_stale():
+                await conn.close()
+
+            nnew = max(0, self.min_size - self._nconns)
+            self._nconns += nnew
+            for i in range(nnew):
+                try:
+                    conn = await self._connect()
+                except Exception as ex:
+                    logger.warning(
+                        "error connecting in pool %r: %s", self.name, ex
+                    )
+                    for j in range(nnew - i):
+                        self._release_slot()
+                    await asyncio.sleep(self.reconnect_delay)
+                    break
+
+                if self._closed:
+                    await self._forget(conn).close()
+                    return
+                self._add_to_pool(conn)
+
+            else:
+                if self._nconns >= self.min_size:
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), self._check_interval()
+                        )
+                    except asyncio.TimeoutError:
+                        pass
@@ -16,7 +16,7 @@ from typing import Callable, Type
 from .misc import ConninfoOption, PQerror, PGnotify, PGresAttDesc
 from .misc import error_message
 from ._enums import ConnStatus, DiagnosticField, ExecStatus, Format
-from ._enums import Ping, PollingStatus, TransactionStatus
+from ._enums import PipelineStatus, Ping, PollingStatus, TransactionStatus
 from . import proto
 
 logger = logging.getLogger(__name__)
@@ -105,6 +105,7 @@ __all__ = (
     "ConnStatus",
     "PollingStatus",
     "TransactionStatus",
+    "PipelineStatus",
     "ExecStatus",
     "Ping",
     "DiagnosticField",
@@ -102,6 +102,46 @@ class ExecStatus(IntEnum):
     query.
     """
 
+    PIPELINE_SYNC = auto()
+    """
+    The PGresult represents a synchronization point in pipeline mode,
+    requested by `~PGconn.pipeline_sync()`.
+
+    This status occurs only when pipeline mode has been selected.
+    """
+
+    PIPELINE_ABORTED = auto()
+    """
+    The PGresult represents a pipeline that has received an error from the
+    server.
+
+    The results of the commands queued after the error are reported with
+    this status, up to the next synchronization point.
+    """
+
+
+class PipelineStatus(IntEnum):
+    """
+    The pipeline status of a connection.
+    """
+
+    __module__ = "psycopg3.pq"
+
+    OFF = 0
+    """The connection is not in pipeline mode."""
+
+    ON = auto()
+    """The connection is in pipeline mode."""
+
+    ABORTED = auto()
+    """
+    The connection is in pipeline mode and an error occurred while
+    processing the current pipeline.
+
+    The aborted flag is cleared when a `~ExecStatus.PIPELINE_SYNC` result is
+    received.
+    """
+
 
 class TransactionStatus(IntEnum):
     """
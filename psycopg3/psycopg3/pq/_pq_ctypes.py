@@ -499,6 +499,85 @@ PQflush.argtypes = [PGconn_ptr]
 PQflush.restype = c_int
 
 
+# 33.5. Retrieving Query Results Row-by-Row
+PQsetSingleRowMode = pq.PQsetSingleRowMode
+PQsetSingleRowMode.argtypes = [PGconn_ptr]
+PQsetSingleRowMode.restype = c_int
+
+
+# 34.5. Pipeline Mode (libpq 14)
+
+_PQpipelineStatus = None
+_PQenterPipelineMode = None
+_PQexitPipelineMode = None
+_PQpipelineSync = None
+_PQsendFlushRequest = None
+
+if libpq_version >= 140000:
+    _PQpipelineStatus = pq.PQpipelineStatus
+    _PQpipelineStatus.argtypes = [PGconn_ptr]
+    _PQpipelineStatus.restype = c_int
+
+    _PQenterPipelineMode = pq.PQenterPipelineMode
+    _PQenterPipelineMode.argtypes = [PGconn_ptr]
+    _PQenterPipelineMode.restype = c_int
+
+    _PQexitPipelineMode = pq.PQexitPipelineMode
+    _PQexitPipelineMode.argtypes = [PGconn_ptr]
+    _PQexitPipelineMode.restype = c_int
+
+    _PQpipelineSync = pq.PQpipelineSync
+    _PQpipelineSync.argtypes = [PGconn_ptr]
+    _PQpipelineSync.restype = c_int
+
+    _PQsendFlushRequest = pq.PQsendFlushRequest
+    _PQsendFlushRequest.argtypes = [PGconn_ptr]
+    _PQsendFlushRequest.restype = c_int
+
+
+def _pipeline_not_supported(fname: str) -> NotSupportedError:
+    return NotSupportedError(
+        f"{fname} requires libpq from PostgreSQL 14,"
+        f" {libpq_version} available instead"
+    )
+
+
+def PQpipelineStatus(pgconn: type) -> int:
+    if _PQpipelineStatus:
+        return _PQpipelineStatus(pgconn)
+    else:
+        # Pipeline mode not available: the connection can't be in it.
+        return 0
+
+
+def PQenterPipelineMode(pgconn: type) -> int:
+    if _PQenterPipelineMode:
+        return _PQenterPipelineMode(pgconn)
+    else:
+        raise _pipeline_not_supported("PQenterPipelineMode")
+
+
+def PQexitPipelineMode(pgconn: type) -> int:
+    if _PQexitPipelineMode:
+        return _PQexitPipelineMode(pgconn)
+    else:
+        raise _pipeline_not_supported("PQexitPipelineMode")
+
+
+def PQpipelineSync(pgconn: type) -> int:
+    if _PQpipelineSync:
+        return _PQpipelineSync(pgconn)
+    else:
+        raise _pipeline_not_supported("PQpipelineSync")
+
+
+def PQsendFlushRequest(pgconn: type) -> int:
+    if _PQsendFlushRequest:
+        return _PQsendFlushRequest(pgconn)
+    else:
+        raise _pipeline_not_supported("PQsendFlushRequest")
+
+
 # 33.6. Canceling Queries in Progress
 
 PQgetCancel = pq.PQgetCancel
@@ -38,6 +38,11 @@ class PGresAttDesc_struct:
     atttypmod: int
 
 def PQhostaddr(arg1: Optional[PGconn_struct]) -> bytes: ...
+def PQpipelineStatus(arg1: Optional[PGconn_struct]) -> int: ...
+def PQenterPipelineMode(arg1: Optional[PGconn_struct]) -> int: ...
+def PQexitPipelineMode(arg1: Optional[PGconn_struct]) -> int: ...
+def PQpipelineSync(arg1: Optional[PGconn_struct]) -> int: ...
+def PQsendFlushRequest(arg1: Optional[PGconn_struct]) -> int: ...
 def PQerrorMessage(arg1: Optional[PGconn_struct]) -> bytes: ...
 def PQresultErrorMessage(arg1: Optional[PGresult_struct]) -> bytes: ...
 def PQexecPrepared(
@@ -180,6 +185,7 @@ def PQisBusy(arg1: Optional[PGconn_struct]) -> int: ...
 def PQsetnonblocking(arg1: Optional[PGconn_struct], arg2: int) -> int: ...
 def PQisnonblocking(arg1: Optional[PGconn_struct]) -> int: ...
 def PQflush(arg1: Optional[PGconn_struct]) -> int: ...
+def PQsetSingleRowMode(arg1: Optional[PGconn_struct]) -> int: ...
 def PQgetCancel(arg1: Optional[PGconn_struct]) -> PGcancel_struct: ...
 def PQfreeCancel(arg1: Optional[PGcancel_struct]) -> None: ...
 def PQputCopyData(arg1: Optional[PGconn_struct], arg2: bytes, arg3: int) -> int: ...
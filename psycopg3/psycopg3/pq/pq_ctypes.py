@@ -14,15 +14,15 @@ from weakref import ref
 from functools import partial
 
 from ctypes import Array, pointer, string_at, create_string_buffer, byref
-from ctypes import c_char_p, c_int, c_size_t, c_ulong
-from typing import Any, Callable, List, Optional, Sequence, Tuple
+from ctypes import addressof, c_char, c_char_p, c_int, c_size_t, c_ulong
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 from typing import cast as t_cast, TYPE_CHECKING
 
 from . import _pq_ctypes as impl
 from .misc import PGnotify, ConninfoOption, PQerror, PGresAttDesc
 from .misc import error_message
 from ._enums import ConnStatus, DiagnosticField, ExecStatus, Format
-from ._enums import Ping, PollingStatus, TransactionStatus
+from ._enums import PipelineStatus, Ping, PollingStatus, TransactionStatus
 
 if TYPE_CHECKING:
     from . import proto
@@ -53,6 +53,19 @@ def notice_receiver(
     res.pgresult_ptr = None  # avoid destroying the pgresult_ptr
 
 
+def _buffer_as_c_char(buffer: Any) -> Tuple[Any, int]:
+    """
+    Return an object to pass as `!char *` pointing to the data of *buffer*.
+
+    Writable buffers are shared with ctypes without copying them. ctypes
+    cannot point to read-only memory, so other buffers are copied.
+    """
+    mv = memoryview(buffer)
+    if mv.readonly or not mv.c_contiguous:
+        return mv.tobytes(), mv.nbytes
+    return (c_char * mv.nbytes).from_buffer(mv), mv.nbytes
+
+
 class PGconn:
     """
     Python representation of a libpq connection.
@@ -490,6 +503,64 @@ class PGconn:
             raise PQerror(f"flushing failed: {error_message(self)}")
         return rv
 
+    def set_single_row_mode(self) -> None:
+        """
+        Select single-row mode for the currently-executing query.
+
+        See :pq:`PQsetSingleRowMode` for details.
+        """
+        if not impl.PQsetSingleRowMode(self.pgconn_ptr):
+            raise PQerror("setting single row mode failed")
+
+    @property
+    def pipeline_status(self) -> PipelineStatus:
+        rv = impl.PQpipelineStatus(self.pgconn_ptr)
+        return PipelineStatus(rv)
+
+    def enter_pipeline_mode(self) -> None:
+        """
+        Cause the connection to enter pipeline mode.
+
+        See :pq:`PQenterPipelineMode` for details.
+        """
+        if impl.PQenterPipelineMode(self.pgconn_ptr) != 1:
+            raise PQerror("failed to enter pipeline mode")
+
+    def exit_pipeline_mode(self) -> None:
+        """
+        Cause the connection to exit pipeline mode.
+
+        The connection must have no pending results. See
+        :pq:`PQexitPipelineMode` for details.
+        """
+        if impl.PQexitPipelineMode(self.pgconn_ptr) != 1:
+            raise PQerror(
+                f"failed to exit pipeline mode: {error_message(self)}"
+            )
+
+    def pipeline_sync(self) -> None:
+        """
+        Mark a synchronization point in a pipeline and flush the data.
+
+        See :pq:`PQpipelineSync` for details.
+        """
+        rv = impl.PQpipelineSync(self.pgconn_ptr)
+        if rv == 0:
+            raise PQerror("connection not in pipeline mode")
+        if rv != 1:
+            raise PQerror(f"failed to sync pipeline: {error_message(self)}")
+
+    def send_flush_request(self) -> None:
+        """
+        Ask the server to flush its output buffer.
+
+        See :pq:`PQsendFlushRequest` for details.
+        """
+        if impl.PQsendFlushRequest(self.pgconn_ptr) != 1:
+            raise PQerror(
+                f"sending flush request failed: {error_message(self)}"
+            )
+
     def get_cancel(self) -> "PGcancel":
         """
         Create an object with the information needed to cancel a command.
@@ -510,8 +581,14 @@ class PGconn:
         else:
             return None
 
-    def put_copy_data(self, buffer: bytes) -> int:
-        rv = impl.PQputCopyData(self.pgconn_ptr, buffer, len(buffer))
+    def put_copy_data(
+        self, buffer: Union[bytes, bytearray, memoryview]
+    ) -> int:
+        if isinstance(buffer, bytes):
+            rv = impl.PQputCopyData(self.pgconn_ptr, buffer, len(buffer))
+        else:
+            cbuf, length = _buffer_as_c_char(buffer)
+            rv = impl.PQputCopyData(self.pgconn_ptr, cbuf, length)
         if rv < 0:
             raise PQerror(f"sending copy data failed: {error_message(self)}")
         return rv
@@ -653,6 +730,30 @@ class PGresult:
             else:
                 return b""
 
+    def get_value_view(
+        self, row_number: int, column_number: int
+    ) -> Optional[memoryview]:
+        """
+        Return a value in the result without copying it.
+
+        The memoryview keeps the result alive, but it is not valid anymore
+        if the result is cleared.
+        """
+        length: int = impl.PQgetlength(
+            self.pgresult_ptr, row_number, column_number
+        )
+        if length:
+            v = impl.PQgetvalue(self.pgresult_ptr, row_number, column_number)
+            addr = addressof(v.contents)
+            buf = (c_char * length).from_address(addr)
+            buf._pgresult = self  # type: ignore
+            return memoryview(buf).cast("B")  # type: ignore[arg-type]
+        else:
+            if impl.PQgetisnull(self.pgresult_ptr, row_number, column_number):
+                return None
+            else:
+                return memoryview(b"")
+
     @property
     def nparams(self) -> int:
         return impl.PQnparams(self.pgresult_ptr)
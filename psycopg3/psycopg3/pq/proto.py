@@ -4,12 +4,12 @@ Protocol objects to represent objects exposed by different pq implementations.
 
 # Copyright (C) 2020 The Psycopg Team
 
-from typing import Any, Callable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 from typing import TYPE_CHECKING
 from typing_extensions import Protocol
 
 from ._enums import ConnStatus, DiagnosticField, ExecStatus, Format
-from ._enums import Ping, PollingStatus, TransactionStatus
+from ._enums import PipelineStatus, Ping, PollingStatus, TransactionStatus
 
 if TYPE_CHECKING:
     from .misc import PGnotify, ConninfoOption, PGresAttDesc
@@ -212,13 +212,34 @@ class PGconn(Protocol):
     def flush(self) -> int:
         ...
 
+    def set_single_row_mode(self) -> None:
+        ...
+
+    @property
+    def pipeline_status(self) -> PipelineStatus:
+        ...
+
+    def enter_pipeline_mode(self) -> None:
+        ...
+
+    def exit_pipeline_mode(self) -> None:
+        ...
+
+    def pipeline_sync(self) -> None:
+        ...
+
+    def send_flush_request(self) -> None:
+        ...
+
     def get_cancel(self) -> "PGcancel":
         ...
 
     def notifies(self) -> Optional["PGnotify"]:
         ...
 
-    def put_copy_data(self, buffer: bytes) -> int:
+    def put_copy_data(
+        self, buffer: Union[bytes, bytearray, memoryview]
+    ) -> int:
         ...
 
     def put_copy_end(self, error: Optional[bytes] = None) -> int:
@@ -284,6 +305,11 @@ class PGresult(Protocol):
     ) -> Optional[bytes]:
         ...
 
+    def get_value_view(
+        self, row_number: int, column_number: int
+    ) -> Optional[memoryview]:
+        ...
+
     @property
     def nparams(self) -> int:
         ...
@@ -4,7 +4,7 @@ Protocol objects representing different implementations of the same classes.
 
 # Copyright (C) 2020 The Psycopg Team
 
-from typing import Any, Callable, Dict, Generator, Mapping
+from typing import Any, Callable, Dict, Generator, List, Mapping
 from typing import Optional, Sequence, Tuple, Type, TypeVar, Union
 from typing import TYPE_CHECKING
 from typing_extensions import Protocol
@@ -21,6 +21,7 @@ if TYPE_CHECKING:
 
 Query = Union[str, bytes, "Composable"]
 Params = Union[Sequence[Any], Mapping[str, Any]]
+Buffer = Union[bytes, bytearray, memoryview]
 ConnectionType = TypeVar("ConnectionType", bound="BaseConnection")
 
 
@@ -42,8 +43,21 @@ LoadFunc = Callable[[bytes], Any]
 LoaderType = Type["Loader"]
 LoadersMap = Dict[Tuple[int, Format], LoaderType]
 
+# Row factories
+
+# A record returned by a cursor: a tuple unless a row factory is used
+Row = Any
+
+# Take the values of a record and return a row object
+RowMaker = Callable[[Sequence[Any]], Row]
+
+# Take a cursor with its current result and return a RowMaker
+RowFactory = Callable[["BaseCursor[Any]"], RowMaker]
+
 
 class Transformer(Protocol):
+    make_row: Optional[RowMaker]
+
     def __init__(self, context: AdaptContext = None):
         ...
 
@@ -63,6 +77,14 @@ class Transformer(Protocol):
     def pgresult(self, result: Optional[pq.proto.PGresult]) -> None:
         ...
 
+    def set_pgresult(
+        self,
+        result: Optional[pq.proto.PGresult],
+        *,
+        set_loaders: bool = True,
+    ) -> None:
+        ...
+
     @property
     def dumpers(self) -> DumpersMap:
         ...
@@ -77,7 +99,21 @@ class Transformer(Protocol):
     def get_dumper(self, obj: Any, format: Format) -> "Dumper":
         ...
 
-    def load_row(self, row: int) -> Optional[Tuple[Any, ...]]:
+    def get_dumper_by_oid(self, oid: int, format: Format) -> "Dumper":
+        ...
+
+    def load_row(self, row: int) -> Optional[Row]:
+        ...
+
+    def load_rows(self, row0: int, row1: int) -> List[Row]:
+        ...
+
+    def load_column(self, col: int, row0: int, row1: int) -> List[Any]:
+        ...
+
+    def load_column_into(
+        self, col: int, row0: int, row1: int, data: Any, nulls: Any
+    ) -> bool:
         ...
 
     def load_sequence(
@@ -0,0 +1,94 @@
+"""
+psycopg3 row factories
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+import re
+import keyword
+import functools
+from collections import namedtuple
+from typing import Any, Dict, List, Sequence, Tuple, Type
+from typing import TYPE_CHECKING
+
+from .proto import RowMaker
+
+if TYPE_CHECKING:
+    from .cursor import BaseCursor
+
+
+def dict_row(cursor: "BaseCursor[Any]") -> RowMaker:
+    """Row factory to represent rows as dicts."""
+    names = _get_names(cursor)
+
+    def make_row(values: Sequence[Any]) -> Dict[str, Any]:
+        return dict(zip(names, values))
+
+    return make_row
+
+
+def namedtuple_row(cursor: "BaseCursor[Any]") -> RowMaker:
+    """Row factory to represent rows as `~collections.namedtuple`."""
+    nt = _make_nt(tuple(_get_names(cursor)))
+    return nt._make  # type: ignore[no-any-return]
+
+
+def dataclass_row(cursor: "BaseCursor[Any]") -> RowMaker:
+    """
+    Row factory to represent rows as instances of a dataclass.
+
+    Available from Python 3.7.
+    """
+    cls = _make_dc(tuple(_get_names(cursor)))
+
+    def make_row(values: Sequence[Any]) -> Any:
+        return cls(*values)
+
+    return make_row
+
+
+def _get_names(cursor: "BaseCursor[Any]") -> List[str]:
+    res = cursor.pgresult
+    if not res:
+        return []
+    enc = cursor.connection.client_encoding
+    return [(res.fname(i) or b"").decode(enc) for i in range(res.nfields)]
+
+
+# The classes are cached by column names, so they are created only once for
+# results of the same shape.
+
+
+@functools.lru_cache(512)
+def _make_nt(names: Tuple[str, ...]) -> Type[Any]:
+    return namedtuple("Row", _as_identifiers(names))
+
+
+@functools.lru_cache(512)
+def _make_dc(names: Tuple[str, ...]) -> Type[Any]:
+    from dataclasses import make_dataclass
+
+    return make_dataclass("Row", _as_identifiers(names))
+
+
+_re_clean = re.compile(r"\W")
+
+
+def _as_identifiers(names: Sequence[str]) -> List[str]:
+    """
+    Convert column names into unique valid Python identifiers.
+    """
+    rv = []
+    seen = set()
+    for i, name in enumerate(names):
+        name = _re_clean.sub("_", name)
+        # Field names cannot start with a digit or an underscore
+        if not name or not name[0].isalpha():
+            name = "f" + name
+        if keyword.iskeyword(name):
+            name += "_"
+        if name in seen:
+            name = f"{name}_{i}"
+        seen.add(name)
+        rv.append(name)
+    return rv
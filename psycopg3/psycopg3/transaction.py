@@ -10,7 +10,6 @@ from types import TracebackType
 from typing import Generic, List, Optional, Type, Union, TYPE_CHECKING
 
 from . import sql
-from .pq import TransactionStatus
 from .proto import ConnectionType
 
 if TYPE_CHECKING:
@@ -80,9 +79,7 @@ class BaseTransaction(Generic[ConnectionType]):
         else:
             self._yolo = False
 
-        self._outer_transaction = (
-            self._conn.pgconn.transaction_status == TransactionStatus.IDLE
-        )
+        self._outer_transaction = not self._conn._in_transaction()
         if self._outer_transaction:
             # outer transaction: if no name it's only a begin, else
             # there will be an additional savepoint
@@ -98,6 +95,7 @@ class BaseTransaction(Generic[ConnectionType]):
         if self._outer_transaction:
             assert not self._conn._savepoints, self._conn._savepoints
             commands.append("begin")
+            self._conn._set_in_transaction(True)
 
         if self._savepoint_name:
             commands.append(
@@ -124,6 +122,7 @@ class BaseTransaction(Generic[ConnectionType]):
         if self._outer_transaction:
             assert not self._conn._savepoints
             commands.append("commit")
+            self._conn._set_in_transaction(False)
 
         return commands
 
@@ -133,15 +132,18 @@ class BaseTransaction(Generic[ConnectionType]):
 
         commands = []
         if self._savepoint_name and not self._outer_transaction:
+            name = sql.Identifier(self._savepoint_name)
             commands.append(
-                sql.SQL("rollback to {n}; release {n}")
-                .format(n=sql.Identifier(self._savepoint_name))
-                .as_string(self._conn)
+                sql.SQL("rollback to {}").format(name).as_string(self._conn)
+            )
+            commands.append(
+                sql.SQL("release {}").format(name).as_string(self._conn)
             )
 
         if self._outer_transaction:
             assert not self._conn._savepoints
             commands.append("rollback")
+            self._conn._set_in_transaction(False)
 
         return commands
 
@@ -191,7 +193,12 @@ class Transaction(BaseTransaction["Connection"]):
         return False
 
     def _execute(self, commands: List[str]) -> None:
-        self._conn._exec_command("; ".join(commands))
+        if self._conn._pipeline:
+            # Only one command per statement is allowed in pipeline mode
+            for command in commands:
+                self._conn._exec_command(command)
+        else:
+            self._conn._exec_command("; ".join(commands))
 
 
 class AsyncTransaction(BaseTransaction["AsyncConnection"]):
@@ -240,4 +247,9 @@ class AsyncTransaction(BaseTransaction["AsyncConnection"]):
         return False
 
     async def _execute(self, commands: List[str]) -> None:
-        await self._conn._exec_command("; ".join(commands))
+        if self._conn._pipeline:
+            # Only one command per statement is allowed in pipeline mode
+            for command in commands:
+                await self._conn._exec_command(command)
+        else:
+            await self._conn._exec_command("; ".join(commands))
@@ -5,9 +5,11 @@ Adapters for arrays
 # Copyright (C) 2020 The Psycopg Team
 
 import re
+import sys
 import struct
-from typing import Any, Iterator, List, Optional, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 
+from .. import pq
 from .. import errors as e
 from ..oids import builtins
 from ..adapt import Format, Dumper, Loader, Transformer
@@ -43,6 +45,10 @@ class BaseListDumper(Dumper):
 
         return oid or TEXT_ARRAY_OID
 
+    def _get_item_dumper(self, item: Any, format: Format) -> Dumper:
+        """Return the dumper to use for an item of the list."""
+        return self._tx.get_dumper(item, format)
+
 
 @Dumper.text(list)
 class ListDumper(BaseListDumper):
@@ -80,7 +86,7 @@ class ListDumper(BaseListDumper):
                 if isinstance(item, list):
                     dump_list(item)
                 elif item is not None:
-                    dumper = self._tx.get_dumper(item, Format.TEXT)
+                    dumper = self._get_item_dumper(item, Format.TEXT)
                     ad = dumper.dump(item)
                     if self._re_needs_quotes.search(ad):
                         ad = b'"' + self._re_escape.sub(br"\\\1", ad) + b'"'
@@ -130,7 +136,7 @@ class ListBinaryDumper(BaseListDumper):
             if dim == len(dims) - 1:
                 for item in L:
                     if item is not None:
-                        dumper = self._tx.get_dumper(item, Format.BINARY)
+                        dumper = self._get_item_dumper(item, Format.BINARY)
                         ad = dumper.dump(item)
                         data.append(_struct_len.pack(len(ad)))
                         data.append(ad)
@@ -159,6 +165,93 @@ class ListBinaryDumper(BaseListDumper):
         return b"".join(data)
 
 
+@Dumper.text("array.array")
+@Dumper.text("numpy.ndarray")
+class BufferDumper(BaseListDumper):
+    """
+    Dump an `array.array` or a NumPy array as the list of its items.
+    """
+
+    def dump(self, obj: Any) -> bytes:
+        items = obj.tolist()
+        dumper = self._tx.get_dumper(items, Format.TEXT)
+        rv = dumper.dump(items)
+        self._array_oid = dumper.oid
+        return rv
+
+
+@Dumper.binary("array.array")
+@Dumper.binary("numpy.ndarray")
+class BufferBinaryDumper(BaseListDumper):
+    """
+    Dump an object exposing numbers via the buffer protocol.
+
+    The data is copied to the array representation in bulk, without
+    creating a Python object per item. Items of types not available in
+    PostgreSQL (e.g. unsigned numbers) are dumped as the list of items.
+    """
+
+    def dump(self, obj: Any) -> bytes:
+        try:
+            m = memoryview(obj)
+        except (TypeError, ValueError):
+            oid = 0
+        else:
+            oid = _buffer_oids.get((m.format.lstrip("@=<>!"), m.itemsize), 0)
+
+        if not oid:
+            items = obj.tolist()
+            dumper = self._tx.get_dumper(items, Format.BINARY)
+            rv = dumper.dump(items)
+            self._array_oid = dumper.oid
+            return rv
+
+        self._array_oid = self._get_array_oid(oid)
+        if not m.ndim:
+            raise e.DataError("can't dump a 0-dimensional array")
+        if not m.nbytes:
+            return _struct_head.pack(0, 0, oid)
+
+        size = m.itemsize
+        nitems = m.nbytes // size
+        data = m.tobytes()
+        swap = m.format[0] == "<" or (
+            m.format[0] not in ">!" and sys.byteorder == "little"
+        )
+
+        # Write the header, then interleave the items length and data,
+        # converting the items to network order on the way.
+        start = 12 + 8 * m.ndim
+        step = 4 + size
+        out = bytearray(start + step * nitems)
+        _struct_head.pack_into(out, 0, m.ndim, 0, oid)
+        for i, dim in enumerate(m.shape or ()):
+            _struct_dim.pack_into(out, 12 + 8 * i, dim, 1)
+
+        blen = _struct_len.pack(size)
+        for i in range(4):
+            out[start + i :: step] = blen[i : i + 1] * nitems
+        for i in range(size):
+            j = size - 1 - i if swap else i
+            out[start + 4 + i :: step] = data[j::size]
+
+        return bytes(out)
+
+
+# Oid of the elements of the arrays exposing the buffer protocol,
+# from the struct format and size of their items.
+_buffer_oids: Dict[Tuple[str, int], int] = {
+    ("?", 1): builtins["bool"].oid,
+    ("h", 2): builtins["int2"].oid,
+    ("i", 4): builtins["int4"].oid,
+    ("l", 4): builtins["int4"].oid,
+    ("l", 8): builtins["int8"].oid,
+    ("q", 8): builtins["int8"].oid,
+    ("f", 4): builtins["float4"].oid,
+    ("d", 8): builtins["float8"].oid,
+}
+
+
 class BaseArrayLoader(Loader):
     base_oid: int
 
@@ -263,6 +356,20 @@ class ArrayBinaryLoader(BaseArrayLoader):
         return agg(dims)
 
 
+_ArrayLoader: Type[Loader]
+_ArrayBinaryLoader: Type[Loader]
+
+# Use the fast loaders as base classes if available
+if pq.__impl__ == "c":
+    from psycopg3_c import _psycopg3
+
+    _ArrayLoader = _psycopg3.ArrayLoader
+    _ArrayBinaryLoader = _psycopg3.ArrayBinaryLoader
+else:
+    _ArrayLoader = ArrayLoader
+    _ArrayBinaryLoader = ArrayBinaryLoader
+
+
 def register(
     array_oid: int,
     base_oid: int,
@@ -273,8 +380,8 @@ def register(
         name = f"oid{base_oid}"
 
     for format, base in (
-        (Format.TEXT, ArrayLoader),
-        (Format.BINARY, ArrayBinaryLoader),
+        (Format.TEXT, _ArrayLoader),
+        (Format.BINARY, _ArrayBinaryLoader),
     ):
         lname = f"{name.title()}Array{'Binary' if format else ''}Loader"
         loader: Type[Loader] = type(lname, (base,), {"base_oid": base_oid})
@@ -5,12 +5,15 @@ Support for composite types adaptation.
 import re
 import struct
 from collections import namedtuple
-from typing import Any, Callable, Iterator, Sequence, Tuple, Type
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Callable, Iterator, List, Sequence, Tuple
+from typing import Optional, Type, TYPE_CHECKING
 
+from .. import pq
+from .. import errors as e
 from ..oids import builtins, TypeInfo
 from ..adapt import Format, Dumper, Loader, Transformer
 from ..proto import AdaptContext
+from .._typed import TypedDumper
 from . import array
 
 if TYPE_CHECKING:
@@ -74,7 +77,7 @@ def register(
     # generate and register a customized text loader
     loader = type(
         f"{info.name.title()}Loader",
-        (CompositeLoader,),
+        (_CompositeLoader,),
         {
             "factory": factory,
             "fields_types": tuple(f.type_oid for f in info.fields),
@@ -85,11 +88,24 @@ def register(
     # generate and register a customized binary loader
     loader = type(
         f"{info.name.title()}BinaryLoader",
-        (CompositeBinaryLoader,),
+        (_CompositeBinaryLoader,),
         {"factory": factory},
     )
     loader.register(info.oid, context=context, format=Format.BINARY)
 
+    # generate and register a binary dumper for the objects created by the
+    # factory, if they are tuples (such as the default namedtuple)
+    if isinstance(factory, type) and issubclass(factory, tuple):
+        dumper: Type[Dumper] = type(
+            f"{info.name.title()}BinaryDumper",
+            (CompositeBinaryDumper,),
+            {
+                "oid": info.oid,
+                "fields_types": tuple(f.type_oid for f in info.fields),
+            },
+        )
+        dumper.register(factory, context=context, format=Format.BINARY)
+
     if info.array_oid:
         array.register(
             info.array_oid, info.oid, context=context, name=info.name
@@ -160,6 +176,45 @@ class TupleDumper(Dumper):
     _re_escape = re.compile(br"([\"])")
 
 
+class CompositeBinaryDumper(Dumper):
+    """
+    Dump a tuple as a composite type in binary format.
+
+    Every value is dumped as the type of its field, converting numbers if
+    needed; values which cannot be dumped as their field raise `DataError`.
+    """
+
+    oid: int
+    fields_types: Tuple[int, ...]
+
+    def __init__(self, src: type, context: AdaptContext = None):
+        super().__init__(src, context)
+        self._dumpers = [
+            TypedDumper(oid, Format.BINARY, context)
+            for oid in self.fields_types
+        ]
+
+    def dump(self, obj: Tuple[Any, ...]) -> bytes:
+        types = self.fields_types
+        if len(obj) != len(types):
+            raise e.DataError(
+                f"composite type has {len(types)} fields,"
+                f" got {len(obj)} values"
+            )
+
+        parts: List[bytes] = [_struct_len.pack(len(types))]
+        for item, oid, dumper in zip(obj, types, self._dumpers):
+            if item is None:
+                parts.append(_struct_oidlen.pack(oid, -1))
+                continue
+
+            ad = dumper.dump(item)
+            parts.append(_struct_oidlen.pack(oid, len(ad)))
+            parts.append(ad)
+
+        return b"".join(parts)
+
+
 class BaseCompositeLoader(Loader):
     def __init__(self, oid: int, context: AdaptContext = None):
         super().__init__(oid, context)
@@ -261,3 +316,17 @@ class CompositeBinaryLoader(RecordBinaryLoader):
     def load(self, data: bytes) -> Any:
         r = super().load(data)
         return type(self).factory(*r)
+
+
+_CompositeLoader: Type[Loader]
+_CompositeBinaryLoader: Type[Loader]
+
+# Use the fast loaders as base classes if available
+if pq.__impl__ == "c":
+    from psycopg3_c import _psycopg3
+
+    _CompositeLoader = _psycopg3.CompositeLoader
+    _CompositeBinaryLoader = _psycopg3.CompositeBinaryLoader
+else:
+    _CompositeLoader = CompositeLoader
+    _CompositeBinaryLoader = CompositeBinaryLoader
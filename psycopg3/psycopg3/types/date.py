@@ -6,14 +6,49 @@ Adapters for date/time types.
 
 import re
 import sys
-from datetime import date, datetime, time, timedelta
-from typing import cast
+import struct
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Callable, Dict, Optional, Tuple, cast
+from typing import TYPE_CHECKING
 
 from ..oids import builtins
 from ..adapt import Dumper, Loader
 from ..proto import AdaptContext
 from ..errors import InterfaceError, DataError
 
+if TYPE_CHECKING:
+    from ..connection import BaseConnection
+
+_PackInt = Callable[[int], bytes]
+_UnpackInt = Callable[[bytes], Tuple[int]]
+
+_pack_int4 = cast(_PackInt, struct.Struct("!i").pack)
+_pack_int8 = cast(_PackInt, struct.Struct("!q").pack)
+_unpack_int4 = cast(_UnpackInt, struct.Struct("!i").unpack)
+_unpack_int8 = cast(_UnpackInt, struct.Struct("!q").unpack)
+
+_pack_timetz = cast(Callable[[int, int], bytes], struct.Struct("!qi").pack)
+_unpack_timetz = cast(
+    Callable[[bytes], Tuple[int, int]], struct.Struct("!qi").unpack
+)
+_pack_interval = cast(
+    Callable[[int, int, int], bytes], struct.Struct("!qii").pack
+)
+_unpack_interval = cast(
+    Callable[[bytes], Tuple[int, int, int]], struct.Struct("!qii").unpack
+)
+
+# PostgreSQL binary dates and timestamps are relative to 2000-01-01
+_pg_date_epoch_days = date(2000, 1, 1).toordinal()
+_pg_datetime_epoch = datetime(2000, 1, 1)
+_pg_datetimetz_epoch = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# Binary representation of infinity/-infinity
+_PG_DATE_INF = 2 ** 31 - 1
+_PG_DATE_NEGINF = -(2 ** 31)
+_PG_TS_INF = 2 ** 63 - 1
+_PG_TS_NEGINF = -(2 ** 63)
+
 
 @Dumper.text(date)
 class DateDumper(Dumper):
@@ -26,6 +61,12 @@ class DateDumper(Dumper):
         return str(obj).encode("utf8")
 
 
+@Dumper.binary(date)
+class DateBinaryDumper(DateDumper):
+    def dump(self, obj: date) -> bytes:
+        return _pack_int4(obj.toordinal() - _pg_date_epoch_days)
+
+
 @Dumper.text(time)
 class TimeDumper(Dumper):
 
@@ -35,17 +76,51 @@ class TimeDumper(Dumper):
         return str(obj).encode("utf8")
 
 
+@Dumper.binary(time)
+class TimeBinaryDumper(TimeDumper):
+    def dump(self, obj: time) -> bytes:
+        # The oid depends on the object dumped: naive times are sent as time,
+        # aware ones as timetz.
+        us = obj.microsecond + 1_000_000 * (
+            obj.second + 60 * (obj.minute + 60 * obj.hour)
+        )
+        off = obj.utcoffset()
+        if off is None:
+            self.oid = builtins["time"].oid
+            return _pack_int8(us)
+        else:
+            self.oid = builtins["timetz"].oid
+            return _pack_timetz(us, -int(off.total_seconds()))
+
+
 @Dumper.text(datetime)
 class DateTimeDumper(Dumper):
 
     oid = builtins["timestamptz"].oid
 
-    def dump(self, obj: date) -> bytes:
+    def dump(self, obj: datetime) -> bytes:
         # NOTE: whatever the PostgreSQL DateStyle input format (DMY, MDY, YMD)
         # the YYYY-MM-DD is always understood correctly.
         return str(obj).encode("utf8")
 
 
+@Dumper.binary(datetime)
+class DateTimeBinaryDumper(DateTimeDumper):
+    def dump(self, obj: datetime) -> bytes:
+        # Naive datetimes are sent as timestamp, aware ones as timestamptz
+        if obj.utcoffset() is None:
+            self.oid = builtins["timestamp"].oid
+            delta = obj - _pg_datetime_epoch
+        else:
+            self.oid = builtins["timestamptz"].oid
+            delta = obj - _pg_datetimetz_epoch
+
+        us = delta.microseconds + 1_000_000 * (
+            86_400 * delta.days + delta.seconds
+        )
+        return _pack_int8(us)
+
+
 @Dumper.text(timedelta)
 class TimeDeltaDumper(Dumper):
 
@@ -73,6 +148,16 @@ class TimeDeltaDumper(Dumper):
         )
 
 
+@Dumper.binary(timedelta)
+class TimeDeltaBinaryDumper(Dumper):
+
+    oid = builtins["interval"].oid
+
+    def dump(self, obj: timedelta) -> bytes:
+        us = obj.microseconds + 1_000_000 * obj.seconds
+        return _pack_interval(us, obj.days, 0)
+
+
 @Loader.text(builtins["date"].oid)
 class DateLoader(Loader):
     def __init__(self, oid: int, context: AdaptContext):
@@ -131,6 +216,21 @@ class DateLoader(Loader):
         return max(map(len, parts))
 
 
+@Loader.binary(builtins["date"].oid)
+class DateBinaryLoader(Loader):
+    def load(self, data: bytes) -> date:
+        days = _unpack_int4(data)[0]
+        if days == _PG_DATE_INF or days == _PG_DATE_NEGINF:
+            raise DataError("Python date doesn't support infinity")
+        try:
+            return date.fromordinal(days + _pg_date_epoch_days)
+        except (ValueError, OverflowError):
+            if days < 0:
+                raise DataError("Python doesn't support BC date")
+            else:
+                raise DataError("Python date doesn't support years after 9999")
+
+
 @Loader.text(builtins["time"].oid)
 class TimeLoader(Loader):
 
@@ -156,6 +256,19 @@ class TimeLoader(Loader):
         raise exc
 
 
+@Loader.binary(builtins["time"].oid)
+class TimeBinaryLoader(Loader):
+    def load(self, data: bytes) -> time:
+        val = _unpack_int8(data)[0]
+        val, us = divmod(val, 1_000_000)
+        val, s = divmod(val, 60)
+        h, m = divmod(val, 60)
+        try:
+            return time(h, m, s, us)
+        except ValueError:
+            raise DataError(f"time not supported by Python: hour={h}")
+
+
 @Loader.text(builtins["timetz"].oid)
 class TimeTzLoader(TimeLoader):
     _format = "%H:%M:%S.%f%z"
@@ -191,6 +304,33 @@ class TimeTzLoader(TimeLoader):
         return TimeTzLoader.load(self, data)
 
 
+@Loader.binary(builtins["timetz"].oid)
+class TimeTzBinaryLoader(Loader):
+    def __init__(self, oid: int, context: AdaptContext):
+        super().__init__(oid, context)
+        self._timezones: Dict[int, tzinfo] = {}
+
+    def load(self, data: bytes) -> time:
+        val, off = _unpack_timetz(data)
+
+        val, us = divmod(val, 1_000_000)
+        val, s = divmod(val, 60)
+        h, m = divmod(val, 60)
+
+        try:
+            return time(h, m, s, us, self._get_timezone(off))
+        except ValueError:
+            raise DataError(f"time not supported by Python: hour={h}")
+
+    def _get_timezone(self, off: int) -> tzinfo:
+        # the offset is in seconds west of UTC
+        try:
+            return self._timezones[off]
+        except KeyError:
+            tz = self._timezones[off] = timezone(timedelta(seconds=-off))
+            return tz
+
+
 @Loader.text(builtins["timestamp"].oid)
 class TimestampLoader(DateLoader):
     def __init__(self, oid: int, context: AdaptContext):
@@ -243,6 +383,16 @@ class TimestampLoader(DateLoader):
                 return 0
 
 
+@Loader.binary(builtins["timestamp"].oid)
+class TimestampBinaryLoader(Loader):
+    def load(self, data: bytes) -> datetime:
+        micros = _unpack_int8(data)[0]
+        try:
+            return _pg_datetime_epoch + timedelta(microseconds=micros)
+        except OverflowError:
+            return _raise_ts_error(micros)
+
+
 @Loader.text(builtins["timestamptz"].oid)
 class TimestamptzLoader(TimestampLoader):
     def __init__(self, oid: int, context: AdaptContext):
@@ -304,6 +454,21 @@ class TimestamptzLoader(TimestampLoader):
         )
 
 
+@Loader.binary(builtins["timestamptz"].oid)
+class TimestamptzBinaryLoader(Loader):
+    def __init__(self, oid: int, context: AdaptContext):
+        super().__init__(oid, context)
+        self._timezone = _timezone_from_connection(self.connection)
+
+    def load(self, data: bytes) -> datetime:
+        micros = _unpack_int8(data)[0]
+        try:
+            ts = _pg_datetimetz_epoch + timedelta(microseconds=micros)
+            return ts.astimezone(self._timezone)
+        except OverflowError:
+            return _raise_ts_error(micros)
+
+
 @Loader.text(builtins["interval"].oid)
 class IntervalLoader(Loader):
 
@@ -372,3 +537,58 @@ class IntervalLoader(Loader):
             "can't parse interval with IntervalStyle"
             f" {ints.decode('ascii')}: {data.decode('ascii')}"
         )
+
+
+@Loader.binary(builtins["interval"].oid)
+class IntervalBinaryLoader(Loader):
+    def load(self, data: bytes) -> timedelta:
+        micros, days, months = _unpack_interval(data)
+
+        # Convert months to days the same way the text loader does:
+        # 365 days per year, 30 days per month.
+        if months > 0:
+            years, months = divmod(months, 12)
+            days = days + 30 * months + 365 * years
+        elif months < 0:
+            years, months = divmod(-months, 12)
+            days = days - 30 * months - 365 * years
+
+        try:
+            return timedelta(days=days, microseconds=micros)
+        except OverflowError as e:
+            raise DataError(f"can't parse interval: {e}")
+
+
+def _raise_ts_error(micros: int) -> datetime:
+    if micros == _PG_TS_INF or micros == _PG_TS_NEGINF:
+        raise DataError("Python datetime doesn't support infinity")
+    elif micros < 0:
+        raise DataError("Python doesn't support BC date")
+    else:
+        raise DataError("Python date doesn't support years after 9999")
+
+
+def _timezone_from_connection(
+    connection: Optional["BaseConnection"],
+) -> tzinfo:
+    """
+    Return the Python timezone of the connection TimeZone setting.
+
+    Fall back on UTC if the setting cannot be represented in Python.
+    """
+    if not connection:
+        return timezone.utc
+
+    tzname = connection.pgconn.parameter_status(b"TimeZone")
+    if not tzname:
+        return timezone.utc
+
+    if sys.version_info >= (3, 9):
+        from zoneinfo import ZoneInfo
+
+        try:
+            return cast(tzinfo, ZoneInfo(tzname.decode("utf8")))
+        except (KeyError, ValueError, OSError):
+            pass
+
+    return timezone.utc
@@ -5,25 +5,77 @@ Adapers for JSON types.
 # Copyright (C) 2020 The Psycopg Team
 
 import json
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Type, Union
 
 from ..oids import builtins
-from ..adapt import Dumper, Loader
+from ..adapt import Dumper, Format, Loader
+from ..proto import AdaptContext
 from ..errors import DataError
 
 JSON_OID = builtins["json"].oid
 JSONB_OID = builtins["jsonb"].oid
 
-JsonDumpsFunction = Callable[[Any], str]
+JsonDumpsFunction = Callable[[Any], Union[str, bytes]]
+JsonLoadsFunction = Callable[[bytes], Any]
+
+
+def set_json_dumps(
+    dumps: JsonDumpsFunction, context: AdaptContext = None
+) -> None:
+    """
+    Set the function used to serialize Python objects to JSON.
+
+    The function may return `!str` or `!bytes` (encoded in utf-8). It is
+    used to dump `Json` and `Jsonb` objects without a custom *dumps* and
+    `!dict` objects. If *context* is not specified the change is global.
+    """
+    dumper: Type[Dumper]
+    for src, format, base in (
+        (Json, Format.TEXT, JsonDumper),
+        (Json, Format.BINARY, JsonDumper),
+        (Jsonb, Format.TEXT, JsonbDumper),
+        (Jsonb, Format.BINARY, JsonbBinaryDumper),
+        (dict, Format.TEXT, JsonbDumper),
+        (dict, Format.BINARY, JsonbBinaryDumper),
+    ):
+        dumper = type(
+            f"Custom{base.__name__}", (base,), {"_dumps": staticmethod(dumps)}
+        )
+        dumper.register(src, context=context, format=format)
+
+
+def set_json_loads(
+    loads: JsonLoadsFunction, context: AdaptContext = None
+) -> None:
+    """
+    Set the function used to parse JSON data loading :sql:`json` and
+    :sql:`jsonb` values.
+
+    The function receives the data as utf-8 encoded `!bytes`. If *context*
+    is not specified the change is global.
+    """
+    loader: Type[Loader]
+    for oid, format, base in (
+        (JSON_OID, Format.TEXT, JsonLoader),
+        (JSONB_OID, Format.TEXT, JsonLoader),
+        (JSON_OID, Format.BINARY, JsonLoader),
+        (JSONB_OID, Format.BINARY, JsonbBinaryLoader),
+    ):
+        loader = type(
+            f"Custom{base.__name__}",
+            (base,),
+            {"_loads": staticmethod(loads), "accept_memoryview": False},
+        )
+        loader.register(oid, context=context, format=format)
 
 
 class _JsonWrapper:
     def __init__(self, obj: Any, dumps: Optional[JsonDumpsFunction] = None):
         self.obj = obj
-        self._dumps: JsonDumpsFunction = dumps or json.dumps
+        self._dumps = dumps
 
-    def dumps(self) -> str:
-        return self._dumps(self.obj)
+    def dumps(self) -> Union[str, bytes]:
+        return (self._dumps or json.dumps)(self.obj)
 
 
 class Json(_JsonWrapper):
@@ -35,8 +87,25 @@ class Jsonb(_JsonWrapper):
 
 
 class _JsonDumper(Dumper):
-    def dump(self, obj: _JsonWrapper) -> bytes:
-        return obj.dumps().encode("utf-8")
+
+    # The function to serialize the objects, if the wrapper doesn't specify
+    # one. It can be customised using set_json_dumps(), which overrides it
+    # with a staticmethod in a subclass.
+    def _dumps(self, obj: Any) -> Union[str, bytes]:
+        return json.dumps(obj)
+
+    def dump(self, obj: Any) -> bytes:
+        if not isinstance(obj, _JsonWrapper):
+            data = self._dumps(obj)
+        elif obj._dumps or type(obj).dumps is not _JsonWrapper.dumps:
+            # The wrapper has its own serialization function
+            data = obj.dumps()
+        else:
+            data = self._dumps(obj.obj)
+
+        if isinstance(data, str):
+            return data.encode("utf-8")
+        return data
 
 
 @Dumper.text(Json)
@@ -46,27 +115,44 @@ class JsonDumper(_JsonDumper):
 
 
 @Dumper.text(Jsonb)
+@Dumper.text(dict)
 class JsonbDumper(_JsonDumper):
     oid = JSONB_OID
 
 
 @Dumper.binary(Jsonb)
+@Dumper.binary(dict)
 class JsonbBinaryDumper(JsonbDumper):
-    def dump(self, obj: _JsonWrapper) -> bytes:
-        return b"\x01" + obj.dumps().encode("utf-8")
+    def dump(self, obj: Any) -> bytes:
+        return b"\x01" + super().dump(obj)
+
+
+class _JsonLoader(Loader):
+
+    # The function to parse the data, receiving bytes; if not set, decode the
+    # data and use json.loads(). It can be customised using set_json_loads().
+    _loads: Optional[JsonLoadsFunction] = None
+
+    accept_memoryview = True
+
+    def _parse(self, data: Union[bytes, memoryview]) -> Any:
+        if self._loads:
+            return self._loads(data)
+        else:
+            return json.loads(str(data, "utf-8"))
 
 
 @Loader.text(builtins["json"].oid)
 @Loader.text(builtins["jsonb"].oid)
 @Loader.binary(builtins["json"].oid)
-class JsonLoader(Loader):
+class JsonLoader(_JsonLoader):
     def load(self, data: bytes) -> Any:
-        return json.loads(data)
+        return self._parse(data)
 
 
 @Loader.binary(builtins["jsonb"].oid)
-class JsonbBinaryLoader(Loader):
+class JsonbBinaryLoader(_JsonLoader):
     def load(self, data: bytes) -> Any:
         if data and data[0] != 1:
-            raise DataError("unknown jsonb binary format: {data[0]}")
-        return json.loads(data[1:])
+            raise DataError(f"unknown jsonb binary format: {data[0]}")
+        return self._parse(data[1:])
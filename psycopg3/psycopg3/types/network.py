@@ -4,11 +4,12 @@ Adapters for network types.
 
 # Copyright (C) 2020 The Psycopg Team
 
-from typing import Callable, Union, TYPE_CHECKING
+from typing import Callable, Optional, Type, Union, TYPE_CHECKING
 
 from ..oids import builtins
 from ..adapt import Dumper, Loader
 from ..proto import AdaptContext
+from ..errors import DataError
 
 if TYPE_CHECKING:
     import ipaddress
@@ -21,6 +22,16 @@ Network = Union["ipaddress.IPv4Network", "ipaddress.IPv6Network"]
 ip_address: Callable[[str], Address]
 ip_interface: Callable[[str], Interface]
 ip_network: Callable[[str], Network]
+IPv4Address: "Type[ipaddress.IPv4Address]"
+IPv6Address: "Type[ipaddress.IPv6Address]"
+IPv4Interface: "Type[ipaddress.IPv4Interface]"
+IPv6Interface: "Type[ipaddress.IPv6Interface]"
+IPv4Network: "Type[ipaddress.IPv4Network]"
+IPv6Network: "Type[ipaddress.IPv6Network]"
+
+# Address families used in the binary representation of inet/cidr
+PGSQL_AF_INET = 2
+PGSQL_AF_INET6 = 3
 
 
 @Dumper.text("ipaddress.IPv4Address")
@@ -45,11 +56,44 @@ class NetworkDumper(Dumper):
         return str(obj).encode("utf8")
 
 
+@Dumper.binary("ipaddress.IPv4Address")
+@Dumper.binary("ipaddress.IPv6Address")
+@Dumper.binary("ipaddress.IPv4Interface")
+@Dumper.binary("ipaddress.IPv6Interface")
+class InterfaceBinaryDumper(InterfaceDumper):
+    def dump(self, obj: Interface) -> bytes:
+        # Interfaces are subclasses of addresses: these have no network
+        net: Optional[Network] = getattr(obj, "network", None)
+        prefixlen = net.prefixlen if net else obj.max_prefixlen
+        return _dump_binary(obj.packed, obj.version, prefixlen, 0)
+
+
+@Dumper.binary("ipaddress.IPv4Network")
+@Dumper.binary("ipaddress.IPv6Network")
+class NetworkBinaryDumper(NetworkDumper):
+    def dump(self, obj: Network) -> bytes:
+        return _dump_binary(
+            obj.network_address.packed, obj.version, obj.prefixlen, 1
+        )
+
+
+def _dump_binary(
+    packed: bytes, version: int, prefixlen: int, cidr: int
+) -> bytes:
+    family = PGSQL_AF_INET if version == 4 else PGSQL_AF_INET6
+    return bytes((family, prefixlen, cidr, len(packed))) + packed
+
+
 class _LazyIpaddress(Loader):
     def __init__(self, oid: int, context: AdaptContext = None):
         super().__init__(oid, context)
         global ip_address, ip_interface, ip_network
+        global IPv4Address, IPv6Address, IPv4Interface, IPv6Interface
+        global IPv4Network, IPv6Network
         from ipaddress import ip_address, ip_interface, ip_network
+        from ipaddress import IPv4Address, IPv6Address
+        from ipaddress import IPv4Interface, IPv6Interface
+        from ipaddress import IPv4Network, IPv6Network
 
 
 @Loader.text(builtins["inet"].oid)
@@ -65,3 +109,33 @@ class InetLoader(_LazyIpaddress):
 class CidrLoader(_LazyIpaddress):
     def load(self, data: bytes) -> Network:
         return ip_network(data.decode("utf8"))
+
+
+@Loader.binary(builtins["inet"].oid)
+class InetBinaryLoader(_LazyIpaddress):
+    def load(self, data: bytes) -> Union[Address, Interface]:
+        prefix = data[1]
+        packed = data[4:]
+        if data[0] == PGSQL_AF_INET:
+            if prefix == 32:
+                return IPv4Address(packed)
+            else:
+                return IPv4Interface((packed, prefix))
+        elif data[0] == PGSQL_AF_INET6:
+            if prefix == 128:
+                return IPv6Address(packed)
+            else:
+                return IPv6Interface((packed, prefix))
+        else:
+            raise DataError(f"unknown inet address family: {data[0]}")
+
+
+@Loader.binary(builtins["cidr"].oid)
+class CidrBinaryLoader(_LazyIpaddress):
+    def load(self, data: bytes) -> Network:
+        if data[0] == PGSQL_AF_INET:
+            return IPv4Network((data[4:], data[1]))
+        elif data[0] == PGSQL_AF_INET6:
+            return IPv6Network((data[4:], data[1]))
+        else:
+            raise DataError(f"unknown cidr address family: {data[0]}")
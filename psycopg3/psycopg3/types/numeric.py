@@ -5,9 +5,10 @@ Adapers for numeric types.
 # Copyright (C) 2020 The Psycopg Team
 
 import struct
-from typing import Any, Callable, Dict, Tuple, cast
+from typing import Any, Callable, Dict, List, Tuple, Union, cast
 from decimal import Decimal
 
+from .. import errors as e
 from ..oids import builtins
 from ..adapt import Dumper, Loader
 
@@ -20,6 +21,7 @@ _pack_int2 = cast(_PackInt, struct.Struct("!h").pack)
 _pack_int4 = cast(_PackInt, struct.Struct("!i").pack)
 _pack_uint4 = cast(_PackInt, struct.Struct("!I").pack)
 _pack_int8 = cast(_PackInt, struct.Struct("!q").pack)
+_pack_float4 = cast(_PackFloat, struct.Struct("!f").pack)
 _pack_float8 = cast(_PackFloat, struct.Struct("!d").pack)
 _unpack_int2 = cast(_UnpackInt, struct.Struct("!h").unpack)
 _unpack_int4 = cast(_UnpackInt, struct.Struct("!i").unpack)
@@ -28,6 +30,22 @@ _unpack_int8 = cast(_UnpackInt, struct.Struct("!q").unpack)
 _unpack_float4 = cast(_UnpackFloat, struct.Struct("!f").unpack)
 _unpack_float8 = cast(_UnpackFloat, struct.Struct("!d").unpack)
 
+# Header of the numeric binary representation: ndigits, weight, sign, dscale.
+# The digits follow, as int2 in base 10000.
+_pack_numeric_head = cast(
+    Callable[[int, int, int, int], bytes], struct.Struct("!HhHH").pack
+)
+_unpack_numeric_head = cast(
+    Callable[[bytes], Tuple[int, int, int, int]],
+    struct.Struct("!HhHH").unpack_from,
+)
+
+NUMERIC_POS = 0x0000
+NUMERIC_NEG = 0x4000
+NUMERIC_NAN = 0xC000
+NUMERIC_PINF = 0xD000
+NUMERIC_NINF = 0xF000
+
 
 # Wrappers to force numbers to be cast as specific PostgreSQL types
 
@@ -56,6 +74,18 @@ class Oid(int):
         return rv
 
 
+class Float4(float):
+    def __new__(cls, arg: float) -> "Float4":
+        rv: Float4 = super().__new__(cls, arg)  # type: ignore[call-arg]
+        return rv
+
+
+class Float8(float):
+    def __new__(cls, arg: float) -> "Float8":
+        rv: Float8 = super().__new__(cls, arg)  # type: ignore[call-arg]
+        return rv
+
+
 class NumberDumper(Dumper):
     def dump(self, obj: Any) -> bytes:
         return str(obj).encode("utf8")
@@ -116,6 +146,12 @@ class DecimalDumper(SpecialValuesDumper):
     }
 
 
+@Dumper.binary(Decimal)
+class DecimalBinaryDumper(DecimalDumper):
+    def dump(self, obj: Decimal) -> bytes:
+        return dump_decimal_to_numeric_binary(obj)
+
+
 @Dumper.text(Int2)
 class Int2Dumper(NumberDumper):
     oid = builtins["int2"].oid
@@ -160,6 +196,34 @@ class OidBinaryDumper(OidDumper):
         return _pack_uint4(obj)
 
 
+@Dumper.text(Float4)
+class Float4Dumper(FloatDumper):
+    oid = builtins["float4"].oid
+
+    _special = {
+        b"inf": b"'Infinity'::float4",
+        b"-inf": b"'-Infinity'::float4",
+        b"nan": b"'NaN'::float4",
+    }
+
+
+@Dumper.text(Float8)
+class Float8Dumper(FloatDumper):
+    pass
+
+
+@Dumper.binary(Float4)
+class Float4BinaryDumper(Float4Dumper):
+    def dump(self, obj: float) -> bytes:
+        return _pack_float4(obj)
+
+
+@Dumper.binary(Float8)
+class Float8BinaryDumper(Float8Dumper):
+    def dump(self, obj: float) -> bytes:
+        return _pack_float8(obj)
+
+
 @Loader.text(builtins["int2"].oid)
 @Loader.text(builtins["int4"].oid)
 @Loader.text(builtins["int8"].oid)
@@ -218,3 +282,135 @@ class Float8BinaryLoader(Loader):
 class NumericLoader(Loader):
     def load(self, data: bytes) -> Decimal:
         return Decimal(data.decode("utf8"))
+
+
+@Loader.binary(builtins["numeric"].oid)
+class NumericBinaryLoader(Loader):
+    def load(self, data: bytes) -> Decimal:
+        return load_numeric_binary(data)
+
+
+# Loaders returning Python numbers instead of Decimal: they are not
+# registered by default, but can be registered on the numeric oid
+# in a context if the loss of precision is acceptable.
+
+
+class NumericIntLoader(Loader):
+    """
+    Load numeric values as int if they have no decimal part, else Decimal.
+    """
+
+    def load(self, data: bytes) -> Union[int, Decimal]:
+        if b"." in data or b"N" in data or b"n" in data:
+            return Decimal(data.decode("utf8"))
+        else:
+            return int(data)
+
+
+class NumericIntBinaryLoader(Loader):
+    """
+    Load binary numeric values as int if they have no scale, else Decimal.
+    """
+
+    def load(self, data: bytes) -> Union[int, Decimal]:
+        ndigits, weight, sign, dscale = _unpack_numeric_head(data)
+        if dscale or sign not in (NUMERIC_POS, NUMERIC_NEG):
+            return load_numeric_binary(data)
+
+        val = 0
+        for i in range(ndigits):
+            val = val * 10000 + _unpack_int2(data[8 + 2 * i : 10 + 2 * i])[0]
+        if weight >= ndigits:
+            val *= 10000 ** (weight - ndigits + 1)
+
+        return -val if sign == NUMERIC_NEG else val
+
+
+class NumericFloatBinaryLoader(Loader):
+    """
+    Load binary numeric values as float.
+    """
+
+    def load(self, data: bytes) -> float:
+        return float(load_numeric_binary(data))
+
+
+_decimal_special = {
+    NUMERIC_NAN: Decimal("NaN"),
+    NUMERIC_PINF: Decimal("Infinity"),
+    NUMERIC_NINF: Decimal("-Infinity"),
+}
+
+
+def load_numeric_binary(data: bytes) -> Decimal:
+    ndigits, weight, sign, dscale = _unpack_numeric_head(data)
+    if sign not in (NUMERIC_POS, NUMERIC_NEG):
+        try:
+            return _decimal_special[sign]
+        except KeyError:
+            raise e.DataError(f"bad value for numeric sign: 0x{sign:X}")
+
+    # Convert the base 10000 digits into decimal digits and find the position
+    # of the decimal exponent: 4 * (weight - ndigits + 1)
+    digits: List[int] = []
+    for i in range(ndigits):
+        d = _unpack_int2(data[8 + 2 * i : 10 + 2 * i])[0]
+        digits.extend((d // 1000, d // 100 % 10, d // 10 % 10, d % 10))
+    exp = 4 * (weight - ndigits + 1)
+
+    # Adjust the number of digits to the display scale, which is the number
+    # of digits after the decimal point, e.g. 1.50 for numeric(3, 2).
+    if exp > -dscale:
+        digits.extend([0] * (exp + dscale))
+    elif exp < -dscale:
+        del digits[exp + dscale :]
+
+    return Decimal((sign == NUMERIC_NEG, digits or [0], -dscale))
+
+
+def dump_decimal_to_numeric_binary(obj: Decimal) -> bytes:
+    sign, digits, exp = obj.as_tuple()
+    if exp == "n" or exp == "N":  # type: ignore[comparison-overlap]
+        return _pack_numeric_head(0, 0, NUMERIC_NAN, 0)
+    elif exp == "F":  # type: ignore[comparison-overlap]
+        return _pack_numeric_head(
+            0, 0, NUMERIC_NINF if sign else NUMERIC_PINF, 0
+        )
+
+    # Align the digits to the decimal point in groups of 4
+    if exp >= 0:
+        digits = digits + (0,) * exp
+        nfrac = 0
+    else:
+        nfrac = -exp
+    nint = len(digits) - nfrac
+    if nint < 0:
+        digits = (0,) * -nint + digits
+        nint = 0
+    lpad = -nint % 4
+    digits = (0,) * lpad + digits + (0,) * (-nfrac % 4)
+    weight = (nint + lpad) // 4 - 1
+
+    groups = [
+        digits[i] * 1000
+        + digits[i + 1] * 100
+        + digits[i + 2] * 10
+        + digits[i + 3]
+        for i in range(0, len(digits), 4)
+    ]
+
+    # Drop the leading and trailing zero groups
+    start = 0
+    while start < len(groups) and not groups[start]:
+        start += 1
+    end = len(groups)
+    while end > start and not groups[end - 1]:
+        end -= 1
+    groups = groups[start:end]
+    weight = weight - start if groups else 0
+    if not -0x8000 <= weight <= 0x7FFF:
+        raise e.DataError(f"numeric value out of range: {obj}")
+
+    return _pack_numeric_head(
+        len(groups), weight, NUMERIC_NEG if sign else NUMERIC_POS, nfrac
+    ) + b"".join(map(_pack_int2, groups))
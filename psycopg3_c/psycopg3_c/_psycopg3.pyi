@@ -7,15 +7,19 @@ information. Will submit a bug.
 
 # Copyright (C) 2020 The Psycopg Team
 
-from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+from typing import Tuple
 
 from psycopg3.adapt import Dumper, Loader
 from psycopg3.proto import AdaptContext, DumpFunc, DumpersMap, DumperType
 from psycopg3.proto import LoadFunc, LoadersMap, LoaderType, PQGen
+from psycopg3.proto import Row, RowMaker
 from psycopg3.connection import BaseConnection
 from psycopg3 import pq
+from psycopg3 import proto
 
 class Transformer:
+    make_row: Optional[RowMaker]
     def __init__(self, context: AdaptContext = None): ...
     @property
     def connection(self) -> Optional[BaseConnection]: ...
@@ -29,18 +33,65 @@ class Transformer:
     def pgresult(self) -> Optional[pq.proto.PGresult]: ...
     @pgresult.setter
     def pgresult(self, result: Optional[pq.proto.PGresult]) -> None: ...
+    def set_pgresult(
+        self,
+        result: Optional[pq.proto.PGresult],
+        *,
+        set_loaders: bool = True,
+    ) -> None: ...
     def set_row_types(
         self, types: Sequence[Tuple[int, pq.Format]]
     ) -> None: ...
     def get_dumper(self, obj: Any, format: pq.Format) -> Dumper: ...
-    def load_row(self, row: int) -> Optional[Tuple[Any, ...]]: ...
+    def get_dumper_by_oid(self, oid: int, format: pq.Format) -> Dumper: ...
+    def load_row(self, row: int) -> Optional[Row]: ...
+    def load_rows(self, row0: int, row1: int) -> List[Row]: ...
+    def load_column(self, col: int, row0: int, row1: int) -> List[Any]: ...
+    def load_column_into(
+        self, col: int, row0: int, row1: int, data: Any, nulls: Any
+    ) -> bool: ...
     def load_sequence(
         self, record: Sequence[Optional[bytes]]
     ) -> Tuple[Any, ...]: ...
     def get_loader(self, oid: int, format: pq.Format) -> Loader: ...
 
+class ArrayLoader(Loader):
+    base_oid: int
+
+class ArrayBinaryLoader(Loader):
+    base_oid: int
+
+class CompositeLoader(Loader):
+    factory: Callable[..., Any]
+    fields_types: Tuple[int, ...]
+
+class CompositeBinaryLoader(Loader):
+    factory: Callable[..., Any]
+
 def register_builtin_c_adapters() -> None: ...
+def format_row_text(
+    row: Sequence[Any],
+    tx: proto.Transformer,
+    out: Optional[bytearray] = None,
+    dumpers: Optional[List[Optional[Dumper]]] = None,
+) -> bytearray: ...
+def format_row_binary(
+    row: Sequence[Any],
+    tx: proto.Transformer,
+    out: Optional[bytearray] = None,
+    dumpers: Optional[List[Optional[Dumper]]] = None,
+) -> bytearray: ...
+def parse_row_text(data: bytes, tx: proto.Transformer) -> Tuple[Any, ...]: ...
+def parse_row_binary(
+    data: bytes, tx: proto.Transformer
+) -> Tuple[Any, ...]: ...
 def connect(conninfo: str) -> PQGen[pq.proto.PGconn]: ...
 def execute(pgconn: pq.proto.PGconn) -> PQGen[List[pq.proto.PGresult]]: ...
+def fetch_result(
+    pgconn: pq.proto.PGconn,
+) -> PQGen[Optional[pq.proto.PGresult]]: ...
+def copy_from_block(
+    pgconn: pq.proto.PGconn, max_bytes: int
+) -> PQGen[Tuple[bytes, Optional[pq.proto.PGresult]]]: ...
 
 # vim: set syntax=python:
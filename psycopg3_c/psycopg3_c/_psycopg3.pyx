@@ -7,9 +7,14 @@ if a compiler is available.
 
 # Copyright (C) 2020 The Psycopg Team
 
+include "types/array.pyx"
+include "types/composite.pyx"
+include "types/date.pyx"
 include "types/numeric.pyx"
 include "types/singletons.pyx"
 include "types/text.pyx"
+include "types/uuid.pyx"
 include "generators.pyx"
 include "adapt.pyx"
 include "transform.pyx"
+include "copy.pyx"
@@ -163,6 +163,10 @@ def register_builtin_c_adapters():
 
     """
     logger.debug("registering optimised c adapters")
+    register_array_c_adapters()
+    register_composite_c_adapters()
+    register_date_c_adapters()
     register_numeric_c_adapters()
     register_singletons_c_adapters()
     register_text_c_adapters()
+    register_uuid_c_adapters()
@@ -0,0 +1,295 @@
+"""
+C optimised functions for the copy system.
+
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from libc.stdint cimport int16_t, int32_t, uint16_t, uint32_t
+from libc.string cimport memcpy, memset
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from cpython.ref cimport Py_INCREF
+from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM
+from cpython.bytes cimport PyBytes_Check, PyBytes_AsStringAndSize
+from cpython.bytearray cimport PyByteArray_FromStringAndSize
+from cpython.bytearray cimport PyByteArray_Resize, PyByteArray_AS_STRING
+from cpython.bytearray cimport PyByteArray_GET_SIZE
+
+from psycopg3_c.endian cimport htobe16, htobe32, be16toh, be32toh
+
+from psycopg3 import errors as e
+from psycopg3.pq import Format
+
+cdef object _FORMAT_TEXT = Format.TEXT
+cdef object _FORMAT_BINARY = Format.BINARY
+
+# Map of the chars to escape in text copy to the char to add after a backslash
+cdef char copy_escape_char[256]
+memset(copy_escape_char, 0, sizeof(copy_escape_char))
+copy_escape_char[ord(b"\b")] = b"b"
+copy_escape_char[ord(b"\t")] = b"t"
+copy_escape_char[ord(b"\n")] = b"n"
+copy_escape_char[ord(b"\v")] = b"v"
+copy_escape_char[ord(b"\f")] = b"f"
+copy_escape_char[ord(b"\r")] = b"r"
+copy_escape_char[ord(b"\\")] = b"\\"
+
+# Map of the chars following a backslash in text copy to the char to emit,
+# if different from the char itself
+cdef char copy_unescape_char[256]
+memset(copy_unescape_char, 0, sizeof(copy_unescape_char))
+copy_unescape_char[ord(b"b")] = b"\b"
+copy_unescape_char[ord(b"t")] = b"\t"
+copy_unescape_char[ord(b"n")] = b"\n"
+copy_unescape_char[ord(b"v")] = b"\v"
+copy_unescape_char[ord(b"f")] = b"\f"
+copy_unescape_char[ord(b"r")] = b"\r"
+
+
+def format_row_binary(
+    row: Sequence[Any],
+    tx: Transformer,
+    out: bytearray = None,
+    dumpers: list = None,
+) -> bytearray:
+    """Convert a row of objects to the data to send for binary copy"""
+    if out is None:
+        out = PyByteArray_FromStringAndSize("", 0)
+
+    cdef Py_ssize_t pos = PyByteArray_GET_SIZE(out)
+    cdef Py_ssize_t rowlen = len(row)
+    cdef char *target
+    cdef char *buf
+    cdef Py_ssize_t size
+    cdef uint16_t berowlen = htobe16(<uint16_t>rowlen)
+    cdef uint32_t besize
+    cdef Py_ssize_t i
+
+    target = _reserve(out, pos, sizeof(berowlen))
+    memcpy(target, <void *>&berowlen, sizeof(berowlen))
+    pos += sizeof(berowlen)
+
+    for i in range(rowlen):
+        item = row[i]
+        if item is None:
+            target = _reserve(out, pos, sizeof(besize))
+            memcpy(target, b"\xff\xff\xff\xff", sizeof(besize))
+            pos += sizeof(besize)
+            continue
+
+        dumper = _get_row_dumper(tx, dumpers, i, item, _FORMAT_BINARY)
+        data = dumper.dump(item)
+        if not PyBytes_Check(data):
+            data = bytes(data)
+        PyBytes_AsStringAndSize(data, &buf, &size)
+
+        target = _reserve(out, pos, sizeof(besize) + size)
+        besize = htobe32(<uint32_t>size)
+        memcpy(target, <void *>&besize, sizeof(besize))
+        memcpy(target + sizeof(besize), buf, size)
+        pos += sizeof(besize) + size
+
+    return out
+
+
+def format_row_text(
+    row: Sequence[Any],
+    tx: Transformer,
+    out: bytearray = None,
+    dumpers: list = None,
+) -> bytearray:
+    """Convert a row of objects to the data to send for text copy"""
+    if out is None:
+        out = PyByteArray_FromStringAndSize("", 0)
+
+    cdef Py_ssize_t pos = PyByteArray_GET_SIZE(out)
+    cdef Py_ssize_t rowlen = len(row)
+    cdef char *target
+    cdef char *buf
+    cdef Py_ssize_t i, j, size, nesc
+    cdef unsigned char c
+
+    if rowlen == 0:
+        target = _reserve(out, pos, 1)
+        target[0] = b"\n"
+        return out
+
+    for i in range(rowlen):
+        item = row[i]
+        if item is None:
+            target = _reserve(out, pos, 3)
+            memcpy(target, b"\\N", 2)
+            pos += 2
+        else:
+            dumper = _get_row_dumper(tx, dumpers, i, item, _FORMAT_TEXT)
+            data = dumper.dump(item)
+            if not PyBytes_Check(data):
+                data = bytes(data)
+            PyBytes_AsStringAndSize(data, &buf, &size)
+
+            # Count the chars to escape to allocate the space once
+            nesc = 0
+            for j in range(size):
+                if copy_escape_char[<unsigned char>buf[j]]:
+                    nesc += 1
+
+            # Reserve one more char for the separator
+            target = _reserve(out, pos, size + nesc + 1)
+            if nesc == 0:
+                memcpy(target, buf, size)
+            else:
+                for j in range(size):
+                    c = <unsigned char>buf[j]
+                    if copy_escape_char[c]:
+                        target[0] = b"\\"
+                        target += 1
+                        target[0] = copy_escape_char[c]
+                    else:
+                        target[0] = c
+                    target += 1
+
+            pos += size + nesc
+
+        # Separator or terminator, the space is already reserved
+        target = PyByteArray_AS_STRING(out) + pos
+        if i < rowlen - 1:
+            target[0] = b"\t"
+        else:
+            target[0] = b"\n"
+        pos += 1
+
+    return out
+
+
+def parse_row_binary(data: bytes, tx: Transformer) -> Tuple[Any, ...]:
+    """Convert a row of data received from a binary copy to Python objects"""
+    cdef char *buf
+    cdef Py_ssize_t length
+    PyBytes_AsStringAndSize(data, &buf, &length)
+
+    cdef const char *p = buf
+    cdef const char *end = buf + length
+    cdef list row_loaders = tx._row_loaders
+    cdef Py_ssize_t nfields, col
+    cdef int32_t flen
+
+    if length < 2:
+        raise e.DataError("binary copy row too short")
+    nfields = <int16_t>be16toh((<uint16_t *>p)[0])
+    p += 2
+    _check_nfields(nfields, row_loaders)
+
+    rv = PyTuple_New(nfields)
+    for col in range(nfields):
+        if p + 4 > end:
+            raise e.DataError("binary copy row truncated")
+        flen = <int32_t>be32toh((<uint32_t *>p)[0])
+        p += 4
+        if flen < 0:
+            val = None
+        else:
+            if p + flen > end:
+                raise e.DataError("binary copy row truncated")
+            val = _load_with(row_loaders[col], p, flen)
+            p += flen
+
+        Py_INCREF(val)
+        PyTuple_SET_ITEM(rv, col, val)
+
+    return rv
+
+
+def parse_row_text(data: bytes, tx: Transformer) -> Tuple[Any, ...]:
+    """Convert a row of data received from a text copy to Python objects"""
+    cdef char *buf
+    cdef Py_ssize_t length
+    PyBytes_AsStringAndSize(data, &buf, &length)
+
+    cdef const char *p = buf
+    cdef const char *end = buf + length
+    cdef const char *fstart
+    cdef list row_loaders = tx._row_loaders
+    cdef Py_ssize_t nfields = 1, col
+    cdef char *out
+
+    if end > p and end[-1] == b"\n":
+        end -= 1
+    while p < end:
+        if p[0] == b"\t":
+            nfields += 1
+        p += 1
+    _check_nfields(nfields, row_loaders)
+
+    # Buffer to copy the unescaped fields into, zero-terminated, as expected
+    # by the text loaders
+    cdef char *scratch = <char *>PyMem_Malloc(length + 1)
+    if scratch == NULL:
+        raise MemoryError()
+
+    rv = PyTuple_New(nfields)
+    p = buf
+    try:
+        for col in range(nfields):
+            fstart = p
+            while p < end and p[0] != b"\t":
+                p += 1
+
+            if p - fstart == 2 and fstart[0] == b"\\" and fstart[1] == b"N":
+                val = None
+            else:
+                out = scratch
+                while fstart < p:
+                    if fstart[0] == b"\\" and fstart + 1 < p:
+                        fstart += 1
+                        out[0] = copy_unescape_char[<unsigned char>fstart[0]]
+                        if not out[0]:
+                            out[0] = fstart[0]
+                    else:
+                        out[0] = fstart[0]
+                    out += 1
+                    fstart += 1
+                out[0] = 0
+                val = _load_with(row_loaders[col], scratch, out - scratch)
+
+            Py_INCREF(val)
+            PyTuple_SET_ITEM(rv, col, val)
+            p += 1  # the separator
+
+    finally:
+        PyMem_Free(scratch)
+
+    return rv
+
+
+cdef int _check_nfields(Py_ssize_t nfields, list row_loaders) except -1:
+    if nfields < 0:
+        raise e.DataError(f"bad copy row fields number: {nfields}")
+    if nfields > len(row_loaders):
+        raise e.DataError(f"copy row has too many fields: {nfields}")
+    return 0
+
+
+cdef object _get_row_dumper(
+    Transformer tx, list dumpers, Py_ssize_t i, object item, object format
+):
+    if dumpers is not None and i < len(dumpers):
+        dumper = dumpers[i]
+        if dumper is not None:
+            return dumper
+    return tx.get_dumper(item, format)
+
+
+cdef char *_reserve(
+    bytearray out, Py_ssize_t pos, Py_ssize_t size
+) except NULL:
+    """
+    Make sure *size* bytes are available at position *pos* of *out*.
+
+    Return a pointer to the data at *pos*. The bytearray resize function
+    overallocates, so growing the buffer row by row is amortised.
+    """
+    cdef Py_ssize_t need = pos + size
+    if PyByteArray_GET_SIZE(out) < need:
+        PyByteArray_Resize(out, need)
+    return PyByteArray_AS_STRING(out) + pos
+
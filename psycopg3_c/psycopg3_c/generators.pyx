@@ -5,11 +5,16 @@ C implementation of generators for the communication protocols with the libpq
 # Copyright (C) 2020 The Psycopg Team
 
 import logging
-from typing import List
+from typing import List, Optional, Tuple
+
+from libc.string cimport memcpy
+from cpython.mem cimport PyMem_Realloc, PyMem_Free
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
 
 from psycopg3 import errors as e
 from psycopg3.proto import PQGen
 from psycopg3.waiting import Wait, Ready
+from psycopg3.encodings import py_codecs
 from psycopg3 import pq
 from psycopg3_c cimport libpq
 from psycopg3_c.pq_cython cimport PGconn, PGresult
@@ -122,3 +127,135 @@ def execute(PGconn pgconn) -> PQGen[List[pq.proto.PGresult]]:
             break
 
     return results
+
+
+def fetch_result(PGconn pgconn) -> PQGen[Optional[pq.proto.PGresult]]:
+    """
+    Generator retrieving a single result from the database without blocking.
+
+    Return the next result (whether success or error), or `!None` if all the
+    results of the query have been received. In single row mode every record
+    is returned in its own result.
+    """
+    cdef libpq.PGconn *pgconn_ptr = pgconn.pgconn_ptr
+    cdef libpq.PGnotify *notify
+    cdef libpq.PGresult *res
+
+    while 1:
+        if 1 != libpq.PQconsumeInput(pgconn_ptr):
+            raise pq.PQerror(
+                f"consuming input failed: {pq.error_message(pgconn)}")
+        if not libpq.PQisBusy(pgconn_ptr):
+            break
+        yield libpq.PQsocket(pgconn_ptr), WAIT_R
+
+    # Consume notifies
+    if pgconn.notify_handler:
+        while 1:
+            pynotify = pgconn.notifies()
+            if pynotify is None:
+                break
+            pgconn.notify_handler(pynotify)
+    else:
+        while 1:
+            notify = libpq.PQnotifies(pgconn_ptr)
+            if notify is NULL:
+                break
+            libpq.PQfreemem(notify)
+
+    res = libpq.PQgetResult(pgconn_ptr)
+    if res is NULL:
+        return None
+    return PGresult._from_ptr(res)
+
+
+def copy_from_block(
+    PGconn pgconn, Py_ssize_t max_bytes
+) -> PQGen[Tuple[bytes, Optional[pq.proto.PGresult]]]:
+    """
+    Generator receiving the data of a :sql:`COPY TO` in blocks.
+
+    Wait only if no data is available, then return all the data already
+    received, up to about *max_bytes* (the last message is not split), as
+    a single block. Also return the final result of the copy if the data is
+    finished, else `!None`.
+    """
+    cdef libpq.PGconn *pgconn_ptr = pgconn.pgconn_ptr
+    cdef char *buffer_ptr
+    cdef int nbytes
+    cdef int finished = 0
+
+    # The messages received, kept until copied in the block
+    cdef char **bufs = NULL
+    cdef Py_ssize_t *lens = NULL
+    cdef Py_ssize_t nbufs = 0, allocated = 0, size = 0, i
+    cdef void *tmp
+    cdef char *target
+
+    try:
+        while size < max_bytes:
+            buffer_ptr = NULL
+            nbytes = libpq.PQgetCopyData(pgconn_ptr, &buffer_ptr, 1)
+            if nbytes > 0:
+                if nbufs >= allocated:
+                    allocated = allocated * 2 if allocated else 16
+                    tmp = PyMem_Realloc(bufs, allocated * sizeof(char *))
+                    if tmp == NULL:
+                        libpq.PQfreemem(buffer_ptr)
+                        raise MemoryError()
+                    bufs = <char **>tmp
+                    tmp = PyMem_Realloc(lens, allocated * sizeof(Py_ssize_t))
+                    if tmp == NULL:
+                        libpq.PQfreemem(buffer_ptr)
+                        raise MemoryError()
+                    lens = <Py_ssize_t *>tmp
+
+                bufs[nbufs] = buffer_ptr
+                lens[nbufs] = nbytes
+                nbufs += 1
+                size += nbytes
+                continue
+
+            if nbytes == -2:
+                raise pq.PQerror(
+                    f"receiving copy data failed: {pq.error_message(pgconn)}")
+
+            if nbytes == 0:
+                if nbufs:
+                    break
+
+                # would block
+                yield libpq.PQsocket(pgconn_ptr), WAIT_R
+                if 1 != libpq.PQconsumeInput(pgconn_ptr):
+                    raise pq.PQerror(
+                        f"consuming input failed: {pq.error_message(pgconn)}")
+                continue
+
+            finished = 1
+            break
+
+        # Copy all the messages into a single block
+        data = PyBytes_FromStringAndSize(NULL, size)
+        target = PyBytes_AS_STRING(data)
+        for i in range(nbufs):
+            memcpy(target, bufs[i], lens[i])
+            target += lens[i]
+
+    finally:
+        for i in range(nbufs):
+            libpq.PQfreemem(bufs[i])
+        PyMem_Free(bufs)
+        PyMem_Free(lens)
+
+    if not finished:
+        return data, None
+
+    # Retrieve the final result of copy
+    (result,) = yield from execute(pgconn)
+    if result.status != pq.ExecStatus.COMMAND_OK:
+        encoding = py_codecs.get(
+            pgconn.parameter_status(b"client_encoding") or "", "utf-8"
+        )
+        raise e.error_from_result(result, encoding=encoding)
+
+    return data, result
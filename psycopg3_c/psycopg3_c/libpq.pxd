@@ -230,6 +230,16 @@ cdef extern from "libpq-fe.h":
     int PQisnonblocking(const PGconn *conn)
     int PQflush(PGconn *conn)
 
+    # 33.5. Retrieving Query Results Row-by-Row
+    int PQsetSingleRowMode(PGconn *conn)
+
+    # 34.5. Pipeline Mode (libpq 14)
+    int PQpipelineStatus(const PGconn *conn)
+    int PQenterPipelineMode(PGconn *conn)
+    int PQexitPipelineMode(PGconn *conn)
+    int PQpipelineSync(PGconn *conn)
+    int PQsendFlushRequest(PGconn *conn)
+
     # 33.6. Canceling Queries in Progress
     PGcancel *PQgetCancel(PGconn *conn)
     void PQfreeCancel(PGcancel *cancel)
@@ -254,3 +264,17 @@ cdef extern from "libpq-fe.h":
     ctypedef void (*PQnoticeReceiver)(void *arg, const PGresult *res)
     PQnoticeReceiver PQsetNoticeReceiver(
         PGconn *conn, PQnoticeReceiver prog, void *arg)
+
+
+cdef extern from *:
+    """
+/* Allow building against libpq versions without pipeline mode: the functions
+ * are never called, as the pipeline support is checked at runtime. */
+#ifndef LIBPQ_HAS_PIPELINING
+#define PQpipelineStatus(conn) 0
+#define PQenterPipelineMode(conn) 0
+#define PQexitPipelineMode(conn) 0
+#define PQpipelineSync(conn) 0
+#define PQsendFlushRequest(conn) 0
+#endif
+    """
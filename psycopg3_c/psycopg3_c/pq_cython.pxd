@@ -27,6 +27,15 @@ cdef class PGresult:
     cdef PGresult _from_ptr(impl.PGresult *ptr)
 
 
+cdef class PGresultBuffer:
+    cdef PGresult pgresult
+    cdef char *buf
+    cdef Py_ssize_t len
+
+    @staticmethod
+    cdef PGresultBuffer _from_value(PGresult pgresult, int row, int col)
+
+
 cdef class PGcancel:
     cdef impl.PGcancel* pgcancel_ptr
 
@@ -7,20 +7,24 @@ libpq Python wrapper using cython bindings.
 from posix.unistd cimport getpid
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 from cpython.bytes cimport PyBytes_AsString
+from cpython.buffer cimport PyBuffer_FillInfo, PyObject_GetBuffer
+from cpython.buffer cimport PyBuffer_Release, PyBUF_SIMPLE
 
 import logging
-from typing import List, Optional, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 
 from psycopg3_c cimport libpq as impl
 from psycopg3_c.libpq cimport Oid
 
 from psycopg3.pq.misc import PGnotify, ConninfoOption, PQerror, PGresAttDesc
 from psycopg3.pq.misc import error_message
+from psycopg3.errors import NotSupportedError
 from psycopg3.pq import (
     ConnStatus,
     PollingStatus,
     ExecStatus,
     TransactionStatus,
+    PipelineStatus,
     Ping,
     DiagnosticField,
     Format,
@@ -413,6 +417,42 @@ cdef class PGconn:
             raise PQerror(f"flushing failed:{error_message(self)}")
         return rv
 
+    def set_single_row_mode(self) -> None:
+        if not impl.PQsetSingleRowMode(self.pgconn_ptr):
+            raise PQerror("setting single row mode failed")
+
+    @property
+    def pipeline_status(self) -> PipelineStatus:
+        cdef int rv = impl.PQpipelineStatus(self.pgconn_ptr)
+        return PipelineStatus(rv)
+
+    def enter_pipeline_mode(self) -> None:
+        _check_pipeline_support("PQenterPipelineMode")
+        if impl.PQenterPipelineMode(self.pgconn_ptr) != 1:
+            raise PQerror("failed to enter pipeline mode")
+
+    def exit_pipeline_mode(self) -> None:
+        _check_pipeline_support("PQexitPipelineMode")
+        if impl.PQexitPipelineMode(self.pgconn_ptr) != 1:
+            raise PQerror(
+                f"failed to exit pipeline mode: {error_message(self)}"
+            )
+
+    def pipeline_sync(self) -> None:
+        _check_pipeline_support("PQpipelineSync")
+        cdef int rv = impl.PQpipelineSync(self.pgconn_ptr)
+        if rv == 0:
+            raise PQerror("connection not in pipeline mode")
+        if rv != 1:
+            raise PQerror(f"failed to sync pipeline: {error_message(self)}")
+
+    def send_flush_request(self) -> None:
+        _check_pipeline_support("PQsendFlushRequest")
+        if impl.PQsendFlushRequest(self.pgconn_ptr) != 1:
+            raise PQerror(
+                f"sending flush request failed: {error_message(self)}"
+            )
+
     def get_cancel(self) -> PGcancel:
         cdef impl.PGcancel *ptr = impl.PQgetCancel(self.pgconn_ptr)
         if not ptr:
@@ -428,11 +468,17 @@ cdef class PGconn:
         else:
             return None
 
-    def put_copy_data(self, buffer: bytes) -> int:
+    def put_copy_data(
+        self, buffer: Union[bytes, bytearray, memoryview]
+    ) -> int:
         cdef int rv
-        cdef const char *cbuffer = PyBytes_AsString(buffer)
-        cdef int length = len(buffer)
-        rv = impl.PQputCopyData(self.pgconn_ptr, cbuffer, length)
+        cdef Py_buffer view
+        PyObject_GetBuffer(buffer, &view, PyBUF_SIMPLE)
+        try:
+            rv = impl.PQputCopyData(
+                self.pgconn_ptr, <const char *>view.buf, <int>view.len)
+        finally:
+            PyBuffer_Release(&view)
         if rv < 0:
             raise PQerror(f"sending copy data failed: {error_message(self)}")
         return rv
@@ -493,6 +539,16 @@ cdef class PGconn:
         return func(self.pgconn_ptr)
 
 
+cdef int _check_pipeline_support(str fname) except -1:
+    cdef int libpq_version = impl.PQlibVersion()
+    if libpq_version < 140000:
+        raise NotSupportedError(
+            f"{fname} requires libpq from PostgreSQL 14,"
+            f" {libpq_version} available instead"
+        )
+    return 0
+
+
 cdef PGconn _connect(const char *conninfo):
     cdef impl.PGconn* pgconn = impl.PQconnectdb(conninfo)
     if not pgconn:
@@ -684,6 +740,15 @@ cdef class PGresult:
             else:
                 return b""
 
+    def get_value_view(
+        self, row_number: int, column_number: int
+    ) -> Optional[memoryview]:
+        cdef int crow = row_number
+        cdef int ccol = column_number
+        if impl.PQgetisnull(self.pgresult_ptr, crow, ccol):
+            return None
+        return memoryview(PGresultBuffer._from_value(self, crow, ccol))
+
     @property
     def nparams(self) -> int:
         return impl.PQnparams(self.pgresult_ptr)
@@ -732,6 +797,25 @@ cdef class PGresult:
             raise PQerror("PQsetResultAttrs failed")
 
 
+cdef class PGresultBuffer:
+    """
+    Expose the memory of a value in a `PGresult`, keeping the result alive.
+    """
+    @staticmethod
+    cdef PGresultBuffer _from_value(PGresult pgresult, int row, int col):
+        cdef PGresultBuffer rv = PGresultBuffer.__new__(PGresultBuffer)
+        rv.pgresult = pgresult
+        rv.buf = impl.PQgetvalue(pgresult.pgresult_ptr, row, col)
+        rv.len = impl.PQgetlength(pgresult.pgresult_ptr, row, col)
+        return rv
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        PyBuffer_FillInfo(buffer, self, self.buf, self.len, 1, flags)
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        pass
+
+
 cdef class PGcancel:
     def __cinit__(self):
         self.pgcancel_ptr = NULL
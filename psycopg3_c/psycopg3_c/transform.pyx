@@ -8,21 +8,33 @@ too many temporary Python objects and performing less memory copying.
 
 # Copyright (C) 2020 The Psycopg Team
 
+from libc.stdint cimport int64_t, uint16_t, uint32_t, uint64_t
+from libc.string cimport memset
 from cpython.ref cimport Py_INCREF
+from cpython.list cimport PyList_New, PyList_SET_ITEM
 from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release
+from cpython.buffer cimport PyBUF_WRITABLE
 
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from psycopg3_c cimport libpq, oids
-from psycopg3_c.pq_cython cimport PGresult
+from psycopg3_c.pq_cython cimport PGresult, PGresultBuffer
+from psycopg3_c.endian cimport be16toh, be32toh, be64toh
 
 from psycopg3 import errors as e
 from psycopg3.pq import Format
 
+# Microseconds between the Unix epoch and the PostgreSQL epoch (2000-01-01)
+DEF PG_EPOCH_USECS = 946684800000000
+DEF INT64_MIN = -9223372036854775807 - 1
+DEF INT64_MAX = 9223372036854775807
+
 
 cdef class RowLoader:
     cdef object pyloader
     cdef CLoader cloader
+    cdef bint accept_memoryview
 
 
 cdef class Transformer:
@@ -36,12 +48,14 @@ cdef class Transformer:
 
     cdef list _dumpers_maps, _loaders_maps
     cdef dict _dumpers, _loaders, _dumpers_cache, _loaders_cache, _load_funcs
+    cdef dict _oid_dumpers_cache
     cdef object _connection
     cdef PGresult _pgresult
     cdef int _nfields, _ntuples
     cdef str _encoding
 
     cdef list _row_loaders
+    cdef public object make_row
 
     def __cinit__(self, context: "AdaptContext" = None):
         self._dumpers_maps: List["DumpersMap"] = []
@@ -51,6 +65,9 @@ cdef class Transformer:
         # mapping class, fmt -> Dumper instance
         self._dumpers_cache: Dict[Tuple[type, Format], "Dumper"] = {}
 
+        # mapping oid, fmt -> Dumper instance
+        self._oid_dumpers_cache: Dict[Tuple[int, Format], "Dumper"] = {}
+
         # mapping oid, fmt -> Loader instance
         self._loaders_cache: Dict[Tuple[int, Format], "Loader"] = {}
 
@@ -59,6 +76,7 @@ cdef class Transformer:
 
         self.pgresult = None
         self._row_loaders = []
+        self.make_row = None
 
     def _setup_context(self, context: "AdaptContext") -> None:
         from psycopg3.adapt import Dumper, Loader
@@ -132,6 +150,11 @@ cdef class Transformer:
 
     @pgresult.setter
     def pgresult(self, result: Optional[PGresult]) -> None:
+        self.set_pgresult(result)
+
+    def set_pgresult(
+        self, result: Optional[PGresult], *, set_loaders: bool = True
+    ) -> None:
         self._pgresult = result
 
         if result is None:
@@ -141,6 +164,8 @@ cdef class Transformer:
         cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
         self._nfields = libpq.PQnfields(res)
         self._ntuples = libpq.PQntuples(res)
+        if not set_loaders:
+            return
 
         cdef int i
         types = [
@@ -172,6 +197,8 @@ cdef class Transformer:
             row_loader.cloader = loader
         else:
             row_loader.cloader = None
+            row_loader.accept_memoryview = getattr(
+                loader, "accept_memoryview", False)
 
         return row_loader
 
@@ -214,7 +241,29 @@ cdef class Transformer:
             f" to format {Format(format).name}"
         )
 
-    def load_row(self, row: int) -> Optional[Tuple[Any, ...]]:
+    def get_dumper_by_oid(self, oid: int, format: Format) -> "Dumper":
+        try:
+            return self._oid_dumpers_cache[oid, format]
+        except KeyError:
+            pass
+
+        for dmap in self._dumpers_maps:
+            for (src, fmt), dumper_class in dmap.items():
+                if (
+                    fmt == format
+                    and isinstance(src, type)
+                    and getattr(dumper_class, "oid", None) == oid
+                ):
+                    dumper = dumper_class(src, self)
+                    self._oid_dumpers_cache[oid, format] = dumper
+                    return dumper
+
+        raise e.ProgrammingError(
+            f"cannot find a dumper for oid {oid}"
+            f" in format {Format(format).name}"
+        )
+
+    def load_row(self, row: int) -> Optional["Row"]:
         if self._pgresult is None:
             return None
 
@@ -222,12 +271,30 @@ cdef class Transformer:
         if crow >= self._ntuples:
             return None
 
+        return self._load_row(self._pgresult.pgresult_ptr, crow)
+
+    def load_rows(self, int row0, int row1) -> List["Row"]:
+        if self._pgresult is None:
+            raise e.InterfaceError("result not set")
+
+        if not (0 <= row0 <= self._ntuples and 0 <= row1 <= self._ntuples):
+            raise e.InterfaceError(
+                f"rows must be included between 0 and {self._ntuples}"
+            )
+
         cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
+        cdef int row
+        cdef list records = PyList_New(row1 - row0 if row1 > row0 else 0)
+        for row in range(row0, row1):
+            rv = self._load_row(res, row)
+            Py_INCREF(rv)
+            PyList_SET_ITEM(records, row - row0, rv)
 
-        cdef RowLoader loader
+        return records
+
+    cdef object _load_row(self, libpq.PGresult *res, int crow):
         cdef int col
         cdef int length
-        cdef const char *val
         rv = PyTuple_New(self._nfields)
         for col in range(self._nfields):
             length = libpq.PQgetlength(res, crow, col)
@@ -237,19 +304,153 @@ cdef class Transformer:
                     PyTuple_SET_ITEM(rv, col, None)
                     continue
 
+            pyval = self._load_value(
+                res, crow, col, length, self._row_loaders[col])
+            Py_INCREF(pyval)
+            PyTuple_SET_ITEM(rv, col, pyval)
+
+        if self.make_row is not None:
+            return self.make_row(rv)
+        return rv
+
+    cdef inline object _load_value(
+        self, libpq.PGresult *res, int crow, int col, int length,
+        RowLoader loader
+    ):
+        cdef const char *val
+        if loader.cloader is not None:
             val = libpq.PQgetvalue(res, crow, col)
-            loader = self._row_loaders[col]
-            if loader.cloader is not None:
-                pyval = loader.cloader.cload(val, length)
-            else:
-                # TODO: no copy
-                pyval = loader.pyloader(val[:length])
+            return loader.cloader.cload(val, length)
+        elif loader.accept_memoryview:
+            return loader.pyloader(memoryview(
+                PGresultBuffer._from_value(self._pgresult, crow, col)))
+        else:
+            val = libpq.PQgetvalue(res, crow, col)
+            return loader.pyloader(val[:length])
+
+    def load_column(self, int col, int row0, int row1) -> List[Any]:
+        self._check_column(col, row0, row1)
 
+        cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
+        cdef RowLoader loader = self._row_loaders[col]
+        cdef int row
+        cdef int length
+        cdef list rv = PyList_New(row1 - row0 if row1 > row0 else 0)
+        for row in range(row0, row1):
+            length = libpq.PQgetlength(res, row, col)
+            if length == 0 and libpq.PQgetisnull(res, row, col):
+                pyval = None
+            else:
+                pyval = self._load_value(res, row, col, length, loader)
             Py_INCREF(pyval)
-            PyTuple_SET_ITEM(rv, col, pyval)
+            PyList_SET_ITEM(rv, row - row0, pyval)
 
         return rv
 
+    def load_column_into(
+        self, int col, int row0, int row1, data, nulls
+    ) -> bool:
+        self._check_column(col, row0, row1)
+
+        cdef libpq.PGresult *res = self._pgresult.pgresult_ptr
+        if libpq.PQfformat(res, col) != 1:  # binary
+            return False
+
+        cdef libpq.Oid oid = libpq.PQftype(res, col)
+        cdef int size
+        cdef bint is_ts = False
+        if oid == oids.BOOL_OID:
+            size = 1
+        elif oid == oids.INT2_OID:
+            size = 2
+        elif oid == oids.INT4_OID or oid == oids.FLOAT4_OID:
+            size = 4
+        elif oid == oids.INT8_OID or oid == oids.FLOAT8_OID:
+            size = 8
+        elif oid == oids.TIMESTAMP_OID or oid == oids.TIMESTAMPTZ_OID:
+            size = 8
+            is_ts = True
+        else:
+            return False
+
+        cdef Py_buffer dbuf, nbuf
+        PyObject_GetBuffer(data, &dbuf, PyBUF_WRITABLE)
+        try:
+            PyObject_GetBuffer(nulls, &nbuf, PyBUF_WRITABLE)
+            try:
+                if (
+                    dbuf.len < <Py_ssize_t>(row1 - row0) * size
+                    or nbuf.len < row1 - row0
+                ):
+                    raise e.InterfaceError(
+                        "buffer too small for the column data")
+
+                self._load_column_into(
+                    res, col, row0, row1, size, is_ts,
+                    <char *>dbuf.buf, <char *>nbuf.buf)
+            finally:
+                PyBuffer_Release(&nbuf)
+        finally:
+            PyBuffer_Release(&dbuf)
+
+        return True
+
+    cdef int _load_column_into(
+        self, libpq.PGresult *res, int col, int row0, int row1,
+        int size, bint is_ts, char *dp, char *nullp
+    ) except -1:
+        cdef int row, i
+        cdef const char *val
+        cdef int64_t ts
+        for row in range(row0, row1):
+            i = row - row0
+            if libpq.PQgetisnull(res, row, col):
+                nullp[i] = 1
+                memset(dp + i * size, 0, size)
+                continue
+
+            nullp[i] = 0
+            if libpq.PQgetlength(res, row, col) != size:
+                raise e.DataError(
+                    f"bad length for binary type {libpq.PQftype(res, col)}")
+
+            val = libpq.PQgetvalue(res, row, col)
+            if size == 1:
+                dp[i] = 1 if val[0] else 0
+            elif size == 2:
+                (<uint16_t *>dp)[i] = be16toh((<uint16_t *>val)[0])
+            elif size == 4:
+                (<uint32_t *>dp)[i] = be32toh((<uint32_t *>val)[0])
+            elif not is_ts:
+                (<uint64_t *>dp)[i] = be64toh((<uint64_t *>val)[0])
+            else:
+                ts = <int64_t>be64toh((<uint64_t *>val)[0])
+                if ts == INT64_MIN or ts == INT64_MAX:
+                    ts = INT64_MIN
+                elif ts > INT64_MAX - PG_EPOCH_USECS:
+                    raise e.DataError("timestamp out of range")
+                else:
+                    ts += PG_EPOCH_USECS
+                (<int64_t *>dp)[i] = ts
+
+        return 0
+
+    cdef int _check_column(self, int col, int row0, int row1) except -1:
+        if self._pgresult is None:
+            raise e.InterfaceError("result not set")
+
+        if not 0 <= col < self._nfields:
+            raise e.InterfaceError(
+                f"column must be included between 0 and {self._nfields}"
+            )
+
+        if not (0 <= row0 <= self._ntuples and 0 <= row1 <= self._ntuples):
+            raise e.InterfaceError(
+                f"rows must be included between 0 and {self._ntuples}"
+            )
+
+        return 0
+
     def load_sequence(
         self, record: Sequence[Optional[bytes]]
     ) -> Tuple[Any, ...]:
@@ -0,0 +1,603 @@
+"""
+Cython adapters for array types.
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from libc.stdint cimport *
+from libc.string cimport memcpy, memcmp
+from cpython.mem cimport PyMem_Realloc, PyMem_Free
+from cpython.ref cimport Py_INCREF
+from cpython.list cimport PyList_New, PyList_SET_ITEM, PyList_Append
+from cpython.long cimport PyLong_FromLong, PyLong_FromLongLong
+from cpython.long cimport PyLong_AsLongLong
+from cpython.float cimport PyFloat_FromDouble
+from cpython.bytes cimport PyBytes_AsStringAndSize
+
+from psycopg3_c cimport libpq, oids
+from psycopg3_c.endian cimport be16toh, be32toh, be64toh, htobe32, htobe64
+
+from psycopg3.pq import Format
+from psycopg3.oids import builtins
+from psycopg3.errors import DataError
+
+# Maximum number of dimensions of a PostgreSQL array
+DEF ARRAY_MAXDIM = 6
+
+cdef libpq.Oid TEXT_ARRAY_OID = builtins["text"].array_oid
+
+# The type of a function decoding a binary number into a Python object.
+ctypedef object (*number_loader)(const char *data)
+
+
+cdef class _BaseListDumper(CDumper):
+    cdef object _tx
+    cdef libpq.Oid _array_oid
+    cdef libpq.Oid _base_oid
+
+    # The dumper of the last item type seen, and whether its text output
+    # can be used without checking if it needs quoting
+    cdef object _item_type
+    cdef object _item_dumper
+    cdef int _item_noquote
+
+    # Buffer to build the array representation into
+    cdef char *_buf
+    cdef Py_ssize_t _bufsize
+
+    def __init__(self, src: type, context: AdaptContext = None):
+        super().__init__(src, context)
+        self._tx = Transformer(context)
+
+    def __dealloc__(self):
+        PyMem_Free(self._buf)
+
+    @property
+    def oid(self) -> int:
+        return self._array_oid or TEXT_ARRAY_OID
+
+    cdef libpq.Oid _get_array_oid(self, libpq.Oid base_oid):
+        """
+        Return the oid of the array from the oid of the base item.
+
+        Fall back on text[].
+        """
+        cdef libpq.Oid oid = 0
+        if base_oid:
+            info = builtins.get(base_oid)
+            if info:
+                oid = info.array_oid
+
+        return oid or TEXT_ARRAY_OID
+
+    cdef object _get_item_dumper(self, item, fmt):
+        # Lists are usually homogeneous: avoid a lookup for every item
+        cls = type(item)
+        if cls is not self._item_type:
+            self._item_dumper = self._tx.get_dumper(item, fmt)
+            self._item_type = cls
+            self._item_noquote = _is_numeric_oid(self._item_dumper.oid)
+
+        return self._item_dumper
+
+    cdef char *_reserve(self, Py_ssize_t pos, Py_ssize_t size) except NULL:
+        """
+        Make room for *size* bytes at *pos* in the buffer and return a pointer
+        to that position.
+        """
+        cdef Py_ssize_t newsize
+        cdef char *newbuf
+        if pos + size > self._bufsize:
+            newsize = max(pos + size, 2 * self._bufsize, 256)
+            newbuf = <char *>PyMem_Realloc(self._buf, newsize)
+            if newbuf == NULL:
+                raise MemoryError()
+            self._buf = newbuf
+            self._bufsize = newsize
+
+        return self._buf + pos
+
+
+cdef class ListDumper(_BaseListDumper):
+    def dump(self, obj) -> bytes:
+        cdef Py_ssize_t pos = 0
+        self._base_oid = 0
+        self._dump_list(obj, &pos)
+
+        if self._base_oid:
+            self._array_oid = self._get_array_oid(self._base_oid)
+
+        return self._buf[:pos]
+
+    cdef int _dump_list(self, obj, Py_ssize_t *pos) except -1:
+        cdef char *target
+        if not obj:
+            target = self._reserve(pos[0], 2)
+            target[0] = b"{"
+            target[1] = b"}"
+            pos[0] += 2
+            return 0
+
+        self._reserve(pos[0], 1)[0] = b"{"
+        pos[0] += 1
+        for item in obj:
+            if isinstance(item, list):
+                self._dump_list(item, pos)
+            elif item is not None:
+                self._dump_item(item, pos)
+            else:
+                memcpy(self._reserve(pos[0], 4), b"NULL", 4)
+                pos[0] += 4
+
+            self._reserve(pos[0], 1)[0] = b","
+            pos[0] += 1
+
+        self._buf[pos[0] - 1] = b"}"
+        return 0
+
+    cdef int _dump_item(self, item, Py_ssize_t *pos) except -1:
+        cdef char *src
+        cdef char *target
+        cdef Py_ssize_t length, i
+
+        dumper = self._get_item_dumper(item, Format.TEXT)
+        if type(dumper) is IntDumper:
+            target = self._reserve(pos[0], 22)
+            pos[0] += PyOS_snprintf(
+                target, 22, "%lld", PyLong_AsLongLong(item))
+            if not self._base_oid:
+                self._base_oid = oids.INT8_OID
+            return 0
+
+        ad = dumper.dump(item)
+        if not self._base_oid:
+            self._base_oid = dumper.oid
+        PyBytes_AsStringAndSize(ad, &src, &length)
+        if self._item_noquote or not _needs_quotes(src, length):
+            memcpy(self._reserve(pos[0], length), src, length)
+            pos[0] += length
+            return 0
+
+        # Double quotes and backslashes embedded in element values will be
+        # backslash-escaped.
+        target = self._reserve(pos[0], 2 * length + 2)
+        target[0] = b'"'
+        target += 1
+        for i in range(length):
+            if src[i] == b'"' or src[i] == b"\\":
+                target[0] = b"\\"
+                target += 1
+            target[0] = src[i]
+            target += 1
+        target[0] = b'"'
+        pos[0] = target + 1 - self._buf
+        return 0
+
+
+cdef class ListBinaryDumper(_BaseListDumper):
+    cdef int _hasnull
+
+    def dump(self, obj) -> bytes:
+        cdef uint32_t head[3]
+        if not obj:
+            head[0] = head[1] = 0
+            head[2] = htobe32(oids.TEXT_OID)
+            return (<char *>head)[:sizeof(head)]
+
+        cdef Py_ssize_t dims[ARRAY_MAXDIM]
+        cdef int ndims = 0
+        L = obj
+        while isinstance(L, self._src):
+            if not L:
+                raise DataError("lists cannot contain empty lists")
+            if ndims >= ARRAY_MAXDIM:
+                raise DataError(
+                    f"lists cannot have more than {ARRAY_MAXDIM} dimensions"
+                )
+            dims[ndims] = len(L)
+            ndims += 1
+            L = L[0]
+
+        self._base_oid = 0
+        self._hasnull = 0
+        cdef Py_ssize_t pos = 12 + 8 * ndims
+        self._reserve(0, pos)
+        self._dump_dims(obj, dims, ndims, 0, &pos)
+
+        if not self._base_oid:
+            self._base_oid = oids.TEXT_OID
+        self._array_oid = self._get_array_oid(self._base_oid)
+
+        head[0] = htobe32(ndims)
+        head[1] = htobe32(self._hasnull)
+        head[2] = htobe32(self._base_oid)
+        memcpy(self._buf, head, sizeof(head))
+
+        cdef uint32_t dim[2]
+        cdef int i
+        for i in range(ndims):
+            dim[0] = htobe32(dims[i])
+            dim[1] = htobe32(1)
+            memcpy(self._buf + 12 + 8 * i, dim, sizeof(dim))
+
+        return self._buf[:pos]
+
+    cdef int _dump_dims(
+        self, L, Py_ssize_t *dims, int ndims, int dim, Py_ssize_t *pos
+    ) except -1:
+        if len(L) != dims[dim]:
+            raise DataError("nested lists have inconsistent lengths")
+
+        cdef uint32_t belen
+        if dim == ndims - 1:
+            for item in L:
+                if item is not None:
+                    self._dump_item(item, pos)
+                else:
+                    self._hasnull = 1
+                    belen = htobe32(<uint32_t>-1)
+                    memcpy(self._reserve(pos[0], 4), &belen, 4)
+                    pos[0] += 4
+        else:
+            for item in L:
+                if not isinstance(item, self._src):
+                    raise DataError("nested lists have inconsistent depths")
+                self._dump_dims(item, dims, ndims, dim + 1, pos)
+
+        return 0
+
+    cdef int _dump_item(self, item, Py_ssize_t *pos) except -1:
+        cdef char *src
+        cdef char *target
+        cdef Py_ssize_t length
+        cdef uint32_t belen
+        cdef uint64_t beval
+
+        dumper = self._get_item_dumper(item, Format.BINARY)
+        if type(dumper) is IntBinaryDumper:
+            target = self._reserve(pos[0], 12)
+            belen = htobe32(8)
+            beval = htobe64(<uint64_t>PyLong_AsLongLong(item))
+            memcpy(target, &belen, 4)
+            memcpy(target + 4, &beval, 8)
+            pos[0] += 12
+            if not self._base_oid:
+                self._base_oid = oids.INT8_OID
+            return 0
+
+        ad = dumper.dump(item)
+        if not self._base_oid:
+            self._base_oid = dumper.oid
+        PyBytes_AsStringAndSize(ad, &src, &length)
+        target = self._reserve(pos[0], 4 + length)
+        belen = htobe32(<uint32_t>length)
+        memcpy(target, &belen, 4)
+        memcpy(target + 4, src, length)
+        pos[0] += 4 + length
+        return 0
+
+
+cdef inline int _is_numeric_oid(libpq.Oid oid):
+    return (
+        oid == oids.INT2_OID
+        or oid == oids.INT4_OID
+        or oid == oids.INT8_OID
+        or oid == oids.OID_OID
+        or oid == oids.FLOAT4_OID
+        or oid == oids.FLOAT8_OID
+        or oid == oids.NUMERIC_OID
+    )
+
+
+cdef int _needs_quotes(const char *src, Py_ssize_t length):
+    # from https://www.postgresql.org/docs/current/arrays.html#ARRAYS-IO
+    #
+    # The array output routine will put double quotes around element values if
+    # they are empty strings, contain curly braces, delimiter characters,
+    # double quotes, backslashes, or white space, or match the word NULL.
+    # TODO: recognise only , as delimiter. Should be configured
+    if length == 0:
+        return 1
+
+    cdef Py_ssize_t i
+    cdef char c
+    for i in range(length):
+        c = src[i]
+        if (
+            c == b'"' or c == b"{" or c == b"}" or c == b"," or c == b"\\"
+            or c == b" " or c == b"\t" or c == b"\n" or c == b"\r"
+            or c == b"\f" or c == b"\v"
+        ):
+            return 1
+
+    if length == 4 and (
+        (src[0] | 0x20) == b"n" and (src[1] | 0x20) == b"u"
+        and (src[2] | 0x20) == b"l" and (src[3] | 0x20) == b"l"
+    ):
+        return 1
+
+    return 0
+
+
+cdef class _BaseArrayLoader(CLoader):
+    cdef libpq.Oid _base_oid
+    cdef object _tx
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        # The concrete classes are Python subclasses created by
+        # psycopg3.types.array.register(), defining the base_oid attribute.
+        self._base_oid = self.base_oid
+        self._tx = Transformer(context)
+
+
+cdef class ArrayLoader(_BaseArrayLoader):
+    cdef CLoader _cloader
+    cdef object _pyload
+    cdef int _int_fast
+
+    # Buffer to copy the tokens into, unescaped and zero-terminated, as
+    # expected by the text loaders
+    cdef char *_scratch
+    cdef Py_ssize_t _scratch_size
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        loader = self._tx.get_loader(self._base_oid, Format.TEXT)
+        if isinstance(loader, CLoader):
+            self._cloader = loader
+        else:
+            self._pyload = loader.load
+
+        # The default int loader is bypassed for numbers fitting an int64
+        self._int_fast = type(loader) is IntLoader
+
+    def __dealloc__(self):
+        PyMem_Free(self._scratch)
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef const char *end = data + length
+        cdef const char *p = data
+        cdef const char *tok
+        cdef Py_ssize_t toklen
+        cdef char c
+        cdef list stack = []
+        cdef list a
+        rv = None
+
+        if <Py_ssize_t>length >= self._scratch_size:
+            self._scratch = <char *>PyMem_Realloc(self._scratch, length + 1)
+            if self._scratch == NULL:
+                self._scratch_size = 0
+                raise MemoryError()
+            self._scratch_size = length + 1
+
+        while p < end:
+            c = p[0]
+            if c == b"{":
+                a = []
+                if rv is None:
+                    rv = a
+                if stack:
+                    PyList_Append(stack[-1], a)
+                stack.append(a)
+                p += 1
+
+            elif c == b"}":
+                if not stack:
+                    raise DataError("malformed array, unexpected '}'")
+                rv = stack.pop()
+                p += 1
+
+            elif c == b",":
+                p += 1
+
+            else:
+                tok = p
+                if c == b'"':
+                    p = self._copy_quoted(p, end, &toklen)
+                else:
+                    while p < end and not (
+                        p[0] == b'"' or p[0] == b"{" or p[0] == b"}"
+                        or p[0] == b"," or p[0] == b"\\"
+                    ):
+                        p += 1
+                    if p == tok:
+                        # a stray backslash, ignored like the Python loader
+                        p += 1
+                        continue
+                    toklen = p - tok
+                    memcpy(self._scratch, tok, toklen)
+                    self._scratch[toklen] = 0
+
+                if not stack:
+                    wat = (
+                        tok[:10].decode("utf8", "replace") + "..."
+                        if p - tok > 10
+                        else ""
+                    )
+                    raise DataError(f"malformed array, unexpected '{wat}'")
+
+                if c != b'"' and toklen == 4 and memcmp(tok, b"NULL", 4) == 0:
+                    PyList_Append(stack[-1], None)
+                else:
+                    PyList_Append(stack[-1], self._load_item(toklen))
+
+        assert rv is not None
+        return rv
+
+    cdef const char *_copy_quoted(
+        self, const char *p, const char *end, Py_ssize_t *toklen
+    ):
+        """
+        Unescape the quoted string at *p* into the scratch buffer.
+
+        Return the pointer past the closing quote.
+        """
+        cdef char *out = self._scratch
+        p += 1
+        while p < end and p[0] != b'"':
+            if p[0] == b"\\" and p + 1 < end:
+                p += 1
+            out[0] = p[0]
+            out += 1
+            p += 1
+
+        if p >= end:
+            raise DataError("malformed array, unterminated quoted string")
+
+        out[0] = 0
+        toklen[0] = out - self._scratch
+        return p + 1
+
+    cdef object _load_item(self, Py_ssize_t length):
+        cdef const char *p = self._scratch
+        cdef const char *end = p + length
+        cdef int64_t val = 0
+        cdef int neg = 0
+
+        if self._int_fast and 0 < length <= 18:
+            if p[0] == b"-":
+                neg = 1
+                p += 1
+            while p < end and b"0" <= p[0] <= b"9":
+                val = val * 10 + (p[0] - ord(b"0"))
+                p += 1
+            if p == end and length > neg:
+                return PyLong_FromLongLong(-val if neg else val)
+
+        if self._cloader is not None:
+            return self._cloader.cload(self._scratch, length)
+        else:
+            return self._pyload(self._scratch[:length])
+
+
+cdef class ArrayBinaryLoader(_BaseArrayLoader):
+    cdef libpq.Oid _elem_oid
+    cdef CLoader _cloader
+    cdef object _pyload
+    cdef number_loader _numload
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef uint32_t *buf32 = <uint32_t *>data
+        cdef uint32_t ndims = be32toh(buf32[0])
+        if not ndims:
+            return []
+        if ndims > ARRAY_MAXDIM:
+            raise DataError(
+                f"unexpected number of dimensions {ndims} exceeding the"
+                f" maximum allowed {ARRAY_MAXDIM}"
+            )
+
+        self._set_element_loader(be32toh(buf32[2]))
+
+        cdef Py_ssize_t dims[ARRAY_MAXDIM]
+        cdef int i
+        for i in range(ndims):
+            dims[i] = be32toh(buf32[3 + 2 * i])
+
+        cdef const char *p = data + 12 + 8 * ndims
+        return self._load_dims(&p, dims, ndims)
+
+    cdef int _set_element_loader(self, libpq.Oid oid) except -1:
+        if oid == self._elem_oid and (
+            self._cloader is not None or self._pyload is not None
+        ):
+            return 0
+
+        loader = self._tx.get_loader(oid, Format.BINARY)
+        self._elem_oid = oid
+        if isinstance(loader, CLoader):
+            self._cloader = loader
+            self._pyload = None
+        else:
+            self._cloader = None
+            self._pyload = loader.load
+
+        # Decode the numbers in place if the default loader is in use
+        cls = type(loader)
+        if cls is Int2BinaryLoader:
+            self._numload = _load_int2
+        elif cls is Int4BinaryLoader:
+            self._numload = _load_int4
+        elif cls is Int8BinaryLoader:
+            self._numload = _load_int8
+        elif cls is Float4BinaryLoader:
+            self._numload = _load_float4
+        elif cls is Float8BinaryLoader:
+            self._numload = _load_float8
+        else:
+            self._numload = NULL
+
+        return 0
+
+    cdef list _load_dims(self, const char **p, Py_ssize_t *dims, int ndims):
+        if ndims == 1:
+            return self._load_1d(p, dims[0])
+
+        cdef list rv = PyList_New(dims[0])
+        cdef Py_ssize_t i
+        for i in range(dims[0]):
+            item = self._load_dims(p, dims + 1, ndims - 1)
+            Py_INCREF(item)
+            PyList_SET_ITEM(rv, i, item)
+
+        return rv
+
+    cdef list _load_1d(self, const char **pp, Py_ssize_t n):
+        cdef list rv = PyList_New(n)
+        cdef const char *p = pp[0]
+        cdef int32_t size
+        cdef Py_ssize_t i
+        cdef number_loader numload = self._numload
+
+        for i in range(n):
+            size = <int32_t>be32toh((<uint32_t *>p)[0])
+            p += 4
+            if size == -1:
+                val = None
+            elif numload != NULL:
+                val = numload(p)
+            elif self._cloader is not None:
+                val = self._cloader.cload(p, size)
+            else:
+                val = self._pyload(p[:size])
+
+            if size > 0:
+                p += size
+            Py_INCREF(val)
+            PyList_SET_ITEM(rv, i, val)
+
+        pp[0] = p
+        return rv
+
+
+cdef object _load_int2(const char *data):
+    return PyLong_FromLong(<int16_t>be16toh((<uint16_t *>data)[0]))
+
+
+cdef object _load_int4(const char *data):
+    return PyLong_FromLong(<int32_t>be32toh((<uint32_t *>data)[0]))
+
+
+cdef object _load_int8(const char *data):
+    return PyLong_FromLongLong(<int64_t>be64toh((<uint64_t *>data)[0]))
+
+
+cdef object _load_float4(const char *data):
+    cdef uint32_t asint = be32toh((<uint32_t *>data)[0])
+    cdef char *swp = <char *>&asint
+    return PyFloat_FromDouble((<float *>swp)[0])
+
+
+cdef object _load_float8(const char *data):
+    cdef uint64_t asint = be64toh((<uint64_t *>data)[0])
+    cdef char *swp = <char *>&asint
+    return PyFloat_FromDouble((<double *>swp)[0])
+
+
+cdef void register_array_c_adapters():
+    logger.debug("registering optimised array c adapters")
+
+    ListDumper.register(list)
+    ListBinaryDumper.register_binary(list)
@@ -0,0 +1,202 @@
+"""
+Cython adapters for composite types.
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from libc.stdint cimport *
+from libc.string cimport memcpy
+from cpython.mem cimport PyMem_Realloc, PyMem_Free
+from cpython.ref cimport Py_INCREF
+from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM
+
+from psycopg3_c cimport oids
+from psycopg3_c.endian cimport be32toh
+
+from psycopg3.pq import Format
+
+
+cdef class _BaseCompositeLoader(CLoader):
+    cdef Transformer _tx
+
+    # Buffer to copy the text tokens into, unescaped and zero-terminated, as
+    # expected by the text loaders
+    cdef char *_scratch
+    cdef Py_ssize_t _scratch_size
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        self._tx = Transformer(context)
+
+    def __dealloc__(self):
+        PyMem_Free(self._scratch)
+
+    cdef object _parse_record(self, const char *data, size_t length):
+        """
+        Split a record in text format into its fields and load them.
+        """
+        cdef list rv = []
+        cdef const char *p = data
+        cdef const char *end = data + length
+        cdef const char *tok
+        cdef char *out
+
+        if length == 2 and data[0] == b"(" and data[1] == b")":
+            return ()
+
+        if <Py_ssize_t>length >= self._scratch_size:
+            self._scratch = <char *>PyMem_Realloc(self._scratch, length + 1)
+            if self._scratch == NULL:
+                self._scratch_size = 0
+                raise MemoryError()
+            self._scratch_size = length + 1
+
+        if p < end and p[0] == b"(":
+            p += 1
+
+        while p < end:
+            if p[0] == b"," or p[0] == b")":
+                # an empty token, representing NULL
+                rv.append(None)
+                p += 1
+                continue
+
+            out = self._scratch
+            if p[0] == b'"':
+                # a quoted string, with quotes and backslashes doubled
+                p += 1
+                while p < end:
+                    if p[0] == b'"' or p[0] == b"\\":
+                        if p + 1 < end and p[1] == p[0]:
+                            p += 1
+                        elif p[0] == b'"':
+                            break
+                    out[0] = p[0]
+                    out += 1
+                    p += 1
+                p += 2  # the closing quote and the separator
+            else:
+                tok = p
+                while p < end and p[0] != b"," and p[0] != b")":
+                    p += 1
+                memcpy(out, tok, p - tok)
+                out += p - tok
+                p += 1  # the separator
+
+            out[0] = 0
+            rv.append(
+                self._load_field(len(rv), self._scratch, out - self._scratch))
+
+        return tuple(rv)
+
+    cdef object _load_field(self, int i, const char *data, Py_ssize_t length):
+        raise NotImplementedError
+
+
+cdef class RecordLoader(_BaseCompositeLoader):
+    cdef RowLoader _loader
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        self._loader = self._tx._get_row_loader(oids.TEXT_OID, Format.TEXT)
+
+    cdef object cload(self, const char *data, size_t length):
+        return self._parse_record(data, length)
+
+    cdef object _load_field(self, int i, const char *data, Py_ssize_t length):
+        return _load_with(self._loader, data, length)
+
+
+cdef class CompositeLoader(_BaseCompositeLoader):
+    cdef int _types_set
+    cdef object _factory
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        # The concrete classes are Python subclasses created by
+        # psycopg3.types.composite.register(), defining factory and types.
+        self._factory = type(self).factory
+
+    cdef object cload(self, const char *data, size_t length):
+        if not self._types_set:
+            self._tx.set_row_types(
+                [(oid, Format.TEXT) for oid in self.fields_types])
+            self._types_set = 1
+
+        return self._factory(*self._parse_record(data, length))
+
+    cdef object _load_field(self, int i, const char *data, Py_ssize_t length):
+        return _load_with(self._tx._row_loaders[i], data, length)
+
+
+cdef class RecordBinaryLoader(_BaseCompositeLoader):
+    cdef int _types_set
+
+    cdef object cload(self, const char *data, size_t length):
+        if not self._types_set:
+            self._config_types(data, length)
+            self._types_set = 1
+
+        cdef uint32_t nfields = be32toh((<uint32_t *>data)[0])
+        cdef const char *p = data + 4
+        cdef int32_t flen
+        cdef list row_loaders = self._tx._row_loaders
+        cdef uint32_t i
+
+        rv = PyTuple_New(nfields)
+        for i in range(nfields):
+            flen = <int32_t>be32toh((<uint32_t *>(p + 4))[0])
+            p += 8
+            if flen == -1:
+                val = None
+            else:
+                val = _load_with(row_loaders[i], p, flen)
+                p += flen
+
+            Py_INCREF(val)
+            PyTuple_SET_ITEM(rv, i, val)
+
+        return rv
+
+    cdef int _config_types(self, const char *data, size_t length) except -1:
+        cdef uint32_t nfields = be32toh((<uint32_t *>data)[0])
+        cdef const char *p = data + 4
+        cdef int32_t flen
+        cdef uint32_t i
+        cdef list types = []
+        for i in range(nfields):
+            types.append((be32toh((<uint32_t *>p)[0]), Format.BINARY))
+            flen = <int32_t>be32toh((<uint32_t *>(p + 4))[0])
+            p += 8
+            if flen > 0:
+                p += flen
+
+        self._tx.set_row_types(types)
+        return 0
+
+
+cdef class CompositeBinaryLoader(RecordBinaryLoader):
+    cdef object _factory
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        self._factory = type(self).factory
+
+    cdef object cload(self, const char *data, size_t length):
+        return self._factory(*RecordBinaryLoader.cload(self, data, length))
+
+
+cdef inline object _load_with(
+    RowLoader loader, const char *data, Py_ssize_t length
+):
+    if loader.cloader is not None:
+        return loader.cloader.cload(data, length)
+    else:
+        return loader.pyloader(data[:length])
+
+
+cdef void register_composite_c_adapters():
+    logger.debug("registering optimised composite c adapters")
+
+    RecordLoader.register(oids.RECORD_OID)
+    RecordBinaryLoader.register_binary(oids.RECORD_OID)
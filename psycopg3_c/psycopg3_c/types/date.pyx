@@ -0,0 +1,598 @@
+"""
+Cython adapters for date/time types.
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from libc.stdint cimport *
+from libc.string cimport memcpy
+from cpython.datetime cimport import_datetime, date_new, time_new
+from cpython.datetime cimport datetime_new, timedelta_new
+from cpython.datetime cimport PyDateTime_GET_YEAR, PyDateTime_GET_MONTH
+from cpython.datetime cimport PyDateTime_GET_DAY, PyDateTime_DATE_GET_HOUR
+from cpython.datetime cimport PyDateTime_DATE_GET_MINUTE
+from cpython.datetime cimport PyDateTime_DATE_GET_SECOND
+from cpython.datetime cimport PyDateTime_DATE_GET_MICROSECOND
+from cpython.datetime cimport PyDateTime_TIME_GET_HOUR
+from cpython.datetime cimport PyDateTime_TIME_GET_MINUTE
+from cpython.datetime cimport PyDateTime_TIME_GET_SECOND
+from cpython.datetime cimport PyDateTime_TIME_GET_MICROSECOND
+from cpython.datetime cimport PyDateTime_DELTA_GET_DAYS
+from cpython.datetime cimport PyDateTime_DELTA_GET_SECONDS
+from cpython.datetime cimport PyDateTime_DELTA_GET_MICROSECONDS
+
+from psycopg3_c cimport libpq, oids
+from psycopg3_c.endian cimport be32toh, be64toh, htobe32, htobe64
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from psycopg3.errors import DataError
+
+import_datetime()
+
+# Days between the Unix epoch and the PostgreSQL epoch (2000-01-01)
+DEF PG_DATE_EPOCH_DAYS = 10957
+
+DEF SECS_PER_DAY = 86400
+DEF USECS_PER_SEC = 1000000
+DEF USECS_PER_DAY = 86400000000
+
+# Binary representation of infinity/-infinity
+DEF PG_DATE_INF = 2147483647
+DEF PG_DATE_NEGINF = -2147483648
+DEF PG_TS_INF = 9223372036854775807
+DEF PG_TS_NEGINF = -9223372036854775807 - 1
+
+cdef object utc = timezone.utc
+
+
+cdef class DateBinaryDumper(CDumper):
+    oid = oids.DATE_OID
+
+    def dump(self, obj) -> bytes:
+        cdef int32_t days = <int32_t>(_days_from_civil(
+            PyDateTime_GET_YEAR(obj),
+            PyDateTime_GET_MONTH(obj),
+            PyDateTime_GET_DAY(obj),
+        ) - PG_DATE_EPOCH_DAYS)
+        cdef uint32_t beval = htobe32(<uint32_t>days)
+        return (<char *>&beval)[:sizeof(beval)]
+
+
+cdef class TimeBinaryDumper(CDumper):
+    cdef libpq.Oid _oid
+
+    def __init__(self, src: type, context: AdaptContext = None):
+        super().__init__(src, context)
+        self._oid = oids.TIMETZ_OID
+
+    @property
+    def oid(self) -> int:
+        return self._oid
+
+    def dump(self, obj) -> bytes:
+        cdef int64_t us = (
+            PyDateTime_TIME_GET_MICROSECOND(obj)
+            + USECS_PER_SEC * (
+                PyDateTime_TIME_GET_SECOND(obj) + 60 * (
+                    PyDateTime_TIME_GET_MINUTE(obj)
+                    + 60 * <int64_t>PyDateTime_TIME_GET_HOUR(obj))))
+
+        cdef char buf[12]
+        cdef uint64_t beval = htobe64(<uint64_t>us)
+        memcpy(buf, &beval, sizeof(beval))
+
+        off = obj.utcoffset()
+        if off is None:
+            self._oid = oids.TIME_OID
+            return buf[:sizeof(beval)]
+
+        # the offset is sent in seconds west of UTC
+        cdef int32_t offsecs = -(
+            PyDateTime_DELTA_GET_DAYS(off) * SECS_PER_DAY
+            + PyDateTime_DELTA_GET_SECONDS(off))
+        cdef uint32_t beoff = htobe32(<uint32_t>offsecs)
+        memcpy(buf + sizeof(beval), &beoff, sizeof(beoff))
+        self._oid = oids.TIMETZ_OID
+        return buf[:sizeof(buf)]
+
+
+cdef class DateTimeBinaryDumper(CDumper):
+    cdef libpq.Oid _oid
+
+    def __init__(self, src: type, context: AdaptContext = None):
+        super().__init__(src, context)
+        self._oid = oids.TIMESTAMPTZ_OID
+
+    @property
+    def oid(self) -> int:
+        return self._oid
+
+    def dump(self, obj) -> bytes:
+        cdef int64_t days = _days_from_civil(
+            PyDateTime_GET_YEAR(obj),
+            PyDateTime_GET_MONTH(obj),
+            PyDateTime_GET_DAY(obj),
+        ) - PG_DATE_EPOCH_DAYS
+        cdef int64_t us = (
+            days * USECS_PER_DAY
+            + PyDateTime_DATE_GET_MICROSECOND(obj)
+            + USECS_PER_SEC * (
+                PyDateTime_DATE_GET_SECOND(obj) + 60 * (
+                    PyDateTime_DATE_GET_MINUTE(obj)
+                    + 60 * <int64_t>PyDateTime_DATE_GET_HOUR(obj))))
+
+        # Naive datetimes are sent as timestamp, aware ones as timestamptz
+        off = obj.utcoffset()
+        if off is None:
+            self._oid = oids.TIMESTAMP_OID
+        else:
+            self._oid = oids.TIMESTAMPTZ_OID
+            us -= PyDateTime_DELTA_GET_MICROSECONDS(off) + USECS_PER_SEC * (
+                PyDateTime_DELTA_GET_SECONDS(off)
+                + SECS_PER_DAY * <int64_t>PyDateTime_DELTA_GET_DAYS(off))
+
+        cdef uint64_t beval = htobe64(<uint64_t>us)
+        return (<char *>&beval)[:sizeof(beval)]
+
+
+cdef class TimeDeltaBinaryDumper(CDumper):
+    oid = oids.INTERVAL_OID
+
+    def dump(self, obj) -> bytes:
+        cdef int64_t us = (
+            PyDateTime_DELTA_GET_MICROSECONDS(obj)
+            + USECS_PER_SEC * <int64_t>PyDateTime_DELTA_GET_SECONDS(obj))
+
+        cdef char buf[16]
+        cdef uint64_t beus = htobe64(<uint64_t>us)
+        cdef uint32_t bedays = htobe32(
+            <uint32_t><int32_t>PyDateTime_DELTA_GET_DAYS(obj))
+        cdef uint32_t bemonths = 0
+        memcpy(buf, &beus, sizeof(beus))
+        memcpy(buf + 8, &bedays, sizeof(bedays))
+        memcpy(buf + 12, &bemonths, sizeof(bemonths))
+        return buf[:sizeof(buf)]
+
+
+cdef class DateBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        cdef int32_t days = <int32_t>be32toh((<uint32_t *>data)[0])
+        if days == PG_DATE_INF or days == PG_DATE_NEGINF:
+            raise DataError("Python date doesn't support infinity")
+
+        cdef int y, m, d
+        _civil_from_days(<int64_t>days + PG_DATE_EPOCH_DAYS, &y, &m, &d)
+        _check_year(y)
+        return date_new(y, m, d)
+
+
+cdef class TimeBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        cdef int64_t val = <int64_t>be64toh((<uint64_t *>data)[0])
+        return _time_from_micros(val, None)
+
+
+cdef class TimeTzBinaryLoader(CLoader):
+    cdef dict _timezones
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        self._timezones = {}
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef int64_t val = <int64_t>be64toh((<uint64_t *>data)[0])
+        cdef int32_t off = <int32_t>be32toh((<uint32_t *>(data + 8))[0])
+
+        # the offset is in seconds west of UTC
+        tz = _get_timezone(self._timezones, -off)
+        if tz is None:
+            raise DataError(f"timezone offset not supported by Python: {off}")
+
+        return _time_from_micros(val, tz)
+
+
+cdef class TimestampBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        cdef int64_t val = <int64_t>be64toh((<uint64_t *>data)[0])
+        return _datetime_from_micros(val, None)
+
+
+cdef class TimestamptzBinaryLoader(CLoader):
+    cdef object _timezone
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        from psycopg3.types.date import _timezone_from_connection
+
+        super().__init__(oid, context)
+        self._timezone = _timezone_from_connection(self._connection)
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef int64_t val = <int64_t>be64toh((<uint64_t *>data)[0])
+        rv = _datetime_from_micros(val, utc)
+        if self._timezone is utc:
+            return rv
+
+        try:
+            return rv.astimezone(self._timezone)
+        except OverflowError:
+            raise DataError("Python datetime can't represent the timestamp")
+
+
+cdef class IntervalBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        cdef int64_t val = <int64_t>be64toh((<uint64_t *>data)[0])
+        cdef int64_t days = <int32_t>be32toh((<uint32_t *>(data + 8))[0])
+        cdef int64_t months = <int32_t>be32toh((<uint32_t *>(data + 12))[0])
+
+        # Convert months to days the same way the text loader does:
+        # 365 days per year, 30 days per month.
+        if months > 0:
+            days += 365 * (months // 12) + 30 * (months % 12)
+        elif months < 0:
+            days -= 365 * (-months // 12) + 30 * (-months % 12)
+
+        cdef int64_t secs = val // USECS_PER_SEC
+        cdef int64_t us = val - secs * USECS_PER_SEC
+        days += secs // SECS_PER_DAY
+        secs -= (secs // SECS_PER_DAY) * SECS_PER_DAY
+
+        if not -999999999 <= days <= 999999999:
+            raise DataError("can't parse interval: days out of range")
+
+        return timedelta_new(<int>days, <int>secs, <int>us)
+
+
+cdef class _TextLoader(CLoader):
+    cdef object _pyload
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        # The Python loader handles the values the C parser doesn't
+        # understand, raising the same errors it would raise for them.
+        self._pyload = self._get_pyloader_class()(oid, context).load
+
+    cdef object _get_pyloader_class(self):
+        raise NotImplementedError
+
+    cdef object _fallback(self, const char *data, size_t length):
+        return self._pyload(data[:length])
+
+
+cdef class _DateStyleTextLoader(_TextLoader):
+    cdef int _iso
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        ds = None
+        if self._connection:
+            ds = self._connection.pgconn.parameter_status(b"DateStyle")
+        self._iso = not ds or ds.startswith(b"ISO")
+
+
+cdef class DateLoader(_DateStyleTextLoader):
+    cdef object _get_pyloader_class(self):
+        from psycopg3.types.date import DateLoader
+        return DateLoader
+
+    cdef object cload(self, const char *data, size_t length):
+        if not self._iso:
+            return self._fallback(data, length)
+
+        cdef int y, m, d
+        cdef const char *end = data + length
+        if _parse_date(data, end, &y, &m, &d) != end:
+            return self._fallback(data, length)
+
+        return date_new(y, m, d)
+
+
+cdef class TimeLoader(_TextLoader):
+    cdef object _get_pyloader_class(self):
+        from psycopg3.types.date import TimeLoader
+        return TimeLoader
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef int h, m, s, us
+        cdef const char *end = data + length
+        if _parse_time(data, end, &h, &m, &s, &us) != end:
+            return self._fallback(data, length)
+
+        return time_new(h, m, s, us, None)
+
+
+cdef class TimeTzLoader(_TextLoader):
+    cdef dict _timezones
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        self._timezones = {}
+
+    cdef object _get_pyloader_class(self):
+        from psycopg3.types.date import TimeTzLoader
+        return TimeTzLoader
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef int h, m, s, us, off
+        cdef const char *end = data + length
+        cdef const char *ptr = _parse_time(data, end, &h, &m, &s, &us)
+        if ptr == NULL or _parse_tzoffset(ptr, end, &off) != end:
+            return self._fallback(data, length)
+
+        tz = _get_timezone(self._timezones, off)
+        if tz is None:
+            return self._fallback(data, length)
+
+        return time_new(h, m, s, us, tz)
+
+
+cdef class TimestampLoader(_DateStyleTextLoader):
+    cdef object _get_pyloader_class(self):
+        from psycopg3.types.date import TimestampLoader
+        return TimestampLoader
+
+    cdef object cload(self, const char *data, size_t length):
+        if not self._iso:
+            return self._fallback(data, length)
+
+        cdef int y, mo, d, h, m, s, us
+        cdef const char *end = data + length
+        cdef const char *ptr = _parse_date(data, end, &y, &mo, &d)
+        if ptr == NULL or ptr >= end or ptr[0] != b" ":
+            return self._fallback(data, length)
+        if _parse_time(ptr + 1, end, &h, &m, &s, &us) != end:
+            return self._fallback(data, length)
+
+        return datetime_new(y, mo, d, h, m, s, us, None)
+
+
+cdef class TimestamptzLoader(_DateStyleTextLoader):
+    cdef dict _timezones
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        self._timezones = {}
+
+    cdef object _get_pyloader_class(self):
+        from psycopg3.types.date import TimestamptzLoader
+        return TimestamptzLoader
+
+    cdef object cload(self, const char *data, size_t length):
+        if not self._iso:
+            return self._fallback(data, length)
+
+        cdef int y, mo, d, h, m, s, us, off
+        cdef const char *end = data + length
+        cdef const char *ptr = _parse_date(data, end, &y, &mo, &d)
+        if ptr == NULL or ptr >= end or ptr[0] != b" ":
+            return self._fallback(data, length)
+        ptr = _parse_time(ptr + 1, end, &h, &m, &s, &us)
+        if ptr == NULL or _parse_tzoffset(ptr, end, &off) != end:
+            return self._fallback(data, length)
+
+        tz = _get_timezone(self._timezones, off)
+        if tz is None:
+            return self._fallback(data, length)
+
+        return datetime_new(y, mo, d, h, m, s, us, tz)
+
+
+cdef inline const char *_parse_int(
+    const char *ptr, const char *end, int *val, int maxdigits
+):
+    """
+    Parse an unsigned integer of at most *maxdigits* digits.
+
+    Return the pointer past the number, NULL if no digit was found.
+    """
+    cdef int acc = 0
+    cdef int ndigits = 0
+    while ptr < end and ndigits < maxdigits and b"0" <= ptr[0] <= b"9":
+        acc = acc * 10 + (ptr[0] - ord(b"0"))
+        ptr += 1
+        ndigits += 1
+
+    if ndigits == 0:
+        return NULL
+    val[0] = acc
+    return ptr
+
+
+cdef inline const char *_parse_sep(
+    const char *ptr, const char *end, char sep
+):
+    if ptr == NULL or ptr >= end or ptr[0] != sep:
+        return NULL
+    return ptr + 1
+
+
+cdef const char *_parse_date(
+    const char *ptr, const char *end, int *y, int *m, int *d
+):
+    """
+    Parse a date in ISO format (YYYY-MM-DD).
+
+    Years with more than 4 digits and BC dates are not parsed.
+    """
+    ptr = _parse_int(ptr, end, y, 4)
+    ptr = _parse_sep(ptr, end, b"-")
+    if ptr == NULL:
+        return NULL
+    ptr = _parse_int(ptr, end, m, 2)
+    ptr = _parse_sep(ptr, end, b"-")
+    if ptr == NULL:
+        return NULL
+    ptr = _parse_int(ptr, end, d, 2)
+    if ptr == NULL or y[0] < 1:
+        return NULL
+    return ptr
+
+
+cdef const char *_parse_time(
+    const char *ptr, const char *end, int *h, int *m, int *s, int *us
+):
+    """
+    Parse a time in ISO format (HH:MM:SS[.ffffff]).
+
+    24:00:00, not supported by Python, is not parsed.
+    """
+    ptr = _parse_int(ptr, end, h, 2)
+    ptr = _parse_sep(ptr, end, b":")
+    if ptr == NULL:
+        return NULL
+    ptr = _parse_int(ptr, end, m, 2)
+    ptr = _parse_sep(ptr, end, b":")
+    if ptr == NULL:
+        return NULL
+    ptr = _parse_int(ptr, end, s, 2)
+    if ptr == NULL or h[0] >= 24:
+        return NULL
+
+    us[0] = 0
+    if ptr >= end or ptr[0] != b".":
+        return ptr
+
+    # Fractional seconds: scale to microseconds
+    cdef const char *start = ptr + 1
+    ptr = _parse_int(start, end, us, 6)
+    if ptr == NULL:
+        return NULL
+    cdef int ndigits = ptr - start
+    while ndigits < 6:
+        us[0] *= 10
+        ndigits += 1
+
+    return ptr
+
+
+cdef const char *_parse_tzoffset(const char *ptr, const char *end, int *off):
+    """
+    Parse a timezone offset (+HH[:MM[:SS]]) into seconds east of UTC.
+    """
+    if ptr >= end or (ptr[0] != b"+" and ptr[0] != b"-"):
+        return NULL
+
+    cdef int sign = -1 if ptr[0] == b"-" else 1
+    cdef int val
+    ptr = _parse_int(ptr + 1, end, &val, 2)
+    if ptr == NULL:
+        return NULL
+    off[0] = val * 3600
+
+    cdef int i
+    for i in range(2):
+        if ptr >= end or ptr[0] != b":":
+            break
+        ptr = _parse_int(ptr + 1, end, &val, 2)
+        if ptr == NULL:
+            return NULL
+        off[0] += val * (60 if i == 0 else 1)
+
+    off[0] *= sign
+    return ptr
+
+
+cdef object _get_timezone(dict timezones, int off):
+    """
+    Return a timezone with offset *off* seconds east of UTC.
+
+    Return None if the offset is not supported by Python.
+    """
+    tz = timezones.get(off)
+    if tz is None:
+        try:
+            tz = timezone(timedelta(seconds=off))
+        except ValueError:
+            # Python 3.6 doesn't support seconds in the offset
+            return None
+        timezones[off] = tz
+
+    return tz
+
+
+cdef inline int64_t _days_from_civil(int64_t y, int64_t m, int64_t d):
+    """Return the days since 1970-01-01 of a proleptic Gregorian date."""
+    # http://howardhinnant.github.io/date_algorithms.html#days_from_civil
+    if m <= 2:
+        y -= 1
+    cdef int64_t era = y // 400
+    cdef int64_t yoe = y - era * 400
+    cdef int64_t doy = (153 * (m - 3 if m > 2 else m + 9) + 2) // 5 + d - 1
+    cdef int64_t doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+cdef inline void _civil_from_days(int64_t z, int *y, int *m, int *d):
+    """Return the proleptic Gregorian date of the days since 1970-01-01."""
+    # http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+    z += 719468
+    cdef int64_t era = z // 146097
+    cdef int64_t doe = z - era * 146097
+    cdef int64_t yoe = (
+        doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    cdef int64_t doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    cdef int64_t mp = (5 * doy + 2) // 153
+    d[0] = <int>(doy - (153 * mp + 2) // 5 + 1)
+    m[0] = <int>(mp + 3 if mp < 10 else mp - 9)
+    y[0] = <int>(yoe + era * 400 + (1 if m[0] <= 2 else 0))
+
+
+cdef inline int _check_year(int y) except -1:
+    if y < 1:
+        raise DataError("Python doesn't support BC date")
+    elif y > 9999:
+        raise DataError("Python date doesn't support years after 9999")
+    return 0
+
+
+cdef object _time_from_micros(int64_t val, object tz):
+    if not 0 <= val < USECS_PER_DAY:
+        raise DataError(
+            f"time not supported by Python: hour={val // 3600000000}")
+
+    cdef int us = <int>(val % USECS_PER_SEC)
+    val //= USECS_PER_SEC
+    cdef int s = <int>(val % 60)
+    val //= 60
+    return time_new(<int>(val // 60), <int>(val % 60), s, us, tz)
+
+
+cdef object _datetime_from_micros(int64_t val, object tz):
+    if val == PG_TS_INF or val == PG_TS_NEGINF:
+        raise DataError("Python datetime doesn't support infinity")
+
+    cdef int64_t days = val // USECS_PER_DAY
+    val -= days * USECS_PER_DAY
+
+    cdef int y, m, d
+    _civil_from_days(days + PG_DATE_EPOCH_DAYS, &y, &m, &d)
+    _check_year(y)
+
+    cdef int us = <int>(val % USECS_PER_SEC)
+    val //= USECS_PER_SEC
+    cdef int s = <int>(val % 60)
+    val //= 60
+    return datetime_new(
+        y, m, d, <int>(val // 60), <int>(val % 60), s, us, tz)
+
+
+cdef void register_date_c_adapters():
+    logger.debug("registering optimised date c adapters")
+
+    DateLoader.register(oids.DATE_OID)
+    TimeLoader.register(oids.TIME_OID)
+    TimeTzLoader.register(oids.TIMETZ_OID)
+    TimestampLoader.register(oids.TIMESTAMP_OID)
+    TimestamptzLoader.register(oids.TIMESTAMPTZ_OID)
+
+    DateBinaryDumper.register_binary(date)
+    TimeBinaryDumper.register_binary(time)
+    DateTimeBinaryDumper.register_binary(datetime)
+    TimeDeltaBinaryDumper.register_binary(timedelta)
+
+    DateBinaryLoader.register_binary(oids.DATE_OID)
+    TimeBinaryLoader.register_binary(oids.TIME_OID)
+    TimeTzBinaryLoader.register_binary(oids.TIMETZ_OID)
+    TimestampBinaryLoader.register_binary(oids.TIMESTAMP_OID)
+    TimestamptzBinaryLoader.register_binary(oids.TIMESTAMPTZ_OID)
+    IntervalBinaryLoader.register_binary(oids.INTERVAL_OID)
@@ -5,12 +5,21 @@ Cython adapters for numeric types.
 # Copyright (C) 2020 The Psycopg Team
 
 from libc.stdint cimport *
+from libc.string cimport memchr
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
 from cpython.long cimport PyLong_FromString, PyLong_FromLong, PyLong_AsLongLong
 from cpython.long cimport PyLong_FromLongLong, PyLong_FromUnsignedLong
+from cpython.long cimport PyLong_AsLong
 from cpython.float cimport PyFloat_FromDouble
+from cpython.unicode cimport PyUnicode_DecodeASCII
 
 from psycopg3_c cimport oids
-from psycopg3_c.endian cimport be16toh, be32toh, be64toh, htobe64
+from psycopg3_c.endian cimport be16toh, be32toh, be64toh, htobe16, htobe64
+
+from decimal import Decimal
+
+from psycopg3.errors import DataError
 
 cdef extern from "Python.h":
     # work around https://github.com/cython/cython/issues/3909
@@ -19,6 +28,20 @@ cdef extern from "Python.h":
 
     int PyOS_snprintf(char *str, size_t size, const char *format, ...)
 
+# Values of the sign field of the numeric binary representation
+DEF NUMERIC_POS = 0x0000
+DEF NUMERIC_NEG = 0x4000
+DEF NUMERIC_NAN = 0xC000
+DEF NUMERIC_PINF = 0xD000
+DEF NUMERIC_NINF = 0xF000
+
+# Size of the buffers allocated on the stack for the numeric conversions
+DEF NUMERIC_STACK_SIZE = 64
+
+cdef object decimal_nan = Decimal("NaN")
+cdef object decimal_pinf = Decimal("Infinity")
+cdef object decimal_ninf = Decimal("-Infinity")
+
 
 cdef class IntDumper(CDumper):
     oid = oids.INT8_OID
@@ -97,11 +120,269 @@ cdef class Float8BinaryLoader(CLoader):
         return PyFloat_FromDouble((<double *>swp)[0])
 
 
+cdef class DecimalBinaryDumper(CDumper):
+    oid = oids.NUMERIC_OID
+
+    def dump(self, obj) -> bytes:
+        return dump_decimal_to_numeric_binary(obj)
+
+
+cdef class NumericLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        return Decimal(PyUnicode_DecodeASCII(data, length, NULL))
+
+
+cdef class NumericBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        return load_numeric_binary(data, length)
+
+
+cdef class NumericIntLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        if (
+            memchr(data, b".", length) != NULL
+            or memchr(data, b"N", length) != NULL
+            or memchr(data, b"n", length) != NULL
+        ):
+            return Decimal(PyUnicode_DecodeASCII(data, length, NULL))
+        else:
+            return PyLong_FromString(data, NULL, 10)
+
+
+cdef class NumericIntBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        cdef uint16_t ndigits = be16toh((<uint16_t *>data)[0])
+        cdef int16_t weight = <int16_t>be16toh((<uint16_t *>data)[1])
+        cdef uint16_t sign = be16toh((<uint16_t *>data)[2])
+        cdef uint16_t dscale = be16toh((<uint16_t *>data)[3])
+        if dscale or (sign != NUMERIC_POS and sign != NUMERIC_NEG):
+            return load_numeric_binary(data, length)
+
+        # Up to 4 base 10000 digits fit in an int64: bigger numbers are
+        # parsed from their decimal representation.
+        if weight >= 4:
+            return _numeric_binary_parse(data, length, _numeric_to_int)
+
+        cdef int64_t val = 0
+        cdef int i
+        for i in range(weight + 1):
+            val *= 10000
+            if i < ndigits:
+                val += <int16_t>be16toh((<uint16_t *>data)[i + 4])
+
+        return PyLong_FromLongLong(-val if sign == NUMERIC_NEG else val)
+
+
+cdef class NumericFloatBinaryLoader(CLoader):
+    cdef object cload(self, const char *data, size_t length):
+        cdef uint16_t sign = be16toh((<uint16_t *>data)[2])
+        if sign == NUMERIC_NAN:
+            return float("nan")
+        elif sign == NUMERIC_PINF:
+            return float("inf")
+        elif sign == NUMERIC_NINF:
+            return float("-inf")
+
+        return _numeric_binary_parse(data, length, _numeric_to_float)
+
+
+cdef object load_numeric_binary(const char *data, size_t length):
+    cdef uint16_t sign = be16toh((<uint16_t *>data)[2])
+    if sign == NUMERIC_POS or sign == NUMERIC_NEG:
+        return _numeric_binary_parse(data, length, _numeric_to_decimal)
+    elif sign == NUMERIC_NAN:
+        return decimal_nan
+    elif sign == NUMERIC_PINF:
+        return decimal_pinf
+    elif sign == NUMERIC_NINF:
+        return decimal_ninf
+    else:
+        raise DataError(f"bad value for numeric sign: 0x{sign:X}")
+
+
+ctypedef object (*numeric_parser)(char *buf, Py_ssize_t length)
+
+
+cdef object _numeric_to_decimal(char *buf, Py_ssize_t length):
+    return Decimal(PyUnicode_DecodeASCII(buf, length, NULL))
+
+
+cdef object _numeric_to_int(char *buf, Py_ssize_t length):
+    return PyLong_FromString(buf, NULL, 10)
+
+
+cdef object _numeric_to_float(char *buf, Py_ssize_t length):
+    cdef double d = PyOS_string_to_double(buf, NULL, OverflowError)
+    return PyFloat_FromDouble(d)
+
+
+cdef object _numeric_binary_parse(
+    const char *data, size_t length, numeric_parser parse
+):
+    """
+    Convert a finite numeric in binary format to its decimal representation
+    and pass the resulting string to *parse*.
+    """
+    cdef uint16_t ndigits = be16toh((<uint16_t *>data)[0])
+    cdef int16_t weight = <int16_t>be16toh((<uint16_t *>data)[1])
+    cdef uint16_t sign = be16toh((<uint16_t *>data)[2])
+    cdef uint16_t dscale = be16toh((<uint16_t *>data)[3])
+
+    # sign, integer part, decimal point, decimal part, terminator
+    cdef Py_ssize_t size = 1 + 4 * (weight + 1 if weight >= 0 else 1) \
+        + 1 + dscale + 4 + 1
+    cdef char sbuf[NUMERIC_STACK_SIZE]
+    cdef char *buf = sbuf
+    if size > NUMERIC_STACK_SIZE:
+        buf = <char *>PyMem_Malloc(size)
+        if buf == NULL:
+            raise MemoryError()
+
+    cdef char *p = buf
+    cdef int i, j, d, started = 0
+    cdef int nfrac = 0
+    try:
+        if sign == NUMERIC_NEG:
+            p[0] = b"-"
+            p += 1
+
+        # Integer part: digits 0 to weight, omitting the leading zeros
+        for i in range(weight + 1):
+            d = <int16_t>be16toh((<uint16_t *>data)[i + 4]) \
+                if i < ndigits else 0
+            for j in range(4):
+                if started or d >= 1000 or j == 3 and i == weight:
+                    p[0] = ord(b"0") + d // 1000
+                    p += 1
+                    started = 1
+                d = d % 1000 * 10
+
+        if weight < 0:
+            p[0] = b"0"
+            p += 1
+
+        # Fractional part: digits after weight, up to dscale decimal digits
+        if dscale:
+            p[0] = b"."
+            p += 1
+            i = weight + 1
+            while nfrac < dscale:
+                d = <int16_t>be16toh((<uint16_t *>data)[i + 4]) \
+                    if 0 <= i < ndigits else 0
+                for j in range(4):
+                    if nfrac >= dscale:
+                        break
+                    p[0] = ord(b"0") + d // 1000
+                    p += 1
+                    nfrac += 1
+                    d = d % 1000 * 10
+                i += 1
+
+        p[0] = 0
+        return parse(buf, p - buf)
+
+    finally:
+        if buf != sbuf:
+            PyMem_Free(buf)
+
+
+cdef object dump_decimal_to_numeric_binary(obj):
+    sign, pydigits, pyexp = obj.as_tuple()
+    if pyexp == "n" or pyexp == "N":
+        return _numeric_head(0, 0, NUMERIC_NAN, 0)
+    elif pyexp == "F":
+        return _numeric_head(0, 0, NUMERIC_NINF if sign else NUMERIC_PINF, 0)
+
+    cdef Py_ssize_t ndec = len(pydigits)
+    cdef long exp = pyexp
+    cdef uint16_t dscale = -exp if exp < 0 else 0
+
+    # Decimal digit k (from the right) has power 10 ** (exp + k) and goes
+    # into the base 10000 digit of weight (exp + k) // 4.
+    cdef long wmax = (exp + ndec - 1) // 4
+    cdef long wmin = exp // 4
+    cdef Py_ssize_t ngroups = wmax - wmin + 1
+
+    cdef uint16_t sgroups[NUMERIC_STACK_SIZE]
+    cdef uint16_t *groups = sgroups
+    if ngroups > NUMERIC_STACK_SIZE:
+        groups = <uint16_t *>PyMem_Malloc(ngroups * sizeof(uint16_t))
+        if groups == NULL:
+            raise MemoryError()
+
+    cdef Py_ssize_t i, k, start, end
+    cdef long pos
+    cdef int mul
+    cdef char *buf
+    try:
+        for i in range(ngroups):
+            groups[i] = 0
+
+        for k in range(ndec):
+            pos = exp + k
+            mul = 1
+            for i in range(pos % 4):
+                mul *= 10
+            groups[wmax - pos // 4] += \
+                PyLong_AsLong(pydigits[ndec - 1 - k]) * mul
+
+        # Drop the leading and trailing zero groups
+        start = 0
+        while start < ngroups and groups[start] == 0:
+            start += 1
+        end = ngroups
+        while end > start and groups[end - 1] == 0:
+            end -= 1
+
+        if start == end:
+            wmax = start = end = 0
+        else:
+            wmax -= start
+        if not -0x8000 <= wmax <= 0x7FFF:
+            raise DataError(f"numeric value out of range: {obj}")
+
+        rv = _numeric_head(
+            end - start,
+            wmax,
+            NUMERIC_NEG if sign else NUMERIC_POS,
+            dscale,
+            (end - start) * sizeof(uint16_t),
+        )
+        buf = PyBytes_AS_STRING(rv) + 4 * sizeof(uint16_t)
+        for i in range(start, end):
+            (<uint16_t *>buf)[i - start] = htobe16(groups[i])
+        return rv
+
+    finally:
+        if groups != sgroups:
+            PyMem_Free(groups)
+
+
+cdef object _numeric_head(
+    uint16_t ndigits,
+    int16_t weight,
+    uint16_t sign,
+    uint16_t dscale,
+    Py_ssize_t extra = 0,
+):
+    """
+    Return a bytes with the numeric header and *extra* bytes to fill.
+    """
+    rv = PyBytes_FromStringAndSize(NULL, 4 * sizeof(uint16_t) + extra)
+    cdef uint16_t *head = <uint16_t *>PyBytes_AS_STRING(rv)
+    head[0] = htobe16(ndigits)
+    head[1] = htobe16(<uint16_t>weight)
+    head[2] = htobe16(sign)
+    head[3] = htobe16(dscale)
+    return rv
+
+
 cdef void register_numeric_c_adapters():
     logger.debug("registering optimised numeric c adapters")
 
     IntDumper.register(int)
     IntBinaryDumper.register_binary(int)
+    DecimalBinaryDumper.register_binary(Decimal)
 
     IntLoader.register(oids.INT2_OID)
     IntLoader.register(oids.INT4_OID)
@@ -109,6 +390,7 @@ cdef void register_numeric_c_adapters():
     IntLoader.register(oids.OID_OID)
     FloatLoader.register(oids.FLOAT4_OID)
     FloatLoader.register(oids.FLOAT8_OID)
+    NumericLoader.register(oids.NUMERIC_OID)
 
     Int2BinaryLoader.register_binary(oids.INT2_OID)
     Int4BinaryLoader.register_binary(oids.INT4_OID)
@@ -116,3 +398,4 @@ cdef void register_numeric_c_adapters():
     OidBinaryLoader.register_binary(oids.OID_OID)
     Float4BinaryLoader.register_binary(oids.FLOAT4_OID)
     Float8BinaryLoader.register_binary(oids.FLOAT8_OID)
+    NumericBinaryLoader.register_binary(oids.NUMERIC_OID)
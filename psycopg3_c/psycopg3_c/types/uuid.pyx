@@ -0,0 +1,97 @@
+"""
+Cython adapters for the UUID type.
+"""
+
+# Copyright (C) 2021 The Psycopg Team
+
+from libc.stdint cimport *
+from cpython.long cimport PyLong_FromUnsignedLongLong
+
+from psycopg3_c cimport oids
+from psycopg3_c.endian cimport be64toh
+
+from psycopg3.errors import DataError
+
+# Importing the uuid module is slow, so import it only on request.
+cdef object _UUID = None
+cdef object _uuid_safe = None
+cdef object _object_setattr = object.__setattr__
+
+
+cdef class _BaseUUIDLoader(CLoader):
+
+    def __init__(self, oid: int, context: "AdaptContext" = None):
+        super().__init__(oid, context)
+        global _UUID, _uuid_safe
+        if _UUID is None:
+            import uuid
+            _UUID = uuid.UUID
+            # Python 3.6 has no SafeUUID
+            _uuid_safe = getattr(uuid, "SafeUUID", None)
+            if _uuid_safe is not None:
+                _uuid_safe = _uuid_safe.unknown
+
+    cdef object _make_uuid(self, uint64_t hi, uint64_t lo):
+        # Create the object bypassing UUID.__init__(), which validates and
+        # converts its input with several Python operations.
+        cdef object val = (
+            (PyLong_FromUnsignedLongLong(hi) << 64)
+            | PyLong_FromUnsignedLongLong(lo))
+        cdef object rv = _UUID.__new__(_UUID)
+        _object_setattr(rv, "int", val)
+        if _uuid_safe is not None:
+            _object_setattr(rv, "is_safe", _uuid_safe)
+        return rv
+
+
+cdef class UUIDLoader(_BaseUUIDLoader):
+
+    cdef object cload(self, const char *data, size_t length):
+        cdef uint64_t hi = 0, lo = 0
+        cdef int ndigits = 0
+        cdef int digit
+        cdef size_t i
+        cdef char c
+
+        for i in range(length):
+            c = data[i]
+            if b"0" <= c <= b"9":
+                digit = c - ord(b"0")
+            elif b"a" <= c <= b"f":
+                digit = c - ord(b"a") + 10
+            elif b"A" <= c <= b"F":
+                digit = c - ord(b"A") + 10
+            elif c == b"-" or c == b"{" or c == b"}":
+                continue
+            else:
+                ndigits = -1
+                break
+
+            if ndigits < 16:
+                hi = (hi << 4) | digit
+            else:
+                lo = (lo << 4) | digit
+            ndigits += 1
+
+        if ndigits != 32:
+            s = bytes(data[:length]).decode("utf8", "replace")
+            raise DataError(f"bad uuid representation: {s!r}")
+
+        return self._make_uuid(hi, lo)
+
+
+cdef class UUIDBinaryLoader(_BaseUUIDLoader):
+
+    cdef object cload(self, const char *data, size_t length):
+        if length != 16:
+            raise DataError(f"bad uuid binary length: {length}")
+
+        return self._make_uuid(
+            be64toh((<uint64_t *>data)[0]), be64toh((<uint64_t *>data)[1]))
+
+
+cdef void register_uuid_c_adapters():
+    logger.debug("registering optimised uuid c adapters")
+
+    UUIDLoader.register(oids.UUID_OID)
+    UUIDBinaryLoader.register_binary(oids.UUID_OID)
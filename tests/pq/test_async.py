@@ -2,7 +2,7 @@ import pytest
 from select import select
 import psycopg3
 from psycopg3 import pq
-from psycopg3.generators import execute
+from psycopg3.generators import execute, fetch_result
 
 
 def test_send_query(pgconn):
@@ -146,3 +146,27 @@ def test_send_prepared_binary_out(pgconn, fmt, out):
     (res,) = psycopg3.waiting.wait(execute(pgconn))
     assert res.status == pq.ExecStatus.TUPLES_OK
     assert res.get_value(0, 0) == out
+
+
+def test_single_row_mode(pgconn):
+    pgconn.nonblocking = 1
+    pgconn.send_query(b"select generate_series(1, 3)")
+    pgconn.set_single_row_mode()
+
+    results = []
+    while 1:
+        res = psycopg3.waiting.wait(fetch_result(pgconn))
+        if res is None:
+            break
+        results.append(res)
+
+    assert [r.status for r in results] == [pq.ExecStatus.SINGLE_TUPLE] * 3 + [
+        pq.ExecStatus.TUPLES_OK
+    ]
+    assert [r.get_value(0, 0) for r in results[:3]] == [b"1", b"2", b"3"]
+    assert results[-1].ntuples == 0
+
+
+def test_single_row_mode_no_query(pgconn):
+    with pytest.raises(psycopg3.OperationalError):
+        pgconn.set_single_row_mode()
@@ -78,6 +78,26 @@ def test_copy_out(pgconn):
     assert res.get_value(0, 3) == b"199"
 
 
+@pytest.mark.parametrize("wrapper", [bytes, bytearray, memoryview])
+def test_copy_in_buffer_types(pgconn, wrapper):
+    ensure_table(pgconn, sample_tabledef)
+    res = pgconn.exec_(b"copy copy_in from stdin")
+    assert res.status == pq.ExecStatus.COPY_IN
+
+    rv = pgconn.put_copy_data(wrapper(sample_text))
+    assert rv > 0
+    rv = pgconn.put_copy_end()
+    assert rv > 0
+
+    res = pgconn.get_result()
+    assert res.status == pq.ExecStatus.COMMAND_OK, res.error_message
+
+    res = pgconn.exec_(b"select data from copy_in order by col1")
+    assert res.status == pq.ExecStatus.TUPLES_OK, res.error_message
+    assert res.get_value(0, 0) == b"hello"
+    assert res.get_value(1, 0) == b"world"
+
+
 def test_copy_out_err(pgconn):
     ensure_table(pgconn, sample_tabledef)
     res = pgconn.exec_(b"copy copy_in from stdin")
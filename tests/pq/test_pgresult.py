@@ -1,3 +1,4 @@
+import gc
 import ctypes
 import pytest
 
@@ -162,6 +163,22 @@ def test_get_value(pgconn):
     assert res.get_value(0, 0) is None
 
 
+def test_get_value_view(pgconn):
+    res = pgconn.exec_(b"select 'abc', '', NULL")
+    assert res.status == pq.ExecStatus.TUPLES_OK, res.error_message
+    view = res.get_value_view(0, 0)
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b"abc"
+    assert bytes(res.get_value_view(0, 1)) == b""
+    assert res.get_value_view(0, 2) is None
+
+
+def test_get_value_view_keeps_result(pgconn):
+    view = pgconn.exec_(b"select 'hello'").get_value_view(0, 0)
+    gc.collect()
+    assert bytes(view) == b"hello"
+
+
 def test_nparams_types(pgconn):
     res = pgconn.prepare(b"", b"select $1::int, $2::text")
     assert res.status == pq.ExecStatus.COMMAND_OK, res.error_message
@@ -0,0 +1,84 @@
+import pytest
+
+import psycopg3
+from psycopg3 import pq
+from psycopg3.generators import pipeline_communicate
+
+pytestmark = pytest.mark.libpq(">= 14")
+
+
+def test_pipeline_status(pgconn):
+    assert pgconn.pipeline_status == pq.PipelineStatus.OFF
+    pgconn.enter_pipeline_mode()
+    assert pgconn.pipeline_status == pq.PipelineStatus.ON
+    pgconn.exit_pipeline_mode()
+    assert pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+
+def test_pipeline_not_idle(pgconn):
+    pgconn.send_query(b"select 1")
+    with pytest.raises(psycopg3.OperationalError):
+        pgconn.enter_pipeline_mode()
+    while pgconn.get_result():
+        pass
+
+
+def test_exit_pipeline_pending(pgconn):
+    pgconn.enter_pipeline_mode()
+    pgconn.send_query_params(b"select 1", None)
+    with pytest.raises(psycopg3.OperationalError):
+        pgconn.exit_pipeline_mode()
+
+
+def test_sync_not_in_pipeline(pgconn):
+    with pytest.raises(psycopg3.OperationalError):
+        pgconn.pipeline_sync()
+
+
+def test_pipeline_results(pgconn):
+    pgconn.nonblocking = 1
+    pgconn.enter_pipeline_mode()
+    pgconn.send_query_params(b"select $1::int", [b"1"])
+    pgconn.send_query_params(b"select $1::int", [b"2"])
+    pgconn.pipeline_sync()
+
+    results = psycopg3.waiting.wait(pipeline_communicate(pgconn, 2))
+    assert [len(r) for r in results] == [1, 1]
+    assert results[0][0].get_value(0, 0) == b"1"
+    assert results[1][0].get_value(0, 0) == b"2"
+    assert pgconn.pipeline_status == pq.PipelineStatus.ON
+    pgconn.exit_pipeline_mode()
+
+
+def test_pipeline_aborted(pgconn):
+    pgconn.nonblocking = 1
+    pgconn.enter_pipeline_mode()
+    pgconn.send_query_params(b"select 1/0", None)
+    pgconn.send_query_params(b"select 1", None)
+    pgconn.pipeline_sync()
+    pgconn.send_query_params(b"select 2", None)
+    pgconn.pipeline_sync()
+
+    results = psycopg3.waiting.wait(pipeline_communicate(pgconn, 2))
+    assert results[0][0].status == pq.ExecStatus.FATAL_ERROR
+    assert results[1][0].status == pq.ExecStatus.PIPELINE_ABORTED
+
+    (res,) = psycopg3.waiting.wait(pipeline_communicate(pgconn, 1))
+    assert res[0].status == pq.ExecStatus.TUPLES_OK
+    assert res[0].get_value(0, 0) == b"2"
+
+
+def test_send_flush_request(pgconn):
+    pgconn.enter_pipeline_mode()
+    pgconn.send_query_params(b"select 1", None)
+    pgconn.send_flush_request()
+    pgconn.flush()
+    res = pgconn.get_result()
+    assert res.status == pq.ExecStatus.TUPLES_OK
+    assert pgconn.get_result() is None
+
+
+def test_pipeline_finished(pgconn):
+    pgconn.finish()
+    with pytest.raises(psycopg3.OperationalError):
+        pgconn.enter_pipeline_mode()
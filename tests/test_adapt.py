@@ -134,6 +134,45 @@ def test_load_cursor_ctx_nested(conn, sql, obj, fmt_out):
     assert res == obj
 
 
+@pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
+def test_load_rows(conn, fmt_out):
+    cur = conn.cursor(format=fmt_out)
+    cur.execute("select i, 'x' || i, null from generate_series(1, 4) as i")
+    t = Transformer()
+    t.pgresult = cur.pgresult
+    assert t.load_rows(1, 3) == [(2, "x2", None), (3, "x3", None)]
+    assert t.load_rows(0, 4) == [t.load_row(i) for i in range(4)]
+    assert t.load_rows(4, 4) == []
+
+    with pytest.raises(psycopg3.InterfaceError):
+        t.load_rows(0, 5)
+    with pytest.raises(psycopg3.InterfaceError):
+        t.load_rows(-1, 2)
+
+    t.pgresult = None
+    with pytest.raises(psycopg3.InterfaceError):
+        t.load_rows(0, 0)
+
+
+@pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("accept", [True, False])
+def test_load_memoryview(conn, fmt_out, accept):
+    got = []
+
+    class TestLoader(Loader):
+        accept_memoryview = accept
+
+        def load(self, data):
+            got.append(type(data))
+            return bytes(data).decode("ascii")
+
+    cur = conn.cursor(format=fmt_out)
+    TestLoader.register(TEXT_OID, cur, format=fmt_out)
+    cur.execute("select 'hello'::text, null::text, ''::text")
+    assert cur.fetchone() == ("hello", None, "")
+    assert got == [memoryview if accept else bytes] * 2
+
+
 @pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
 def test_none_type_argument(conn, fmt_in):
     cur = conn.cursor()
@@ -1,5 +1,6 @@
 import string
 import hashlib
+from decimal import Decimal
 from io import BytesIO, StringIO
 from itertools import cycle
 
@@ -7,7 +8,10 @@ import pytest
 
 from psycopg3 import pq
 from psycopg3 import errors as e
-from psycopg3.adapt import Format
+from psycopg3.oids import builtins
+from psycopg3.adapt import Format, Transformer
+from psycopg3.copy import format_row_text, format_row_binary
+from psycopg3.copy import parse_row_text, parse_row_binary
 from psycopg3.types.numeric import Int4
 
 eur = "\u20ac"
@@ -74,6 +78,164 @@ def test_copy_out_iter(conn, format):
         assert list(copy) == want
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_out_read_block(conn, format):
+    want = sample_text if format == Format.TEXT else sample_binary
+    cur = conn.cursor()
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        got = b""
+        while True:
+            data = copy.read_block(5)
+            if not data:
+                break
+            assert len(data) <= 5
+            got += data
+
+        assert copy.read_block() == b""
+
+    assert got == want
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_out_readinto(conn, format):
+    want = sample_text if format == Format.TEXT else sample_binary
+    cur = conn.cursor()
+    buf = bytearray(7)
+    got = b""
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        while True:
+            n = copy.readinto(buf)
+            if not n:
+                break
+            got += buf[:n]
+
+    assert got == want
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_to_file(conn, format):
+    want = sample_text if format == Format.TEXT else sample_binary
+    cur = conn.cursor()
+    f = BytesIO()
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        assert copy.copy_to_file(f) == len(want)
+
+    assert f.getvalue() == want
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("typetype", ["names", "oids"])
+def test_copy_out_rows(conn, format, typetype):
+    types = ["int4", "int4", "text"]
+    if typetype == "oids":
+        types = [builtins[t].oid for t in types]
+
+    cur = conn.cursor()
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        copy.set_types(types)
+        rows = list(copy.rows())
+
+    assert rows == sample_records
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_out_read_row_no_types(conn, format):
+    cur = conn.cursor()
+    with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        row = copy.read_row()
+        if format == Format.TEXT:
+            assert row == ("10", "20", "hello")
+        else:
+            assert row == (
+                b"\x00\x00\x00\x0a",
+                b"\x00\x00\x00\x14",
+                b"hello",
+            )
+
+        assert copy.read_row() is not None
+        assert copy.read_row() is None
+        assert copy.read_row() is None
+
+
+def test_copy_out_rows_allchars(conn):
+    cur = conn.cursor()
+    conn.client_encoding = "utf8"
+    chars = list(map(chr, range(1, 256))) + [eur]
+    with cur.copy(
+        f"""copy (
+            select chr(i) from generate_series(1, 255) as i
+            union all select {eur!r}
+        ) to stdout"""
+    ) as copy:
+        rows = list(copy.rows())
+
+    assert rows == [(c,) for c in chars]
+
+
+@pytest.mark.parametrize(
+    "data, want",
+    [
+        (b"10\t20\thello\n", (10, 20, "hello")),
+        (b"\\N\t\\N\t\\N\n", (None, None, None)),
+        (b"1\t2\t\n", (1, 2, "")),
+        (b"1\t2\ta\\tb\\\\c\\nd\\re\n", (1, 2, "a\tb\\c\nd\re")),
+        (b"1\t2\t\\\\N\\\\N\n", (1, 2, "\\N\\N")),
+    ],
+)
+def test_parse_row_text(data, want):
+    tx = Transformer()
+    tx.set_row_types(
+        [
+            (builtins["int4"].oid, Format.TEXT),
+            (builtins["int4"].oid, Format.TEXT),
+            (builtins["text"].oid, Format.TEXT),
+        ]
+    )
+    assert parse_row_text(data, tx) == want
+
+
+def test_parse_row_binary():
+    tx = Transformer()
+    tx.set_row_types(
+        [
+            (builtins["int4"].oid, Format.BINARY),
+            (builtins["int4"].oid, Format.BINARY),
+            (builtins["text"].oid, Format.BINARY),
+        ]
+    )
+    # skip the header
+    assert parse_row_binary(sample_binary_rows[0][19:], tx) == (
+        10,
+        20,
+        "hello",
+    )
+    assert parse_row_binary(sample_binary_rows[1], tx) == (40, None, "world")
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_parse_row_too_many_fields(format):
+    tx = Transformer()
+    tx.set_row_types([(builtins["text"].oid, format)])
+    with pytest.raises(e.DataError):
+        if format == Format.TEXT:
+            parse_row_text(b"a\tb\n", tx)
+        else:
+            parse_row_binary(b"\x00\x02\x00\x00\x00\x01a\x00\x00\x00\x01b", tx)
+
+
 @pytest.mark.parametrize(
     "format, buffer",
     [(Format.TEXT, "sample_text"), (Format.BINARY, "sample_binary")],
@@ -88,6 +250,62 @@ def test_copy_in_buffers(conn, format, buffer):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("wrapper", [bytearray, memoryview])
+def test_copy_in_buffer_types(conn, format, wrapper):
+    data = sample_text if format == Format.TEXT else sample_binary
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.write(wrapper(data))
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("chunk_size", [0, 1, 20])
+@pytest.mark.parametrize("source", ["path", "str", "file"])
+def test_copy_in_write_from(conn, tmp_path, format, chunk_size, source):
+    data = sample_text if format == Format.TEXT else sample_binary
+    fn = tmp_path / "copy.dat"
+    fn.write_bytes(data)
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        if source == "path":
+            assert copy.write_from(fn, chunk_size) == len(data)
+        elif source == "str":
+            assert copy.write_from(str(fn), chunk_size) == len(data)
+        else:
+            with fn.open("rb") as f:
+                assert copy.write_from(f, chunk_size) == len(data)
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_write_from_text_file(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin") as copy:
+        copy.write_from(StringIO(sample_text.decode()), 10)
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_write_from_empty(conn, tmp_path):
+    fn = tmp_path / "copy.dat"
+    fn.write_bytes(b"")
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin") as copy:
+        assert copy.write_from(fn) == 0
+
+    assert cur.execute("select count(*) from copy_in").fetchone() == (0,)
+
+
 def test_copy_in_buffers_pg_error(conn):
     cur = conn.cursor()
     ensure_table(cur, sample_tabledef)
@@ -206,6 +424,175 @@ from copy_in group by 1, 2, 3
     assert data == [(True, True, 1, 256)]
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("buffer_size", [1, 20, 1024])
+def test_copy_in_buffer_size(conn, format, buffer_size):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.buffer_size = buffer_size
+        for row in sample_records:
+            copy.write_row(row)
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_rows_and_buffers(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy("copy copy_in from stdin") as copy:
+        copy.write_row(sample_records[0])
+        copy.write(b"30\t\\N\tbuffer\n")
+        copy.write_row(sample_records[1])
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == [sample_records[0], (30, None, "buffer"), sample_records[1]]
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize(
+    "types",
+    [
+        ["int4", "int4", "text"],
+        ["integer", None, "text"],
+        [builtins["int4"].oid, builtins["int4"].oid, builtins["text"].oid],
+    ],
+)
+def test_copy_in_set_types(conn, format, types):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(types)
+        for row in sample_records:
+            copy.write_row((int(row[0]), row[1], row[2]))
+
+    data = cur.execute("select * from copy_in order by 1").fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_set_types_array(conn):
+    cur = conn.cursor()
+    ensure_table(cur, "id serial primary key, data text[]")
+
+    with cur.copy("copy copy_in (data) from stdin (format binary)") as copy:
+        copy.set_types(["text[]"])
+        copy.write_row([["hello", None, "world"]])
+
+    data = cur.execute("select data from copy_in").fetchone()[0]
+    assert data == ["hello", None, "world"]
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_copy_in_set_types_convert(conn, format):
+    cur = conn.cursor()
+    ensure_table(
+        cur,
+        "num numeric, f8 float8, f4 float4, i4 int4, arr int4[], txt text",
+    )
+
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(
+            ["numeric", "float8", "float4", "int4", "int4[]", "text"]
+        )
+        copy.write_row([10, 1, 2.5, 3.0, [1, None, 2.0], "hello"])
+        copy.write_row([Decimal("1.5"), True, 1, 2 ** 31 - 1, [], "world"])
+
+    data = cur.execute("select * from copy_in order by txt").fetchall()
+    assert data == [
+        (Decimal("10"), 1.0, 2.5, 3, [1, None, 2], "hello"),
+        (Decimal("1.5"), 1.0, 1.0, 2 ** 31 - 1, [], "world"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "type, value",
+    [
+        ("int4", 1.5),
+        ("int4", 2 ** 31),
+        ("int4", "10"),
+        ("numeric", "10"),
+        ("float8", b"10"),
+        ("date", 10),
+        ("text", 10),
+        ("int4[]", [1.5]),
+    ],
+)
+def test_copy_in_set_types_bad_value(conn, type, value):
+    cur = conn.cursor()
+    ensure_table(cur, f"data {type}")
+
+    with pytest.raises(e.QueryCanceled) as exc:
+        with cur.copy("copy copy_in from stdin (format binary)") as copy:
+            copy.set_types([type])
+            copy.write_row([value])
+
+    assert "DataError" in str(exc.value)
+
+
+def test_copy_in_set_types_bad_name(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with pytest.raises(e.QueryCanceled) as exc:
+        with cur.copy("copy copy_in from stdin (format binary)") as copy:
+            copy.set_types(["int4", "wat"])
+
+    assert "ProgrammingError - unknown type name: 'wat'" in str(exc.value)
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+def test_get_dumper_by_oid(format):
+    tx = Transformer()
+    dumper = tx.get_dumper_by_oid(builtins["int4"].oid, format)
+    assert dumper.oid == builtins["int4"].oid
+    assert dumper is tx.get_dumper_by_oid(builtins["int4"].oid, format)
+    assert dumper.dump(10) == (
+        b"10" if format == Format.TEXT else b"\x00\x00\x00\x0a"
+    )
+
+    with pytest.raises(e.ProgrammingError):
+        tx.get_dumper_by_oid(builtins["int4"].array_oid, format)
+
+
+def test_format_row_dumpers():
+    tx = Transformer()
+    int4 = tx.get_dumper_by_oid(builtins["int4"].oid, Format.BINARY)
+    rows = [(10, 20, "hello"), (40, None, "world")]
+    out = bytearray()
+    for row in rows:
+        format_row_binary(row, tx, out, [int4, int4])
+    assert out == sample_binary[19:-2]
+
+
+def test_format_row_text():
+    tx = Transformer()
+    out = bytearray()
+    for row in sample_records:
+        rv = format_row_text(row, tx, out)
+        assert rv is out
+    assert out == sample_text
+
+    assert format_row_text((), tx) == b"\n"
+    row = ("\b\t\n\v\f\r\\x", "y")
+    assert format_row_text(row, tx) == b"\\b\\t\\n\\v\\f\\r\\\\x\ty\n"
+
+
+def test_format_row_binary():
+    tx = Transformer()
+    out = bytearray()
+    for row in sample_records:
+        rv = format_row_binary(row, tx, out)
+        assert rv is out
+    # skip the signature/flags/extension header and the trailer
+    assert out == sample_binary[19:-2]
+
+    assert format_row_binary((), tx) == b"\x00\x00"
+
+
 @pytest.mark.slow
 def test_copy_from_to(conn):
     # Roundtrip from file to database to file blockwise
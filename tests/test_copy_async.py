@@ -1,5 +1,6 @@
 import string
 import hashlib
+from decimal import Decimal
 from io import BytesIO, StringIO
 from itertools import cycle
 
@@ -53,6 +54,87 @@ async def test_copy_out_iter(aconn, format):
     assert got == want
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_out_read_block(aconn, format):
+    want = sample_text if format == Format.TEXT else sample_binary
+    cur = await aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        got = b""
+        while True:
+            data = await copy.read_block(5)
+            if not data:
+                break
+            assert len(data) <= 5
+            got += data
+
+        assert await copy.read_block() == b""
+
+    assert got == want
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_out_readinto(aconn, format):
+    want = sample_text if format == Format.TEXT else sample_binary
+    cur = await aconn.cursor()
+    buf = bytearray(7)
+    got = b""
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        while True:
+            n = await copy.readinto(buf)
+            if not n:
+                break
+            got += buf[:n]
+
+    assert got == want
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_to_file(aconn, format):
+    want = sample_text if format == Format.TEXT else sample_binary
+    cur = await aconn.cursor()
+    f = BytesIO()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        assert await copy.copy_to_file(f) == len(want)
+
+    assert f.getvalue() == want
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_out_rows(aconn, format):
+    cur = await aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        rows = []
+        async for row in copy.rows():
+            rows.append(row)
+
+    assert rows == sample_records
+    assert cur.rowcount == 2
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_out_read_row(aconn, format):
+    cur = await aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        assert await copy.read_row() == sample_records[0]
+        assert await copy.read_row() == sample_records[1]
+        assert await copy.read_row() is None
+        assert await copy.read_row() is None
+
+
 @pytest.mark.parametrize(
     "format, buffer",
     [(Format.TEXT, "sample_text"), (Format.BINARY, "sample_binary")],
@@ -70,6 +152,77 @@ async def test_copy_in_buffers(aconn, format, buffer):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("buffer_size", [1, 20, 1024])
+async def test_copy_in_buffer_size(aconn, format, buffer_size):
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})"
+    ) as copy:
+        copy.buffer_size = buffer_size
+        for row in sample_records:
+            await copy.write_row(row)
+
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == sample_records
+
+
+async def test_copy_in_rows_and_buffers(aconn):
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+
+    async with cur.copy("copy copy_in from stdin") as copy:
+        await copy.write_row(sample_records[0])
+        await copy.write(b"30\t\\N\tbuffer\n")
+        await copy.write_row(sample_records[1])
+
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == [sample_records[0], (30, None, "buffer"), sample_records[1]]
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("wrapper", [bytearray, memoryview])
+async def test_copy_in_buffer_types(aconn, format, wrapper):
+    data = sample_text if format == Format.TEXT else sample_binary
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})"
+    ) as copy:
+        await copy.write(wrapper(data))
+
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == sample_records
+
+
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("chunk_size", [0, 1, 20])
+@pytest.mark.parametrize("source", ["path", "file"])
+async def test_copy_in_write_from(aconn, tmp_path, format, chunk_size, source):
+    data = sample_text if format == Format.TEXT else sample_binary
+    fn = tmp_path / "copy.dat"
+    fn.write_bytes(data)
+    cur = await aconn.cursor()
+    await ensure_table(cur, sample_tabledef)
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})"
+    ) as copy:
+        if source == "path":
+            assert await copy.write_from(fn, chunk_size) == len(data)
+        else:
+            with fn.open("rb") as f:
+                assert await copy.write_from(f, chunk_size) == len(data)
+
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == sample_records
+
+
 async def test_copy_in_buffers_pg_error(aconn):
     cur = await aconn.cursor()
     await ensure_table(cur, sample_tabledef)
@@ -158,6 +311,27 @@ async def test_copy_in_records(aconn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
+async def test_copy_in_set_types_convert(aconn, format):
+    cur = await aconn.cursor()
+    await ensure_table(
+        cur,
+        "num numeric, f8 float8, f4 float4, i4 int4, arr int4[], txt text",
+    )
+
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})"
+    ) as copy:
+        copy.set_types(
+            ["numeric", "float8", "float4", "int4", "int4[]", "text"]
+        )
+        await copy.write_row([10, 1, 2.5, 3.0, [1, None, 2.0], "hello"])
+
+    await cur.execute("select * from copy_in")
+    data = await cur.fetchall()
+    assert data == [(Decimal("10"), 1.0, 2.5, 3, [1, None, 2], "hello")]
+
+
 @pytest.mark.parametrize("format", [Format.TEXT, Format.BINARY])
 async def test_copy_in_records_binary(aconn, format):
     cur = await aconn.cursor()
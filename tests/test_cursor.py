@@ -1,8 +1,11 @@
 import gc
 import pytest
 import weakref
+import datetime as dt
 
 import psycopg3
+from psycopg3 import pq
+from psycopg3 import errors as e
 from psycopg3.oids import builtins
 
 
@@ -192,6 +195,90 @@ def test_executemany_badquery(conn, query):
         cur.executemany(query, [(10, "hello"), (20, "world")])
 
 
+def test_executemany_many(conn, execmany):
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(i, str(i)) for i in range(1000)],
+    )
+    assert cur.rowcount == 1000
+    cur.execute("select count(*), sum(num) from execmany")
+    assert cur.fetchone() == (1000, sum(range(1000)))
+
+
+def test_executemany_large_batch(conn, execmany):
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(i, str(i)) for i in range(20000)],
+    )
+    assert cur.rowcount == 20000
+    cur.execute("select count(*), sum(num) from execmany")
+    assert cur.fetchone() == (20000, sum(range(20000)))
+
+
+def test_executemany_large_batch_error(conn, execmany):
+    conn.autocommit = True
+    cur = conn.cursor()
+    params = [[str(i)] for i in range(5000)]
+    params[3500] = ["x"]
+    with pytest.raises(psycopg3.DataError):
+        cur.executemany("insert into execmany(num) values (%s::int)", params)
+    assert cur.params == [b"x"]
+    assert conn.pgconn.pipeline_status == 0
+    # The queries before the failing one are committed, the ones in the
+    # following batches are not executed.
+    cur.execute("select count(*) from execmany where num < 3500")
+    assert cur.fetchone() == (3500,)
+    cur.execute("select count(*) from execmany where num >= 4500")
+    assert cur.fetchone() == (0,)
+
+
+def test_executemany_empty(conn, execmany):
+    cur = conn.cursor()
+    cur.executemany("insert into execmany(num) values (%s)", [])
+    assert cur.rowcount == -1
+    assert conn.pgconn.pipeline_status == 0
+
+
+def test_executemany_error_autocommit(conn, execmany):
+    conn.autocommit = True
+    cur = conn.cursor()
+    with pytest.raises(psycopg3.DataError):
+        cur.executemany(
+            "insert into execmany(num) values (%s::int)", [[1], [2], ["x"]]
+        )
+    assert cur.params == [b"x"]
+    cur.execute("select num from execmany order by num")
+    assert cur.fetchall() == [(1,), (2,)]
+
+
+def test_executemany_error_transaction(conn, execmany):
+    conn.autocommit = True
+    cur = conn.cursor()
+    with pytest.raises(psycopg3.DataError):
+        with conn.transaction():
+            cur.executemany(
+                "insert into execmany(num) values (%s::int)",
+                [[1], [2], ["x"]],
+            )
+    assert conn.pgconn.pipeline_status == 0
+    cur.execute("select num from execmany")
+    assert cur.fetchall() == []
+
+
+def test_executemany_dump_error(conn, execmany):
+    conn.autocommit = True
+    cur = conn.cursor()
+    with pytest.raises(psycopg3.ProgrammingError):
+        cur.executemany(
+            "insert into execmany(num) values (%s)", [[1], [object()], [3]]
+        )
+    assert conn.pgconn.pipeline_status == 0
+    cur.execute("select num from execmany")
+    assert cur.fetchall() == [(1,)]
+
+
 def test_rowcount(conn):
     cur = conn.cursor()
 
@@ -234,6 +321,135 @@ def test_iter_stop(conn):
     assert list(cur) == []
 
 
+def test_stream(conn):
+    cur = conn.cursor()
+    recs = []
+    for rec in cur.stream(
+        "select i, '2021-01-01'::date + i"
+        " from generate_series(1, %s::int) as i",
+        [2],
+    ):
+        recs.append(rec)
+
+    assert recs == [(1, dt.date(2021, 1, 2)), (2, dt.date(2021, 1, 3))]
+    assert cur.rowcount == 2
+    assert cur.fetchone() is None
+
+
+def test_stream_loaders_set_once(conn, monkeypatch):
+    cur = conn.cursor()
+    calls = []
+    orig = cur._stream_fetchone_gen
+
+    def fetchone_gen(first):
+        calls.append(first)
+        return orig(first)
+
+    monkeypatch.setattr(cur, "_stream_fetchone_gen", fetchone_gen)
+    assert list(cur.stream("select generate_series(1, 3)")) == [
+        (1,),
+        (2,),
+        (3,),
+    ]
+    assert calls == [True, False, False, False]
+
+
+def test_stream_no_rows(conn):
+    cur = conn.cursor()
+    assert list(cur.stream("select 1 where false")) == []
+    assert cur.rowcount == 0
+
+
+def test_stream_command(conn):
+    cur = conn.cursor()
+    assert list(cur.stream("create temp table test_stream (id int)")) == []
+    assert cur.status == cur.ExecStatus.COMMAND_OK
+
+
+def test_stream_error(conn):
+    cur = conn.cursor()
+    with pytest.raises(e.DivisionByZero):
+        for rec in cur.stream(
+            "select 1 / (2 - i) from generate_series(1, 3) i"
+        ):
+            pass
+    assert conn.pgconn.transaction_status == conn.TransactionStatus.INERROR
+
+
+def test_stream_break(conn):
+    cur = conn.cursor()
+    for rec in cur.stream("select generate_series(1, 1000)"):
+        assert rec == (1,)
+        break
+
+    assert conn.pgconn.transaction_status == conn.TransactionStatus.INTRANS
+    cur.execute("select 42")
+    assert cur.fetchone() == (42,)
+
+
+def test_stream_binary(conn):
+    cur = conn.cursor(format=pq.Format.BINARY)
+    recs = list(cur.stream("select %s::text, %s::int", ["hello", 10]))
+    assert recs == [("hello", 10)]
+
+
+def test_fetch_columns(conn):
+    cur = conn.cursor()
+    cur.execute(
+        "select i, 'x' || i, nullif(i, 2) from generate_series(1, 3) as i"
+    )
+    assert cur.fetchone() == (1, "x1", 1)
+    assert cur.fetch_columns() == [[2, 3], ["x2", "x3"], [None, 3]]
+    assert cur.fetch_columns() == [[], [], []]
+    assert cur.fetchone() is None
+
+
+@pytest.mark.parametrize("fmt", [pq.Format.TEXT, pq.Format.BINARY])
+def test_fetchnumpy(conn, fmt):
+    np = pytest.importorskip("numpy")
+    cur = conn.cursor(format=fmt)
+    cur.execute(
+        """
+        select i::int2, i::int4, i::int8, (i / 2.0)::float4, (i / 2.0)::float8,
+            i % 2 = 0, '2021-01-01'::timestamp + i * '1 day'::interval,
+            'x' || i
+        from generate_series(1, 3) as i
+        """
+    )
+    arrs = cur.fetchnumpy()
+    dtypes = [a.dtype for a in arrs]
+    assert dtypes == [
+        np.dtype(t)
+        for t in ["int16", "int32", "int64", "float32", "float64", "bool"]
+        + ["datetime64[us]", object]
+    ]
+    assert arrs[2].tolist() == [1, 2, 3]
+    assert arrs[4].tolist() == [0.5, 1.0, 1.5]
+    assert arrs[5].tolist() == [False, True, False]
+    assert arrs[6].tolist() == [
+        dt.datetime(2021, 1, 2),
+        dt.datetime(2021, 1, 3),
+        dt.datetime(2021, 1, 4),
+    ]
+    assert arrs[7].tolist() == ["x1", "x2", "x3"]
+    assert cur.fetchone() is None
+
+
+@pytest.mark.parametrize("fmt", [pq.Format.TEXT, pq.Format.BINARY])
+def test_fetchnumpy_nulls(conn, fmt):
+    np = pytest.importorskip("numpy")
+    cur = conn.cursor(format=fmt)
+    cur.execute(
+        "select nullif(i, 2), '2021-01-01 12:00+02'::timestamptz"
+        " from generate_series(1, 3) as i"
+    )
+    ints, tss = cur.fetchnumpy()
+    assert isinstance(ints, np.ma.MaskedArray)
+    assert ints.tolist() == [1, None, 3]
+    assert not isinstance(tss, np.ma.MaskedArray)
+    assert tss[0] == np.datetime64("2021-01-01T10:00")
+
+
 def test_query_params_execute(conn):
     cur = conn.cursor()
     assert cur.query is None
@@ -1,8 +1,11 @@
 import gc
 import pytest
 import weakref
+import datetime as dt
 
 import psycopg3
+from psycopg3 import errors as e
+from psycopg3.pq import Format
 
 pytestmark = pytest.mark.asyncio
 
@@ -193,6 +196,85 @@ async def test_executemany_badquery(aconn, query):
         await cur.executemany(query, [(10, "hello"), (20, "world")])
 
 
+async def test_executemany_many(aconn, execmany):
+    cur = await aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(i, str(i)) for i in range(1000)],
+    )
+    assert cur.rowcount == 1000
+    await cur.execute("select count(*), sum(num) from execmany")
+    assert await cur.fetchone() == (1000, sum(range(1000)))
+
+
+async def test_executemany_large_batch(aconn, execmany):
+    cur = await aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        [(i, str(i)) for i in range(20000)],
+    )
+    assert cur.rowcount == 20000
+    await cur.execute("select count(*), sum(num) from execmany")
+    assert await cur.fetchone() == (20000, sum(range(20000)))
+
+
+async def test_executemany_large_batch_error(aconn, execmany):
+    await aconn.set_autocommit(True)
+    cur = await aconn.cursor()
+    params = [[str(i)] for i in range(5000)]
+    params[3500] = ["x"]
+    with pytest.raises(psycopg3.DataError):
+        await cur.executemany(
+            "insert into execmany(num) values (%s::int)", params
+        )
+    assert cur.params == [b"x"]
+    assert aconn.pgconn.pipeline_status == 0
+    # The queries before the failing one are committed, the ones in the
+    # following batches are not executed.
+    await cur.execute("select count(*) from execmany where num < 3500")
+    assert await cur.fetchone() == (3500,)
+    await cur.execute("select count(*) from execmany where num >= 4500")
+    assert await cur.fetchone() == (0,)
+
+
+async def test_executemany_error_autocommit(aconn, execmany):
+    await aconn.set_autocommit(True)
+    cur = await aconn.cursor()
+    with pytest.raises(psycopg3.DataError):
+        await cur.executemany(
+            "insert into execmany(num) values (%s::int)", [[1], [2], ["x"]]
+        )
+    assert cur.params == [b"x"]
+    await cur.execute("select num from execmany order by num")
+    assert await cur.fetchall() == [(1,), (2,)]
+
+
+async def test_executemany_error_transaction(aconn, execmany):
+    await aconn.set_autocommit(True)
+    cur = await aconn.cursor()
+    with pytest.raises(psycopg3.DataError):
+        async with aconn.transaction():
+            await cur.executemany(
+                "insert into execmany(num) values (%s::int)",
+                [[1], [2], ["x"]],
+            )
+    assert aconn.pgconn.pipeline_status == 0
+    await cur.execute("select num from execmany")
+    assert await cur.fetchall() == []
+
+
+async def test_executemany_dump_error(aconn, execmany):
+    await aconn.set_autocommit(True)
+    cur = await aconn.cursor()
+    with pytest.raises(psycopg3.ProgrammingError):
+        await cur.executemany(
+            "insert into execmany(num) values (%s)", [[1], [object()], [3]]
+        )
+    assert aconn.pgconn.pipeline_status == 0
+    await cur.execute("select num from execmany")
+    assert await cur.fetchall() == [(1,)]
+
+
 async def test_rowcount(aconn):
     cur = await aconn.cursor()
 
@@ -222,6 +304,30 @@ async def test_iter(aconn):
     assert res == [(1,), (2,), (3,)]
 
 
+async def test_fetch_columns(aconn):
+    cur = await aconn.cursor()
+    await cur.execute(
+        "select i, 'x' || i, nullif(i, 2) from generate_series(1, 3) as i"
+    )
+    assert await cur.fetchone() == (1, "x1", 1)
+    assert await cur.fetch_columns() == [[2, 3], ["x2", "x3"], [None, 3]]
+    assert await cur.fetch_columns() == [[], [], []]
+
+
+@pytest.mark.parametrize("fmt", [Format.TEXT, Format.BINARY])
+async def test_fetchnumpy(aconn, fmt):
+    np = pytest.importorskip("numpy")
+    cur = await aconn.cursor(format=fmt)
+    await cur.execute(
+        "select i, nullif(i, 2)::float8 from generate_series(1, 3) as i"
+    )
+    ints, floats = await cur.fetchnumpy()
+    assert ints.dtype == np.dtype("int32")
+    assert ints.tolist() == [1, 2, 3]
+    assert isinstance(floats, np.ma.MaskedArray)
+    assert floats.tolist() == [1.0, None, 3.0]
+
+
 async def test_query_params_execute(aconn):
     cur = await aconn.cursor()
     assert cur.query is None
@@ -269,3 +375,40 @@ async def test_iter_stop(aconn):
     assert (await cur.fetchone()) == (3,)
     async for rec in cur:
         assert False
+
+
+async def test_stream(aconn):
+    cur = await aconn.cursor()
+    recs = []
+    async for rec in cur.stream(
+        "select i, '2021-01-01'::date + i"
+        " from generate_series(1, %s::int) as i",
+        [2],
+    ):
+        recs.append(rec)
+
+    assert recs == [(1, dt.date(2021, 1, 2)), (2, dt.date(2021, 1, 3))]
+    assert cur.rowcount == 2
+
+
+async def test_stream_error(aconn):
+    cur = await aconn.cursor()
+    with pytest.raises(e.DivisionByZero):
+        async for rec in cur.stream(
+            "select 1 / (2 - i) from generate_series(1, 3) i"
+        ):
+            pass
+    assert aconn.pgconn.transaction_status == aconn.TransactionStatus.INERROR
+
+
+async def test_stream_break(aconn):
+    cur = await aconn.cursor()
+    it = cur.stream("select generate_series(1, 1000)")
+    async for rec in it:
+        assert rec == (1,)
+        break
+    await it.aclose()
+
+    assert aconn.pgconn.transaction_status == aconn.TransactionStatus.INTRANS
+    await cur.execute("select 42")
+    assert await cur.fetchone() == (42,)
@@ -0,0 +1,239 @@
+import pytest
+
+import psycopg3
+from psycopg3 import errors as e
+from psycopg3.pq import Format
+
+
+def get_cursors(conn):
+    cur = conn.cursor()
+    cur.execute("select name from pg_cursors order by name")
+    return [r[0] for r in cur.fetchall()]
+
+
+def test_funny_name(conn):
+    cur = conn.cursor("1-2-3")
+    assert isinstance(cur, psycopg3.NamedCursor)
+    cur.execute("select generate_series(1, 3) as bar")
+    assert cur.fetchall() == [(1,), (2,), (3,)]
+    assert cur.name == "1-2-3"
+    assert repr(cur) == "<NamedCursor '1-2-3'>"
+
+
+def test_properties(conn):
+    cur = conn.cursor("foo")
+    assert cur.scrollable is None
+    assert not cur.withhold
+    assert cur.itersize == 100
+
+    cur = conn.cursor("foo", scrollable=True, withhold=True)
+    assert cur.scrollable
+    assert cur.withhold
+
+
+def test_declare(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, %s) as bar", [3])
+    assert get_cursors(conn) == ["foo"]
+    assert cur.query.startswith(b'declare "foo" cursor for select')
+    assert cur.description[0].name == "bar"
+    assert cur.rowcount == 0
+
+
+def test_description_binary(conn):
+    cur = conn.cursor("foo", format=Format.BINARY)
+    cur.execute("select 10::int as a, 'hello'::text as b")
+    assert [c.name for c in cur.description] == ["a", "b"]
+    assert cur.fetchone() == (10, "hello")
+
+
+def test_fetchone(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, %s) as bar", [2])
+    assert cur.fetchone() == (1,)
+    assert cur.fetchone() == (2,)
+    assert cur.fetchone() is None
+    assert cur.rowcount == 2
+
+
+def test_fetchmany(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, %s) as bar", [5])
+    assert cur.fetchmany(3) == [(1,), (2,), (3,)]
+    assert cur.fetchone() == (4,)
+    assert cur.fetchmany(3) == [(5,)]
+    assert cur.fetchmany(3) == []
+
+
+def test_fetchall(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, %s) as bar", [3])
+    assert cur.fetchone() == (1,)
+    assert cur.fetchall() == [(2,), (3,)]
+    assert cur.fetchall() == []
+    assert cur.rowcount == 3
+
+
+def test_fetch_columns(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select i, i * 10 from generate_series(1, %s) as i", [3])
+    assert cur.fetchone() == (1, 10)
+    assert cur.fetch_columns() == [[2, 3], [20, 30]]
+    assert cur.fetch_columns() == [[], []]
+    assert cur.rowcount == 3
+
+
+def test_iter(conn):
+    cur = conn.cursor("foo")
+    cur.itersize = 2
+    cur.execute("select generate_series(1, %s) as bar", [5])
+    assert list(cur) == [(1,), (2,), (3,), (4,), (5,)]
+
+
+def test_iter_itersize(conn, monkeypatch):
+    cur = conn.cursor("foo")
+    cur.itersize = 2
+    cur.execute("select generate_series(1, %s) as bar", [4])
+
+    nfetches = 0
+    orig = cur._fetch_gen
+
+    def fetch_gen(num):
+        nonlocal nfetches
+        nfetches += 1
+        return orig(num)
+
+    monkeypatch.setattr(cur, "_fetch_gen", fetch_gen)
+    assert len(list(cur)) == 4
+    assert nfetches == 3
+
+
+def test_execute_reuse(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, %s) as foo", [3])
+    assert cur.fetchone() == (1,)
+    cur.execute("select %s::text as bar", ["hello"])
+    assert cur.fetchone() == ("hello",)
+    assert cur.description[0].name == "bar"
+    assert get_cursors(conn) == ["foo"]
+
+
+def test_execute_error(conn):
+    cur = conn.cursor("foo")
+    with pytest.raises(e.UndefinedColumn):
+        cur.execute("select wat")
+    conn.rollback()
+    with pytest.raises(e.ProgrammingError):
+        cur.execute("select 1; select 2")
+
+
+def test_executemany(conn):
+    cur = conn.cursor("foo")
+    with pytest.raises(e.NotSupportedError):
+        cur.executemany("select %s", [(1,), (2,)])
+
+
+def test_stream(conn):
+    cur = conn.cursor("foo")
+    with pytest.raises(e.NotSupportedError):
+        cur.stream("select 1")
+
+
+def test_copy(conn):
+    cur = conn.cursor("foo")
+    with pytest.raises(e.NotSupportedError):
+        with cur.copy("copy (select 1) to stdout"):
+            pass
+
+
+def test_fetch_not_executed(conn):
+    cur = conn.cursor("foo")
+    with pytest.raises(e.ProgrammingError):
+        cur.fetchone()
+
+
+def test_close(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, 10) as bar")
+    cur.close()
+    assert cur.closed
+    assert get_cursors(conn) == []
+    with pytest.raises(e.InterfaceError):
+        cur.fetchone()
+
+
+def test_close_after_commit(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, 10) as bar")
+    conn.commit()
+    conn.cursor().execute("select 1")
+    cur.close()
+    assert conn.pgconn.transaction_status == conn.TransactionStatus.INTRANS
+
+
+def test_close_inerror(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, 10) as bar")
+    with pytest.raises(e.DivisionByZero):
+        conn.cursor().execute("select 1 / 0")
+    cur.close()
+    assert cur.closed
+
+
+def test_context(conn):
+    with conn.cursor("foo") as cur:
+        cur.execute("select generate_series(1, 10) as bar")
+    assert cur.closed
+    assert get_cursors(conn) == []
+
+
+def test_withhold(conn):
+    cur = conn.cursor("foo", withhold=True)
+    cur.execute("select generate_series(1, %s) as bar", [3])
+    assert cur.query.startswith(b'declare "foo" cursor with hold for')
+    conn.commit()
+    assert cur.fetchall() == [(1,), (2,), (3,)]
+    cur.close()
+    assert get_cursors(conn) == []
+
+
+def test_no_withhold_dropped_on_commit(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select generate_series(1, %s) as bar", [3])
+    conn.commit()
+    with pytest.raises(e.InvalidCursorName):
+        cur.fetchone()
+
+
+@pytest.mark.parametrize("scrollable", [True, False])
+def test_scrollable(conn, scrollable):
+    cur = conn.cursor("foo", scrollable=scrollable)
+    cur.execute("select generate_series(0, 5) as bar")
+    kw = b"scroll" if scrollable else b"no scroll"
+    assert cur.query.startswith(b'declare "foo" ' + kw + b" cursor")
+    cur.scroll(2)
+    assert cur.fetchone() == (2,)
+    if scrollable:
+        cur.scroll(-2)
+        assert cur.fetchone() == (1,)
+        cur.scroll(0, mode="absolute")
+        assert cur.fetchone() == (0,)
+    else:
+        with pytest.raises(e.ObjectNotInPrerequisiteState):
+            cur.scroll(-2)
+
+
+def test_scroll_bad_mode(conn):
+    cur = conn.cursor("foo")
+    cur.execute("select 1")
+    with pytest.raises(ValueError):
+        cur.scroll(1, mode="wat")
+
+
+def test_pipeline(conn):
+    if not psycopg3.Pipeline.is_supported():
+        pytest.skip("pipeline mode not supported")
+    cur = conn.cursor("foo")
+    with conn.pipeline():
+        with pytest.raises(e.NotSupportedError):
+            cur.execute("select 1")
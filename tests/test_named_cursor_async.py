@@ -0,0 +1,81 @@
+import pytest
+
+import psycopg3
+from psycopg3 import errors as e
+
+pytestmark = pytest.mark.asyncio
+
+
+async def get_cursors(aconn):
+    cur = await aconn.cursor()
+    await cur.execute("select name from pg_cursors order by name")
+    return [r[0] for r in await cur.fetchall()]
+
+
+async def test_declare(aconn):
+    cur = await aconn.cursor("foo")
+    assert isinstance(cur, psycopg3.AsyncNamedCursor)
+    await cur.execute("select generate_series(1, %s) as bar", [3])
+    assert await get_cursors(aconn) == ["foo"]
+    assert cur.description[0].name == "bar"
+
+
+async def test_fetch(aconn):
+    cur = await aconn.cursor("foo")
+    await cur.execute("select generate_series(1, %s) as bar", [6])
+    assert await cur.fetchone() == (1,)
+    assert await cur.fetchmany(2) == [(2,), (3,)]
+    assert await cur.fetchall() == [(4,), (5,), (6,)]
+    assert await cur.fetchone() is None
+    assert cur.rowcount == 6
+
+
+async def test_iter(aconn):
+    cur = await aconn.cursor("foo")
+    cur.itersize = 2
+    await cur.execute("select generate_series(1, %s) as bar", [5])
+    rv = []
+    async for rec in cur:
+        rv.append(rec)
+    assert rv == [(1,), (2,), (3,), (4,), (5,)]
+
+
+async def test_close(aconn):
+    cur = await aconn.cursor("foo")
+    await cur.execute("select generate_series(1, 10) as bar")
+    await cur.close()
+    assert cur.closed
+    assert await get_cursors(aconn) == []
+
+
+async def test_context(aconn):
+    async with await aconn.cursor("foo") as cur:
+        await cur.execute("select generate_series(1, 10) as bar")
+    assert cur.closed
+    assert await get_cursors(aconn) == []
+
+
+async def test_withhold(aconn):
+    cur = await aconn.cursor("foo", withhold=True)
+    await cur.execute("select generate_series(1, %s) as bar", [3])
+    await aconn.commit()
+    assert await cur.fetchall() == [(1,), (2,), (3,)]
+    await cur.close()
+    assert await get_cursors(aconn) == []
+
+
+async def test_scroll(aconn):
+    cur = await aconn.cursor("foo", scrollable=True)
+    await cur.execute("select generate_series(0, 5) as bar")
+    await cur.scroll(2)
+    assert await cur.fetchone() == (2,)
+    await cur.scroll(-2)
+    assert await cur.fetchone() == (1,)
+    await cur.scroll(4, mode="absolute")
+    assert await cur.fetchone() == (4,)
+
+
+async def test_executemany(aconn):
+    cur = await aconn.cursor("foo")
+    with pytest.raises(e.NotSupportedError):
+        await cur.executemany("select %s", [(1,), (2,)])
@@ -0,0 +1,231 @@
+import pytest
+
+import psycopg3
+from psycopg3 import pq
+from psycopg3 import errors as e
+
+pytestmark = pytest.mark.libpq(">= 14")
+
+
+def test_pipeline_status(conn):
+    assert conn._pipeline is None
+    with conn.pipeline() as p:
+        assert conn._pipeline is p
+        assert conn.pgconn.pipeline_status == pq.PipelineStatus.ON
+    assert conn._pipeline is None
+    assert conn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+
+def test_pipeline_nested(conn):
+    with conn.pipeline():
+        with pytest.raises(e.ProgrammingError):
+            with conn.pipeline():
+                pass
+
+
+def test_execute_no_wait(conn):
+    with conn.pipeline():
+        cur = conn.cursor()
+        cur.execute("select pg_sleep(%s)", [0.01])
+        assert cur.pgresult is None
+        assert conn.pgconn.transaction_status == pq.TransactionStatus.ACTIVE
+    assert cur.pgresult.status == pq.ExecStatus.TUPLES_OK
+    assert conn.pgconn.transaction_status == pq.TransactionStatus.INTRANS
+
+
+def test_results_to_cursors(conn):
+    with conn.pipeline():
+        cur1 = conn.cursor()
+        cur2 = conn.cursor()
+        cur1.execute("select %s::int", [1])
+        cur2.execute("select %s::text, %s::text", ["a", "b"])
+        cur3 = conn.cursor().execute("select generate_series(1, 3)")
+
+    assert cur1.fetchone() == (1,)
+    assert cur2.fetchone() == ("a", "b")
+    assert cur3.fetchall() == [(1,), (2,), (3,)]
+    assert cur3.rowcount == 3
+
+
+def test_fetch_syncs(conn):
+    with conn.pipeline() as p:
+        cur1 = conn.cursor().execute("select %s::int", [1])
+        cur2 = conn.cursor().execute("select %s::int", [2])
+        assert cur2.fetchone() == (2,)
+        assert not p._queue
+        assert cur1.fetchone() == (1,)
+
+
+def test_sync(conn):
+    with conn.pipeline() as p:
+        cur = conn.cursor().execute("select 1")
+        p.sync()
+        assert cur.pgresult.status == pq.ExecStatus.TUPLES_OK
+        cur.execute("select 2")
+        p.sync()
+        assert cur.fetchone() == (2,)
+
+
+def test_cursor_reused(conn):
+    with conn.pipeline():
+        cur = conn.cursor()
+        cur.execute("select %s::int", [1])
+        cur.execute("select %s::int", [2])
+        assert cur.fetchall() == [(2,)]
+        assert cur.rowcount == 1
+
+
+def test_error(conn):
+    cur1 = conn.cursor()
+    cur2 = conn.cursor()
+    with pytest.raises(e.DivisionByZero):
+        with conn.pipeline():
+            cur1.execute("select 1")
+            cur2.execute("select 1 / %s::int", [0])
+            cur1.execute("select 2")
+
+    assert cur2.pgresult is None
+    assert cur1.pgresult is None
+    assert conn.pgconn.transaction_status == pq.TransactionStatus.INERROR
+    conn.rollback()
+
+
+def test_error_in_block_not_clobbered(conn):
+    with pytest.raises(ZeroDivisionError):
+        with conn.pipeline():
+            conn.cursor().execute("select 1 / %s::int", [0])
+            1 / 0
+
+    assert conn._pipeline is None
+    assert conn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+
+def test_recover_after_sync(conn):
+    conn.autocommit = True
+    with conn.pipeline() as p:
+        cur = conn.cursor()
+        cur.execute("select 1 / %s::int", [0])
+        with pytest.raises(e.DivisionByZero):
+            p.sync()
+        cur.execute("select %s::int", [1])
+        assert cur.fetchone() == (1,)
+
+
+def test_executemany(conn):
+    conn.cursor().execute("create temp table testmany (id int, data text)")
+    conn.commit()
+    with conn.pipeline():
+        cur = conn.cursor()
+        cur.executemany(
+            "insert into testmany values (%s, %s)",
+            [(10, "hello"), (20, "world")],
+        )
+        cur2 = conn.cursor().execute("select * from testmany order by id")
+
+    assert cur.rowcount == 2
+    assert cur2.fetchall() == [(10, "hello"), (20, "world")]
+
+
+def test_transaction(conn):
+    conn.cursor().execute("create temp table testtx (id int)")
+    conn.commit()
+    with conn.pipeline():
+        with conn.transaction():
+            conn.cursor().execute("insert into testtx values (%s)", [1])
+            with conn.transaction():
+                conn.cursor().execute("insert into testtx values (%s)", [2])
+            with pytest.raises(ZeroDivisionError):
+                with conn.transaction():
+                    conn.cursor().execute(
+                        "insert into testtx values (%s)", [3]
+                    )
+                    1 / 0
+
+    cur = conn.cursor().execute("select id from testtx order by id")
+    assert cur.fetchall() == [(1,), (2,)]
+
+
+def test_commit(conn):
+    with conn.pipeline():
+        conn.cursor().execute("select 1")
+        conn.commit()
+    assert conn.pgconn.transaction_status == pq.TransactionStatus.IDLE
+
+
+def test_begin_after_commit(conn):
+    conn.cursor().execute("create table if not exists testtx (id int)")
+    conn.cursor().execute("delete from testtx")
+    conn.commit()
+    with conn.pipeline():
+        cur = conn.cursor()
+        cur.execute("insert into testtx values (%s)", [1])
+        conn.commit()
+        cur.execute("insert into testtx values (%s)", [2])
+        conn.rollback()
+        cur.execute("insert into testtx values (%s)", [3])
+
+    conn.rollback()
+    cur = conn.cursor().execute("select id from testtx order by id")
+    assert cur.fetchall() == [(1,)]
+    conn.cursor().execute("drop table testtx")
+    conn.commit()
+
+
+def test_prepared(conn):
+    conn.prepare_threshold = 1
+    with conn.pipeline():
+        cur = conn.cursor()
+        for i in range(3):
+            cur.execute("select %s::int", [i])
+            assert cur.fetchone() == (i,)
+
+    assert conn.prepared_stats["prepared"] == 1
+    assert conn.prepared_stats["hits"] == 1
+
+
+def test_prepared_twice_in_pipeline(conn):
+    conn.prepare_threshold = 0
+    conn.prepared_max = 1
+    with conn.pipeline():
+        cur1 = conn.cursor().execute("select %s::int", [1])
+        cur2 = conn.cursor().execute("select %s::int", [2])
+
+    assert cur1.fetchone() == (1,)
+    assert cur2.fetchone() == (2,)
+    assert conn.prepared_stats["prepared"] == 1
+
+    cur = conn.cursor()
+    cur.execute("select %s::int", [3])
+    cur.execute("select count(*) from pg_prepared_statements", prepare=False)
+    assert cur.fetchone() == (1,)
+
+
+def test_prepare_error(conn):
+    conn.prepare_threshold = 0
+    with pytest.raises(e.UndefinedColumn):
+        with conn.pipeline():
+            conn.cursor().execute("select wat + %s", [1])
+    conn.rollback()
+    assert conn.prepared_stats["prepared"] == 0
+
+
+def test_copy_not_supported(conn):
+    cur = conn.cursor()
+    with conn.pipeline():
+        with pytest.raises(e.NotSupportedError):
+            with cur.copy("copy (select 1) to stdout"):
+                pass
+
+
+def test_closed(conn):
+    with conn.pipeline():
+        conn.cursor().execute("select 1")
+        conn.close()
+    assert conn._pipeline is None
+
+
+def test_repr(conn):
+    with conn.pipeline() as p:
+        assert repr(p).startswith("Pipeline(connection=")
+        assert isinstance(p, psycopg3.Pipeline)
+        assert p.connection is conn
@@ -0,0 +1,104 @@
+import pytest
+
+import psycopg3
+from psycopg3 import pq
+from psycopg3 import errors as e
+
+pytestmark = [pytest.mark.libpq(">= 14"), pytest.mark.asyncio]
+
+
+async def test_pipeline_status(aconn):
+    async with aconn.pipeline() as p:
+        assert aconn._pipeline is p
+        assert aconn.pgconn.pipeline_status == pq.PipelineStatus.ON
+        assert isinstance(p, psycopg3.AsyncPipeline)
+    assert aconn._pipeline is None
+    assert aconn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+
+async def test_results_to_cursors(aconn):
+    async with aconn.pipeline():
+        cur1 = await aconn.cursor()
+        cur2 = await aconn.cursor()
+        await cur1.execute("select %s::int", [1])
+        await cur2.execute("select %s::text, %s::text", ["a", "b"])
+        assert cur1.pgresult is None
+
+    assert await cur1.fetchone() == (1,)
+    assert await cur2.fetchone() == ("a", "b")
+
+
+async def test_fetch_syncs(aconn):
+    async with aconn.pipeline() as p:
+        cur1 = await (await aconn.cursor()).execute("select %s::int", [1])
+        cur2 = await (await aconn.cursor()).execute("select %s::int", [2])
+        assert await cur2.fetchall() == [(2,)]
+        assert not p._queue
+        assert await cur1.fetchone() == (1,)
+
+
+async def test_sync(aconn):
+    async with aconn.pipeline() as p:
+        cur = await aconn.cursor()
+        await cur.execute("select 1")
+        await p.sync()
+        assert cur.pgresult.status == pq.ExecStatus.TUPLES_OK
+
+
+async def test_error(aconn):
+    cur1 = await aconn.cursor()
+    cur2 = await aconn.cursor()
+    with pytest.raises(e.DivisionByZero):
+        async with aconn.pipeline():
+            await cur1.execute("select 1 / %s::int", [0])
+            await cur2.execute("select 1")
+
+    assert cur2.pgresult is None
+    assert aconn.pgconn.transaction_status == pq.TransactionStatus.INERROR
+    await aconn.rollback()
+
+
+async def test_executemany(aconn):
+    cur = await aconn.cursor()
+    await cur.execute("create temp table testmany (id int, data text)")
+    async with aconn.pipeline():
+        await cur.executemany(
+            "insert into testmany values (%s, %s)",
+            [(10, "hello"), (20, "world")],
+        )
+    assert cur.rowcount == 2
+
+
+async def test_transaction(aconn):
+    cur = await aconn.cursor()
+    await cur.execute("create temp table testtx (id int)")
+    await aconn.commit()
+    async with aconn.pipeline():
+        async with aconn.transaction():
+            await cur.execute("insert into testtx values (%s)", [1])
+            with pytest.raises(ZeroDivisionError):
+                async with aconn.transaction():
+                    await cur.execute("insert into testtx values (%s)", [2])
+                    1 / 0
+
+    await cur.execute("select id from testtx order by id")
+    assert await cur.fetchall() == [(1,)]
+
+
+async def test_begin_after_commit(aconn):
+    cur = await aconn.cursor()
+    await cur.execute("create table if not exists testtx (id int)")
+    await cur.execute("delete from testtx")
+    await aconn.commit()
+    async with aconn.pipeline():
+        await cur.execute("insert into testtx values (%s)", [1])
+        await aconn.commit()
+        await cur.execute("insert into testtx values (%s)", [2])
+        await aconn.rollback()
+        await cur.execute("insert into testtx values (%s)", [3])
+
+    await aconn.rollback()
+    await cur.execute("select id from testtx order by id")
+    assert await cur.fetchall() == [(1,)]
+    await cur.execute("drop table testtx")
+    await aconn.commit()
@@ -0,0 +1,351 @@
+import time
+import logging
+from threading import Thread
+
+import pytest
+
+import psycopg3
+from psycopg3 import pool
+from psycopg3.pq import TransactionStatus
+
+
+def test_defaults(dsn):
+    with pool.ConnectionPool(dsn) as p:
+        assert p.min_size == p.max_size == 4
+        assert p.timeout == 30
+        assert p.max_idle == 600
+        assert p.max_lifetime == 3600
+
+
+def test_min_size_max_size(dsn):
+    with pool.ConnectionPool(dsn, min_size=2) as p:
+        assert p.min_size == p.max_size == 2
+
+    with pool.ConnectionPool(dsn, min_size=2, max_size=4) as p:
+        assert p.min_size == 2
+        assert p.max_size == 4
+
+
+@pytest.mark.parametrize("min_size, max_size", [(1, 0), (-1, None), (4, 2)])
+def test_bad_size(dsn, min_size, max_size):
+    with pytest.raises(ValueError):
+        pool.ConnectionPool(min_size=min_size, max_size=max_size)
+
+
+def test_connection_class(dsn):
+    class MyConn(psycopg3.Connection):
+        pass
+
+    with pool.ConnectionPool(dsn, connection_class=MyConn, min_size=1) as p:
+        with p.connection() as conn:
+            assert isinstance(conn, MyConn)
+
+
+def test_kwargs(dsn):
+    with pool.ConnectionPool(
+        dsn, kwargs={"autocommit": True}, min_size=1
+    ) as p:
+        with p.connection() as conn:
+            assert conn.autocommit
+
+
+def test_its_really_a_pool(dsn):
+    with pool.ConnectionPool(dsn, min_size=2) as p:
+        with p.connection() as conn:
+            pid1 = conn.pgconn.backend_pid
+
+            with p.connection() as conn2:
+                pid2 = conn2.pgconn.backend_pid
+
+        with p.connection() as conn:
+            assert conn.pgconn.backend_pid in (pid1, pid2)
+
+
+def test_wait(dsn):
+    with pool.ConnectionPool(dsn, min_size=2) as p:
+        p.wait(2.0)
+        assert len(p._pool) == 2
+        pids = set()
+        for conn, _ in p._pool:
+            pids.add(conn.pgconn.backend_pid)
+        assert len(pids) == 2
+
+
+def test_wait_closed(dsn):
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        pass
+
+    with pytest.raises(pool.PoolClosed):
+        p.wait()
+
+
+def test_connection_not_lost(dsn):
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        with pytest.raises(ZeroDivisionError):
+            with p.connection() as conn:
+                pid = conn.pgconn.backend_pid
+                1 / 0
+
+        with p.connection() as conn2:
+            assert conn2.pgconn.backend_pid == pid
+
+
+def test_getconn_putconn(dsn):
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        conn = p.getconn()
+        conn.cursor().execute("select 1")
+        assert conn.pgconn.transaction_status == TransactionStatus.INTRANS
+        p.putconn(conn)
+        assert conn.pgconn.transaction_status == TransactionStatus.IDLE
+        assert not conn.closed
+
+
+def test_putconn_wrong_pool(dsn):
+    with pool.ConnectionPool(dsn, min_size=1) as p1:
+        with pool.ConnectionPool(dsn, min_size=1) as p2:
+            conn = p1.getconn()
+            with pytest.raises(psycopg3.ProgrammingError):
+                p2.putconn(conn)
+            p1.putconn(conn)
+
+
+def test_queue(dsn):
+    def worker(n):
+        t0 = time.time()
+        with p.connection() as conn:
+            (pid,) = (
+                conn.cursor().execute("select pg_backend_pid()").fetchone()
+            )
+            time.sleep(0.2)
+        t1 = time.time()
+        results.append((n, t1 - t0, pid))
+
+    results = []
+    with pool.ConnectionPool(dsn, min_size=2) as p:
+        ts = [Thread(target=worker, args=(i,)) for i in range(6)]
+        [t.start() for t in ts]
+        [t.join() for t in ts]
+
+    times = [item[1] for item in results]
+    want_times = [0.2, 0.2, 0.4, 0.4, 0.6, 0.6]
+    for got, want in zip(times, want_times):
+        assert got == pytest.approx(want, 0.2), times
+
+    assert len(set(r[2] for r in results)) == 2
+
+
+def test_queue_timeout(dsn):
+    def worker(n):
+        t0 = time.time()
+        try:
+            with p.connection() as conn:
+                cur = conn.cursor()
+                (pid,) = cur.execute("select pg_backend_pid()").fetchone()
+                time.sleep(0.2)
+        except pool.PoolTimeout as e:
+            t1 = time.time()
+            errors.append((n, t1 - t0, e))
+        else:
+            t1 = time.time()
+            results.append((n, t1 - t0, pid))
+
+    results = []
+    errors = []
+
+    with pool.ConnectionPool(dsn, min_size=2, timeout=0.1) as p:
+        ts = [Thread(target=worker, args=(i,)) for i in range(4)]
+        [t.start() for t in ts]
+        [t.join() for t in ts]
+
+    assert len(results) == 2
+    assert len(errors) == 2
+    for e in errors:
+        assert 0.1 <= e[1] < 0.3
+
+
+def test_grow(dsn):
+    def worker(n):
+        with p.connection() as conn:
+            conn.cursor().execute("select pg_sleep(0.2)")
+
+    with pool.ConnectionPool(dsn, min_size=1, max_size=3) as p:
+        p.wait(2.0)
+        ts = [Thread(target=worker, args=(i,)) for i in range(3)]
+        [t.start() for t in ts]
+        [t.join() for t in ts]
+        assert p._nconns == 3
+        assert len(p._pool) == 3
+
+
+def test_shrink(dsn):
+    with pool.ConnectionPool(dsn, min_size=1, max_size=3, max_idle=0.2) as p:
+        conns = [p.getconn() for i in range(3)]
+        for conn in conns:
+            p.putconn(conn)
+        assert p._nconns == 3
+
+        time.sleep(0.5)
+        assert p._nconns == 1
+        assert len(p._pool) == 1
+        assert sum(c.closed for c in conns) == 2
+
+
+def test_max_lifetime(dsn):
+    with pool.ConnectionPool(dsn, min_size=1, max_lifetime=0.2) as p:
+        pids = []
+        for i in range(5):
+            with p.connection() as conn:
+                pids.append(conn.pgconn.backend_pid)
+            time.sleep(0.1)
+
+    assert pids[0] == pids[1] != pids[4], pids
+
+
+def test_intrans_rollback(dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        conn = p.getconn()
+        pid = conn.pgconn.backend_pid
+        conn.cursor().execute("create table test_intrans_rollback ()")
+        assert conn.pgconn.transaction_status == TransactionStatus.INTRANS
+        p.putconn(conn)
+
+        with p.connection() as conn2:
+            assert conn2.pgconn.backend_pid == pid
+            cur = conn2.cursor()
+            cur.execute(
+                "select 1 from pg_class where relname = 'test_intrans_rollback'"
+            )
+            assert not cur.fetchone()
+
+    assert len(caplog.records) == 1
+    assert "INTRANS" in caplog.records[0].message
+
+
+def test_inerror_rollback(dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        conn = p.getconn()
+        pid = conn.pgconn.backend_pid
+        with pytest.raises(psycopg3.ProgrammingError):
+            conn.cursor().execute("wat")
+        assert conn.pgconn.transaction_status == TransactionStatus.INERROR
+        p.putconn(conn)
+
+        with p.connection() as conn2:
+            assert conn2.pgconn.backend_pid == pid
+            assert conn2.pgconn.transaction_status == TransactionStatus.IDLE
+
+    assert len(caplog.records) == 1
+    assert "INERROR" in caplog.records[0].message
+
+
+def test_commit_on_exit(dsn, svcconn):
+    svcconn.autocommit = True
+    svcconn.cursor().execute("drop table if exists test_pool_commit")
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        with p.connection() as conn:
+            conn.cursor().execute("create table test_pool_commit ()")
+
+        with p.connection() as conn:
+            assert conn.pgconn.transaction_status == TransactionStatus.IDLE
+            cur = conn.cursor()
+            cur.execute(
+                "select 1 from pg_class where relname = 'test_pool_commit'"
+            )
+            assert cur.fetchone()
+            cur.execute("drop table test_pool_commit")
+
+
+def test_broken_connection_replaced(dsn):
+    with pool.ConnectionPool(dsn, min_size=1) as p:
+        with p.connection() as conn:
+            pid = conn.pgconn.backend_pid
+            conn.close()
+
+        with p.connection() as conn:
+            assert conn.pgconn.backend_pid != pid
+            assert not conn.closed
+
+
+def test_close(dsn):
+    p = pool.ConnectionPool(dsn, min_size=2)
+    p.wait(2.0)
+    conns = [conn for conn, _ in p._pool]
+    p.close()
+    assert p.closed
+    assert all(conn.closed for conn in conns)
+
+    with pytest.raises(pool.PoolClosed):
+        p.getconn()
+
+
+def test_putconn_after_close(dsn):
+    p = pool.ConnectionPool(dsn, min_size=1)
+    conn = p.getconn()
+    p.close()
+    assert not conn.closed
+    p.putconn(conn)
+    assert conn.closed
+
+
+def test_close_wakes_waiters(dsn):
+    def worker():
+        try:
+            p.getconn(timeout=2.0)
+        except pool.PoolClosed as e:
+            errors.append(e)
+
+    errors = []
+    p = pool.ConnectionPool(dsn, min_size=1)
+    conn = p.getconn()
+    t = Thread(target=worker)
+    t.start()
+    time.sleep(0.1)
+    p.close()
+    t.join(1.0)
+    assert len(errors) == 1
+    p.putconn(conn)
+
+
+def test_reconnect_after_failure(dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    with pool.ConnectionPool(
+        "dbname=nosuchdb", kwargs={"host": "nosuchhost.invalid"}, min_size=1
+    ) as p:
+        with pytest.raises(pool.PoolTimeout):
+            p.wait(0.5)
+
+    assert caplog.records
+    assert "error connecting" in caplog.records[0].message
+
+
+def test_stats(dsn):
+    def worker(n):
+        with p.connection() as conn:
+            conn.cursor().execute("select pg_sleep(0.2)")
+
+    with pool.ConnectionPool(dsn, min_size=2) as p:
+        p.wait(2.0)
+        stats = p.get_stats()
+        assert stats["pool_min"] == 2
+        assert stats["pool_max"] == 2
+        assert stats["pool_size"] == 2
+        assert stats["pool_available"] == 2
+        assert stats["requests_waiting"] == 0
+        assert stats["connections_num"] == 2
+
+        ts = [Thread(target=worker, args=(i,)) for i in range(3)]
+        [t.start() for t in ts]
+        time.sleep(0.1)
+        stats = p.get_stats()
+        assert stats["pool_available"] == 0
+        assert stats["requests_waiting"] == 1
+        [t.join() for t in ts]
+
+        stats = p.pop_stats()
+        assert stats["requests_num"] == 3
+        assert stats["requests_queued"] == 1
+        assert 200 <= stats["requests_wait_ms"] < 300
+        assert 600 <= stats["usage_ms"] < 800
+        assert "requests_num" not in p.get_stats()
@@ -0,0 +1,322 @@
+import time
+import asyncio
+import logging
+
+import pytest
+
+import psycopg3
+from psycopg3 import pool
+from psycopg3.pq import TransactionStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_defaults(dsn):
+    async with pool.AsyncConnectionPool(dsn) as p:
+        assert p.min_size == p.max_size == 4
+        assert p.timeout == 30
+        assert p.max_idle == 600
+        assert p.max_lifetime == 3600
+        assert p.health_check
+
+
+async def test_connection_class(dsn):
+    class MyConn(psycopg3.AsyncConnection):
+        pass
+
+    async with pool.AsyncConnectionPool(
+        dsn, connection_class=MyConn, min_size=1
+    ) as p:
+        async with p.connection() as conn:
+            assert isinstance(conn, MyConn)
+
+
+async def test_its_really_a_pool(dsn):
+    async with pool.AsyncConnectionPool(dsn, min_size=2) as p:
+        async with p.connection() as conn:
+            pid1 = conn.pgconn.backend_pid
+
+            async with p.connection() as conn2:
+                pid2 = conn2.pgconn.backend_pid
+
+        async with p.connection() as conn:
+            assert conn.pgconn.backend_pid in (pid1, pid2)
+
+
+async def test_wait(dsn):
+    async with pool.AsyncConnectionPool(dsn, min_size=2) as p:
+        await p.wait(2.0)
+        assert len(p._pool) == 2
+        pids = set()
+        for conn, _ in p._pool:
+            pids.add(conn.pgconn.backend_pid)
+        assert len(pids) == 2
+
+
+async def test_connection_not_lost(dsn):
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p:
+        with pytest.raises(ZeroDivisionError):
+            async with p.connection() as conn:
+                pid = conn.pgconn.backend_pid
+                1 / 0
+
+        async with p.connection() as conn2:
+            assert conn2.pgconn.backend_pid == pid
+
+
+async def test_putconn_wrong_pool(dsn):
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p1:
+        async with pool.AsyncConnectionPool(dsn, min_size=1) as p2:
+            conn = await p1.getconn()
+            with pytest.raises(psycopg3.ProgrammingError):
+                await p2.putconn(conn)
+            await p1.putconn(conn)
+
+
+async def test_queue(dsn):
+    async def worker(n):
+        t0 = time.time()
+        async with p.connection() as conn:
+            cur = await conn.cursor()
+            await cur.execute("select pg_backend_pid()")
+            (pid,) = await cur.fetchone()
+            await asyncio.sleep(0.2)
+        t1 = time.time()
+        results.append((n, t1 - t0, pid))
+
+    results = []
+    async with pool.AsyncConnectionPool(dsn, min_size=2) as p:
+        await asyncio.gather(*(worker(i) for i in range(6)))
+
+    # The clients are served in the order they arrived, two at time
+    got = [set(r[0] for r in results[i : i + 2]) for i in range(0, 6, 2)]
+    assert got == [{0, 1}, {2, 3}, {4, 5}]
+    times = [item[1] for item in results]
+    want_times = [0.2, 0.2, 0.4, 0.4, 0.6, 0.6]
+    for got, want in zip(times, want_times):
+        assert got == pytest.approx(want, 0.2), times
+
+    assert len(set(r[2] for r in results)) == 2
+
+
+async def test_queue_timeout(dsn):
+    async def worker(n):
+        t0 = time.time()
+        try:
+            async with p.connection() as conn:
+                cur = await conn.cursor()
+                await cur.execute("select pg_backend_pid()")
+                (pid,) = await cur.fetchone()
+                await asyncio.sleep(0.2)
+        except pool.PoolTimeout as e:
+            t1 = time.time()
+            errors.append((n, t1 - t0, e))
+        else:
+            t1 = time.time()
+            results.append((n, t1 - t0, pid))
+
+    results = []
+    errors = []
+
+    async with pool.AsyncConnectionPool(dsn, min_size=2, timeout=0.1) as p:
+        await asyncio.gather(*(worker(i) for i in range(4)))
+
+    assert len(results) == 2
+    assert len(errors) == 2
+    for e in errors:
+        assert 0.1 <= e[1] < 0.3
+    assert not p._waiting
+
+
+async def test_queue_cancelled(dsn):
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p:
+        conn = await p.getconn()
+        t = asyncio.ensure_future(p.getconn())
+        await asyncio.sleep(0.1)
+        assert p.get_stats()["requests_waiting"] == 1
+        t.cancel()
+        await asyncio.sleep(0.1)
+        assert not p._waiting
+        assert p.get_stats()["requests_waiting"] == 0
+        await p.putconn(conn)
+        assert len(p._pool) == 1
+
+
+async def test_grow(dsn):
+    async def worker(n):
+        async with p.connection() as conn:
+            cur = await conn.cursor()
+            await cur.execute("select pg_sleep(0.2)")
+
+    async with pool.AsyncConnectionPool(dsn, min_size=1, max_size=3) as p:
+        await p.wait(2.0)
+        await asyncio.gather(*(worker(i) for i in range(3)))
+        assert p._nconns == 3
+        assert len(p._pool) == 3
+
+
+async def test_shrink(dsn):
+    async with pool.AsyncConnectionPool(
+        dsn, min_size=1, max_size=3, max_idle=0.2
+    ) as p:
+        conns = [await p.getconn() for i in range(3)]
+        for conn in conns:
+            await p.putconn(conn)
+        assert p._nconns == 3
+
+        await asyncio.sleep(0.5)
+        assert p._nconns == 1
+        assert len(p._pool) == 1
+        assert sum(c.closed for c in conns) == 2
+
+
+async def test_max_lifetime(dsn):
+    async with pool.AsyncConnectionPool(
+        dsn, min_size=1, max_lifetime=0.2
+    ) as p:
+        pids = []
+        for i in range(5):
+            async with p.connection() as conn:
+                pids.append(conn.pgconn.backend_pid)
+            await asyncio.sleep(0.1)
+
+    assert pids[0] == pids[1] != pids[4], pids
+
+
+async def test_intrans_rollback(dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p:
+        conn = await p.getconn()
+        pid = conn.pgconn.backend_pid
+        cur = await conn.cursor()
+        await cur.execute("create table test_intrans_rollback ()")
+        assert conn.pgconn.transaction_status == TransactionStatus.INTRANS
+        await p.putconn(conn)
+
+        async with p.connection() as conn2:
+            assert conn2.pgconn.backend_pid == pid
+            cur = await conn2.cursor()
+            await cur.execute(
+                "select 1 from pg_class where relname = 'test_intrans_rollback'"
+            )
+            assert not await cur.fetchone()
+
+    assert len(caplog.records) == 1
+    assert "INTRANS" in caplog.records[0].message
+
+
+async def test_inerror_rollback(dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p:
+        conn = await p.getconn()
+        pid = conn.pgconn.backend_pid
+        cur = await conn.cursor()
+        with pytest.raises(psycopg3.ProgrammingError):
+            await cur.execute("wat")
+        assert conn.pgconn.transaction_status == TransactionStatus.INERROR
+        await p.putconn(conn)
+
+        async with p.connection() as conn2:
+            assert conn2.pgconn.backend_pid == pid
+            assert conn2.pgconn.transaction_status == TransactionStatus.IDLE
+
+    assert len(caplog.records) == 1
+    assert "INERROR" in caplog.records[0].message
+
+
+async def test_broken_connection_replaced(dsn):
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p:
+        async with p.connection() as conn:
+            pid = conn.pgconn.backend_pid
+            await conn.close()
+
+        async with p.connection() as conn:
+            assert conn.pgconn.backend_pid != pid
+            assert not conn.closed
+
+        assert p.get_stats()["connections_lost"] == 1
+
+
+async def test_health_check(dsn, svcconn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    svcconn.autocommit = True
+    async with pool.AsyncConnectionPool(dsn, min_size=1) as p:
+        async with p.connection() as conn:
+            pid = conn.pgconn.backend_pid
+
+        svcconn.cursor().execute("select pg_terminate_backend(%s::int)", [pid])
+        await asyncio.sleep(0.1)
+
+        async with p.connection() as conn:
+            assert conn.pgconn.backend_pid != pid
+            cur = await conn.cursor()
+            await cur.execute("select 1")
+
+    assert "broken connection" in caplog.records[0].message
+
+
+async def test_close(dsn):
+    p = pool.AsyncConnectionPool(dsn, min_size=2)
+    await p.wait(2.0)
+    conns = [conn for conn, _ in p._pool]
+    await p.close()
+    assert p.closed
+    assert all(conn.closed for conn in conns)
+
+    with pytest.raises(pool.PoolClosed):
+        await p.getconn()
+
+
+async def test_close_wakes_waiters(dsn):
+    p = pool.AsyncConnectionPool(dsn, min_size=1)
+    conn = await p.getconn()
+    t = asyncio.ensure_future(p.getconn(timeout=2.0))
+    await asyncio.sleep(0.1)
+    await p.close()
+    with pytest.raises(pool.PoolClosed):
+        await t
+    await p.putconn(conn)
+    assert conn.closed
+
+
+async def test_reconnect_after_failure(dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg3.pool")
+    async with pool.AsyncConnectionPool(
+        "dbname=nosuchdb", kwargs={"host": "nosuchhost.invalid"}, min_size=1
+    ) as p:
+        with pytest.raises(pool.PoolTimeout):
+            await p.wait(0.5)
+        assert p.get_stats()["connections_errors"] >= 1
+
+    assert "error connecting" in caplog.records[0].message
+
+
+async def test_stats(dsn):
+    async def worker(n):
+        async with p.connection() as conn:
+            cur = await conn.cursor()
+            await cur.execute("select pg_sleep(0.2)")
+
+    async with pool.AsyncConnectionPool(dsn, min_size=2) as p:
+        await p.wait(2.0)
+        stats = p.get_stats()
+        assert stats["pool_min"] == 2
+        assert stats["pool_max"] == 2
+        assert stats["pool_size"] == 2
+        assert stats["pool_available"] == 2
+        assert stats["requests_waiting"] == 0
+        assert stats["connections_num"] == 2
+
+        ts = [asyncio.ensure_future(worker(i)) for i in range(3)]
+        await asyncio.sleep(0.1)
+        stats = p.get_stats()
+        assert stats["pool_available"] == 0
+        assert stats["requests_waiting"] == 1
+        await asyncio.gather(*ts)
+
+        stats = p.pop_stats()
+        assert stats["requests_num"] == 3
+        assert stats["requests_queued"] == 1
+        assert 200 <= stats["requests_wait_ms"] < 300
+        assert 600 <= stats["usage_ms"] < 800
+        assert "requests_num" not in p.get_stats()
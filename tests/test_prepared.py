@@ -0,0 +1,188 @@
+"""
+Prepared statements tests
+"""
+
+import pytest
+
+from psycopg3 import errors as e
+from psycopg3.pq import Format
+
+
+def get_prepared(conn):
+    cur = conn.cursor()
+    cur.execute(
+        "select statement from pg_prepared_statements order by prepare_time",
+        prepare=False,
+    )
+    return [r[0] for r in cur.fetchall()]
+
+
+def test_connection_attributes(conn):
+    assert conn.prepare_threshold == 5
+    assert conn.prepared_max == 100
+
+    conn.prepare_threshold = 0
+    assert conn.prepare_threshold == 0
+    conn.prepared_max = 10
+    assert conn.prepared_max == 10
+
+
+def test_dont_prepare(conn):
+    cur = conn.cursor()
+    for i in range(10):
+        cur.execute("select %s::int", [i], prepare=False)
+
+    assert get_prepared(conn) == []
+    assert conn.prepared_stats["hits"] == 0
+
+
+def test_do_prepare(conn):
+    cur = conn.cursor()
+    cur.execute("select %s::int", [10], prepare=True)
+    assert cur.fetchone() == (10,)
+    assert get_prepared(conn) == ["select $1::int"]
+
+
+def test_auto_prepare(conn):
+    cur = conn.cursor()
+    res = []
+    for i in range(10):
+        cur.execute("select %s::int", [0])
+        res.append(cur.fetchone()[0])
+        if i < 5:
+            assert get_prepared(conn) == []
+
+    assert res == [0] * 10
+    assert get_prepared(conn) == ["select $1::int"]
+    stats = conn.prepared_stats
+    assert stats["hits"] == 4
+    assert stats["misses"] == 6
+    assert stats["prepared"] == 1
+
+
+def test_prepare_threshold_init(conn):
+    conn.prepare_threshold = 2
+    cur = conn.cursor()
+    for i in range(2):
+        cur.execute("select %s::int", [i])
+        assert get_prepared(conn) == []
+
+    cur.execute("select %s::int", [2])
+    assert get_prepared(conn) == ["select $1::int"]
+    assert cur.fetchone() == (2,)
+
+
+def test_prepare_threshold_zero(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    cur.execute("select %s::int", [10])
+    assert get_prepared(conn) == ["select $1::int"]
+
+
+def test_prepare_disable(conn):
+    conn.prepare_threshold = None
+    cur = conn.cursor()
+    for i in range(10):
+        cur.execute("select %s::int", [i])
+
+    assert get_prepared(conn) == []
+    assert conn.prepared_stats == {"hits": 0, "misses": 0, "prepared": 0}
+
+
+def test_no_params_not_prepared(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    cur.execute("select 1")
+    assert get_prepared(conn) == []
+
+
+def test_binary_prepared(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor(format=Format.BINARY)
+    cur.execute("select 1::int")
+    cur.execute("select 1::int")
+    assert cur.fetchone() == (1,)
+    assert get_prepared(conn) == ["select 1::int"]
+
+
+def test_different_types(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    cur.execute("select %s", [None])
+    cur.execute("select %s", [10])
+    cur.execute("select %s", [1.5])
+    cur.execute("select %s", [10])
+    assert cur.fetchone() == (10,)
+    assert len(get_prepared(conn)) == 3
+    assert conn.prepared_stats["hits"] == 1
+
+
+def test_evict_lru(conn):
+    conn.prepare_threshold = 0
+    conn.prepared_max = 5
+    cur = conn.cursor()
+    for i in range(10):
+        cur.execute("select 'a'::text, %s::int", [i])
+        cur.execute(f"select {i}::text, %s::int", [i])
+
+    assert conn.prepared_stats["prepared"] == 5
+    assert get_prepared(conn) == ["select 'a'::text, $1::int"] + [
+        f"select {i}::text, $1::int" for i in range(6, 10)
+    ]
+
+
+def test_evict_lru_deallocate_after_error(conn):
+    conn.prepare_threshold = 0
+    conn.prepared_max = 1
+    cur = conn.cursor()
+    cur.execute("select %s::int", [1])
+    with pytest.raises(e.DivisionByZero):
+        cur.execute("select 1 / %s::int", [0])
+
+    conn.rollback()
+    assert get_prepared(conn) == ["select $1::int", "select 1 / $1::int"]
+
+    cur.execute("select 1 + %s::int", [0])
+    assert get_prepared(conn) == ["select 1 + $1::int"]
+
+
+def test_prepare_error(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    with pytest.raises(e.UndefinedColumn):
+        cur.execute("select wat + %s", [1])
+    conn.rollback()
+    assert get_prepared(conn) == []
+
+
+def test_discard_all(conn):
+    conn.autocommit = True
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    cur.execute("select %s::int", [1])
+    assert conn.prepared_stats["prepared"] == 1
+    cur.execute("discard all")
+    assert conn.prepared_stats["prepared"] == 0
+    cur.execute("select %s::int", [1])
+    assert cur.fetchone() == (1,)
+
+
+def test_deallocate_all(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    cur.execute("select %s::int", [1])
+    cur.execute("deallocate all")
+    assert conn.prepared_stats["prepared"] == 0
+    cur.execute("select %s::int", [1])
+    assert cur.fetchone() == (1,)
+    assert get_prepared(conn) == ["select $1::int"]
+
+
+def test_multiple_statements_not_prepared(conn):
+    conn.prepare_threshold = 0
+    cur = conn.cursor()
+    for i in range(3):
+        cur.execute("select 1; select 2", ())
+
+    assert cur.fetchone() == (1,)
+    assert get_prepared(conn) == []
@@ -0,0 +1,74 @@
+"""
+Prepared statements tests on async connections
+"""
+
+import pytest
+
+from psycopg3 import errors as e
+
+pytestmark = pytest.mark.asyncio
+
+
+async def get_prepared(aconn):
+    cur = await aconn.cursor()
+    await cur.execute(
+        "select statement from pg_prepared_statements order by prepare_time",
+        prepare=False,
+    )
+    return [r[0] for r in await cur.fetchall()]
+
+
+async def test_dont_prepare(aconn):
+    cur = await aconn.cursor()
+    for i in range(10):
+        await cur.execute("select %s::int", [i], prepare=False)
+
+    assert await get_prepared(aconn) == []
+
+
+async def test_do_prepare(aconn):
+    cur = await aconn.cursor()
+    await cur.execute("select %s::int", [10], prepare=True)
+    assert await cur.fetchone() == (10,)
+    assert await get_prepared(aconn) == ["select $1::int"]
+
+
+async def test_auto_prepare(aconn):
+    cur = await aconn.cursor()
+    res = []
+    for i in range(10):
+        await cur.execute("select %s::int", [0])
+        res.append((await cur.fetchone())[0])
+        if i < 5:
+            assert await get_prepared(aconn) == []
+
+    assert res == [0] * 10
+    assert await get_prepared(aconn) == ["select $1::int"]
+    assert aconn.prepared_stats == {"hits": 4, "misses": 6, "prepared": 1}
+
+
+async def test_evict_lru(aconn):
+    aconn.prepare_threshold = 0
+    aconn.prepared_max = 5
+    cur = await aconn.cursor()
+    for i in range(10):
+        await cur.execute("select 'a'::text, %s::int", [i])
+        await cur.execute(f"select {i}::text, %s::int", [i])
+
+    assert aconn.prepared_stats["prepared"] == 5
+    assert await get_prepared(aconn) == ["select 'a'::text, $1::int"] + [
+        f"select {i}::text, $1::int" for i in range(6, 10)
+    ]
+
+
+async def test_evict_lru_deallocate_after_error(aconn):
+    aconn.prepare_threshold = 0
+    aconn.prepared_max = 1
+    cur = await aconn.cursor()
+    await cur.execute("select %s::int", [1])
+    with pytest.raises(e.DivisionByZero):
+        await cur.execute("select 1 / %s::int", [0])
+
+    await aconn.rollback()
+    await cur.execute("select 1 + %s::int", [0])
+    assert await get_prepared(aconn) == ["select 1 + $1::int"]
@@ -0,0 +1,121 @@
+import sys
+import pytest
+
+import psycopg3
+from psycopg3 import rows
+
+
+def test_dict_row(conn):
+    cur = conn.cursor(row_factory=rows.dict_row)
+    cur.execute("select 'bob' as name, 3 as id")
+    assert cur.fetchall() == [{"name": "bob", "id": 3}]
+
+    cur.execute("select 'a' as letter; select 1 as number")
+    assert cur.fetchall() == [{"letter": "a"}]
+    assert cur.nextset()
+    assert cur.fetchall() == [{"number": 1}]
+    assert not cur.nextset()
+
+
+def test_namedtuple_row(conn):
+    cur = conn.cursor(row_factory=rows.namedtuple_row)
+    cur.execute("select 'bob' as name, 3 as id")
+    (person1,) = cur.fetchall()
+    assert f"{person1.name} {person1.id}" == "bob 3"
+
+    cur.execute("select 'alice' as name, 1 as id")
+    (person2,) = cur.fetchall()
+    assert type(person2) is type(person1)
+
+    cur.execute("select 1 as a, 2 as b, 3 as c")
+    (r,) = cur.fetchall()
+    assert type(r) is not type(person1)
+    assert r == (1, 2, 3)
+    assert r._fields == ("a", "b", "c")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="no dataclasses")
+def test_dataclass_row(conn):
+    cur = conn.cursor(row_factory=rows.dataclass_row)
+    cur.execute("select 'bob' as name, 3 as id")
+    rec = cur.fetchone()
+    assert (rec.name, rec.id) == ("bob", 3)
+    assert type(rec).__name__ == "Row"
+
+
+def test_names_as_identifiers(conn):
+    cur = conn.cursor(row_factory=rows.namedtuple_row)
+    cur.execute('select 1, 2, 3 as "class", 4 as "2x", 5 as "a b", 6 as a')
+    rec = cur.fetchone()
+    assert rec._fields == (
+        "f_column_",
+        "f_column__1",
+        "class_",
+        "f2x",
+        "a_b",
+        "a",
+    )
+    assert rec == (1, 2, 3, 4, 5, 6)
+
+
+def test_row_factory_fetch_methods(conn):
+    cur = conn.cursor(row_factory=rows.dict_row)
+    cur.execute("select generate_series(1, 4) as n")
+    assert cur.fetchone() == {"n": 1}
+    assert cur.fetchmany(2) == [{"n": 2}, {"n": 3}]
+    assert list(cur) == [{"n": 4}]
+
+
+def test_connection_row_factory(dsn):
+    with psycopg3.connect(dsn, row_factory=rows.dict_row) as conn:
+        assert conn.row_factory is rows.dict_row
+        cur = conn.cursor()
+        assert cur.row_factory is rows.dict_row
+        assert cur.execute("select 1 as x").fetchone() == {"x": 1}
+
+        cur = conn.cursor(row_factory=rows.namedtuple_row)
+        assert cur.execute("select 1 as x").fetchone().x == 1
+
+
+def test_cursor_row_factory_change(conn):
+    cur = conn.cursor()
+    cur.execute("select 1 as x")
+    assert cur.fetchone() == (1,)
+    cur.row_factory = rows.dict_row
+    cur.execute("select 1 as x")
+    assert cur.fetchone() == {"x": 1}
+
+
+def test_stream(conn):
+    cur = conn.cursor(row_factory=rows.dict_row)
+    recs = list(cur.stream("select generate_series(1, 2) as n"))
+    assert recs == [{"n": 1}, {"n": 2}]
+
+
+def test_named_cursor(conn):
+    cur = conn.cursor("foo", row_factory=rows.namedtuple_row)
+    cur.execute("select generate_series(1, 3) as n")
+    assert cur.fetchone().n == 1
+    assert [r.n for r in cur.fetchall()] == [2, 3]
+
+
+def test_maker_once_per_result(conn):
+    calls = 0
+
+    def counting_row(cursor):
+        nonlocal calls
+        calls += 1
+        return rows.dict_row(cursor)
+
+    cur = conn.cursor(row_factory=counting_row)
+    cur.execute("select generate_series(1, 10) as n")
+    assert len(cur.fetchall()) == 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async(aconn):
+    cur = await aconn.cursor(row_factory=rows.dict_row)
+    await cur.execute("select generate_series(1, 2) as n")
+    assert await cur.fetchone() == {"n": 1}
+    assert await cur.fetchall() == [{"n": 2}]
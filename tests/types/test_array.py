@@ -1,3 +1,6 @@
+from array import array as pyarray
+from decimal import Decimal
+
 import pytest
 import psycopg3
 from psycopg3.oids import builtins
@@ -75,6 +78,39 @@ def test_dump_list_int(conn, obj, want):
     assert cur.fetchone()[0]
 
 
+@pytest.mark.parametrize(
+    "obj, want, type",
+    [
+        ([1, None, -30], b"{1,NULL,-30}", "int8"),
+        ([[1, 2], [3, 4]], b"{{1,2},{3,4}}", "int8"),
+        ([1.5, -2.0], b"{1.5,-2.0}", "float8"),
+        ([1.5, 2], b"{1.5,2}", "float8"),
+        ([None, 2, 1.5], b"{NULL,2,1.5}", "int8"),
+        ([Decimal("1.50"), Decimal("NaN")], b"{1.50,NaN}", "numeric"),
+        (["foo", "null", "", "a b"], b'{foo,"null","","a b"}', "text"),
+        (['a"b', "c\\d", "{}"], b'{"a\\"b","c\\\\d","{}"}', "text"),
+    ],
+)
+def test_dump_list_text(obj, want, type):
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.TEXT)
+    assert dumper.dump(obj) == want
+    assert dumper.oid == builtins[type].array_oid
+
+
+def test_dump_list_large():
+    tx = Transformer()
+    obj = list(range(-50000, 50000))
+    dumper = tx.get_dumper(obj, Format.TEXT)
+    assert dumper.dump(obj) == b"{%s}" % ",".join(map(str, obj)).encode()
+
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    data = dumper.dump(obj)
+    assert len(data) == 12 + 8 + 12 * len(obj)
+    loader = tx.get_loader(builtins["int8"].array_oid, Format.BINARY)
+    assert loader.load(data) == obj
+
+
 @pytest.mark.parametrize(
     "input",
     [
@@ -125,3 +161,175 @@ def test_array_mixed_numbers(array, type):
     dumper = tx.get_dumper(array, Format.BINARY)
     dumper.dump(array)
     assert dumper.oid == builtins[type].array_oid
+
+
+@pytest.mark.parametrize(
+    "type, data, want",
+    [
+        ("int2", b"{1,-2,NULL,32767}", [1, -2, None, 32767]),
+        (
+            "int8",
+            b"{0,-9223372036854775808,9223372036854775807}",
+            [0, -9223372036854775808, 9223372036854775807],
+        ),
+        ("int8", b"{{1,2},{NULL,4}}", [[1, 2], [None, 4]]),
+        ("float8", b"{1.5,-Infinity,NULL}", [1.5, float("-inf"), None]),
+        ("numeric", b"{1.50,-2}", [Decimal("1.50"), Decimal("-2")]),
+        (
+            "text",
+            b'{a,"b,c","d\\"e",NULL,"NULL"}',
+            ["a", "b,c", 'd"e', None, "NULL"],
+        ),
+    ],
+)
+def test_load_array_text(type, data, want):
+    tx = Transformer()
+    loader = tx.get_loader(builtins[type].array_oid, Format.TEXT)
+    assert loader.load(data) == want
+
+
+@pytest.mark.parametrize(
+    "type, obj",
+    [
+        ("int8", [-(2 ** 63), None, 2 ** 63 - 1]),
+        ("int8", [[1, -2], [None, 2 ** 31 - 1]]),
+        ("float8", [[[1.5]], [[None]], [[-0.25]]]),
+        ("text", ["a", None, "b,c", ""]),
+        ("numeric", [Decimal("1.50"), None]),
+    ],
+)
+def test_load_array_binary(type, obj):
+    tx = Transformer()
+    data = tx.get_dumper(obj, Format.BINARY).dump(obj)
+    # the float binary dumper doesn't declare its oid: set the element oid
+    data = data[:8] + builtins[type].oid.to_bytes(4, "big") + data[12:]
+    loader = tx.get_loader(builtins[type].array_oid, Format.BINARY)
+    assert loader.load(data) == obj
+
+
+@pytest.mark.parametrize("data", [b"1,2}", b'"a"', b"{1,2}}"])
+def test_load_array_text_malformed(data):
+    tx = Transformer()
+    loader = tx.get_loader(builtins["int4"].array_oid, Format.TEXT)
+    with pytest.raises(psycopg3.DataError):
+        loader.load(data)
+
+
+@pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("type", ["int8", "float8", "text", "uuid"])
+def test_load_large_array(conn, fmt_out, type):
+    cur = conn.cursor(format=fmt_out)
+    cur.execute(
+        """
+        select array_agg(
+            case when x % 100 = 0 then null else {} end order by x)
+        from generate_series(1, 10000) x
+        """.format(
+            "md5(x::text)::uuid"
+            if type == "uuid"
+            else f"(x::int8 * 1000003)::{type}"
+        )
+    )
+    got = cur.fetchone()[0]
+    assert len(got) == 10000
+    assert got[99] is None
+    if type == "uuid":
+        assert str(got[0]) == "c4ca4238-a0b9-2382-0dcc-509a6f75849b"
+    else:
+        assert str(got[0]).startswith("1000003")
+        assert float(got[-2]) == float(got[0]) * 9999
+
+
+@pytest.mark.parametrize(
+    "typecode, type",
+    [
+        ("h", "int2"),
+        ("i", "int4"),
+        ("q", "int8"),
+        ("f", "float4"),
+        ("d", "float8"),
+    ],
+)
+def test_dump_array_array_binary(typecode, type):
+    obj = pyarray(typecode, [1, -2, 3])
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    data = dumper.dump(obj)
+    assert dumper.oid == builtins[type].array_oid
+    assert data[8:12] == builtins[type].oid.to_bytes(4, "big")
+    loader = tx.get_loader(builtins[type].array_oid, Format.BINARY)
+    assert loader.load(data) == [1, -2, 3]
+
+
+def test_dump_array_array_unsigned():
+    obj = pyarray("B", [1, 200])
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    data = dumper.dump(obj)
+    assert dumper.oid == builtins["int8"].array_oid
+    loader = tx.get_loader(builtins["int8"].array_oid, Format.BINARY)
+    assert loader.load(data) == [1, 200]
+
+
+def test_dump_array_array_text():
+    obj = pyarray("i", [1, -2, 3])
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.TEXT)
+    assert dumper.dump(obj) == b"{1,-2,3}"
+
+
+def test_dump_array_array_empty():
+    obj = pyarray("i")
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    loader = tx.get_loader(builtins["int4"].array_oid, Format.BINARY)
+    assert loader.load(dumper.dump(obj)) == []
+    assert dumper.oid == builtins["int4"].array_oid
+
+
+@pytest.mark.parametrize(
+    "dtype, type",
+    [
+        ("int16", "int2"),
+        ("int32", "int4"),
+        ("int64", "int8"),
+        (">i8", "int8"),
+        ("float32", "float4"),
+        ("float64", "float8"),
+        ("bool", "bool"),
+    ],
+)
+def test_dump_numpy_binary(dtype, type):
+    np = pytest.importorskip("numpy")
+    obj = np.array([[1, 0], [0, 1], [1, 1]], dtype=dtype)
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    data = dumper.dump(obj)
+    assert dumper.oid == builtins[type].array_oid
+    loader = tx.get_loader(builtins[type].array_oid, Format.BINARY)
+    assert loader.load(data) == obj.tolist()
+
+    # non-contiguous arrays are dumped too
+    data = dumper.dump(obj.T)
+    assert loader.load(data) == obj.T.tolist()
+
+
+@pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
+def test_roundtrip_array_array(conn, fmt_in):
+    cur = conn.cursor()
+    ph = "%s" if fmt_in == Format.TEXT else "%b"
+    obj = pyarray("q", range(10000))
+    cur.execute(
+        f"select {ph} = array(select generate_series(0, 9999)::int8)", [obj]
+    )
+    assert cur.fetchone()[0]
+
+
+def test_copy_array_array(conn):
+    cur = conn.cursor()
+    cur.execute("create temp table testarr (data float8[])")
+    with cur.copy("copy testarr from stdin (format binary)") as copy:
+        copy.write_row([pyarray("d", [1.5, -2.5])])
+
+    cur.execute("select data from testarr")
+    assert cur.fetchone()[0] == [1.5, -2.5]
@@ -1,7 +1,11 @@
+import struct
+from collections import namedtuple
+
 import pytest
 
+import psycopg3
 from psycopg3.oids import builtins
-from psycopg3.adapt import Format, Loader
+from psycopg3.adapt import Format, Loader, Transformer
 from psycopg3.types import composite
 
 
@@ -196,3 +200,126 @@ def test_register_scope(conn):
             key = oid, fmt
             assert key not in Loader.globals
             assert key in conn.loaders
+
+
+def test_dump_composite_binary():
+    info = composite.CompositeTypeInfo(
+        "thing",
+        99999,
+        0,
+        [
+            composite.FieldInfo("foo", builtins["text"].oid),
+            composite.FieldInfo("bar", builtins["int4"].oid),
+            composite.FieldInfo("baz", builtins["float8"].oid),
+        ],
+    )
+    tx = Transformer()
+    composite.register(info, tx)
+    obj = tx.get_loader(99999, Format.TEXT).load(b"(hello,10,2.5)")
+    assert obj == ("hello", 10, 2.5)
+
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    assert dumper.oid == 99999
+    data = dumper.dump(obj)
+    assert data == (
+        b"\x00\x00\x00\x03"
+        + b"\x00\x00\x00\x19\x00\x00\x00\x05hello"
+        + b"\x00\x00\x00\x17\x00\x00\x00\x04\x00\x00\x00\x0a"
+        + b"\x00\x00\x02\xbd\x00\x00\x00\x08"
+        + struct.pack("!d", 2.5)
+    )
+    assert tx.get_loader(99999, Format.BINARY).load(data) == obj
+
+    obj = obj._replace(bar=None)
+    data = dumper.dump(obj)
+    assert tx.get_loader(99999, Format.BINARY).load(data) == obj
+
+    with pytest.raises(psycopg3.DataError):
+        dumper.dump(obj[:2])
+
+
+@pytest.fixture(scope="session")
+def testcomp_types(svcconn):
+    cur = svcconn.cursor()
+    cur.execute(
+        """
+        drop type if exists testcomp_types cascade;
+        create type testcomp_types as (
+            num numeric, txt text, f4 float4, i4 int4, arr int4[]);
+        """
+    )
+
+
+def test_dump_composite_binary_convert(conn, testcomp_types):
+    info = composite.fetch_info(conn, "testcomp_types")
+    Thing = namedtuple("Thing", "num txt f4 i4 arr")
+    composite.register(info, conn, factory=Thing)
+    obj = Thing(5, "hello", 2.5, 10.0, [1, None, 3])
+    cur = conn.cursor()
+    cur.execute(
+        "select (%b).num::text, (%b).f4::text, (%b).i4, (%b).arr",
+        [obj] * 4,
+    )
+    assert cur.fetchone() == ("5", "2.5", 10, [1, None, 3])
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("text", 10),
+        ("numeric", "10"),
+        ("int4", 1.5),
+        ("int4", 2 ** 40),
+        ("int2", 100000),
+        ("float8", "1.0"),
+        ("int4[]", [1.5]),
+    ],
+)
+def test_dump_composite_binary_bad_field(field, value):
+    oid = (
+        builtins[field[:-2]].array_oid
+        if field.endswith("[]")
+        else builtins[field].oid
+    )
+    info = composite.CompositeTypeInfo(
+        "thing", 99999, 0, [composite.FieldInfo("foo", oid)]
+    )
+    Thing = namedtuple("Thing", "foo")
+    tx = Transformer()
+    composite.register(info, tx, factory=Thing)
+    obj = Thing(value)
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    with pytest.raises(psycopg3.DataError):
+        dumper.dump(obj)
+
+
+@pytest.mark.parametrize(
+    "data, want",
+    [
+        (b"()", ()),
+        (b"(,)", (None, None)),
+        (b'(,"")', (None, "")),
+        (
+            b'(42,foo,"ba,r","qu""x","a\\\\b")',
+            ("42", "foo", "ba,r", 'qu"x', "a\\b"),
+        ),
+    ],
+)
+def test_load_record_text(data, want):
+    tx = Transformer()
+    loader = tx.get_loader(builtins["record"].oid, Format.TEXT)
+    assert loader.load(data) == want
+
+
+@pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
+def test_roundtrip_composite_binary(conn, testcomp, fmt_out):
+    info = composite.fetch_info(conn, "testcomp")
+    composite.register(info, conn)
+    cur = conn.cursor(format=fmt_out)
+    obj = cur.execute("select row('hello', 10, 20)::testcomp").fetchone()[0]
+
+    res = cur.execute("select %b", [obj]).fetchone()[0]
+    assert res == obj
+    obj = obj._replace(foo=None)
+    res = cur.execute("select %b", [obj]).fetchone()[0]
+    assert res == obj
@@ -35,8 +35,17 @@ def test_dump_date(conn, val, expr):
     assert cur.fetchone()[0] is True
 
 
-@pytest.mark.xfail  # TODO: binary dump
-@pytest.mark.parametrize("val, expr", [("2000,1,1", "2000-01-01")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min", "0001-01-01"),
+        ("1000,1,1", "1000-01-01"),
+        ("2000,1,1", "2000-01-01"),
+        ("2000,12,31", "2000-12-31"),
+        ("3000,1,1", "3000-01-01"),
+        ("max", "9999-12-31"),
+    ],
+)
 def test_dump_date_binary(conn, val, expr):
     cur = conn.cursor()
     cur.execute(f"select '{expr}'::date = %b", (as_date(val),))
@@ -68,14 +77,33 @@ def test_load_date(conn, val, expr):
     assert cur.fetchone()[0] == as_date(val)
 
 
-@pytest.mark.xfail  # TODO: binary load
-@pytest.mark.parametrize("val, expr", [("2000,1,1", "2000-01-01")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min", "0001-01-01"),
+        ("1000,1,1", "1000-01-01"),
+        ("2000,1,1", "2000-01-01"),
+        ("2000,12,31", "2000-12-31"),
+        ("3000,1,1", "3000-01-01"),
+        ("max", "9999-12-31"),
+    ],
+)
 def test_load_date_binary(conn, val, expr):
     cur = conn.cursor(format=Format.BINARY)
     cur.execute(f"select '{expr}'::date")
     assert cur.fetchone()[0] == as_date(val)
 
 
+@pytest.mark.parametrize(
+    "expr", ["'infinity'::date", "'-infinity'::date", "'0001-01-01'::date - 1"]
+)
+def test_load_date_binary_overflow(conn, expr):
+    cur = conn.cursor(format=Format.BINARY)
+    cur.execute(f"select {expr}")
+    with pytest.raises(DataError):
+        cur.fetchone()[0]
+
+
 @pytest.mark.parametrize("datestyle_out", ["ISO", "Postgres", "SQL", "German"])
 def test_load_date_datestyle(conn, datestyle_out):
     cur = conn.cursor()
@@ -119,15 +147,20 @@ def test_dump_datetime(conn, val, expr):
     assert cur.fetchone()[0] is True
 
 
-@pytest.mark.xfail  # TODO: binary dump
 @pytest.mark.parametrize(
     "val, expr",
-    [("2000,1,1,0,0", "'2000-01-01 00:00'::timestamp")],
+    [
+        ("min", "0001-01-01 00:00"),
+        ("1000,1,1,0,0", "1000-01-01 00:00"),
+        ("2000,1,1,0,0", "2000-01-01 00:00"),
+        ("2000,12,31,23,59,59,999999", "2000-12-31 23:59:59.999999"),
+        ("max", "9999-12-31 23:59:59.999999"),
+    ],
 )
 def test_dump_datetime_binary(conn, val, expr):
     cur = conn.cursor()
     cur.execute("set timezone to '+02:00'")
-    cur.execute(f"select {expr} = %b", (as_dt(val),))
+    cur.execute(f"select '{expr}'::timestamp = %b", (as_dt(val),))
     assert cur.fetchone()[0] is True
 
 
@@ -151,6 +184,7 @@ def test_dump_datetime_datestyle(conn, datestyle_in):
         ("2000,1,2,3,4,5,6", "2000-01-02 03:04:05.000006"),
         ("2000,1,2,3,4,5,678", "2000-01-02 03:04:05.000678"),
         ("2000,1,2,3,0,0,456789", "2000-01-02 03:00:00.456789"),
+        ("2000,1,2,3,0,0,450000", "2000-01-02 03:00:00.45"),
         ("2000,12,31", "2000-12-31"),
         ("3000,1,1", "3000-01-01"),
         ("max", "9999-12-31 23:59:59.999999"),
@@ -166,6 +200,25 @@ def test_load_datetime(conn, val, expr, datestyle_in, datestyle_out):
     assert cur.fetchone()[0] == as_dt(val)
 
 
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min", "0001-01-01"),
+        ("1000,1,1", "1000-01-01"),
+        ("2000,1,2,3,4,5,6", "2000-01-02 03:04:05.000006"),
+        ("2000,1,2,3,0,0,456789", "2000-01-02 03:00:00.456789"),
+        ("1969,12,31,23,59,59,999999", "1969-12-31 23:59:59.999999"),
+        ("max", "9999-12-31 23:59:59.999999"),
+    ],
+)
+@pytest.mark.parametrize("datestyle_out", ["ISO", "Postgres"])
+def test_load_datetime_binary(conn, val, expr, datestyle_out):
+    cur = conn.cursor(format=Format.BINARY)
+    cur.execute(f"set datestyle = {datestyle_out}, DMY")
+    cur.execute(f"select '{expr}'::timestamp")
+    assert cur.fetchone()[0] == as_dt(val)
+
+
 @pytest.mark.parametrize("val", ["min", "max"])
 @pytest.mark.parametrize("datestyle_out", ["ISO", "Postgres", "SQL", "German"])
 def test_load_datetime_overflow(conn, val, datestyle_out):
@@ -214,8 +267,16 @@ def test_dump_datetimetz(conn, val, expr):
     assert cur.fetchone()[0] is True
 
 
-@pytest.mark.xfail  # TODO: binary dump
-@pytest.mark.parametrize("val, expr", [("2000,1,1,0,0~2", "2000-01-01 00:00")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min~2", "0001-01-01 00:00+2"),
+        ("2000,1,1,0,0~2", "2000-01-01 00:00+2"),
+        ("2000,1,1,0,0~-12", "2000-01-01 00:00-12"),
+        ("2000,12,31,23,59,59,999999~2", "2000-12-31 23:59:59.999999+2"),
+        ("max~2", "9999-12-31 23:59:59.999999+2"),
+    ],
+)
 def test_dump_datetimetz_binary(conn, val, expr):
     cur = conn.cursor()
     cur.execute("set timezone to '-02:00'")
@@ -245,6 +306,7 @@ def test_dump_datetimetz_datestyle(conn, datestyle_in):
         ("2000,7,2,3,4,5,678~2", "2000-07-02 03:04:05.000678", "Europe/Rome"),
         ("2000,1,2,3,0,0,456789~2", "2000-01-02 03:00:00.456789", "-02:00"),
         ("2000,1,2,3,0,0,456789~-2", "2000-01-02 03:00:00.456789", "+02:00"),
+        ("2000,1,2,3,0,0,400000~-2", "2000-01-02 03:00:00.4", "+02:00"),
         ("2000,12,31~2", "2000-12-31", "-02:00"),
         ("1900,1,1~05:21:10", "1900-01-01", "Asia/Calcutta"),
     ],
@@ -258,6 +320,40 @@ def test_load_datetimetz(conn, val, expr, timezone, datestyle_out):
     assert cur.fetchone()[0] == as_dt(val)
 
 
+@pytest.mark.parametrize(
+    "val, expr, timezone",
+    [
+        ("2000,1,1~2", "2000-01-01", "-02:00"),
+        ("2000,1,2,3,4,5,6~2", "2000-01-02 03:04:05.000006", "-02:00"),
+        ("2000,1,2,3,4,5,678~1", "2000-01-02 03:04:05.000678", "Europe/Rome"),
+        ("2000,7,2,3,4,5,678~2", "2000-07-02 03:04:05.000678", "Europe/Rome"),
+        ("1900,1,1~05:21:10", "1900-01-01", "Asia/Calcutta"),
+    ],
+)
+@pytest.mark.parametrize("datestyle_out", ["ISO", "SQL", "Postgres"])
+def test_load_datetimetz_binary(conn, val, expr, timezone, datestyle_out):
+    cur = conn.cursor(format=Format.BINARY)
+    cur.execute(f"set datestyle = {datestyle_out}, DMY")
+    cur.execute(f"set timezone to '{timezone}'")
+    cur.execute(f"select '{expr}'::timestamptz")
+    assert cur.fetchone()[0] == as_dt(val)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "'infinity'::timestamp",
+        "'-infinity'::timestamp",
+        "'infinity'::timestamptz",
+    ],
+)
+def test_load_datetime_binary_infinity(conn, expr):
+    cur = conn.cursor(format=Format.BINARY)
+    cur.execute(f"select {expr}")
+    with pytest.raises(DataError):
+        cur.fetchone()[0]
+
+
 @pytest.mark.xfail  # parse timezone names
 @pytest.mark.parametrize("val, expr", [("2000,1,1~2", "2000-01-01")])
 @pytest.mark.parametrize("datestyle_out", ["SQL", "Postgres", "German"])
@@ -289,8 +385,14 @@ def test_dump_time(conn, val, expr):
     assert cur.fetchone()[0] is True
 
 
-@pytest.mark.xfail  # TODO: binary dump
-@pytest.mark.parametrize("val, expr", [("0,0", "00:00")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min", "00:00"),
+        ("10,20,30,40", "10:20:30.000040"),
+        ("max", "23:59:59.999999"),
+    ],
+)
 def test_dump_time_binary(conn, val, expr):
     cur = conn.cursor()
     cur.execute(f"select '{expr}'::time = %b", (as_time(val),))
@@ -305,6 +407,7 @@ def test_dump_time_binary(conn, val, expr):
         ("10,20", "10:20"),
         ("10,20,30", "10:20:30"),
         ("10,20,30,40", "10:20:30.000040"),
+        ("10,20,30,500000", "10:20:30.5"),
         ("max", "23:59:59.999999"),
     ],
 )
@@ -314,16 +417,23 @@ def test_load_time(conn, val, expr):
     assert cur.fetchone()[0] == as_time(val)
 
 
-@pytest.mark.xfail  # TODO: binary load
-@pytest.mark.parametrize("val, expr", [("0,0", "00:00")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min", "00:00"),
+        ("10,20,30,40", "10:20:30.000040"),
+        ("max", "23:59:59.999999"),
+    ],
+)
 def test_load_time_binary(conn, val, expr):
     cur = conn.cursor(format=Format.BINARY)
     cur.execute(f"select '{expr}'::time")
     assert cur.fetchone()[0] == as_time(val)
 
 
-def test_load_time_24(conn):
-    cur = conn.cursor()
+@pytest.mark.parametrize("fmt", [Format.TEXT, Format.BINARY])
+def test_load_time_24(conn, fmt):
+    cur = conn.cursor(format=fmt)
     cur.execute("select '24:00'::time")
     with pytest.raises(DataError):
         cur.fetchone()[0]
@@ -353,11 +463,18 @@ def test_dump_timetz(conn, val, expr):
     assert cur.fetchone()[0] is True
 
 
-@pytest.mark.xfail  # TODO: binary dump
-@pytest.mark.parametrize("val, expr", [("0,0~0", "00:00Z")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("0,0~0", "00:00Z"),
+        ("10,20,30,40~-2", "10:20:30.000040-02:00"),
+        ("10,20,30,40~+2:30", "10:20:30.000040+02:30"),
+        ("max~+12", "23:59:59.999999+12:00"),
+    ],
+)
 def test_dump_timetz_binary(conn, val, expr):
     cur = conn.cursor()
-    cur.execute(f"select '{expr}'::time = %b", (as_time(val),))
+    cur.execute(f"select '{expr}'::timetz = %b", (as_time(val),))
     assert cur.fetchone()[0] is True
 
 
@@ -370,6 +487,7 @@ def test_dump_timetz_binary(conn, val, expr):
         ("3,4,5,6~7:8", "03:04:05.000006", "-07:08"),
         ("3,0,0,456789~2", "03:00:00.456789", "-02:00"),
         ("3,0,0,456789~-2", "03:00:00.456789", "+02:00"),
+        ("3,0,0,120000~-2", "03:00:00.12", "+02:00"),
     ],
 )
 def test_load_timetz(conn, val, timezone, expr):
@@ -379,17 +497,24 @@ def test_load_timetz(conn, val, timezone, expr):
     assert cur.fetchone()[0] == as_time(val)
 
 
-@pytest.mark.xfail  # TODO: binary load
-@pytest.mark.parametrize("val, expr, timezone", [("0,0~2", "00:00", "-02:00")])
+@pytest.mark.parametrize(
+    "val, expr, timezone",
+    [
+        ("0,0~2", "00:00", "-02:00"),
+        ("3,4,5,6~7:8", "03:04:05.000006", "-07:08"),
+        ("3,0,0,456789~-2", "03:00:00.456789", "+02:00"),
+    ],
+)
 def test_load_timetz_binary(conn, val, expr, timezone):
     cur = conn.cursor(format=Format.BINARY)
     cur.execute(f"set timezone to '{timezone}'")
-    cur.execute(f"select '{expr}'::time")
+    cur.execute(f"select '{expr}'::timetz")
     assert cur.fetchone()[0] == as_time(val)
 
 
-def test_load_timetz_24(conn):
-    cur = conn.cursor()
+@pytest.mark.parametrize("fmt", [Format.TEXT, Format.BINARY])
+def test_load_timetz_24(conn, fmt):
+    cur = conn.cursor(format=fmt)
     cur.execute("select '24:00'::timetz")
     with pytest.raises(DataError):
         cur.fetchone()[0]
@@ -424,8 +549,18 @@ def test_dump_interval(conn, val, expr, intervalstyle):
     assert cur.fetchone()[0] is True
 
 
-@pytest.mark.xfail  # TODO: binary dump
-@pytest.mark.parametrize("val, expr", [("1s", "1s")])
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("min", "-999999999 days"),
+        ("1d", "1 day"),
+        ("-1d", "-1 day"),
+        ("1s", "1 s"),
+        ("-1s", "-1 s"),
+        ("-1m", "-0.000001 s"),
+        ("max", "999999999 days 23:59:59.999999"),
+    ],
+)
 def test_dump_interval_binary(conn, val, expr):
     cur = conn.cursor()
     cur.execute(f"select '{expr}'::interval = %b", (as_td(val),))
@@ -465,6 +600,29 @@ def test_load_interval(conn, val, expr):
     assert cur.fetchone()[0] == as_td(val)
 
 
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        ("1s", "1 sec"),
+        ("-1s", "-1 sec"),
+        ("1s,1m", "1.000001 sec"),
+        ("1d,1s,1m", "1 day 1.000001 sec"),
+        ("-86399s,-999999m", "-23:59:59.999999"),
+        ("-3723s,-400000m", "-1:2:3.4"),
+        ("365d", "1 year"),
+        ("-730d", "-2 years"),
+        ("395d", "1 year 1 month"),
+        ("-425d", "-1 year -2 months"),
+    ],
+)
+@pytest.mark.parametrize("intervalstyle", ["postgres", "sql_standard"])
+def test_load_interval_binary(conn, val, expr, intervalstyle):
+    cur = conn.cursor(format=Format.BINARY)
+    cur.execute(f"set IntervalStyle to '{intervalstyle}'")
+    cur.execute(f"select '{expr}'::interval")
+    assert cur.fetchone()[0] == as_td(val)
+
+
 @pytest.mark.xfail  # weird interval outputs
 @pytest.mark.parametrize("val, expr", [("1d,1s", "1 day 1 sec")])
 @pytest.mark.parametrize(
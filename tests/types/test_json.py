@@ -3,8 +3,10 @@ import json
 import pytest
 
 import psycopg3.types.json
-from psycopg3.types.json import Json, Jsonb
-from psycopg3.adapt import Format
+from psycopg3.types.json import Json, Jsonb, JSON_OID, JSONB_OID
+from psycopg3.types.json import JsonDumper, JsonbDumper, JsonbBinaryDumper
+from psycopg3.types.json import set_json_dumps, set_json_loads
+from psycopg3.adapt import Format, Transformer
 
 samples = [
     "null",
@@ -81,3 +83,108 @@ def test_json_dump_subclass(conn, wrapper, fmt_in):
 def my_dumps(obj):
     obj["baz"] = "qux"
     return json.dumps(obj)
+
+
+@pytest.mark.parametrize("val", samples)
+@pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
+def test_dict_dump(conn, val, fmt_in):
+    ph = "%s" if fmt_in == Format.TEXT else "%b"
+    obj = {"val": json.loads(val)}
+    cur = conn.cursor()
+    cur.execute(f"select pg_typeof({ph}) = 'jsonb'::regtype", (obj,))
+    assert cur.fetchone()[0] is True
+    cur.execute(f"select {ph} = %s::jsonb", (obj, json.dumps(obj)))
+    assert cur.fetchone()[0] is True
+
+
+@pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
+@pytest.mark.parametrize("wrapper", ["Json", "Jsonb"])
+def test_list_dump(conn, wrapper, fmt_in):
+    ph = "%s" if fmt_in == Format.TEXT else "%b"
+    cur = conn.cursor()
+    dumper = JsonDumper if wrapper == "Json" else JsonbDumper
+    if wrapper == "Jsonb" and fmt_in == Format.BINARY:
+        dumper = JsonbBinaryDumper
+    dumper.register(list, cur, format=fmt_in)
+    cur.execute(f"select {ph}::text", ([1, "a", None],))
+    assert json.loads(cur.fetchone()[0]) == [1, "a", None]
+
+
+@pytest.mark.parametrize("wrapper", ["Json", "Jsonb", None])
+@pytest.mark.parametrize("fmt", [Format.TEXT, Format.BINARY])
+def test_set_json_dumps_bytes(wrapper, fmt):
+    tx = Transformer()
+    set_json_dumps(my_dumps_bytes, tx)
+    obj = {"foo": "bar"}
+    if wrapper:
+        obj = getattr(psycopg3.types.json, wrapper)(obj)
+    data = tx.get_dumper(obj, fmt).dump(obj)
+    if fmt == Format.BINARY and wrapper != "Json":
+        assert data[:1] == b"\x01"
+        data = data[1:]
+    assert json.loads(data) == {"foo": "bar", "baz": "qux"}
+
+    # the wrapper customisation has the priority
+    if wrapper:
+        obj = getattr(psycopg3.types.json, wrapper)(
+            {"foo": "bar"}, dumps=json.dumps
+        )
+        data = tx.get_dumper(obj, fmt).dump(obj)
+        assert b"baz" not in data
+
+
+def test_set_json_dumps_scope(conn):
+    cur = conn.cursor()
+    set_json_dumps(my_dumps_bytes, cur)
+    obj = {"foo": "bar"}
+    cur.execute("select %s->>'baz'", [obj])
+    assert cur.fetchone()[0] == "qux"
+    cur = conn.cursor()
+    cur.execute("select %s->>'baz'", [obj])
+    assert cur.fetchone()[0] is None
+
+
+@pytest.mark.parametrize(
+    "oid, fmt, data",
+    [
+        (JSON_OID, Format.TEXT, b'{"a": 1}'),
+        (JSONB_OID, Format.TEXT, b'{"a": 1}'),
+        (JSON_OID, Format.BINARY, b'{"a": 1}'),
+        (JSONB_OID, Format.BINARY, b'\x01{"a": 1}'),
+    ],
+)
+def test_set_json_loads(oid, fmt, data):
+    tx = Transformer()
+    assert tx.get_loader(oid, fmt).load(data) == {"a": 1}
+
+    got = []
+
+    def my_loads(data):
+        got.append(data)
+        return json.loads(data)
+
+    tx = Transformer()
+    set_json_loads(my_loads, tx)
+    assert tx.get_loader(oid, fmt).load(data) == {"a": 1}
+    assert got == [b'{"a": 1}']
+
+
+def test_jsonb_binary_bad_version():
+    tx = Transformer()
+    loader = tx.get_loader(JSONB_OID, Format.BINARY)
+    with pytest.raises(psycopg3.DataError, match="format: 2"):
+        loader.load(b'\x02{"a": 1}')
+
+
+@pytest.mark.parametrize("jtype", ["json", "jsonb"])
+@pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
+def test_set_json_loads_conn(conn, jtype, fmt_out):
+    set_json_loads(lambda data: ("custom", json.loads(data)), conn)
+    cur = conn.cursor(format=fmt_out)
+    cur.execute(f"""select '{{"a": 1}}'::{jtype}""")
+    assert cur.fetchone()[0] == ("custom", {"a": 1})
+
+
+def my_dumps_bytes(obj):
+    obj = dict(obj, baz="qux")
+    return json.dumps(obj).encode("utf-8")
@@ -5,13 +5,14 @@ import subprocess as sp
 
 import pytest
 
-from psycopg3.adapt import Format
+from psycopg3 import DataError
+from psycopg3.oids import builtins
+from psycopg3.adapt import Format, Transformer
 
 
 @pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("val", ["192.168.0.1", "2001:db8::"])
 def test_address_dump(conn, fmt_in, val):
-    binary_check(fmt_in)
     ph = "%s" if fmt_in == Format.TEXT else "%b"
     cur = conn.cursor()
     cur.execute(f"select {ph} = %s::inet", (ipaddress.ip_address(val), val))
@@ -26,7 +27,6 @@ def test_address_dump(conn, fmt_in, val):
 @pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("val", ["127.0.0.1/24", "::ffff:102:300/128"])
 def test_interface_dump(conn, fmt_in, val):
-    binary_check(fmt_in)
     ph = "%s" if fmt_in == Format.TEXT else "%b"
     cur = conn.cursor()
     cur.execute(f"select {ph} = %s::inet", (ipaddress.ip_interface(val), val))
@@ -41,7 +41,6 @@ def test_interface_dump(conn, fmt_in, val):
 @pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("val", ["127.0.0.0/24", "::ffff:102:300/128"])
 def test_network_dump(conn, fmt_in, val):
-    binary_check(fmt_in)
     ph = "%s" if fmt_in == Format.TEXT else "%b"
     cur = conn.cursor()
     cur.execute(f"select {ph} = %s::cidr", (ipaddress.ip_network(val), val))
@@ -56,7 +55,6 @@ def test_network_dump(conn, fmt_in, val):
 @pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("val", ["127.0.0.1/32", "::ffff:102:300/128"])
 def test_inet_load_address(conn, fmt_out, val):
-    binary_check(fmt_out)
     cur = conn.cursor(format=fmt_out)
     cur.execute("select %s::inet", (val,))
     addr = ipaddress.ip_address(val.split("/", 1)[0])
@@ -68,7 +66,6 @@ def test_inet_load_address(conn, fmt_out, val):
 @pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("val", ["127.0.0.1/24", "::ffff:102:300/127"])
 def test_inet_load_network(conn, fmt_out, val):
-    binary_check(fmt_out)
     cur = conn.cursor(format=fmt_out)
     cur.execute("select %s::inet", (val,))
     assert cur.fetchone()[0] == ipaddress.ip_interface(val)
@@ -79,7 +76,6 @@ def test_inet_load_network(conn, fmt_out, val):
 @pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
 @pytest.mark.parametrize("val", ["127.0.0.0/24", "::ffff:102:300/128"])
 def test_cidr_load(conn, fmt_out, val):
-    binary_check(fmt_out)
     cur = conn.cursor(format=fmt_out)
     cur.execute("select %s::cidr", (val,))
     assert cur.fetchone()[0] == ipaddress.ip_network(val)
@@ -87,9 +83,54 @@ def test_cidr_load(conn, fmt_out, val):
     assert cur.fetchone()[0] == [None, ipaddress.ip_network(val)]
 
 
-def binary_check(fmt):
-    if fmt == Format.BINARY:
-        pytest.xfail("inet binary not implemented")
+@pytest.mark.parametrize(
+    "val, data",
+    [
+        ("127.0.0.1", b"\x02\x20\x00\x04\x7f\x00\x00\x01"),
+        ("10.0.0.1/8", b"\x02\x08\x00\x04\x0a\x00\x00\x01"),
+        ("::1", b"\x03\x80\x00\x10" + b"\x00" * 15 + b"\x01"),
+        ("::1/64", b"\x03\x40\x00\x10" + b"\x00" * 15 + b"\x01"),
+    ],
+)
+def test_inet_binary_roundtrip(val, data):
+    obj = (
+        ipaddress.ip_interface(val)
+        if "/" in val
+        else ipaddress.ip_address(val)
+    )
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    assert dumper.oid == builtins["inet"].oid
+    assert dumper.dump(obj) == data
+    loader = tx.get_loader(builtins["inet"].oid, Format.BINARY)
+    got = loader.load(data)
+    assert got == obj
+    assert type(got) is type(obj)
+
+
+@pytest.mark.parametrize(
+    "val, data",
+    [
+        ("10.0.0.0/8", b"\x02\x08\x01\x04\x0a\x00\x00\x00"),
+        ("2001:db8::/32", b"\x03\x20\x01\x10\x20\x01\x0d\xb8" + b"\x00" * 12),
+    ],
+)
+def test_cidr_binary_roundtrip(val, data):
+    obj = ipaddress.ip_network(val)
+    tx = Transformer()
+    dumper = tx.get_dumper(obj, Format.BINARY)
+    assert dumper.oid == builtins["cidr"].oid
+    assert dumper.dump(obj) == data
+    loader = tx.get_loader(builtins["cidr"].oid, Format.BINARY)
+    assert loader.load(data) == obj
+
+
+@pytest.mark.parametrize("typname", ["inet", "cidr"])
+def test_binary_bad_family(typname):
+    tx = Transformer()
+    loader = tx.get_loader(builtins[typname].oid, Format.BINARY)
+    with pytest.raises(DataError):
+        loader.load(b"\x04\x20\x00\x04\x7f\x00\x00\x01")
 
 
 def test_lazy_load(dsn):
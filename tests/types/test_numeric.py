@@ -7,7 +7,10 @@ import psycopg3
 from psycopg3 import sql
 from psycopg3.oids import builtins
 from psycopg3.adapt import Transformer, Format
-from psycopg3.types.numeric import FloatLoader
+from psycopg3.types.numeric import Float4, Float8
+from psycopg3.types.numeric import FloatLoader, NumericIntLoader
+from psycopg3.types.numeric import NumericIntBinaryLoader
+from psycopg3.types.numeric import NumericFloatBinaryLoader
 
 
 #
@@ -63,6 +66,28 @@ def test_dump_int_subtypes(conn, val, expr, fmt_in):
     assert cur.fetchone()[0] is True
 
 
+@pytest.mark.parametrize(
+    "val, expr",
+    [
+        (0.0, "'0'::real"),
+        (-2.5, "'-2.5'::real"),
+        (float("inf"), "'Infinity'::real"),
+        (0.0, "'0'::double precision"),
+        (1e300, "'1e300'::double precision"),
+        (float("-inf"), "'-Infinity'::double precision"),
+    ],
+)
+@pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
+def test_dump_float_subtypes(conn, val, expr, fmt_in):
+    Type = Float4 if expr.endswith("real") else Float8
+    ph = "%s" if fmt_in == Format.TEXT else "%b"
+    cur = conn.cursor()
+    cur.execute(f"select pg_typeof({expr}) = pg_typeof({ph})", (Type(val),))
+    assert cur.fetchone()[0] is True
+    cur.execute(f"select {expr} = {ph}", (Type(val),))
+    assert cur.fetchone()[0] is True
+
+
 @pytest.mark.parametrize(
     "val, expr",
     [
@@ -325,20 +350,174 @@ def test_quote_numeric(conn, val, expr):
         assert r == (val, -val)
 
 
-@pytest.mark.xfail
-def test_dump_numeric_binary():
-    # TODO: numeric binary adaptation
+@pytest.mark.parametrize(
+    "val, want",
+    [
+        ("0", "0000 0000 0000 0000"),
+        ("0.00", "0000 0000 0000 0002"),
+        ("1", "0001 0000 0000 0000 0001"),
+        ("-1", "0001 0000 4000 0000 0001"),
+        ("1.50", "0002 0000 0000 0002 0001 1388"),
+        ("12345.6789", "0003 0001 0000 0004 0001 0929 1a85"),
+        ("1E+8", "0001 0002 0000 0000 0001"),
+        ("0.0001", "0001 ffff 0000 0004 0001"),
+        ("nan", "0000 0000 c000 0000"),
+        ("inf", "0000 0000 d000 0000"),
+        ("-inf", "0000 0000 f000 0000"),
+    ],
+)
+def test_dump_numeric_binary(val, want):
     tx = Transformer()
-    n = Decimal(1)
-    tx.get_dumper(n, Format.BINARY).dump(n)
+    n = Decimal(val)
+    dumper = tx.get_dumper(n, Format.BINARY)
+    assert dumper.dump(n) == bytes.fromhex(want)
+    assert dumper.oid == builtins["numeric"].oid
 
 
-@pytest.mark.xfail
-def test_load_numeric_binary(conn):
-    # TODO: numeric binary casting
+@pytest.mark.parametrize(
+    "val",
+    [
+        "0",
+        "0.0",
+        "0.00",
+        "1",
+        "-1",
+        "1.50",
+        "10000",
+        "10000.0001",
+        "99990000",
+        "12345678901234567890.123456789",
+        "0.000000000000000000001",
+        "-0.000000000000000000001",
+        "nan",
+        "inf",
+        "-inf",
+    ],
+)
+def test_load_numeric_binary_roundtrip(val):
+    tx = Transformer()
+    n = Decimal(val)
+    data = tx.get_dumper(n, Format.BINARY).dump(n)
+    loader = tx.get_loader(builtins["numeric"].oid, Format.BINARY)
+    result = loader.load(data)
+    assert isinstance(result, Decimal)
+    if n.is_nan():
+        assert result.is_nan()
+    else:
+        assert str(result) == str(n)
+
+
+def test_dump_numeric_binary_out_of_range():
+    tx = Transformer()
+    n = Decimal("1E+200000")
+    with pytest.raises(psycopg3.DataError):
+        tx.get_dumper(n, Format.BINARY).dump(n)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "0",
+        "0.00",
+        "1",
+        "-1",
+        "1.50",
+        "-12345.6789",
+        "100000000",
+        "123456789012345678901234567890.123",
+        "0.000000000000000000001",
+        "NaN",
+    ],
+)
+def test_load_numeric_binary(conn, expr):
     cur = conn.cursor(format=1)
-    res = cur.execute("select 1::numeric").fetchone()[0]
-    assert res == Decimal(1)
+    res = cur.execute(f"select '{expr}'::numeric").fetchone()[0]
+    assert isinstance(res, Decimal)
+    if expr == "NaN":
+        assert res.is_nan()
+    else:
+        want = Decimal(expr)
+        assert res == want
+        assert res.as_tuple().exponent == want.as_tuple().exponent
+
+
+@pytest.mark.parametrize(
+    "val",
+    [
+        "0",
+        "1.50",
+        "-12345.6789",
+        "123456789012345678901234567890.123",
+        "0.000000000000000000001",
+        "nan",
+    ],
+)
+def test_roundtrip_numeric_binary(conn, val):
+    cur = conn.cursor(format=1)
+    val = Decimal(val)
+    cur.execute("select %b", (val,))
+    result = cur.fetchone()[0]
+    if val.is_nan():
+        assert result.is_nan()
+    else:
+        assert str(result) == str(val)
+
+
+@pytest.mark.parametrize(
+    "expr, want",
+    [
+        ("0", 0),
+        ("1", 1),
+        ("-1", -1),
+        ("10000", 10000),
+        ("99990000", 99990000),
+        ("123456789012345678901234567890", 123456789012345678901234567890),
+        ("-123456789012345678901234567890", -123456789012345678901234567890),
+        ("1.5", Decimal("1.5")),
+        ("1.0", Decimal("1.0")),
+        ("NaN", Decimal("NaN")),
+    ],
+)
+@pytest.mark.parametrize("fmt_out", [Format.TEXT, Format.BINARY])
+def test_numeric_as_int(conn, expr, want, fmt_out):
+    cur = conn.cursor(format=fmt_out)
+    oid = builtins["numeric"].oid
+    if fmt_out == Format.TEXT:
+        NumericIntLoader.register(oid, cur)
+    else:
+        NumericIntBinaryLoader.register_binary(oid, cur)
+
+    cur.execute(f"select '{expr}'::numeric")
+    result = cur.fetchone()[0]
+    assert type(result) is type(want)
+    if isinstance(want, Decimal) and want.is_nan():
+        assert result.is_nan()
+    else:
+        assert result == want
+
+
+@pytest.mark.parametrize(
+    "expr, want",
+    [
+        ("0", 0.0),
+        ("-1", -1.0),
+        ("1.5", 1.5),
+        ("12345.6789", 12345.6789),
+        ("0.000000000000000000001", 1e-21),
+        ("123456789012345678901234567890", 1.2345678901234568e29),
+        ("NaN", float("nan")),
+    ],
+)
+def test_numeric_as_float_binary(conn, expr, want):
+    cur = conn.cursor(format=1)
+    NumericFloatBinaryLoader.register_binary(builtins["numeric"].oid, cur)
+    cur.execute(f"select '{expr}'::numeric")
+    result = cur.fetchone()[0]
+    assert isinstance(result, float)
+    if isnan(want):
+        assert isnan(result)
+    else:
+        assert result == want
 
 
 @pytest.mark.parametrize(
@@ -5,7 +5,8 @@ import subprocess as sp
 
 import pytest
 
-from psycopg3.adapt import Format
+from psycopg3.oids import builtins
+from psycopg3.adapt import Format, Transformer
 
 
 @pytest.mark.parametrize("fmt_in", [Format.TEXT, Format.BINARY])
@@ -25,6 +26,40 @@ def test_uuid_load(conn, fmt_out):
     assert cur.fetchone()[0] == UUID(val)
 
 
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"12345678-1234-5678-1234-567812345679",
+        b"12345678123456781234567812345679",
+        b"{12345678-1234-5678-1234-567812345679}",
+        b"ABCDEF00-0000-0000-0000-00000000FFFF",
+    ],
+)
+def test_uuid_load_text(data):
+    tx = Transformer()
+    loader = tx.get_loader(builtins["uuid"].oid, Format.TEXT)
+    got = loader.load(data)
+    assert got == UUID(data.decode("ascii"))
+    assert str(got) == str(UUID(data.decode("ascii")))
+
+
+@pytest.mark.parametrize(
+    "val",
+    [
+        "12345678123456781234567812345679",
+        "00000000000000000000000000000000",
+        "ffffffffffffffffffffffffffffffff",
+    ],
+)
+def test_uuid_load_binary(val):
+    tx = Transformer()
+    loader = tx.get_loader(builtins["uuid"].oid, Format.BINARY)
+    got = loader.load(UUID(val).bytes)
+    assert got == UUID(val)
+    assert got.int == UUID(val).int
+    assert hash(got) == hash(UUID(val))
+
+
 def test_lazy_load(dsn):
     script = f"""\
 import sys